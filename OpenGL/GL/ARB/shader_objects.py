@@ -182,7 +182,8 @@ def _afterCheck( key ):
         cArguments=None,
         *args
     ):
-        result = _errors._error_checker.glCheckError( result, baseOperation, cArguments, *args )
+        if OpenGL.ERROR_CHECKING != 'deferred':
+            result = _errors._error_checker.glCheckError( result, baseOperation, cArguments, *args )
         status = glGetObjectParameterivARB(
             cArguments[0], key
         )
@@ -289,7 +289,8 @@ def _afterCheck( key ):
         cArguments=None,
         *args
     ):
-        result = _errors._error_checker.glCheckError( result, baseOperation, cArguments, *args )
+        if _configflags.ERROR_CHECKING != 'deferred':
+            result = _errors._error_checker.glCheckError( result, baseOperation, cArguments, *args )
         status = ctypes.c_int()
         getter( cArguments[0], key, ctypes.byref(status))
         status = status.value
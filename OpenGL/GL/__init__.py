@@ -1,49 +1,77 @@
-"""OpenGL.GL, the core GL library and extensions to it"""
+"""OpenGL.GL, the core GL library and extensions to it
+
+Names are loaded on first access: OpenGL.GL._names records which module
+defines each one, and only that module is imported when one of its names
+is first used.  "from OpenGL.GL import *" still binds (and so loads)
+everything.
+"""
 # early import of our modules to prevent import loops...
 from OpenGL import error as _error
-from OpenGL.GL.VERSION.GL_1_1 import *
-from OpenGL.GL.pointers import *
-from OpenGL.GL.images import *
-
-from OpenGL.GL.exceptional import *
-
-from OpenGL.GL.glget import *
-
-from OpenGL.GL.VERSION.GL_1_2 import *
-from OpenGL.GL.VERSION.GL_1_3 import *
-from OpenGL.GL.VERSION.GL_1_4 import *
-from OpenGL.GL.VERSION.GL_1_5 import *
-from OpenGL.GL.VERSION.GL_2_0 import *
-from OpenGL.GL.VERSION.GL_2_1 import *
-from OpenGL.GL.VERSION.GL_3_0 import *
-from OpenGL.GL.VERSION.GL_3_1 import *
-from OpenGL.GL.VERSION.GL_3_2 import *
-from OpenGL.GL.VERSION.GL_3_3 import *
-from OpenGL.GL.VERSION.GL_4_0 import *
-from OpenGL.GL.VERSION.GL_4_1 import *
-from OpenGL.GL.VERSION.GL_4_2 import *
-from OpenGL.GL.VERSION.GL_4_3 import *
-from OpenGL.GL.VERSION.GL_4_4 import *
-from OpenGL.GL.VERSION.GL_4_5 import *
-from OpenGL.GL.VERSION.GL_4_6 import *
-
 from OpenGL.error import *
 GLerror = GLError
 
+import importlib as _importlib
+from OpenGL.GL._names import INDEX as _INDEX
+
+_OWNERS = dict(
+    (name, module_name)
+    for module_name, names in _INDEX.items()
+    for name in names
+)
+
 # Now the aliases...
-glRotate = glRotated
-glTranslate = glTranslated
-glLight = glLightfv
-glTexCoord = glTexCoord2d
-glScale = glScaled
-#glColor = glColor3f
-glNormal = glNormal3d
-
-glGetBoolean = glGetBooleanv
-glGetDouble = glGetDoublev
-glGetFloat = glGetFloatv
-glGetInteger = glGetIntegerv 
-glGetPolygonStippleub = glGetPolygonStipple
+_ALIASES = {
+    'glRotate': 'glRotated',
+    'glTranslate': 'glTranslated',
+    'glLight': 'glLightfv',
+    'glTexCoord': 'glTexCoord2d',
+    'glScale': 'glScaled',
+    #'glColor': 'glColor3f',
+    'glNormal': 'glNormal3d',
+
+    'glGetBoolean': 'glGetBooleanv',
+    'glGetDouble': 'glGetDoublev',
+    'glGetFloat': 'glGetFloatv',
+    'glGetInteger': 'glGetIntegerv',
+    'glGetPolygonStippleub': 'glGetPolygonStipple',
+}
+# Sub-modules the eager namespace imported, and so exposed as attributes
+_SUBMODULES = (
+    'VERSION', 'pointers', 'images', 'exceptional', 'glget', 'vboimplementation', 'ARB', 'KHR',
+)
+
+def _load( module_name ):
+    """Import module_name and bind every name it wins in the namespace"""
+    module = _importlib.import_module( module_name )
+    namespace = globals()
+    for name in _INDEX[module_name]:
+        namespace[name] = getattr( module, name )
+
+def __getattr__( name ):
+    """Resolve name on first access, after which it is an ordinary global"""
+    if name in _ALIASES:
+        value = globals().get( _ALIASES[name] )
+        if value is None:
+            value = __getattr__( _ALIASES[name] )
+        globals()[name] = value
+        return value
+    module_name = _OWNERS.get( name )
+    if module_name is not None:
+        _load( module_name )
+        return globals()[name]
+    if name in _SUBMODULES:
+        return _importlib.import_module( '%s.%s'%( __name__, name ))
+    raise AttributeError( 'module %r has no attribute %r'%( __name__, name ))
+
+def __dir__():
+    return sorted( set( globals() ) | set( _OWNERS ) | set( _ALIASES ) )
+
+__all__ = sorted(
+    set( _error.__all__ ) | set( _OWNERS ) | set( _ALIASES ) | set( _SUBMODULES ) | set( ['GLerror'] )
+)
 
+# Modules that register pixel-format tables, glGetString's result type and the
+# VBO implementations as import side effects, so they cannot wait for first use
+from OpenGL.GL import images as _images, glget as _glget
 from OpenGL.GL import vboimplementation as _core_implementation
 from OpenGL.GL.ARB import vboimplementation as _arb_implementation
@@ -0,0 +1,94 @@
+"""Build the name index behind the lazily-loaded OpenGL.GL namespace
+
+OpenGL.GL used to star-import every module below, in this order, so that
+later modules overrode earlier ones.  It now resolves each name on first
+access through OpenGL.GL._names, which records, for every name that star
+import would have produced, the module whose definition won (the first,
+for constants that later modules re-declare with the same value).  Regenerate
+the index whenever the modules or their exports change:
+
+    python -m OpenGL.GL._namespace
+"""
+import importlib, os, pprint, sys
+from OpenGL.constant import Constant
+
+STAR_MODULES = (
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+    'OpenGL.GL.VERSION.GL_1_2',
+    'OpenGL.GL.VERSION.GL_1_3',
+    'OpenGL.GL.VERSION.GL_1_4',
+    'OpenGL.GL.VERSION.GL_1_5',
+    'OpenGL.GL.VERSION.GL_2_0',
+    'OpenGL.GL.VERSION.GL_2_1',
+    'OpenGL.GL.VERSION.GL_3_0',
+    'OpenGL.GL.VERSION.GL_3_1',
+    'OpenGL.GL.VERSION.GL_3_2',
+    'OpenGL.GL.VERSION.GL_3_3',
+    'OpenGL.GL.VERSION.GL_4_0',
+    'OpenGL.GL.VERSION.GL_4_1',
+    'OpenGL.GL.VERSION.GL_4_2',
+    'OpenGL.GL.VERSION.GL_4_3',
+    'OpenGL.GL.VERSION.GL_4_4',
+    'OpenGL.GL.VERSION.GL_4_5',
+    'OpenGL.GL.VERSION.GL_4_6',
+)
+
+def exported( module ):
+    """Names "from module import *" binds"""
+    names = getattr( module, '__all__', None )
+    if names is None:
+        names = [name for name in vars( module ) if not name.startswith( '_' )]
+    return list( names )
+
+def _same_constant( first, second ):
+    """Is second a re-declaration of constant first?"""
+    return (
+        isinstance( first, Constant ) and type( first ) is type( second ) and
+        first.name == second.name and first == second
+    )
+
+def build_index():
+    """Map module name -> sorted names that resolve to that module
+
+    Later GL versions re-declare many core constants (GL_FLOAT,
+    GL_TEXTURE_2D...); an equal re-declaration keeps the earlier owner so
+    that using a core constant does not load the newest version module.
+    """
+    owners, values = {}, {}
+    for module_name in STAR_MODULES:
+        module = importlib.import_module( module_name )
+        for name in exported( module ):
+            value = getattr( module, name )
+            if name in owners and _same_constant( values[name], value ):
+                continue
+            owners[name] = module_name
+            values[name] = value
+    # OpenGL.error's names are bound eagerly by OpenGL.GL itself
+    from OpenGL import error
+    for name in exported( error ):
+        owners.pop( name, None )
+    index = {}
+    for name, module_name in owners.items():
+        index.setdefault( module_name, [] ).append( name )
+    return dict(
+        (module_name, tuple(sorted( index[module_name] )))
+        for module_name in STAR_MODULES if module_name in index
+    )
+
+def write_index( path=None ):
+    path = path or os.path.join( os.path.dirname( __file__ ), '_names.py' )
+    index = build_index()
+    with open( path, 'w' ) as handle:
+        handle.write( '"""Generated by python -m OpenGL.GL._namespace, do not edit"""\n' )
+        handle.write( 'INDEX = ' )
+        handle.write( pprint.pformat( index, width=100 ) )
+        handle.write( '\n' )
+    return sum( len(names) for names in index.values() )
+
+if __name__ == "__main__":
+    count = write_index( *sys.argv[1:] )
+    print( 'Indexed %s names'%( count, ))
@@ -32,7 +32,7 @@ glRasterPosDispatch = {
     4: full.glRasterPos4d,
 }
 
-if _configflags.ERROR_CHECKING:
+if _configflags.ERROR_CHECKING and _configflags.ERROR_CHECKING != 'deferred':
     @_lazy( full.glBegin )
     def glBegin( baseFunction, mode ):
         """Begin GL geometry-definition mode, disable automatic error checking"""
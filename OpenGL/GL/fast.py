@@ -0,0 +1,73 @@
+"""Unchecked ctypes entry points for the scalar-only GL 1.x functions
+
+The GL 1.0 and 1.1 entry points whose arguments and result are all
+scalars (glVertex3f, glColor4f, glTranslatef, glPushMatrix, glEnable...)
+are bound here to plain ctypes function pointers, resolved when this
+module is imported.  A call goes straight to ctypes: there is no error
+checking, context checking or logging, so GL errors are only seen through
+glGetError or OpenGL.error.checkpoint (see ERROR_CHECKING = 'deferred').
+ctypes converts the arguments just as it does for the OpenGL.GL versions,
+which have no array arguments to convert.
+
+Choose the fast versions per import, for the calls made most often:
+
+    from OpenGL.GL import glDrawArrays, glBindTexture
+    from OpenGL.GL.fast import glBegin, glEnd, glVertex3f, glColor3f
+
+While errors are checked after every call, glBegin and glEnd here are the
+OpenGL.GL versions, which suspend that checking, so fast and checked calls
+can be mixed between them.  Functions the GL library does not export are
+the OpenGL.raw.GL definitions, resolved on first call.
+"""
+from OpenGL import platform as _p, _configflags
+from OpenGL.platform import ctypesloader as _ctypesloader
+from OpenGL.platform.baseplatform import _NullFunctionPointer, _DeprecatedFunctionPointer
+from OpenGL.raw.GL.VERSION import GL_1_0 as _GL_1_0, GL_1_1 as _GL_1_1
+
+# ctypes type codes of the integer, floating point and boolean types
+_SCALAR_CODES = 'bBhHiIlLqQfd?'
+
+def _isScalar( typ ):
+    """Is typ a scalar ctypes type (or None, for a void result)?"""
+    if typ is None:
+        return True
+    code = getattr( typ, '_type_', None )
+    return isinstance( code, str ) and code in _SCALAR_CODES
+
+def _isScalarOnly( definition ):
+    """Is definition a raw GL function taking and returning only scalars?"""
+    return (
+        isinstance( definition, _NullFunctionPointer ) and
+        not isinstance( definition, _DeprecatedFunctionPointer ) and
+        _isScalar( definition.restype ) and
+        all( [_isScalar( typ ) for typ in definition.argtypes] )
+    )
+
+def _resolve( definition ):
+    """Build a bare ctypes function for definition, or return definition"""
+    functionType = _p.PLATFORM.functionTypeFor( definition.DLL )(
+        definition.restype, *definition.argtypes
+    )
+    try:
+        function = _ctypesloader.buildFunction(
+            functionType, definition.__name__, definition.DLL,
+        )
+    except AttributeError:
+        return definition
+    function.__name__ = definition.__name__
+    return function
+
+# GL_1_1 re-declares the GL 1.0 functions, so each name is only resolved once
+_definitions = dict( vars( _GL_1_0 ) )
+_definitions.update( vars( _GL_1_1 ) )
+__all__ = sorted([
+    _name for _name, _definition in _definitions.items()
+    if _isScalarOnly( _definition )
+])
+for _name in __all__:
+    globals()[_name] = _resolve( _definitions[_name] )
+
+if _configflags.ERROR_CHECKING and _configflags.ERROR_CHECKING != 'deferred':
+    from OpenGL.GL.exceptional import glBegin, glEnd
+
+del _definitions, _name
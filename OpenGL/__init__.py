@@ -33,6 +33,15 @@ import occurs the flags should no longer be changed.
         i.e. where you are explicitly checking for errors
         everywhere they can occur in your code.
 
+        If set to 'deferred', GL entry points do not check
+        for errors at all; instead the errors the GL records
+        are collected and raised by OpenGL.error.checkpoint,
+        which the application calls at frame boundaries (or
+        wherever it wants errors reported), naming the region
+        of code the errors came from.  This keeps most of the
+        speed of disabling checking while still reporting
+        errors, though not the call that caused them.
+
         Default: True
 
     ERROR_LOGGING -- If True, then wrap array-handler
@@ -182,18 +191,20 @@ from OpenGL.version import __version__
 import os
 
 
-def environ_key(name, default):
+def environ_key(name, default, choices=()):
     composed = "PYOPENGL_%s" % name.upper()
     if composed in os.environ:
         value = os.environ[composed]
         if value.lower() in ("1", "true"):
             return True
+        elif value.lower() in choices:
+            return value.lower()
         else:
             return False
     return os.environ.get(composed, default)
 
 
-ERROR_CHECKING = environ_key("ERROR_CHECKING", True)
+ERROR_CHECKING = environ_key("ERROR_CHECKING", True, choices=("deferred",))
 ERROR_LOGGING = environ_key("ERROR_LOGGING", False)
 ERROR_ON_COPY = environ_key("ERROR_ON_COPY", False)
 ARRAY_SIZE_CHECKING = environ_key("ARRAY_SIZE_CHECKING", True)
@@ -96,6 +96,7 @@ if ADT is None:
                 types = [types]
             for type in types:
                 self[type] = handler
+            _DIRECT_DISPATCH.clear()
             if handler.isOutput:
                 self.all_output_handlers.append(handler)
 
@@ -111,6 +112,49 @@ if ADT is None:
     GLOBAL_REGISTRY = HandlerRegistry(plugins.FormatHandler.match)
     formathandler.FormatHandler.TYPE_REGISTRY = GLOBAL_REGISTRY
 
+    # (array class, exact value type, dtype) -> whether C-contiguous values
+    # of that type and dtype can be passed straight through, decided once
+    _DIRECT_DISPATCH = {}
+
+    def _direct(cls, value):
+        """Is value a C-contiguous numpy array already of cls's type?
+
+        Such arrays need no copy or conversion, so the array class methods
+        skip the handler lookup and answer for them directly.
+        """
+        key = (cls, value.__class__, getattr(value, "dtype", None))
+        direct = _DIRECT_DISPATCH.get(key)
+        if direct is None:
+            direct = _DIRECT_DISPATCH[key] = _decideDirect(cls, value)
+        return direct and value.flags.c_contiguous
+
+    def _decideDirect(cls, value):
+        """Uncached part of _direct, for the first value of each key"""
+        if getattr(value, "dtype", None) is None:
+            return False
+        try:
+            from OpenGL.arrays import numpymodule
+        except ImportError:
+            return False
+        if not (
+            isinstance(value, numpymodule.numpy.ndarray)
+            and isinstance(GLOBAL_REGISTRY(value), numpymodule.NumpyHandler)
+        ):
+            return False
+        if cls.typeConstant is None:
+            # untyped (void) arrays take any dtype
+            return True
+        mapping = numpymodule.GL_TYPE_TO_ARRAY_MAPPING
+        return cls.typeConstant in mapping and value.dtype == mapping[cls.typeConstant]
+
+    def _directPointer(value):
+        """Data pointer of a numpy array without building __array_interface__"""
+        try:
+            return ctypes.addressof(ctypes.c_char.from_buffer(value))
+        except (TypeError, ValueError):
+            # read-only or empty arrays
+            return value.__array_interface__["data"][0]
+
     class ArrayDatatype(object):
         """Mix-in for array datatype classes
 
@@ -132,6 +176,8 @@ if ADT is None:
 
         def from_param(cls, value, typeConstant=None):
             """Given a value in a known data-pointer type, convert to a ctypes pointer"""
+            if _direct(cls, value):
+                return ctypes.c_void_p(_directPointer(value))
             return cls.getHandler(value).from_param(value, cls.typeConstant)
 
         from_param = classmethod(logs.logOnFail(from_param, _log))
@@ -139,6 +185,8 @@ if ADT is None:
         def dataPointer(cls, value):
             """Given a value in a known data-pointer type, return long for pointer"""
             try:
+                if _direct(cls, value):
+                    return _directPointer(value)
                 return cls.getHandler(value).dataPointer(value)
             except Exception:
                 _log.warning(
@@ -168,6 +216,8 @@ if ADT is None:
 
         def asArray(cls, value, typeCode=None):
             """Given a value, convert to preferred array representation"""
+            if typeCode is None and _direct(cls, value):
+                return value
             return cls.getHandler(value).asArray(value, typeCode or cls.typeConstant)
 
         asArray = classmethod(logs.logOnFail(asArray, _log))
@@ -184,6 +234,8 @@ if ADT is None:
 
         def arraySize(cls, value, typeCode=None):
             """Given a data-value, calculate dimensions for the array (number-of-units)"""
+            if typeCode is None and _direct(cls, value):
+                return value.size
             return cls.getHandler(value).arraySize(value, typeCode or cls.typeConstant)
 
         arraySize = classmethod(logs.logOnFail(arraySize, _log))
@@ -214,6 +266,8 @@ if ADT is None:
 
             For most data-types this is arraySize() * atomic-unit-size
             """
+            if _direct(cls, value):
+                return value.nbytes
             return cls.getHandler(value).arrayByteCount(value)
 
         arrayByteCount = classmethod(logs.logOnFail(arrayByteCount, _log))
@@ -29,6 +29,9 @@ usage of VBO objects:
 
 This implementation will choose either the ARB or Core (OpenGL 1.5) 
 implementation of the VBO functions.
+
+StreamingVBO is a ring buffer for vertex data re-generated every frame
+(particles, text quads), see its docstring.
 """
 from OpenGL.arrays.arraydatatype import ArrayDatatype
 from OpenGL.arrays.formathandler import FormatHandler
@@ -40,7 +43,7 @@ _log = logging.getLogger( 'OpenGL.arrays.vbo' )
 from OpenGL._bytes import long, integer_types
 
 import weakref
-__all__ = ('VBO','VBOHandler','mapVBO')
+__all__ = ('VBO','VBOHandler','mapVBO','StreamingVBO')
 
 class Implementation( object ):
     """Abstraction point for the various implementations that can be used
@@ -54,6 +57,10 @@ class Implementation( object ):
     @classmethod 
     def get_implementation( cls, *args ):
         if cls.CHOSEN is None:
+            if not cls.IMPLEMENTATION_CLASSES:
+                # Registered by importing OpenGL.GL, which may not have happened yet
+                from OpenGL.GL import vboimplementation
+                from OpenGL.GL.ARB import vboimplementation
             for possible in cls.IMPLEMENTATION_CLASSES:
                 implementation = possible()
                 if possible:
@@ -295,7 +302,19 @@ if VBO is None:
             """
             assert self.buffers, """Should do create_buffers before copy_data"""
             if self.copied:
-                if self._copy_segments:
+                if len( self._copy_segments ) > 1 and _c_contiguous( self.data ):
+                    # self.data already holds every update, so overlapping and
+                    # adjacent segments go over together, straight from it
+                    base = ArrayDatatype.dataPointer( self.data )
+                    ranges = _coalesce([
+                        (start,start+size) for (start,size,data) in self._copy_segments
+                    ])
+                    del self._copy_segments[:]
+                    for start,stop in ranges:
+                        self.implementation.glBufferSubData(
+                            self.target, start, stop-start, ctypes.c_void_p( base+start ),
+                        )
+                elif self._copy_segments:
                     while self._copy_segments:
                         start,size,data  = self._copy_segments.pop(0)
                         dataptr = ArrayDatatype.voidDataPointer( data )
@@ -430,6 +449,278 @@ if VBO is None:
             """Returns a c_void_p( instance.offset )"""
             return ctypes.c_void_p( instance.offset )
 
+def _coalesce( ranges, gap=0 ):
+    """Merge (start,stop) byte ranges that overlap or are within gap of each other"""
+    merged = []
+    for start,stop in sorted( ranges ):
+        if merged and start <= merged[-1][1] + gap:
+            if stop > merged[-1][1]:
+                merged[-1][1] = stop
+        else:
+            merged.append( [start,stop] )
+    return [tuple(item) for item in merged]
+
+def _c_contiguous( data ):
+    """Whether data is an array whose bytes are laid out as the GL buffer holds them"""
+    flags = getattr( data, 'flags', None )
+    return bool( getattr( flags, 'c_contiguous', False ) )
+
+class StreamingVBO( object ):
+    """Ring buffer for vertex data that is re-generated every frame
+
+    Basic usage:
+
+        stream = vbo.StreamingVBO( 1<<20 )
+        ...
+        # every frame
+        points = stream.append( point_array )
+        colours = stream.append( colour_array )
+        with stream:
+            glVertexPointer( 3, GL_FLOAT, 0, points )
+            glColorPointer( 4, GL_UNSIGNED_BYTE, 0, colours )
+            glDrawArrays( GL_POINTS, 0, len(point_array) )
+        ...
+        stream.next_frame()
+
+    The buffer object is split into segments, and each frame's appends go
+    into fresh segments after the previous frame's, so the GL never has to
+    wait for draws still reading earlier data before accepting new data.
+    append returns a VBOOffset to its copy of the data, which stays valid
+    until the ring comes back round to it.
+
+    Where glBufferStorage, glMapBufferRange and sync objects are available
+    (GL 4.4, or ARB_buffer_storage and ARB_sync) the buffer is mapped once,
+    persistently and coherently, appends write straight into it, and each
+    frame's segments are fenced at next_frame; re-using a segment waits on
+    its fence (counted in stalls) if the GL has not finished with it.
+
+    Otherwise appends are copied into a client-side copy of the ring, and
+    bind uploads the ranges written since the last bind, merged, with
+    glBufferSubData.  When the ring wraps the buffer is orphaned (given new
+    storage with glBufferData( ..., None, ... )) at the next bind, so
+    in-flight draws keep the old storage.  Everything appended since the
+    last bind is uploaded to the new storage at the same offsets, while
+    offsets from before that bind are no longer valid.
+
+    Appends between two binds must fit in the ring together, otherwise
+    append raises ValueError rather than overwrite them.
+    """
+    _no_cache_ = True # do not cache in context data arrays
+    MAP_FLAGS = 0x0002 | 0x0040 | 0x0080 # GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+    WAIT_TIMEOUT = 1000000 # nanoseconds per glClientWaitSync call
+    def __init__(
+        self, segment_size, segments=3, usage='GL_STREAM_DRAW',
+        target='GL_ARRAY_BUFFER', persistent=True, alignment=16,
+    ):
+        """Initialize the ring (no GL calls are made until first use)
+
+        segment_size -- bytes in each segment, a frame's appends should fit
+            in one segment
+        segments -- segments in the ring, at least the number of frames the
+            GL may be behind, plus one
+        usage -- usage constant for glBufferData when not persistently mapped
+        target -- VBO target to which to bind
+        persistent -- whether to use a persistent mapping where available
+        alignment -- byte alignment of each appended array
+        """
+        assert segments > 1, """Need at least two segments to stream"""
+        self.segment_size = segment_size
+        self.segments = segments
+        self.size = segment_size * segments
+        self.usage = usage
+        self.target = target
+        self.alignment = alignment
+        self.persistent = persistent
+        self.buffers = []
+        self.cursor = 0
+        self.stalls = 0
+        self.ready = False
+        self._frame_segments = set()
+        self._fences = {}
+        self._dirty = []
+        self._orphan = False
+        self._batch = None # offset of the first append since the last bind
+        self._wrapped = False # whether the ring wrapped since that append
+        self._pointer = None
+        self.staging = None
+    implementation = property( get_implementation, )
+    def resolve( self, value ):
+        """Resolve string constant to constant"""
+        if isinstance( value, (bytes,unicode)):
+            return getattr( self.implementation, self.implementation.basename( value ) )
+        return value
+    def _persistentAvailable( self ):
+        """Are the persistent mapping and sync entry points present?"""
+        from OpenGL.GL import (
+            glBufferStorage, glMapBufferRange, glFenceSync, glClientWaitSync, glDeleteSync,
+        )
+        return all([
+            bool( function ) for function in (
+                glBufferStorage, glMapBufferRange, glFenceSync, glClientWaitSync, glDeleteSync,
+            )
+        ])
+    def setup( self ):
+        """Create the buffer, choosing persistent mapping or client-side copies
+
+        Called by the first append or bind, as this needs a current context.
+        With persistent mapping the buffer is left bound to our target.
+        """
+        if self.ready:
+            return
+        self.target = self.resolve( self.target )
+        self.usage = self.resolve( self.usage )
+        self.persistent = bool( self.persistent ) and self._persistentAvailable()
+        self.buffers = [ long(self.implementation.glGenBuffers(1)) ]
+        self.implementation._DELETERS_[ id(self) ] = weakref.ref( self, self.implementation.deleter( self.buffers, id(self) ))
+        if self.persistent:
+            from OpenGL.GL import glBufferStorage, glMapBufferRange
+            self.implementation.glBindBuffer( self.target, self.buffers[0] )
+            glBufferStorage( self.target, self.size, None, self.MAP_FLAGS )
+            self._pointer = glMapBufferRange( self.target, 0, self.size, self.MAP_FLAGS )
+            if not self._pointer:
+                raise error.GLError(
+                    baseOperation = glMapBufferRange,
+                    description = 'Unable to map the streaming buffer',
+                )
+        else:
+            self.staging = (ctypes.c_ubyte * self.size)()
+            self._pointer = ctypes.addressof( self.staging )
+            self._orphan = True
+        self.ready = True
+    def append( self, array ):
+        """Copy array into the ring and return a VBOOffset to the copy
+
+        array -- contiguous PyOpenGL-compatible array-data structure, numpy
+            arrays, ctypes arrays, etc.
+        """
+        if not self.ready:
+            self.setup()
+        data = ArrayDatatype.asArray( array )
+        size = ArrayDatatype.arrayByteCount( data )
+        start = self._reserve( size )
+        if self._batch is None:
+            self._batch = start
+        if size:
+            ctypes.memmove( self._pointer + start, ArrayDatatype.voidDataPointer( data ), size )
+            if not self.persistent:
+                self._dirty.append( (start,start+size) )
+        return VBOOffset( self, start )
+    def _reserve( self, size ):
+        """Find size bytes at the cursor, wrapping the ring if needed"""
+        if size > self.size:
+            raise ValueError(
+                """%s bytes do not fit in a %s byte stream"""%( size, self.size )
+            )
+        start = -(-self.cursor // self.alignment) * self.alignment
+        if start + size > self.size:
+            start = 0
+            wrapping = True
+        else:
+            wrapping = False
+        if (wrapping or self._wrapped) and self._batch is not None and start + size > self._batch:
+            raise ValueError(
+                """Appends since the last bind do not fit in a %s byte stream"""%( self.size, )
+            )
+        if wrapping:
+            self._wrap()
+        for segment in range( start // self.segment_size, -(-(start+size) // self.segment_size) ):
+            self._claim( segment )
+        self.cursor = start + size
+        return start
+    def _wrap( self ):
+        """Go back to the start of the ring"""
+        self.cursor = 0
+        self._wrapped = self._batch is not None
+        if not self.persistent:
+            # the pending ranges stay dirty, so they go to the new storage too
+            self._orphan = True
+    def _claim( self, segment ):
+        """Note a write to segment this frame, waiting for the GL to finish with it"""
+        self._frame_segments.add( segment )
+        fence = self._fences.pop( segment, None )
+        if fence is not None:
+            self._wait( fence )
+            if fence not in self._fences.values():
+                from OpenGL.GL import glDeleteSync
+                glDeleteSync( fence )
+    def _wait( self, fence ):
+        """Block until the GL has passed fence"""
+        from OpenGL.GL import (
+            glClientWaitSync, GL_SYNC_FLUSH_COMMANDS_BIT,
+            GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED, GL_WAIT_FAILED,
+        )
+        result = glClientWaitSync( fence, GL_SYNC_FLUSH_COMMANDS_BIT, 0 )
+        if result == GL_ALREADY_SIGNALED:
+            return
+        self.stalls += 1
+        while result not in (GL_CONDITION_SATISFIED, GL_ALREADY_SIGNALED, GL_WAIT_FAILED):
+            result = glClientWaitSync( fence, GL_SYNC_FLUSH_COMMANDS_BIT, self.WAIT_TIMEOUT )
+    def next_frame( self ):
+        """Finish the frame's appends; the next frame starts in a fresh segment
+
+        Call once per frame, after the frame's draws have been issued.
+        """
+        if not self._frame_segments:
+            return
+        if self.persistent:
+            from OpenGL.GL import glFenceSync, GL_SYNC_GPU_COMMANDS_COMPLETE
+            fence = glFenceSync( GL_SYNC_GPU_COMMANDS_COMPLETE, 0 )
+            for segment in self._frame_segments:
+                self._fences[segment] = fence
+        self._frame_segments = set()
+        self.cursor = -(-self.cursor // self.segment_size) * self.segment_size
+    def flush( self ):
+        """Upload the (merged) ranges appended since the last flush, buffer must be bound"""
+        if self._orphan:
+            self.implementation.glBufferData( self.target, self.size, None, self.usage )
+            self._orphan = False
+        for start,stop in _coalesce( self._dirty, self.alignment ):
+            self.implementation.glBufferSubData(
+                self.target, start, stop-start, ctypes.c_void_p( self._pointer+start ),
+            )
+        del self._dirty[:]
+    def bind( self ):
+        """Bind the buffer for use in vertex calls, uploading new data"""
+        if not self.ready:
+            self.setup()
+        self.implementation.glBindBuffer( self.target, self.buffers[0] )
+        if not self.persistent:
+            self.flush()
+        self._batch = None
+        self._wrapped = False
+    def unbind( self ):
+        """Unbind the buffer (make normal array operations active)"""
+        self.implementation.glBindBuffer( self.target, 0 )
+    def __int__( self ):
+        """Get our VBO id"""
+        if not self.ready:
+            self.setup()
+        return self.buffers[0]
+    def delete( self ):
+        """Delete the buffer and fences explicitly (also unmaps the buffer)"""
+        if self._fences:
+            from OpenGL.GL import glDeleteSync
+            for fence in set( self._fences.values() ):
+                glDeleteSync( fence )
+            self._fences.clear()
+        while self.buffers:
+            try:
+                self.implementation.glDeleteBuffers(1, _types.GLuint( self.buffers.pop(0) ))
+            except (AttributeError,error.NullFunctionError) as err:
+                pass
+        self.ready = False
+        self._pointer = self.staging = None
+        self._frame_segments = set()
+        self._dirty = []
+        self._batch = None
+        self._wrapped = False
+        self.cursor = 0
+    __enter__ = bind
+    def __exit__( self, exc_type=None, exc_val=None, exc_tb=None ):
+        """Context manager exit"""
+        self.unbind()
+        return False # do not supress exceptions...
+
 _cleaners = {}
 def _cleaner( vbo ):
     """Construct a mapped-array cleaner function to unmap vbo.target"""
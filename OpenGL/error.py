@@ -242,6 +242,52 @@ if _configflags.ERROR_CHECKING:
                 self._currentChecker = self._registeredChecker
 else:
     _ErrorChecker = None
+
+class DeferredGLError( GLError ):
+    """GL errors collected by checkpoint rather than after each call
+
+    Attributes (beyond those of GLError):
+
+        region -- name given to the checkpoint, i.e. to the code
+            which ran since the previous checkpoint
+        errors -- all of the error codes collected, err is the first
+    """
+    DISPLAY_ORDER = ( 'region', 'errors', ) + GLError.DISPLAY_ORDER
+    def __init__( self, errors, region=None ):
+        super( DeferredGLError, self ).__init__( err=errors[0] )
+        self.errors = errors
+        self.region = region
+
+# Each kind of error is recorded once until read, this just bounds the loop
+# should glGetError keep failing (e.g. for want of a context)
+CHECKPOINT_ERROR_LIMIT = 16
+
+def checkpoint( region=None ):
+    """Raise DeferredGLError for any errors the GL has recorded
+
+    Intended for ERROR_CHECKING = 'deferred', where entry points leave
+    their errors in the GL: call at frame boundaries, or after a block
+    of code under suspicion, with a name for the code which ran since
+    the previous checkpoint.  With per-call checking it reports only
+    errors the wrappers could not (e.g. between glBegin and glEnd), and
+    with ERROR_CHECKING off it does nothing.
+
+    Must not be called between glBegin and glEnd.
+    """
+    if not _configflags.ERROR_CHECKING:
+        return
+    if _configflags.CONTEXT_CHECKING and not platform.PLATFORM.CurrentContextIsValid():
+        return
+    getError = platform.PLATFORM.GL.glGetError
+    errors = []
+    for i in range( CHECKPOINT_ERROR_LIMIT ):
+        err = getError()
+        if not err:
+            break
+        errors.append( err )
+    if errors:
+        raise DeferredGLError( errors, region )
+
 # Compatibility with PyOpenGL 2.x series
 GLUerror = GLUError
 GLerror = GLError 
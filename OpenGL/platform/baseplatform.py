@@ -109,6 +109,9 @@ class BasePlatform( object ):
         """Add error checking to the function if appropriate"""
         from OpenGL import error
         if error_checker and _configflags.ERROR_CHECKING:
+            if _configflags.ERROR_CHECKING == 'deferred' and dll is self.GL:
+                # GL errors are left for OpenGL.error.checkpoint to collect
+                return func
             #GLUT spec says error-checking is basically undefined...
             # there *may* be GL errors on GLUT calls that e.g. render 
             # geometry, but that's all basically "maybe" stuff...
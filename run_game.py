@@ -35,6 +35,7 @@ if __name__ == "__main__":
     print("    R                   Restart (back to Level 1)")
     print("    N                   Next level (after winning)")
     print("    P                   Toggle debug info")
+    print("    C                   Start / stop recording frames")
     print("    ESC                 Quit")
     print()
     print("  RULES")
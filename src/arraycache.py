@@ -0,0 +1,106 @@
+"""
+Named NumPy arrays cached in one memory-mappable file.
+
+Anything the game derives at startup from fixed inputs (the forest layout
+and its baked vertex buffers) can be written here once and mapped back on
+later launches instead of being computed again. The file is a short header
+followed by the raw array data, each array starting on a 64-byte boundary,
+so loading maps the file and slices views out of it: nothing is parsed or
+copied, and pages are only read from disk when something (typically
+glBufferData) touches them.
+
+Every file records the key it was written for. A file with a different key,
+or one that is truncated or unreadable, is treated as missing, so changing
+any input to the computation simply causes a rebuild.
+"""
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+from numpy.lib import format as npformat
+
+MAGIC = b'RLGLARR1'
+ALIGNMENT = 64
+
+
+def cache_key(*parts):
+    """Short digest of the repr of everything the cached data was computed from."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+
+def default_directory(name):
+    """Per-user cache directory for an application, following XDG_CACHE_HOME."""
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, name)
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_arrays(path, arrays, key):
+    """
+    Write a dict of arrays to path for key.
+
+    The file is written beside path and renamed over it, so a reader never
+    sees a partial file and a failed write leaves any previous one intact.
+    """
+    arrays = {name: np.asarray(array, order='C') for name, array in arrays.items()}
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        entries[name] = {'dtype': npformat.dtype_to_descr(array.dtype), 'shape': array.shape, 'offset': offset}
+        offset += array.nbytes
+    header = json.dumps({'key': key, 'arrays': entries}).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    partial = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(partial, 'wb') as handle:
+            handle.write(MAGIC + struct.pack('<Q', len(header)) + header)
+            for name, array in arrays.items():
+                handle.seek(data_start + entries[name]['offset'])
+                handle.write(array.data)
+            handle.truncate(data_start + offset)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def load_arrays(path, key):
+    """
+    Map the arrays saved at path for key, or return None.
+
+    The arrays are read-only views into one memory map, which stays open
+    as long as any of them is alive.
+    """
+    try:
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                return None
+            header_size, = struct.unpack('<Q', handle.read(8))
+            if header_size > os.fstat(handle.fileno()).st_size:
+                return None
+            header = json.loads(handle.read(header_size))
+        if header.get('key') != key:
+            return None
+        data_start = _aligned(len(MAGIC) + 8 + header_size)
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name, entry in header['arrays'].items():
+            dtype = npformat.descr_to_dtype(entry['dtype'])
+            shape = tuple(entry['shape'])
+            start = data_start + entry['offset']
+            end = start + dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+            if end > len(mapped):
+                return None
+            arrays[name] = mapped[start:end].view(dtype).reshape(shape)
+        return arrays
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
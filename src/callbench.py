@@ -0,0 +1,99 @@
+"""
+Calls per second through PyOpenGL's regular entry points and OpenGL.GL.fast.
+
+Times the immediate-mode and matrix calls the front end makes for every
+model, once as imported from OpenGL.GL and once from OpenGL.GL.fast, in
+an offscreen context (see offscreen.py). Vertex attribute calls are timed
+between glBegin(GL_POINTS) and glEnd, as the game makes them; the rest
+are timed on their own. By default PyOpenGL checks for errors after every
+regular call, as it does unless told otherwise; --error-checking deferred
+shows how much of the difference is left when that checking moves to
+frame checkpoints.
+"""
+import os
+import sys
+import time
+
+# The vendored OpenGL package lives in the repository root, next to src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from offscreen import BACKENDS, CONTEXTS, select_platform
+
+BATCH = 1000        # Calls timed per glBegin/glEnd pair, and per timer read
+
+# (name, arguments, timed between glBegin and glEnd)
+CALLS = (
+    ('glVertex3f', (1.0, 2.0, 3.0), True),
+    ('glVertex2f', (1.0, 2.0), True),
+    ('glColor3f', (0.5, 0.5, 0.5), True),
+    ('glColor4f', (0.5, 0.5, 0.5, 1.0), True),
+    ('glNormal3f', (0.0, 0.0, 1.0), True),
+    ('glTranslatef', (1.0, 0.0, 0.0), False),
+    ('glRotatef', (1.0, 0.0, 0.0, 1.0), False),
+    ('glScalef', (1.0, 1.0, 1.0), False),
+    ('glPushMatrix', (), False),    # Paired with glPopMatrix, see time_calls
+    ('glLoadIdentity', (), False),
+)
+
+
+def time_calls(namespace, name, arguments, inside_begin, seconds):
+    """Calls per second of namespace's name over about seconds."""
+    from OpenGL.GL import GL_POINTS
+    function = getattr(namespace, name)
+    pop = namespace.glPopMatrix if name == 'glPushMatrix' else None
+    begin, end = namespace.glBegin, namespace.glEnd
+    calls, elapsed = 0, 0.0
+    while elapsed < seconds:
+        if inside_begin:
+            begin(GL_POINTS)
+        start = time.perf_counter()
+        if pop is not None:
+            for _ in range(BATCH // 2):
+                function()
+                pop()
+        else:
+            for _ in range(BATCH):
+                function(*arguments)
+        elapsed += time.perf_counter() - start
+        if inside_begin:
+            end()
+        calls += BATCH
+    return calls / elapsed
+
+
+def run(seconds=0.5):
+    """Rows of (name, regular calls/s, fast calls/s) for CALLS."""
+    from OpenGL import GL
+    from OpenGL.GL import fast
+    rows = []
+    for name, arguments, inside_begin in CALLS:
+        label = 'glPushMatrix/glPopMatrix' if name == 'glPushMatrix' else name
+        rows.append((label,
+                     time_calls(GL, name, arguments, inside_begin, seconds),
+                     time_calls(fast, name, arguments, inside_begin, seconds)))
+    GL.glFinish()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark OpenGL.GL against OpenGL.GL.fast.")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="offscreen context to create")
+    parser.add_argument("--seconds", type=float, default=0.5, help="time spent on each function and path")
+    parser.add_argument("--error-checking", choices=("true", "deferred"), default="true",
+                        help="PyOpenGL's error checking for the regular path")
+    args = parser.parse_args()
+
+    backend = select_platform(args.backend)
+    import OpenGL
+    OpenGL.ERROR_CHECKING = True if args.error_checking == "true" else args.error_checking
+    context = CONTEXTS[backend](64, 64)
+    try:
+        rows = run(args.seconds)
+    finally:
+        context.destroy()
+    print(f"Backend: {backend}  Error checking: {args.error_checking}")
+    print(f"{'Function':<26}{'OpenGL.GL':>14}{'GL.fast':>14}{'Speedup':>10}")
+    for label, regular, quick in rows:
+        print(f"{label:<26}{regular:>12,.0f}/s{quick:>12,.0f}/s{quick / regular:>9.1f}x")
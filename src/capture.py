@@ -0,0 +1,210 @@
+"""
+Recording rendered frames without stalling the render loop.
+
+A plain glReadPixels waits for the GPU to finish the frame and then copies
+it while the game waits, and saving the image on the same thread costs more
+again. FrameRecorder instead reads each frame into one of a ring of pixel
+pack buffers, which returns immediately, and collects a frame one capture
+later, when its transfer has long completed: the buffer is mapped and copied
+into a preallocated array, and a writer thread does the compression and I/O.
+
+Frames reach the sinks top-down as (height, width, 3) uint8 arrays. Sinks
+write raw RGB streams, numbered PNG files, or feed an encoder process such
+as ffmpeg.
+"""
+import ctypes
+import os
+import queue
+import struct
+import subprocess
+import threading
+import zlib
+
+import numpy as np
+
+from OpenGL import images
+from OpenGL.GL import (GL_MAP_READ_BIT, GL_PIXEL_PACK_BUFFER, GL_RGB, GL_STREAM_READ,
+                       GL_UNSIGNED_BYTE, glBindBuffer, glBufferData, glDeleteBuffers,
+                       glGenBuffers, glMapBufferRange, glReadPixels, glUnmapBuffer)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def write_png(path, rgb, level=1):
+    """Save a top-down (height, width, 3) uint8 array as an RGB PNG; level is the zlib effort."""
+    height, width, _ = rgb.shape
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)   # Filter byte 0 (none) before each row
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+    with open(path, 'wb') as handle:
+        handle.write(PNG_SIGNATURE)
+        handle.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        handle.write(_png_chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        handle.write(_png_chunk(b'IEND', b''))
+
+
+class RawSink:
+    """Every frame appended to one file of packed RGB24, as ffmpeg's rawvideo reads it."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+
+    def write(self, index, frame):
+        self._file.write(np.ascontiguousarray(frame))
+
+    def close(self):
+        self._file.close()
+
+
+class PngSequenceSink:
+    """One numbered PNG file per frame in a directory."""
+
+    def __init__(self, directory, pattern='frame_{:06d}.png', level=1):
+        os.makedirs(directory, exist_ok=True)
+        self.path = directory
+        self.pattern = pattern
+        self.level = level
+
+    def write(self, index, frame):
+        write_png(os.path.join(self.path, self.pattern.format(index)), frame, self.level)
+
+    def close(self):
+        pass
+
+
+class EncoderSink:
+    """Raw RGB24 frames piped into an encoder's standard input."""
+
+    def __init__(self, command):
+        self.path = command[-1]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, index, frame):
+        self._process.stdin.write(np.ascontiguousarray(frame))
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+
+def ffmpeg_command(path, width, height, fps, encoder='libx264'):
+    """Command line for an ffmpeg process turning raw RGB24 on stdin into a video file."""
+    return ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+            '-c:v', encoder, '-pix_fmt', 'yuv420p', path]
+
+
+def open_sink(kind, path, width, height, fps):
+    """A sink by name: 'raw' (file), 'png' (directory) or 'ffmpeg' (video file)."""
+    if kind == 'raw':
+        return RawSink(path)
+    if kind == 'png':
+        return PngSequenceSink(path)
+    if kind == 'ffmpeg':
+        return EncoderSink(ffmpeg_command(path, width, height, fps))
+    raise ValueError(f"Unknown capture format {kind!r}; expected 'raw', 'png' or 'ffmpeg'")
+
+
+class FrameRecorder:
+    """
+    Captures the bottom-left width x height pixels of every frame into a sink.
+
+    capture() goes after the frame is drawn and before the buffers are
+    swapped. Frames are copied into a pool of `frames` preallocated arrays;
+    if the writer falls so far behind that none is free, capture waits for
+    one rather than drop a frame, and counts the wait in `stalls`.
+
+    The size is fixed for the whole recording, since raw and video streams
+    cannot change it midway. Frames of any other size, drawn after the
+    window was resized, are not recorded but counted in `skipped`.
+    """
+
+    def __init__(self, width, height, sink, buffers=2, frames=8):
+        self.width = width
+        self.height = height
+        self.sink = sink
+        self.captured = 0
+        self.written = 0
+        self.stalls = 0
+        self.skipped = 0
+        self.error = None
+        self._size = width * height * 3
+
+        self._buffers = [int(buffer) for buffer in np.atleast_1d(glGenBuffers(buffers))]
+        for buffer in self._buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self._size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending = []   # (frame index, buffer) read but not yet collected, oldest first
+
+        # SetupPixelRead also sets the tight pack alignment the buffer size assumes
+        self._free = queue.Queue()
+        for _ in range(frames):
+            self._free.put(images.SetupPixelRead(GL_RGB, (height, width), GL_UNSIGNED_BYTE))
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_frames, name='frame-writer', daemon=True)
+        self._writer.start()
+
+    def capture(self, width, height):
+        """
+        Start reading the current frame and hand the oldest finished one to the writer.
+
+        width and height are the size of the frame just drawn; returns False,
+        without reading anything, when they are not the recording's.
+        """
+        if (width, height) != (self.width, self.height):
+            self.skipped += 1
+            return False
+        if len(self._pending) == len(self._buffers):
+            self._collect()
+        buffer = self._buffers[self.captured % len(self._buffers)]
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+        glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, 0)   # 0 is an offset into the buffer
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append((self.captured, buffer))
+        self.captured += 1
+        return True
+
+    def _collect(self):
+        index, buffer = self._pending.pop(0)
+        try:
+            frame = self._free.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            frame = self._free.get()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+        pointer = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self._size, GL_MAP_READ_BIT)
+        ctypes.memmove(frame.ctypes.data, pointer, self._size)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._queue.put((index, frame))
+
+    def _write_frames(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, frame = item
+            try:
+                if self.error is None:
+                    self.sink.write(index, frame[::-1])   # GL rows run bottom-up
+                    self.written += 1
+            except Exception as error:   # Keep draining so capture() never waits on a dead writer
+                self.error = error
+            finally:
+                self._free.put(frame)
+
+    def close(self):
+        """Collect the frames still in flight, wait for the writer and close the sink."""
+        while self._pending:
+            self._collect()
+        self._queue.put(None)
+        self._writer.join()
+        glDeleteBuffers(len(self._buffers), self._buffers)
+        self.sink.close()
+        if self.error is not None:
+            raise self.error
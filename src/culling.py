@@ -0,0 +1,70 @@
+"""
+View-frustum and distance culling for static scenery.
+
+The camera's projection and modelview matrices are combined once per frame
+into six clip planes; whole groups of scenery are then accepted or rejected
+by testing their axis-aligned bounding boxes against those planes, all boxes
+in one NumPy pass. The same box distances drive level-of-detail choices.
+"""
+import numpy as np
+
+
+def frustum_planes(projection, modelview):
+    """
+    Extract the six frustum planes from OpenGL matrices.
+
+    projection and modelview are 4x4 matrices as returned by glGetFloatv
+    (column-major). Returns a (6, 4) array of (a, b, c, d) world-space planes
+    with normals pointing into the frustum, in the order left, right, bottom,
+    top, near, far.
+    """
+    # glGetFloatv returns column-major data, so transpose to row-major clip = P * M
+    clip = np.asarray(projection, dtype=np.float64).reshape(4, 4).T @ \
+        np.asarray(modelview, dtype=np.float64).reshape(4, 4).T
+    planes = np.array([
+        clip[3] + clip[0],
+        clip[3] - clip[0],
+        clip[3] + clip[1],
+        clip[3] - clip[1],
+        clip[3] + clip[2],
+        clip[3] - clip[2],
+    ])
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes
+
+
+def visible_boxes(box_min, box_max, planes=None, eye=None, max_distance=None):
+    """
+    Boolean mask of the (N, 3) boxes that can be seen.
+
+    A box is rejected when it lies entirely behind any frustum plane, or when
+    its nearest point is farther than max_distance from eye (the distance at
+    which fog hides everything).
+    """
+    box_min = np.asarray(box_min, dtype=np.float64)
+    box_max = np.asarray(box_max, dtype=np.float64)
+    visible = np.ones(len(box_min), dtype=bool)
+
+    if planes is not None:
+        # For each plane test the box corner farthest along its normal
+        normals = planes[:, :3]
+        corners = np.where(normals[None, :, :] >= 0, box_max[:, None, :], box_min[:, None, :])
+        distances = np.einsum('npk,pk->np', corners, normals) + planes[:, 3]
+        visible &= (distances >= 0).all(axis=1)
+
+    if eye is not None and max_distance is not None:
+        visible &= box_distances(box_min, box_max, eye) <= max_distance
+
+    return visible
+
+
+def box_distances(box_min, box_max, point):
+    """Distance from point to the nearest point of each (N, 3) box; zero inside."""
+    point = np.asarray(point, dtype=np.float64)
+    gap = np.clip(point, box_min, box_max) - point
+    return np.sqrt(np.einsum('ij,ij->i', gap, gap))
+
+
+def fog_cutoff_distance(density, threshold=1.0 / 255.0):
+    """Distance at which GL_EXP2 fog of the given density leaves less than threshold of the color."""
+    return float(np.sqrt(-np.log(threshold))) / density
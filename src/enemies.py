@@ -0,0 +1,91 @@
+"""
+Structure-of-arrays storage for enemies.
+
+Every enemy attribute lives in its own NumPy array indexed by enemy slot, so
+the simulation can move, check and count down all enemies with single array
+operations instead of looping over one dict per enemy.
+"""
+import numpy as np
+
+# Enemy type codes stored in EnemyStore.type
+ENEMY_RED = 0
+ENEMY_BLUE = 1
+ENEMY_BLACK = 2
+ENEMY_TYPE_NAMES = ('red', 'blue', 'black')
+
+# Per-type lookup tables, indexed by type code
+ENEMY_COLORS = ((0.95, 0.2, 0.2), (0.2, 0.3, 0.9), (0.1, 0.1, 0.1))
+ENEMY_SCALES = np.array([1.0, 1.0, 2.0])          # Black enemies are twice the size
+ENEMY_KILL_SCORES = np.array([100, 200, 500])
+ENEMY_CATCH_CHANCES = np.array([0.6, 0.4, 0.2])   # Chance of being caught moving on red light
+
+# Per-slot arrays, moved together when the store is compacted
+FIELDS = ('position', 'prev_position', 'last_position', 'direction', 'speed', 'type', 'scale',
+          'health', 'alive', 'can_shoot', 'shoot_timer')
+
+
+class EnemyStore:
+    """Parallel arrays holding position, motion and combat state for all enemies."""
+
+    def __init__(self, count=0, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.resize(count)
+
+    def resize(self, count):
+        """Reallocate every array for count enemies; all slots start dead."""
+        self.position = np.zeros((count, 3))
+        self.prev_position = np.zeros((count, 3))   # Before the current tick, for interpolation
+        self.last_position = np.zeros((count, 3))   # End of the last tick, for red light detection
+        self.direction = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.type = np.zeros(count, dtype=np.int8)
+        self.scale = np.ones(count)
+        self.health = np.zeros(count, dtype=np.int32)
+        self.alive = np.zeros(count, dtype=bool)
+        self.can_shoot = np.zeros(count, dtype=bool)
+        self.shoot_timer = np.zeros(count)
+
+    def seed(self, seed):
+        """Reseed the generator used for spawning, jitter and catch rolls."""
+        self.rng = np.random.default_rng(seed)
+
+    def spawn(self, start, count, enemy_type, x_range, y_range):
+        """Place count enemies of one type in slots [start, start + count) at random positions."""
+        end = start + count
+        self.position[start:end, 0] = self.rng.uniform(x_range[0], x_range[1], count)
+        self.position[start:end, 1] = self.rng.uniform(y_range[0], y_range[1], count)
+        self.position[start:end, 2] = 0.0
+        self.prev_position[start:end] = self.position[start:end]
+        self.last_position[start:end] = self.position[start:end]
+        self.direction[start:end] = self.rng.uniform(0, 360, count)
+        self.type[start:end] = enemy_type
+        self.scale[start:end] = ENEMY_SCALES[enemy_type]
+        self.alive[start:end] = True
+        return slice(start, end)
+
+    def kill(self, slots):
+        """Mark the enemies in slots (an index, index array or mask) dead."""
+        self.alive[slots] = False
+
+    def compact(self):
+        """Move the live enemies to the front, in slot order, and drop the dead slots.
+
+        Slot numbers change, so nothing may hold on to one across a compaction.
+        Returns the number of enemies left.
+        """
+        alive = self.alive
+        if not alive.all():
+            for name in FIELDS:
+                setattr(self, name, getattr(self, name)[alive])
+        return len(self)
+
+    def __len__(self):
+        return len(self.alive)
+
+    def type_name(self, index):
+        """Return the 'red' / 'blue' / 'black' name of the enemy in a slot."""
+        return ENEMY_TYPE_NAMES[self.type[index]]
+
+    def color(self, index):
+        """Return the body color of the enemy in a slot."""
+        return ENEMY_COLORS[self.type[index]]
@@ -0,0 +1,553 @@
+"""
+Batched vertex-buffer renderer for the background forest.
+
+Every plant is built from a handful of shared unit meshes (trunk frustum,
+pine cone, foliage sphere, bush sphere). Per-plant placement, rotation,
+scale and color are applied to those meshes with NumPy once at startup and
+the results are uploaded into a single vertex buffer plus index buffer, so a
+frame draws the forest with one glMultiDrawElements call per mesh type
+instead of a quadric or GLUT primitive per trunk and clump. The plants are
+also grouped into spatial chunks so that chunks outside the view are skipped.
+
+Each chunk picks a level of detail from its distance to the camera: full
+meshes up close, coarser meshes at medium range, and beyond that one
+camera-facing impostor quad per plant textured from a small atlas (see
+impostors.py).
+
+The forest never moves, which is why the transforms are baked into the
+vertices rather than supplied per instance each frame: the fixed-function
+pipeline has no instancing, and baking gives the same draw-call count.
+"""
+import math
+
+import numpy as np
+
+from OpenGL.GL import (GL_ARRAY_BUFFER, GL_COLOR_ARRAY, GL_ELEMENT_ARRAY_BUFFER, GL_FLOAT,
+                       GL_NORMAL_ARRAY, GL_STATIC_DRAW, GL_TRIANGLES, GL_UNSIGNED_BYTE,
+                       GL_UNSIGNED_INT, GL_VERTEX_ARRAY, glColorPointer, glDisableClientState,
+                       glEnableClientState, glMultiDrawElements, glNormalPointer, glVertexPointer)
+from OpenGL.arrays import vbo
+
+from culling import box_distances, visible_boxes
+from impostors import BillboardSet, ImpostorAtlas
+
+TRUNK_COLOR = (0.40, 0.28, 0.18)
+
+# Slices and stacks of each unit mesh, one entry per geometry level of detail
+MESH_DETAIL = (
+    {'trunk': (6, 2), 'cone': (8, 4), 'clump': (6, 5), 'bush': (5, 4)},   # Near: full geometry
+    {'trunk': (4, 1), 'cone': (5, 1), 'clump': (4, 3), 'bush': (4, 3)},   # Medium range
+)
+LOD_DISTANCES = (3000.0, 8000.0)   # Chunk distance where coarse meshes, then impostors, take over
+IMPOSTOR_VARIANTS = 4              # Atlas pictures per kind of plant
+
+# Interleaved vertex layout shared by every forest mesh
+VERTEX_DTYPE = np.dtype([
+    ('position', np.float32, 3),
+    ('normal', np.float32, 3),
+    ('color', np.uint8, 4),
+])
+
+
+# --- Unit meshes ---
+def _lathe(rows, slices):
+    """
+    Build an indexed surface of revolution around +Z.
+
+    rows is a list of (radius, z, normal_radial, normal_z) profile points from
+    bottom to top. Returns (positions, normals, indices) with the seam column
+    duplicated so normals stay smooth all the way round.
+    """
+    theta = np.linspace(0.0, 2.0 * math.pi, slices + 1)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    profile = np.asarray(rows, dtype=np.float64)
+
+    positions = np.empty((len(profile), slices + 1, 3))
+    positions[:, :, 0] = profile[:, 0:1] * cos_t
+    positions[:, :, 1] = profile[:, 0:1] * sin_t
+    positions[:, :, 2] = profile[:, 1:2]
+    normals = np.empty_like(positions)
+    normals[:, :, 0] = profile[:, 2:3] * cos_t
+    normals[:, :, 1] = profile[:, 2:3] * sin_t
+    normals[:, :, 2] = profile[:, 3:4]
+
+    # Two counter-clockwise triangles per quad between neighbouring rows
+    row = np.arange(len(profile) - 1)[:, None] * (slices + 1)
+    col = np.arange(slices)[None, :]
+    a = (row + col).ravel()
+    b = a + 1
+    c = a + slices + 1
+    d = c + 1
+    indices = np.stack([a, b, d, a, d, c], axis=1).ravel()
+    return positions.reshape(-1, 3), normals.reshape(-1, 3), indices
+
+
+def _disk(radius, z, slices, facing):
+    """Flat cap for a lathed mesh, facing -1 (down) or +1 (up)."""
+    theta = np.linspace(0.0, 2.0 * math.pi, slices + 1)
+    positions = np.zeros((slices + 2, 3))
+    positions[1:, 0] = radius * np.cos(theta)
+    positions[1:, 1] = radius * np.sin(theta)
+    positions[:, 2] = z
+    normals = np.zeros_like(positions)
+    normals[:, 2] = facing
+    ring = np.arange(1, slices + 1)
+    if facing > 0:
+        indices = np.stack([np.zeros(slices, dtype=int), ring, ring + 1], axis=1).ravel()
+    else:
+        indices = np.stack([np.zeros(slices, dtype=int), ring + 1, ring], axis=1).ravel()
+    return positions, normals, indices
+
+
+def _merge(*meshes):
+    """Concatenate indexed meshes into one."""
+    positions, normals, indices, base = [], [], [], 0
+    for mesh_positions, mesh_normals, mesh_indices in meshes:
+        positions.append(mesh_positions)
+        normals.append(mesh_normals)
+        indices.append(mesh_indices + base)
+        base += len(mesh_positions)
+    return np.concatenate(positions), np.concatenate(normals), np.concatenate(indices)
+
+
+def trunk_mesh(slices=6, stacks=2, top_ratio=0.3):
+    """Open frustum of height 1, base radius 1, like gluCylinder's trunk."""
+    # Side normal of a frustum slopes inward by the radius change over the height
+    slope = 1.0 - top_ratio
+    length = math.hypot(1.0, slope)
+    rows = [(1.0 - slope * z, z, 1.0 / length, slope / length)
+            for z in np.linspace(0.0, 1.0, stacks + 1)]
+    return _lathe(rows, slices)
+
+
+def cone_mesh(slices=8, stacks=4):
+    """Closed cone of height 1 and base radius 1, like glutSolidCone."""
+    length = math.sqrt(2.0)
+    rows = [(1.0 - z, z, 1.0 / length, 1.0 / length) for z in np.linspace(0.0, 1.0, stacks + 1)]
+    return _merge(_lathe(rows, slices), _disk(1.0, 0.0, slices, -1))
+
+
+def sphere_mesh(slices, stacks):
+    """Unit sphere, like glutSolidSphere."""
+    phi = np.linspace(0.0, math.pi, stacks + 1)
+    rows = [(math.sin(p), -math.cos(p), math.sin(p), -math.cos(p)) for p in phi]
+    return _lathe(rows, slices)
+
+
+# --- Baking ---
+class MeshBatch:
+    """Placement of every instance of one unit mesh, collected in plant order."""
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.plant = []     # Index of the owning plant in fixed_plants
+        self.origin = []    # Plant position on the ground
+        self.angle = []     # Plant rotation about Z, degrees
+        self.offset = []    # Mesh position in the plant's rotated frame
+        self.scale = []     # Per-axis scale of the unit mesh
+        self.color = []
+
+    def add(self, plant, origin, angle, offset, scale, color):
+        self.plant.append(plant)
+        self.origin.append(origin)
+        self.angle.append(angle)
+        self.offset.append(offset)
+        self.scale.append(scale)
+        self.color.append(color)
+
+    def __len__(self):
+        return len(self.plant)
+
+    def bake(self):
+        """Return (vertices, indices) in world space with indices local to this batch."""
+        positions, normals, indices = self.mesh
+        count, per_mesh = len(self.plant), len(positions)
+        origin = np.asarray(self.origin, dtype=np.float64).reshape(count, 1, 3)
+        offset = np.asarray(self.offset, dtype=np.float64).reshape(count, 1, 3)
+        scale = np.asarray(self.scale, dtype=np.float64).reshape(count, 1, 3)
+        angle = np.radians(np.asarray(self.angle, dtype=np.float64)).reshape(count, 1)
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+
+        # Scale, offset, rotate about Z, then move to the plant
+        local = offset + scale * positions[None, :, :]
+        world = np.empty_like(local)
+        world[:, :, 0] = cos_a * local[:, :, 0] - sin_a * local[:, :, 1]
+        world[:, :, 1] = sin_a * local[:, :, 0] + cos_a * local[:, :, 1]
+        world[:, :, 2] = local[:, :, 2]
+        world += origin
+
+        # Normals take the inverse scale so stretched meshes still light correctly
+        local_n = normals[None, :, :] / scale
+        local_n /= np.linalg.norm(local_n, axis=2, keepdims=True)
+        world_n = np.empty_like(local_n)
+        world_n[:, :, 0] = cos_a * local_n[:, :, 0] - sin_a * local_n[:, :, 1]
+        world_n[:, :, 1] = sin_a * local_n[:, :, 0] + cos_a * local_n[:, :, 1]
+        world_n[:, :, 2] = local_n[:, :, 2]
+
+        vertices = np.zeros(count * per_mesh, dtype=VERTEX_DTYPE)
+        vertices['position'] = world.reshape(-1, 3)
+        vertices['normal'] = world_n.reshape(-1, 3)
+        color = np.clip(np.asarray(self.color, dtype=np.float64) * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        vertices['color'][:, :3] = np.repeat(color, per_mesh, axis=0)
+        vertices['color'][:, 3] = 255
+
+        instance_base = (np.arange(count) * per_mesh)[:, None]
+        return vertices, (indices[None, :] + instance_base).ravel()
+
+
+def build_batches(plants, detail=MESH_DETAIL[0]):
+    """Sort every trunk, cone and sphere of the plants into per-mesh batches."""
+    trunks = MeshBatch(trunk_mesh(*detail['trunk']))
+    cones = MeshBatch(cone_mesh(*detail['cone']))
+    clumps = MeshBatch(sphere_mesh(*detail['clump']))
+    bushes = MeshBatch(sphere_mesh(*detail['bush']))
+
+    for i, plant in enumerate(plants):
+        x, y = plant['x'], plant['y']
+
+        if plant['plant'] == 'tree':
+            height = plant['height']
+            angle = plant['z_rot']
+            trunk_radius = max(2.5, height / 22.0)
+            trunk_height = height / 2.6
+            foliage_z = trunk_height * 0.7
+            trunks.add(i, (x, y, 0.0), angle, (0.0, 0.0, 0.0),
+                       (trunk_radius, trunk_radius, trunk_height), TRUNK_COLOR)
+
+            if plant['type'] == 0:
+                # Pine tree
+                radius = height / 5.0
+                cones.add(i, (x, y, 0.0), angle, (0.0, 0.0, foliage_z),
+                          (radius, radius, height * 0.85), plant['color'])
+            elif 'clump_details' in plant:
+                # Deciduous tree
+                for clump in plant['clump_details']:
+                    size = clump['size']
+                    clumps.add(i, (x, y, 0.0), angle, (clump['ox'], clump['oy'], foliage_z + clump['oz']),
+                               (size, size, size), plant['color'])
+            else:
+                size = height / 4.0
+                clumps.add(i, (x, y, 0.0), angle, (0.0, 0.0, foliage_z), (size, size, size), plant['color'])
+
+        elif plant['plant'] == 'bush':
+            size = plant['size']
+            spheres = plant.get('sphere_details') or [{'ox': 0.0, 'oy': 0.0, 'oz': 0.0, 'size': size * 0.6}]
+            for sphere in spheres:
+                ssize = sphere['size']
+                bushes.add(i, (x, y, size * 0.3), 0.0, (sphere['ox'], sphere['oy'], sphere['oz']),
+                           (ssize, ssize, ssize), plant['color'])
+
+    return [batch for batch in (trunks, cones, clumps, bushes) if len(batch)]
+
+
+def _impostor_kind(plant):
+    """0 for pines, 1 for broadleaf trees, 2 for bushes."""
+    if plant['plant'] == 'tree':
+        return 0 if plant['type'] == 0 else 1
+    return 2
+
+
+def _plant_size(plant):
+    return plant['height'] if plant['plant'] == 'tree' else plant['size']
+
+
+def build_impostors(plants, variants=IMPOSTOR_VARIANTS):
+    """
+    Pick atlas pictures for the plants.
+
+    The first few plants of each kind serve as the pictures, moved to the
+    origin and with white foliage so one picture can be tinted to any
+    plant's color. Returns (atlas, archetype, scale): the ImpostorAtlas plus
+    the picture index and size relative to that picture for every plant.
+    """
+    archetypes = {}
+    meshes = []
+    archetype = np.zeros(len(plants), dtype=np.intp)
+    scale = np.ones(len(plants))
+    seen = [0, 0, 0]
+
+    for i, plant in enumerate(plants):
+        kind = _impostor_kind(plant)
+        variant = seen[kind] % variants
+        seen[kind] += 1
+        if (kind, variant) not in archetypes:
+            model = dict(plant, x=0.0, y=0.0, z_rot=0.0, color=(1.0, 1.0, 1.0))
+            vertices, indices = [], []
+            base = 0
+            for batch in build_batches([model]):
+                batch_vertices, batch_indices = batch.bake()
+                vertices.append(batch_vertices)
+                indices.append(batch_indices + base)
+                base += len(batch_vertices)
+            archetypes[(kind, variant)] = (len(meshes), _plant_size(plant))
+            meshes.append((np.concatenate(vertices), np.concatenate(indices)))
+
+        archetype[i], size = archetypes[(kind, variant)]
+        scale[i] = _plant_size(plant) / size
+
+    return ImpostorAtlas(meshes), archetype, scale
+
+
+class ForestRenderer:
+    """
+    Owns the forest vertex and index buffers and draws the visible chunks.
+
+    Plants are grouped into square chunks of chunk_size. Within each mesh
+    batch the instances are ordered chunk by chunk, so every chunk is one
+    contiguous index range per batch and has its own bounding box; a frame
+    culls the boxes and hands the surviving ranges to one glMultiDrawElements
+    call per batch. Every geometry level in MESH_DETAIL is baked into the same
+    buffers, and the impostor quads follow the same chunk order, so choosing
+    a level per chunk only changes which ranges are drawn.
+    """
+
+    def __init__(self, plants, chunk_size=2500.0, lod_distances=LOD_DISTANCES):
+        self.plant_count = len(plants)
+        self.chunk_size = chunk_size
+        self.lod_distances = np.asarray(lod_distances, dtype=np.float64)
+
+        # Chunk every plant by its ground position, keeping each chunk's plants
+        # in their original near-to-far order
+        xs = np.array([plant['x'] for plant in plants], dtype=np.float64)
+        ys = np.array([plant['y'] for plant in plants], dtype=np.float64)
+        cells = np.stack([np.floor(xs / chunk_size), np.floor(ys / chunk_size)], axis=1)
+        if len(plants):
+            _, plant_chunk = np.unique(cells, axis=0, return_inverse=True)
+            plant_chunk = plant_chunk.ravel()
+        else:
+            plant_chunk = np.zeros(0, dtype=np.intp)
+        order = np.lexsort((np.arange(len(plants)), plant_chunk))
+        plant_chunk = plant_chunk[order]
+        ordered = [plants[i] for i in order]
+        self.chunk_count = int(plant_chunk.max()) + 1 if len(plants) else 0
+
+        self.chunk_min = np.full((self.chunk_count, 3), np.inf)
+        self.chunk_max = np.full((self.chunk_count, 3), -np.inf)
+        self.levels = []    # Per geometry level, a (starts, counts) index range pair per batch
+        self._instances = []    # Per geometry level, (chunk, rank in chunk, indices each) per batch
+        plant_rank = np.arange(len(plants)) - np.searchsorted(plant_chunk, plant_chunk)
+        vertices, indices = [], []
+        vertex_base = index_base = 0
+
+        for detail in MESH_DETAIL:
+            ranges, instances = [], []
+            for batch in build_batches(ordered, detail):
+                batch_vertices, batch_indices = batch.bake()
+                vertices.append(batch_vertices)
+                indices.append(batch_indices + vertex_base)
+
+                # Index range of each chunk within this batch
+                instance_chunk = plant_chunk[np.asarray(batch.plant)]
+                per_instance = len(batch.mesh[2])
+                counts = np.bincount(instance_chunk, minlength=self.chunk_count) * per_instance
+                ranges.append((index_base + np.cumsum(counts) - counts, counts.astype(np.int32)))
+                instances.append((instance_chunk, plant_rank[np.asarray(batch.plant)], per_instance))
+
+                # Grow the chunk bounding boxes around this batch's instances
+                positions = batch_vertices['position'].reshape(len(batch), -1, 3)
+                np.minimum.at(self.chunk_min, instance_chunk, positions.min(axis=1))
+                np.maximum.at(self.chunk_max, instance_chunk, positions.max(axis=1))
+
+                vertex_base += len(batch_vertices)
+                index_base += len(batch_indices)
+            self.levels.append(ranges)
+            self._instances.append(instances)
+
+        self.vertices = np.concatenate(vertices) if vertices else np.zeros(0, dtype=VERTEX_DTYPE)
+        self.indices = (np.concatenate(indices) if indices else np.zeros(0)).astype(np.uint32)
+
+        # One impostor quad per plant, in chunk order
+        atlas, archetype, scale = build_impostors(ordered)
+        centers = np.stack([xs[order], ys[order], np.zeros(len(plants))], axis=1)
+        colors = np.reshape([plant['color'] for plant in ordered], (-1, 3))
+        self._finish(atlas, centers, archetype, scale, colors, np.bincount(plant_chunk, minlength=self.chunk_count))
+
+    def _finish(self, atlas, centers, archetype, scale, colors, chunk_plants):
+        self.atlas = atlas
+        self.billboards = BillboardSet(self.atlas, centers, archetype, scale, colors)
+        self._impostor_plants = (centers, archetype, scale, colors)
+        self.chunk_plants = chunk_plants
+        self.chunk_first_plant = np.cumsum(self.chunk_plants) - self.chunk_plants
+        self.drawn_plants = self.chunk_plants   # Plants drawn per chunk at the current density
+        self.density = 1.0
+        self.vertex_buffer = None
+        self.index_buffer = None
+        self.impostors_ready = False
+
+        self.visible_chunks = self.chunk_count
+        self.level_chunks = np.zeros(len(MESH_DETAIL) + 1, dtype=np.intp)   # Chunks drawn at each level
+
+    def to_arrays(self):
+        """
+        Everything the constructor baked, as a dict of arrays from which
+        from_arrays rebuilds the renderer without touching the plants.
+        """
+        levels, ranges, instances = [], [], []
+        for level, (level_ranges, level_instances) in enumerate(zip(self.levels, self._instances)):
+            levels += [level] * len(level_ranges)
+            ranges += level_ranges
+            instances += level_instances
+        meshes = self.atlas.meshes
+        centers, archetype, scale, colors = self._impostor_plants
+        return {
+            'vertices': self.vertices,
+            'indices': self.indices,
+            'chunk_min': self.chunk_min,
+            'chunk_max': self.chunk_max,
+            'chunk_plants': self.chunk_plants,
+            # One row per mesh batch of every level
+            'batch_level': np.array(levels, dtype=np.intp),
+            'batch_starts': np.array([starts for starts, _ in ranges], dtype=np.int64).reshape(-1, self.chunk_count),
+            'batch_counts': np.array([counts for _, counts in ranges], dtype=np.int32).reshape(-1, self.chunk_count),
+            'batch_per_instance': np.array([per for _, _, per in instances], dtype=np.intp),
+            'batch_instances': np.array([len(chunk) for chunk, _, _ in instances], dtype=np.intp),
+            'instance_chunk': np.concatenate([chunk for chunk, _, _ in instances] or [np.zeros(0, np.intp)]),
+            'instance_rank': np.concatenate([rank for _, rank, _ in instances] or [np.zeros(0, np.intp)]),
+            # Atlas meshes back to back
+            'impostor_vertices': np.concatenate([vertices for vertices, _ in meshes] or [np.zeros(0, VERTEX_DTYPE)]),
+            'impostor_indices': np.concatenate([indices for _, indices in meshes] or [np.zeros(0, np.intp)]),
+            'impostor_vertex_counts': np.array([len(vertices) for vertices, _ in meshes], dtype=np.intp),
+            'impostor_index_counts': np.array([len(indices) for _, indices in meshes], dtype=np.intp),
+            'plant_centers': centers,
+            'plant_archetype': archetype,
+            'plant_scale': scale,
+            'plant_colors': colors,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, chunk_size=2500.0, lod_distances=LOD_DISTANCES):
+        """Rebuild a renderer from to_arrays output, such as arrays mapped from a cache file."""
+        forest = cls.__new__(cls)
+        forest.plant_count = len(arrays['plant_archetype'])
+        forest.chunk_size = chunk_size
+        forest.lod_distances = np.asarray(lod_distances, dtype=np.float64)
+        forest.chunk_min = np.array(arrays['chunk_min'])
+        forest.chunk_max = np.array(arrays['chunk_max'])
+        forest.chunk_count = len(forest.chunk_min)
+        forest.vertices = arrays['vertices']
+        forest.indices = arrays['indices']
+
+        forest.levels = [[] for _ in MESH_DETAIL]
+        forest._instances = [[] for _ in MESH_DETAIL]
+        instance_chunk = np.split(arrays['instance_chunk'], np.cumsum(arrays['batch_instances'])[:-1])
+        instance_rank = np.split(arrays['instance_rank'], np.cumsum(arrays['batch_instances'])[:-1])
+        for i, level in enumerate(arrays['batch_level']):
+            # Copies, since set_density rewrites the counts and the arrays may be read-only maps
+            forest.levels[level].append((np.array(arrays['batch_starts'][i]), np.array(arrays['batch_counts'][i])))
+            forest._instances[level].append((np.array(instance_chunk[i]), np.array(instance_rank[i]),
+                                             int(arrays['batch_per_instance'][i])))
+
+        vertices = np.split(arrays['impostor_vertices'], np.cumsum(arrays['impostor_vertex_counts'])[:-1])
+        indices = np.split(arrays['impostor_indices'], np.cumsum(arrays['impostor_index_counts'])[:-1])
+        forest._finish(ImpostorAtlas(list(zip(vertices, indices))), arrays['plant_centers'],
+                       arrays['plant_archetype'], arrays['plant_scale'], arrays['plant_colors'],
+                       np.array(arrays['chunk_plants']))
+        return forest
+
+    @property
+    def full_detail_triangles(self):
+        """Triangles of the nearest geometry level alone."""
+        return sum(int(counts.sum()) for _, counts in self.levels[0]) // 3 if self.levels else 0
+
+    def set_density(self, fraction):
+        """
+        Draw only the first fraction of each chunk's plants.
+
+        Chunks keep their plants in the original order, nearest the field
+        first, so thinning drops the far side of each chunk. Only the index
+        counts change; nothing is re-uploaded.
+        """
+        fraction = min(1.0, max(0.0, fraction))
+        if fraction == self.density:
+            return
+        self.density = fraction
+        self.drawn_plants = np.ceil(self.chunk_plants * fraction).astype(self.chunk_plants.dtype)
+        for ranges, instances in zip(self.levels, self._instances):
+            for i, ((starts, _), (chunk, rank, per_instance)) in enumerate(zip(ranges, instances)):
+                kept = rank < self.drawn_plants[chunk]
+                counts = np.bincount(chunk[kept], minlength=self.chunk_count) * per_instance
+                ranges[i] = (starts, counts.astype(np.int32))
+
+    def upload(self):
+        """Create the GL buffers and render the impostor atlas; needs a current context."""
+        self.vertex_buffer = vbo.VBO(self.vertices.view(np.uint8), usage=GL_STATIC_DRAW,
+                                     target=GL_ARRAY_BUFFER)
+        self.index_buffer = vbo.VBO(self.indices, usage=GL_STATIC_DRAW, target=GL_ELEMENT_ARRAY_BUFFER)
+        # Without an atlas the coarsest meshes cover the far range as well
+        self.impostors_ready = self.plant_count > 0 and self.atlas.render()
+
+    def draw(self, planes=None, eye=None, max_distance=None, right=None):
+        """
+        Draw every chunk inside the frustum planes and within max_distance of eye.
+
+        planes comes from culling.frustum_planes; leaving it and max_distance
+        as None draws the whole forest. Chunks are drawn at a level of detail
+        picked from their distance to eye; impostors also need right, the
+        camera's right axis in world space, to face the camera.
+        """
+        if len(self.indices) == 0:
+            return
+        if self.vertex_buffer is None:
+            self.upload()
+
+        visible = visible_boxes(self.chunk_min, self.chunk_max, planes)
+        if eye is not None:
+            distance = box_distances(self.chunk_min, self.chunk_max, eye)
+            if max_distance is not None:
+                visible &= distance <= max_distance
+            level = np.searchsorted(self.lod_distances, distance, side='right')
+        else:
+            level = np.zeros(self.chunk_count, dtype=np.intp)
+        if not (self.impostors_ready and right is not None):
+            level = np.minimum(level, len(self.levels) - 1)
+
+        self.visible_chunks = int(visible.sum())
+        self.level_chunks = np.bincount(level[visible], minlength=len(self.levels) + 1)
+        if not self.visible_chunks:
+            return
+
+        self._draw_meshes(visible, level)
+        impostors = visible & (level == len(self.levels))
+        if impostors.any():
+            self.billboards.face(right)
+            self.billboards.draw(self.chunk_first_plant[impostors], self.drawn_plants[impostors])
+
+    def _draw_meshes(self, visible, level):
+        stride = VERTEX_DTYPE.itemsize
+        self.vertex_buffer.bind()
+        self.index_buffer.bind()
+        try:
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, stride, self.vertex_buffer)
+            glNormalPointer(GL_FLOAT, stride, self.vertex_buffer + VERTEX_DTYPE.fields['normal'][1])
+            glColorPointer(4, GL_UNSIGNED_BYTE, stride, self.vertex_buffer + VERTEX_DTYPE.fields['color'][1])
+
+            for lod, ranges in enumerate(self.levels):
+                chunks = visible & (level == lod)
+                if not chunks.any():
+                    continue
+                for starts, counts in ranges:
+                    drawn = chunks & (counts > 0)
+                    if drawn.any():
+                        # Offsets are byte positions in the bound element buffer
+                        offsets = (starts[drawn] * self.indices.itemsize).astype(np.uintp)
+                        glMultiDrawElements(GL_TRIANGLES, counts[drawn], GL_UNSIGNED_INT, offsets,
+                                            int(drawn.sum()))
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            self.index_buffer.unbind()
+            self.vertex_buffer.unbind()
+
+    def delete(self):
+        """Release the GL buffers and the impostor atlas."""
+        for buffer in (self.vertex_buffer, self.index_buffer):
+            if buffer is not None:
+                buffer.delete()
+        self.vertex_buffer = self.index_buffer = None
+        self.billboards.delete()
+        self.atlas.delete()
+        self.impostors_ready = False
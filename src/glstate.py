@@ -0,0 +1,117 @@
+"""
+Shadow copy of the fixed-function GL state the game toggles.
+
+Every PyOpenGL call goes through ctypes wrapping and error checking, so the
+draw code's habit of re-enabling lighting, blending and depth testing that
+are already on costs real time each frame. GLStateCache remembers what it
+last set and drops calls that would not change anything, answers
+glIsEnabled and viewport queries from memory, and counts both so the debug
+overlay can show what was saved.
+
+Display lists are the one place where nothing may be skipped: a list is
+replayed later against whatever state is current then. Lists compiled with
+new_list/end_list record every change in full, and call_list applies the
+state each list leaves behind to the cache.
+
+Code that changes these states behind the cache's back must restore them
+(glPushAttrib/glPopAttrib) or call invalidate() afterwards.
+"""
+from OpenGL.GL import (GL_COMPILE_AND_EXECUTE, GL_VIEWPORT, glBlendFunc, glCallList,
+                       glDepthMask, glDisable, glEnable, glEndList, glGetIntegerv,
+                       glIsEnabled, glNewList, glViewport)
+
+BLEND_FUNC = 'blend_func'
+DEPTH_MASK = 'depth_mask'
+
+
+class GLStateCache:
+    """Skips redundant state changes and answers state queries without a GL round trip."""
+
+    def __init__(self):
+        self._state = {}         # Capability or BLEND_FUNC/DEPTH_MASK -> value last set
+        self._viewport = None
+        self._list_effects = {}  # Display list -> state it leaves behind
+        self._recording = None   # State set so far by the list being compiled
+        self._executing = True   # False while compiling with GL_COMPILE
+        self.issued = 0          # State calls passed to GL this frame
+        self.skipped = 0         # Redundant state calls dropped this frame
+        self.answered = 0        # Queries answered from the cache this frame
+        self.last_frame = (0, 0, 0)
+
+    def _change(self, key, value, function, *args):
+        if self._recording is None and self._state.get(key) == value:
+            self.skipped += 1
+            return
+        function(*args)
+        self.issued += 1
+        if self._recording is not None:
+            self._recording[key] = value
+            if not self._executing:
+                return
+        self._state[key] = value
+
+    def enable(self, cap):
+        self._change(cap, True, glEnable, cap)
+
+    def disable(self, cap):
+        self._change(cap, False, glDisable, cap)
+
+    def blend_func(self, src, dst):
+        self._change(BLEND_FUNC, (src, dst), glBlendFunc, src, dst)
+
+    def depth_mask(self, flag):
+        self._change(DEPTH_MASK, bool(flag), glDepthMask, flag)
+
+    def is_enabled(self, cap):
+        """glIsEnabled, queried from GL only the first time a capability is asked about."""
+        enabled = self._state.get(cap)
+        if enabled is None:
+            enabled = self._state[cap] = bool(glIsEnabled(cap))
+        else:
+            self.answered += 1
+        return enabled
+
+    def viewport(self):
+        """The current viewport as (x, y, width, height)."""
+        if self._viewport is None:
+            self._viewport = tuple(int(v) for v in glGetIntegerv(GL_VIEWPORT))
+        else:
+            self.answered += 1
+        return self._viewport
+
+    def set_viewport(self, x, y, width, height):
+        glViewport(x, y, width, height)
+        self._viewport = (x, y, width, height)
+
+    def new_list(self, display_list, mode):
+        """glNewList, recording the state the list sets so call_list can account for it."""
+        glNewList(display_list, mode)
+        self._recording = {}
+        self._executing = mode == GL_COMPILE_AND_EXECUTE
+
+    def end_list(self, display_list):
+        glEndList()
+        self._list_effects[display_list] = self._recording
+        self._recording = None
+        self._executing = True
+
+    def call_list(self, display_list):
+        glCallList(display_list)
+        effects = self._list_effects.get(display_list)
+        if effects:
+            if self._recording is not None:
+                self._recording.update(effects)
+                if not self._executing:
+                    return
+            self._state.update(effects)
+
+    def invalidate(self):
+        """Forget everything; the next change of each state goes to GL."""
+        self._state.clear()
+        self._viewport = None
+
+    def end_frame(self):
+        """Keep this frame's (issued, skipped, answered) counts in last_frame and reset them."""
+        self.last_frame = (self.issued, self.skipped, self.answered)
+        self.issued = self.skipped = self.answered = 0
+        return self.last_frame
@@ -0,0 +1,384 @@
+"""
+Texture-atlas text rendering for GLUT bitmap fonts.
+
+glutBitmapCharacter costs one library call (and one glBitmap) per character,
+every frame. GlyphAtlas instead rasterizes the printable ASCII range of each
+font once, with GLUT itself, into cells of a texture through a framebuffer
+object, and keeps each font's advance widths in a table. Strings are then
+laid out into textured quads - cached per string, since most HUD text does
+not change between frames - and a TextBatch draws every queued string with a
+single glDrawArrays call. Quads are pixel-aligned with nearest filtering, so
+the result matches the bitmap output exactly.
+
+Without framebuffer objects the atlas is not built and strings fall back to
+glutBitmapCharacter.
+
+Glyphs come from a bitmaps object: GLUTBitmaps asks GLUT, which needs
+glutInit and so a window system; FontTableBitmaps reads the same glyphs out
+of freeglut's font tables and draws them with identical glBitmap calls,
+which works in any context.
+"""
+import ctypes
+import math
+
+import numpy as np
+
+from OpenGL.GL import (GL_ALPHA, GL_ALPHA_TEST, GL_BLEND, GL_CLAMP_TO_EDGE,
+                       GL_CLIENT_PIXEL_STORE_BIT, GL_COLOR_ARRAY, GL_COLOR_ATTACHMENT0,
+                       GL_COLOR_BUFFER_BIT, GL_CULL_FACE, GL_DEPTH_TEST, GL_ENABLE_BIT, GL_FLOAT,
+                       GL_FOG, GL_FRAMEBUFFER, GL_FRAMEBUFFER_BINDING, GL_FRAMEBUFFER_COMPLETE,
+                       GL_GREATER, GL_LIGHTING, GL_MODELVIEW, GL_MODULATE, GL_NEAREST,
+                       GL_PROJECTION, GL_QUADS, GL_RGBA, GL_RGBA8, GL_TEXTURE_2D, GL_TEXTURE_BIT,
+                       GL_TEXTURE_COORD_ARRAY, GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE,
+                       GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_TEXTURE_WRAP_S,
+                       GL_TEXTURE_WRAP_T, GL_TRANSFORM_BIT, GL_UNPACK_ALIGNMENT,
+                       GL_UNPACK_LSB_FIRST, GL_UNPACK_ROW_LENGTH, GL_UNPACK_SKIP_PIXELS,
+                       GL_UNPACK_SKIP_ROWS, GL_UNPACK_SWAP_BYTES, GL_UNSIGNED_BYTE, GL_VERTEX_ARRAY,
+                       GL_VIEWPORT_BIT, glAlphaFunc, glBindFramebuffer, glBindTexture, glBitmap,
+                       glCheckFramebufferStatus, glClear, glClearColor, glColor3fv, glColor4f,
+                       glColorPointer, glDeleteFramebuffers, glDeleteTextures, glDisable,
+                       glDisableClientState, glDrawArrays, glEnable, glEnableClientState,
+                       glFramebufferTexture2D, glGenFramebuffers, glGenTextures, glGetIntegerv,
+                       glGetTexImage, glLoadIdentity, glMatrixMode, glOrtho, glPixelStorei,
+                       glPopAttrib, glPopClientAttrib, glPopMatrix, glPushAttrib,
+                       glPushClientAttrib, glPushMatrix, glTexCoordPointer, glTexEnvi, glTexImage2D,
+                       glTexParameteri, glVertexPointer, glViewport, glWindowPos2f, glWindowPos2i)
+from OpenGL import GLUT, platform
+from OpenGL.GLUT import glutBitmapCharacter, glutBitmapWidth
+
+FIRST_CHAR = 32            # Printable ASCII range held in the atlas
+LAST_CHAR = 126
+COLUMNS = 16               # Glyph cells per atlas row
+CELL_HEIGHT = 36           # Tall enough for the largest GLUT bitmap font
+BASELINE = 10              # Baseline height inside a cell, room for descenders
+PAD = 3                    # Cell margin left of the pen position, for overhanging glyphs
+LAYOUT_CACHE_SIZE = 512    # Laid-out strings kept between frames
+
+
+def font_key(font):
+    """Hashable key for a GLUT font; GLX/EGL hand out ctypes pointers, which are not."""
+    return getattr(font, 'value', font)
+
+
+class GLUTBitmaps:
+    """Glyph widths and drawing from GLUT itself; GLUT must be initialized."""
+
+    def width(self, font, code):
+        return glutBitmapWidth(font, code)
+
+    def draw(self, font, code):
+        glutBitmapCharacter(font, code)
+
+
+class _FontTable(ctypes.Structure):
+    """freeglut's SFG_Font: each character is its advance width followed by its rows, bottom first."""
+    _fields_ = [('name', ctypes.c_char_p), ('quantity', ctypes.c_int), ('height', ctypes.c_int),
+                ('characters', ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))),
+                ('xorig', ctypes.c_float), ('yorig', ctypes.c_float)]
+
+
+class FontTableBitmaps:
+    """
+    The GLUT bitmap fonts read from freeglut's exported font tables.
+
+    Draws exactly what glutBitmapCharacter would, without needing glutInit.
+    Raises LookupError when the GLUT library is not freeglut (or has no
+    tables to export).
+    """
+
+    TABLES = {
+        'GLUT_BITMAP_8_BY_13': 'fgFontFixed8x13',
+        'GLUT_BITMAP_9_BY_15': 'fgFontFixed9x15',
+        'GLUT_BITMAP_TIMES_ROMAN_10': 'fgFontTimesRoman10',
+        'GLUT_BITMAP_TIMES_ROMAN_24': 'fgFontTimesRoman24',
+        'GLUT_BITMAP_HELVETICA_10': 'fgFontHelvetica10',
+        'GLUT_BITMAP_HELVETICA_12': 'fgFontHelvetica12',
+        'GLUT_BITMAP_HELVETICA_18': 'fgFontHelvetica18',
+    }
+
+    def __init__(self):
+        library = platform.PLATFORM.GLUT
+        self._tables = {}
+        for name, table in self.TABLES.items():
+            font = getattr(GLUT, name, None)
+            if font is None:
+                continue
+            try:
+                self._tables[font_key(font)] = _FontTable.in_dll(library, table)
+            except (ValueError, AttributeError) as error:
+                raise LookupError(f"No freeglut font table {table}: {error}")
+
+    def _face(self, font, code):
+        table = self._tables[font_key(font)]
+        if not 0 < code < min(256, table.quantity):
+            return table, None
+        return table, table.characters[code]
+
+    def width(self, font, code):
+        _, face = self._face(font, code)
+        return face[0] if face else 0
+
+    def draw(self, font, code):
+        table, face = self._face(font, code)
+        if not face:
+            return
+        width = face[0]
+        rows = ctypes.string_at(ctypes.addressof(face.contents) + 1, (width + 7) // 8 * table.height)
+        glPushClientAttrib(GL_CLIENT_PIXEL_STORE_BIT)
+        try:
+            for setting, value in ((GL_UNPACK_SWAP_BYTES, 0), (GL_UNPACK_LSB_FIRST, 0), (GL_UNPACK_ROW_LENGTH, 0),
+                                   (GL_UNPACK_SKIP_ROWS, 0), (GL_UNPACK_SKIP_PIXELS, 0), (GL_UNPACK_ALIGNMENT, 1)):
+                glPixelStorei(setting, value)
+            glBitmap(width, table.height, table.xorig, table.yorig, float(width), 0.0, rows)
+        finally:
+            glPopClientAttrib()
+
+
+class GlyphAtlas:
+    """
+    Every font's printable characters in one texture, plus width tables.
+
+    fonts are GLUT bitmap font handles and bitmaps supplies their glyphs,
+    GLUTBitmaps by default. text_width works as soon as the bitmaps can be
+    queried; layout needs build() to have succeeded first.
+    """
+
+    def __init__(self, fonts, bitmaps=None):
+        self.fonts = tuple(fonts)
+        self.bitmaps = bitmaps or GLUTBitmaps()
+        self.texture = None
+        self._widths = {}      # Font -> advance width per character code
+        self._cells = {}       # Font -> (first cell x, first cell y, cell width)
+        self._boxes = {}       # Font -> inked (left, bottom, right, top) of each glyph within its cell
+        self._layouts = {}     # (font, text) -> (positions, texcoords) at the origin
+        self.width = self.height = 0
+
+    def advances(self, font):
+        """Advance width of every character code below 256, queried from the bitmaps once."""
+        widths = self._widths.get(font_key(font))
+        if widths is None:
+            widths = np.array([self.bitmaps.width(font, code) for code in range(256)], dtype=np.int32)
+            self._widths[font_key(font)] = widths
+        return widths
+
+    def text_width(self, text, font):
+        """Width in pixels of text drawn in font."""
+        widths = self.advances(font)
+        return int(sum(widths[code] for code in text.encode('latin-1', 'replace')))
+
+    def build(self):
+        """Rasterize every font into the atlas texture; needs a current context. Returns success."""
+        if not bool(glGenFramebuffers) or not self.fonts:
+            return False
+
+        # Stack one block of COLUMNS-wide rows per font
+        rows = -(-(LAST_CHAR - FIRST_CHAR + 1) // COLUMNS)
+        cell_widths = [int(self.advances(font)[FIRST_CHAR:LAST_CHAR + 1].max()) + 2 * PAD for font in self.fonts]
+        self.width = 1 << (COLUMNS * max(cell_widths) - 1).bit_length()
+        self.height = 1 << (rows * CELL_HEIGHT * len(self.fonts) - 1).bit_length()
+        for i, font in enumerate(self.fonts):
+            self._cells[font_key(font)] = (0, i * rows * CELL_HEIGHT, cell_widths[i])
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, self.width, self.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+        complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        if complete:
+            glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_VIEWPORT_BIT)
+            try:
+                for cap in (GL_LIGHTING, GL_DEPTH_TEST, GL_FOG, GL_TEXTURE_2D, GL_BLEND, GL_ALPHA_TEST):
+                    glDisable(cap)
+                glViewport(0, 0, self.width, self.height)
+                glClearColor(0.0, 0.0, 0.0, 0.0)
+                glClear(GL_COLOR_BUFFER_BIT)
+                for font in self.fonts:
+                    origin_x, origin_y, cell_width = self._cells[font_key(font)]
+                    for code in range(FIRST_CHAR, LAST_CHAR + 1):
+                        row, column = divmod(code - FIRST_CHAR, COLUMNS)
+                        # The raster color is latched by glWindowPos
+                        glColor4f(1.0, 1.0, 1.0, 1.0)
+                        glWindowPos2i(origin_x + column * cell_width + PAD,
+                                      origin_y + row * CELL_HEIGHT + BASELINE)
+                        self.bitmaps.draw(font, code)
+            finally:
+                glPopAttrib()
+
+        glBindFramebuffer(GL_FRAMEBUFFER, int(previous))
+        glDeleteFramebuffers(1, [framebuffer])
+        if not complete:
+            self.delete()
+            return False
+
+        # Trim every glyph's quad to its inked pixels so blank cell space costs no fill
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        alpha = np.frombuffer(glGetTexImage(GL_TEXTURE_2D, 0, GL_ALPHA, GL_UNSIGNED_BYTE), dtype=np.uint8)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        alpha = alpha.reshape(self.height, self.width)
+        for font in self.fonts:
+            origin_x, origin_y, cell_width = self._cells[font_key(font)]
+            boxes = np.zeros((LAST_CHAR - FIRST_CHAR + 1, 4), dtype=np.int32)
+            for index in range(len(boxes)):
+                row, column = divmod(index, COLUMNS)
+                x, y = origin_x + column * cell_width, origin_y + row * CELL_HEIGHT
+                inked_rows, inked_columns = np.nonzero(alpha[y:y + CELL_HEIGHT, x:x + cell_width])
+                if len(inked_rows):
+                    boxes[index] = (inked_columns.min(), inked_rows.min(),
+                                    inked_columns.max() + 1, inked_rows.max() + 1)
+            self._boxes[font_key(font)] = boxes
+        return True
+
+    def layout(self, text, font):
+        """
+        Quads for text with its pen starting at the origin, or None if the
+        atlas cannot draw it. Returns (positions, texcoords), four (x, y)
+        rows of each per inked character.
+        """
+        key = (font_key(font), text)
+        cached = self._layouts.get(key)
+        if cached is not None:
+            return cached
+        if self.texture is None or font_key(font) not in self._cells:
+            return None
+        codes = np.frombuffer(text.encode('latin-1', 'replace'), dtype=np.uint8).astype(np.int32)
+        if len(codes) and (codes.min() < FIRST_CHAR or codes.max() > LAST_CHAR):
+            return None
+
+        origin_x, origin_y, cell_width = self._cells[font_key(font)]
+        advances = self.advances(font)[codes]
+        pen = np.cumsum(advances) - advances
+        boxes = self._boxes[font_key(font)][codes - FIRST_CHAR]
+        inked = (boxes[:, 2] > boxes[:, 0])
+        codes, pen, boxes = codes[inked], pen[inked], boxes[inked]
+        row, column = np.divmod(codes - FIRST_CHAR, COLUMNS)
+        cell_x = origin_x + column * cell_width
+        cell_y = origin_y + row * CELL_HEIGHT
+
+        # Corners in order lower-left, lower-right, upper-right, upper-left
+        corner_x = boxes[:, [0, 2, 2, 0]]
+        corner_y = boxes[:, [1, 1, 3, 3]]
+        positions = np.empty((len(codes), 4, 2), dtype=np.float32)
+        positions[:, :, 0] = (pen - PAD)[:, None] + corner_x
+        positions[:, :, 1] = corner_y - BASELINE
+        texcoords = np.empty((len(codes), 4, 2), dtype=np.float32)
+        texcoords[:, :, 0] = (cell_x[:, None] + corner_x) / self.width
+        texcoords[:, :, 1] = (cell_y[:, None] + corner_y) / self.height
+
+        if len(self._layouts) >= LAYOUT_CACHE_SIZE:
+            self._layouts.clear()
+        cached = (positions.reshape(-1, 2), texcoords.reshape(-1, 2))
+        self._layouts[key] = cached
+        return cached
+
+    def delete(self):
+        """Release the atlas texture; text falls back to GLUT bitmaps."""
+        if self.texture is not None:
+            glDeleteTextures([self.texture])
+            self.texture = None
+        self._layouts.clear()
+
+
+def draw_bitmap_text(x, y, text, font, color, bitmaps):
+    """Draw text one bitmap character at a time at window position (x, y)."""
+    glColor3fv(color)
+    glWindowPos2f(x, y)
+    for char in text:
+        bitmaps.draw(font, ord(char))
+
+
+class TextBatch:
+    """
+    Strings queued during a frame and drawn together by flush().
+
+    Strings the atlas cannot draw are drawn straight away with GLUT bitmaps.
+    Positions are window coordinates of the pen at the baseline, as for
+    glWindowPos. The viewport comes from state, the GLStateCache. With a
+    stream (an OpenGL.arrays.vbo.StreamingVBO) the quads are appended to it
+    and drawn from there rather than from client arrays.
+    """
+
+    def __init__(self, atlas, state, stream=None):
+        self.atlas = atlas
+        self.state = state
+        self.stream = stream
+        self._positions = []
+        self._texcoords = []
+        self._colors = []
+
+    def add(self, x, y, text, font, color):
+        """Queue text at window position (x, y) in an RGB color."""
+        quads = self.atlas.layout(text, font)
+        if quads is None:
+            draw_bitmap_text(x, y, text, font, color, self.atlas.bitmaps)
+            return
+        positions, texcoords = quads
+        if not len(positions):
+            return
+        # Bitmaps snap down to whole pixels, so the quads must too
+        self._positions.append(positions + np.array([math.floor(x), math.floor(y)], dtype=np.float32))
+        self._texcoords.append(texcoords)
+        self._colors.append(tuple(min(255, max(0, int(channel * 255.0 + 0.5))) for channel in color[:3]) + (255,))
+
+    def __len__(self):
+        return len(self._positions)
+
+    def flush(self):
+        """Draw everything queued since the last flush in one call."""
+        if not self._positions:
+            return
+        positions = np.concatenate(self._positions)
+        texcoords = np.concatenate(self._texcoords)
+        colors = np.repeat(np.array(self._colors, dtype=np.uint8), [len(p) for p in self._positions], axis=0)
+        self._positions, self._texcoords, self._colors = [], [], []
+        count = len(positions)
+        stream = self.stream
+        if stream is not None:
+            positions, texcoords, colors = stream.append(positions), stream.append(texcoords), stream.append(colors)
+
+        _, _, width, height = self.state.viewport()
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT | GL_COLOR_BUFFER_BIT | GL_TRANSFORM_BIT)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, width, 0, height, -1.0, 1.0)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        try:
+            for cap in (GL_LIGHTING, GL_DEPTH_TEST, GL_FOG, GL_CULL_FACE, GL_BLEND):
+                glDisable(cap)
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, self.atlas.texture)
+            glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+            glEnable(GL_ALPHA_TEST)
+            glAlphaFunc(GL_GREATER, 0.5)
+
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            if stream is not None:
+                stream.bind()
+            glVertexPointer(2, GL_FLOAT, 0, positions)
+            glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, colors)
+            glDrawArrays(GL_QUADS, 0, count)
+        finally:
+            if stream is not None:
+                stream.unbind()
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+            glMatrixMode(GL_MODELVIEW)
+            glPopMatrix()
+            glPopAttrib()
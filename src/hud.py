@@ -0,0 +1,97 @@
+"""
+Retained-mode HUD widgets.
+
+Each widget wraps a build function that draws one piece of the HUD (a panel,
+a bar, the text on it) in immediate mode. The first draw compiles that output
+into a display list; later draws replay the list for as long as the values
+the widget is bound to stay the same, so an unchanged score panel or a static
+overlay costs one glCallList instead of dozens of GL calls and a text layout.
+A minimum refresh interval can hold a widget's list a little longer still,
+so counters that tick every frame are rebuilt at a lower rate.
+
+Text queued on a TextBatch must be flushed inside the build function so its
+vertex arrays are captured by the list with the rest of the widget. Lists are
+compiled and called through the game's GLStateCache, which needs to know what
+state each one leaves behind.
+"""
+import time
+
+from OpenGL.GL import GL_COMPILE_AND_EXECUTE, glDeleteLists, glGenLists
+
+
+class RetainedWidget:
+    """One HUD element, recompiled only when the values it is drawn with change."""
+
+    def __init__(self, build, state):
+        self.build = build
+        self.state = state
+        self.values = None
+        self.display_list = None
+        self.rebuilds = 0
+        self.min_interval = 0.0   # Seconds a built list is kept even when the values move on
+        self._built_at = 0.0
+
+    @property
+    def dirty(self):
+        return self.values is None
+
+    def draw(self, *values):
+        """Draw the widget for these values; build(*values) runs only if they differ from last time."""
+        if self.display_list is not None and self.values is not None:
+            if values == self.values or time.perf_counter() - self._built_at < self.min_interval:
+                self.state.call_list(self.display_list)
+                return
+
+        if self.display_list is None:
+            self.display_list = glGenLists(1)
+        # Values are recorded only once the list is complete, so a failed build retries next frame
+        self.values = None
+        self.state.new_list(self.display_list, GL_COMPILE_AND_EXECUTE)
+        try:
+            self.build(*values)
+        finally:
+            self.state.end_list(self.display_list)
+        self.values = values
+        self.rebuilds += 1
+        self._built_at = time.perf_counter()
+
+    def invalidate(self):
+        """Force a rebuild on the next draw (e.g. after the window is resized)."""
+        self.values = None
+
+    def delete(self):
+        if self.display_list is not None:
+            glDeleteLists(self.display_list, 1)
+        self.display_list = None
+        self.values = None
+
+
+class RetainedHud:
+    """The set of widgets making up the HUD, so they can be invalidated together."""
+
+    def __init__(self, state):
+        self.state = state
+        self.widgets = []
+
+    def widget(self, build):
+        """Create and register a widget for a build function."""
+        widget = RetainedWidget(build, self.state)
+        self.widgets.append(widget)
+        return widget
+
+    @property
+    def rebuilds(self):
+        return sum(widget.rebuilds for widget in self.widgets)
+
+    def set_refresh_interval(self, seconds, widgets=None):
+        """Rebuild changing widgets (all by default) at most once per interval; 0 rebuilds on every change."""
+        for widget in self.widgets if widgets is None else widgets:
+            widget.min_interval = seconds
+
+    def invalidate(self):
+        for widget in self.widgets:
+            widget.invalidate()
+
+    def delete(self):
+        for widget in self.widgets:
+            widget.delete()
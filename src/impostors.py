@@ -0,0 +1,288 @@
+"""
+Billboard impostors for distant plants.
+
+A handful of representative plant meshes are rendered side-on, once at
+startup, into the cells of one RGBA texture atlas. Far from the camera every
+plant is then drawn as a single textured quad standing on its base and turned
+to face the camera, tinted with the plant's own color and alpha-tested
+against the transparent background of its cell. Quads are only re-aimed when
+the camera has turned noticeably, so most frames draw straight from the
+buffer uploaded on an earlier frame.
+"""
+import math
+
+import numpy as np
+
+from OpenGL.GL import (GL_ALPHA_TEST, GL_ARRAY_BUFFER, GL_CLAMP_TO_EDGE, GL_COLOR_ARRAY,
+                       GL_COLOR_ATTACHMENT0, GL_COLOR_BUFFER_BIT, GL_DEPTH_ATTACHMENT,
+                       GL_DEPTH_BUFFER_BIT, GL_DEPTH_COMPONENT24, GL_DEPTH_TEST, GL_DYNAMIC_DRAW,
+                       GL_ENABLE_BIT, GL_FLOAT, GL_FOG, GL_FRAMEBUFFER, GL_FRAMEBUFFER_BINDING,
+                       GL_FRAMEBUFFER_COMPLETE, GL_GREATER, GL_LIGHTING, GL_LINEAR,
+                       GL_LINEAR_MIPMAP_LINEAR, GL_MODELVIEW, GL_MODULATE, GL_NORMAL_ARRAY,
+                       GL_PROJECTION, GL_QUADS, GL_RENDERBUFFER, GL_RGBA, GL_RGBA8, GL_TEXTURE_2D,
+                       GL_TEXTURE_BIT, GL_TEXTURE_COORD_ARRAY, GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE,
+                       GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_TEXTURE_WRAP_S,
+                       GL_TEXTURE_WRAP_T, GL_TRANSFORM_BIT, GL_TRIANGLES, GL_UNSIGNED_BYTE,
+                       GL_UNSIGNED_INT, GL_VERTEX_ARRAY, GL_VIEWPORT_BIT, glAlphaFunc,
+                       glBindFramebuffer, glBindRenderbuffer, glBindTexture, glCheckFramebufferStatus,
+                       glClear, glClearColor, glColorPointer, glDeleteFramebuffers,
+                       glDeleteRenderbuffers, glDeleteTextures, glDisable, glDisableClientState,
+                       glDrawElements, glEnable, glEnableClientState, glFramebufferRenderbuffer,
+                       glFramebufferTexture2D, glGenerateMipmap, glGenFramebuffers,
+                       glGenRenderbuffers, glGenTextures, glGetIntegerv, glLoadIdentity,
+                       glMatrixMode, glMultiDrawArrays, glNormalPointer, glOrtho, glPopAttrib,
+                       glPopMatrix, glPushAttrib, glPushMatrix, glRenderbufferStorage, glRotatef,
+                       glTexCoordPointer, glTexEnvi, glTexImage2D, glTexParameteri, glVertexPointer,
+                       glViewport)
+from OpenGL.arrays import vbo
+
+# Interleaved layout of the billboard quads
+QUAD_DTYPE = np.dtype([
+    ('position', np.float32, 3),
+    ('texcoord', np.float32, 2),
+    ('color', np.uint8, 4),
+])
+
+REFACE_DEGREES = 2.0   # Camera turn that triggers re-aiming every quad
+
+
+class ImpostorAtlas:
+    """
+    Side-on pictures of a few meshes packed into one texture.
+
+    meshes is a list of (vertices, indices) pairs in forest.VERTEX_DTYPE
+    layout, each standing at the origin. The picture of mesh i covers
+    texcoords uv[i] and shows the mesh between -half_width[i] and
+    half_width[i] across and z_min[i] to z_max[i] up.
+    """
+
+    def __init__(self, meshes, cell_size=128, margin=4):
+        self.meshes = meshes
+        self.cell_size = cell_size
+        self.margin = margin
+        self.columns = max(1, math.ceil(math.sqrt(len(meshes))))
+        rows = max(1, math.ceil(len(meshes) / self.columns))
+        self.width = 1 << (self.columns * cell_size - 1).bit_length()
+        self.height = 1 << (rows * cell_size - 1).bit_length()
+        self.texture = None
+
+        self.half_width = np.empty(len(meshes))
+        self.z_min = np.empty(len(meshes))
+        self.z_max = np.empty(len(meshes))
+        self.uv = np.empty((len(meshes), 4))   # u0, v0, u1, v1
+        for i, (vertices, _) in enumerate(meshes):
+            positions = vertices['position']
+            self.half_width[i] = np.abs(positions[:, 0]).max()
+            self.z_min[i] = positions[:, 2].min()
+            self.z_max[i] = positions[:, 2].max()
+            x, y, size = self._cell_rect(i)
+            self.uv[i] = (x / self.width, y / self.height, (x + size) / self.width, (y + size) / self.height)
+
+    def _cell_rect(self, index):
+        """Pixel rectangle (x, y, size) inside the margin of a mesh's cell."""
+        row, column = divmod(index, self.columns)
+        return (column * self.cell_size + self.margin, row * self.cell_size + self.margin,
+                self.cell_size - 2 * self.margin)
+
+    def render(self):
+        """
+        Draw every mesh into the atlas texture; needs a current context.
+
+        Uses the scene's current lighting so impostors shade like the real
+        plants. Returns False, leaving no texture, when framebuffer objects
+        are unavailable.
+        """
+        if not (bool(glGenFramebuffers) and bool(glGenerateMipmap)):
+            return False
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, self.width, self.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        framebuffer = glGenFramebuffers(1)
+        depth = glGenRenderbuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+        glBindRenderbuffer(GL_RENDERBUFFER, depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, self.width, self.height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        if complete:
+            glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_VIEWPORT_BIT | GL_TRANSFORM_BIT)
+            glMatrixMode(GL_PROJECTION)
+            glPushMatrix()
+            glMatrixMode(GL_MODELVIEW)
+            glPushMatrix()
+            try:
+                glDisable(GL_FOG)
+                glDisable(GL_TEXTURE_2D)
+                glEnable(GL_DEPTH_TEST)
+                glViewport(0, 0, self.width, self.height)
+                glClearColor(0.0, 0.0, 0.0, 0.0)
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                for i in range(len(self.meshes)):
+                    self._draw_cell(i)
+            finally:
+                glMatrixMode(GL_PROJECTION)
+                glPopMatrix()
+                glMatrixMode(GL_MODELVIEW)
+                glPopMatrix()
+                glPopAttrib()
+
+        glBindFramebuffer(GL_FRAMEBUFFER, int(previous))
+        glDeleteFramebuffers(1, [framebuffer])
+        glDeleteRenderbuffers(1, [depth])
+        if not complete:
+            self.delete()
+            return False
+
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glGenerateMipmap(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return True
+
+    def _draw_cell(self, index):
+        vertices, indices = self.meshes[index]
+        x, y, size = self._cell_rect(index)
+        glViewport(x, y, size, size)
+
+        # Orthographic side view looking along +Y with Z up
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        half_width = self.half_width[index]
+        glOrtho(-half_width, half_width, self.z_min[index], self.z_max[index], -4.0 * half_width - 1.0,
+                4.0 * half_width + 1.0)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glRotatef(-90.0, 1.0, 0.0, 0.0)
+
+        positions = np.ascontiguousarray(vertices['position'])
+        normals = np.ascontiguousarray(vertices['normal'])
+        colors = np.ascontiguousarray(vertices['color'])
+        elements = np.ascontiguousarray(indices, dtype=np.uint32)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        try:
+            glVertexPointer(3, GL_FLOAT, 0, positions)
+            glNormalPointer(GL_FLOAT, 0, normals)
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, colors)
+            glDrawElements(GL_TRIANGLES, len(elements), GL_UNSIGNED_INT, elements)
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        """Release the atlas texture."""
+        if self.texture is not None:
+            glDeleteTextures([self.texture])
+            self.texture = None
+
+
+class BillboardSet:
+    """
+    One camera-facing quad per plant, all in a single vertex buffer.
+
+    centers are the (N, 3) ground positions, archetype the atlas picture each
+    plant uses, scale its size relative to that picture and color its (N, 3)
+    tint.
+    """
+
+    def __init__(self, atlas, centers, archetype, scale, color):
+        self.atlas = atlas
+        count = len(centers)
+        self.centers = np.asarray(centers, dtype=np.float64)
+        archetype = np.asarray(archetype, dtype=np.intp)
+        scale = np.asarray(scale, dtype=np.float64)
+        self.half_width = atlas.half_width[archetype] * scale
+        self.bottom = atlas.z_min[archetype] * scale
+        self.top = atlas.z_max[archetype] * scale
+
+        self.vertices = np.zeros(count * 4, dtype=QUAD_DTYPE)
+        corners = self.vertices.reshape(count, 4)
+        u0, v0, u1, v1 = atlas.uv[archetype].T
+        corners['texcoord'][:, 0] = np.stack([u0, v0], axis=1)
+        corners['texcoord'][:, 1] = np.stack([u1, v0], axis=1)
+        corners['texcoord'][:, 2] = np.stack([u1, v1], axis=1)
+        corners['texcoord'][:, 3] = np.stack([u0, v1], axis=1)
+        tint = np.clip(np.asarray(color, dtype=np.float64) * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        corners['color'][:, :, :3] = tint[:, None, :]
+        corners['color'][:, :, 3] = 255
+
+        self.facing = None
+        self.buffer = None
+
+    def face(self, right):
+        """Turn every quad broadside to a camera whose right axis is right."""
+        right = np.array([right[0], right[1], 0.0], dtype=np.float64)
+        length = np.hypot(right[0], right[1])
+        if length == 0.0:
+            return
+        right /= length
+        if self.facing is not None and np.dot(right, self.facing) >= math.cos(math.radians(REFACE_DEGREES)):
+            return
+        self.facing = right
+
+        across = self.half_width[:, None] * right
+        corners = self.vertices.reshape(-1, 4)['position']
+        corners[:, 0] = self.centers - across
+        corners[:, 1] = self.centers + across
+        corners[:, 2] = self.centers + across
+        corners[:, 3] = self.centers - across
+        corners[:, 0:2, 2] = (self.centers[:, 2] + self.bottom)[:, None]
+        corners[:, 2:4, 2] = (self.centers[:, 2] + self.top)[:, None]
+        if self.buffer is not None:
+            self.buffer.set_array(self.vertices.view(np.uint8))
+
+    def upload(self):
+        """Create the GL buffer; needs a current context."""
+        self.buffer = vbo.VBO(self.vertices.view(np.uint8), usage=GL_DYNAMIC_DRAW, target=GL_ARRAY_BUFFER)
+
+    def draw(self, first_quads, quad_counts):
+        """Draw runs of quads, given as first quad index and quad count per run."""
+        if self.buffer is None:
+            self.upload()
+        firsts = (np.asarray(first_quads) * 4).astype(np.int32)
+        counts = (np.asarray(quad_counts) * 4).astype(np.int32)
+
+        stride = QUAD_DTYPE.itemsize
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT | GL_COLOR_BUFFER_BIT)
+        self.buffer.bind()
+        try:
+            # Shading is already baked into the atlas
+            glDisable(GL_LIGHTING)
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, self.atlas.texture)
+            glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+            glEnable(GL_ALPHA_TEST)
+            glAlphaFunc(GL_GREATER, 0.5)
+
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, stride, self.buffer)
+            glTexCoordPointer(2, GL_FLOAT, stride, self.buffer + QUAD_DTYPE.fields['texcoord'][1])
+            glColorPointer(4, GL_UNSIGNED_BYTE, stride, self.buffer + QUAD_DTYPE.fields['color'][1])
+            glMultiDrawArrays(GL_QUADS, firsts, counts, len(counts))
+        finally:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            self.buffer.unbind()
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glPopAttrib()
+
+    def delete(self):
+        """Release the GL buffer."""
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
@@ -0,0 +1,242 @@
+"""
+Windowless rendering of the game.
+
+OffscreenGame creates an OpenGL context with no window - a pbuffer on EGL's
+surfaceless platform, or an OSMesa context drawing into host memory - runs
+the same init_game() and display() as the GLUT front-end, and hands each
+frame back as a NumPy array. This is what rendering benchmarks, visual
+regression checks and frame captures use on headless servers.
+
+PyOpenGL picks its platform once, on first import, so the backend has to be
+chosen before anything imports OpenGL: create the OffscreenGame (or call
+select_platform) before importing red_light_green_light.
+
+GLUT itself cannot start without a window system, and freeglut refuses to
+draw its shapes or bitmap fonts until it has. OffscreenGame therefore hands
+init_game vertex-array shapes and HUD glyphs read from freeglut's font
+tables, which draw the same pixels the GLUT calls would.
+"""
+import os
+import sys
+import time
+
+# The vendored OpenGL package lives in the repository root, next to src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+BACKENDS = ('egl', 'osmesa')
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def select_platform(backend=None):
+    """
+    Make PyOpenGL load the given backend's platform and return its name.
+
+    Defaults to $PYOPENGL_PLATFORM when that names a backend, else EGL.
+    Raises RuntimeError when OpenGL has already been imported for another
+    platform.
+    """
+    current = os.environ.get('PYOPENGL_PLATFORM')
+    backend = backend or (current if current in BACKENDS else 'egl')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown offscreen backend {backend!r}; expected one of {BACKENDS}")
+    if 'OpenGL.platform' in sys.modules and current != backend:
+        raise RuntimeError(f"OpenGL was imported for the {current or 'default'} platform before the "
+                           f"{backend} backend was selected")
+    os.environ['PYOPENGL_PLATFORM'] = backend
+    return backend
+
+
+class EGLContext:
+    """A pbuffer-backed context on EGL's surfaceless platform (any EGL display when that is missing)."""
+
+    def __init__(self, width, height):
+        import ctypes
+        from OpenGL import EGL
+        from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+
+        self.egl = EGL
+        self.display = None
+        if bool(eglGetPlatformDisplayEXT):
+            self.display = eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None)
+        if not self.display:
+            self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("eglInitialize failed")
+
+        attributes = [EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                      EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                      EGL.EGL_DEPTH_SIZE, 24, EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE]
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        if not (EGL.eglChooseConfig(self.display, (EGL.EGLint * len(attributes))(*attributes),
+                                    ctypes.pointer(config), 1, ctypes.pointer(count)) and count.value):
+            raise RuntimeError("No EGL config with an 8-bit RGB pbuffer, 24-bit depth and desktop OpenGL")
+        size = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, (EGL.EGLint * len(size))(*size))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not (self.surface and self.context and
+                EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context)):
+            raise RuntimeError("Could not make an EGL pbuffer context current")
+
+    def destroy(self):
+        EGL = self.egl
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglTerminate(self.display)
+
+
+class OSMesaContext:
+    """A software-rendered context whose framebuffer is an array in host memory."""
+
+    def __init__(self, width, height):
+        from OpenGL import GL, arrays, osmesa
+
+        self.osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("OSMesaCreateContextExt failed")
+        self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("Could not make the OSMesa context current")
+
+    def destroy(self):
+        self.osmesa.OSMesaDestroyContext(self.context)
+
+
+CONTEXTS = {'egl': EGLContext, 'osmesa': OSMesaContext}
+
+
+class SimulatedClock:
+    """
+    The game's animation clock, following game time rather than the wall clock.
+
+    time() advances only when the frame loop says so, which makes pulsing
+    overlays the same on every run.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+
+class OffscreenGame:
+    """
+    The game rendered into an offscreen context of width x height pixels.
+
+    With adaptive=False the quality governor and dynamic resolution are held
+    at full quality and pulsing effects run on game time, so the same inputs
+    give the same pixels; pass adaptive=True to benchmark the adaptive paths.
+    """
+
+    def __init__(self, width=1200, height=800, backend=None, adaptive=False):
+        self.backend = select_platform(backend)
+        self.context = CONTEXTS[self.backend](width, height)
+        self.width = width
+        self.height = height
+        self.frames = 0
+
+        from OpenGL.GL import GL_PACK_ALIGNMENT, glPixelStorei
+        from glyphs import FontTableBitmaps
+        from shapes import ArrayShapes
+        import red_light_green_light as game
+        self.game = game
+        self.sim = game.sim
+        self.clock = None
+        game.STRICT_GL_ERRORS = True
+        if not adaptive:
+            game.PERFORMANCE_MODE = False
+            game.DYNAMIC_RESOLUTION = False
+            self.clock = SimulatedClock()
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        game.WINDOW_WIDTH, game.WINDOW_HEIGHT = width, height
+        game.init_game(clock=self.clock, shapes=ArrayShapes(), bitmaps=FontTableBitmaps(),
+                       swap_buffers=self._present, post_redisplay=self._present)
+        game.reshape(width, height)
+
+    def _present(self):
+        """Nothing to swap or schedule: frames are read straight from the context."""
+
+    def frame(self, dt=None, controller=None, read=True):
+        """
+        Advance the game by dt seconds (one frame at TARGET_FPS by default),
+        render it and return the image as a (height, width, 3) uint8 array.
+
+        controller, if given, is called first to set the inputs, like
+        simulation.autopilot. With read=False nothing is read back and None
+        is returned, for benchmarks and for recording through capture.py.
+        """
+        dt = 1.0 / self.game.TARGET_FPS if dt is None else dt
+        if controller is not None:
+            controller()
+        if self.clock is not None:
+            self.clock.now += dt
+            self.game.fps = round(1.0 / dt)
+        self.game.advance(dt)
+        return self.render(read)
+
+    def render(self, read=True):
+        """Draw the current game state with display() and return the image."""
+        self.game.display()
+        self.frames += 1
+        return self.read_pixels() if read else None
+
+    def read_pixels(self):
+        """The framebuffer as a top-down (height, width, 3) uint8 array."""
+        from OpenGL.GL import GL_RGB, GL_UNSIGNED_BYTE, glReadPixels
+        pixels = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        return np.frombuffer(pixels, np.uint8).reshape(self.height, self.width, 3)[::-1].copy()
+
+    def close(self):
+        self.game.stop_recording()
+        self.context.destroy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render Red Light, Green Light frames without a window.")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="offscreen context to create")
+    parser.add_argument("--size", default="1200x800", help="frame size as WIDTHxHEIGHT")
+    parser.add_argument("--frames", type=int, default=300, help="frames to render")
+    parser.add_argument("--adaptive", action="store_true", help="let quality and resolution adapt")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="save every frame: a directory for png, a file for raw or ffmpeg")
+    parser.add_argument("--record-format", choices=("png", "raw", "ffmpeg"), default="png",
+                        help="how --record stores the frames")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    with OffscreenGame(width, height, args.backend, args.adaptive) as offscreen:
+        sim = offscreen.sim
+        if args.seed is not None:
+            import random
+            random.seed(args.seed)
+            sim.enemies.seed(args.seed)
+            sim.sparks.seed(args.seed)
+            sim.debris.seed(args.seed)
+        sim.VERBOSE = False
+        sim.start_game()
+        if args.record:
+            offscreen.game.start_recording(args.record_format, args.record)
+        start_time = time.perf_counter()
+        for _ in range(args.frames):
+            offscreen.frame(controller=sim.autopilot, read=False)
+        offscreen.game.stop_recording()
+        elapsed = time.perf_counter() - start_time
+    print(f"Backend: {offscreen.backend}  Size: {width}x{height}  Frames: {args.frames}")
+    print(f"Elapsed: {elapsed:.2f}s  ({elapsed / args.frames * 1000:.1f} ms/frame, "
+          f"{args.frames / elapsed:.1f} FPS)")
@@ -0,0 +1,134 @@
+"""
+Fixed-capacity particle emitters.
+
+Each emitter keeps its particles in preallocated NumPy arrays laid out the
+way glVertexPointer and glColorPointer read them, with the live particles
+packed at the front, so the renderer draws an emitter with a single
+glDrawArrays over the first `count` entries. Spawning writes straight into
+the free tail; a tick applies drag, gravity, motion and fade to every
+particle in a few in-place array operations; and dead particles are squeezed
+out through scratch arrays allocated with the emitter. Nothing is allocated
+per frame, and an emitter that is full drops new particles rather than grow.
+"""
+import numpy as np
+
+
+class ParticleEmitter:
+    """
+    Up to capacity particles of one kind.
+
+    gravity pulls down the Z axis in units per second squared; drag is the
+    fraction of velocity lost per second. Particles are held above the
+    ground plane and fade out over their lifetime.
+    """
+
+    def __init__(self, capacity, gravity=0.0, drag=0.0, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.drag = drag
+        self.count = 0
+        self.dropped = 0   # Particles not spawned because the emitter was full
+        self.position = np.zeros((capacity, 3), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 3), dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.inverse_lifetime = np.zeros(capacity, dtype=np.float32)   # 1 / lifetime at spawn, for the fade
+        self._rng = np.random.default_rng(seed)
+        self._vectors = np.zeros((capacity, 3), dtype=np.float32)     # Scratch for the arrays above
+        self._scalars = np.zeros(capacity, dtype=np.float32)
+        self._colors = np.zeros((capacity, 4), dtype=np.uint8)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    def emit(self, position, count, speed, lifetime, color, drift=(0.0, 0.0, 0.0), spread=0.0):
+        """
+        Release count particles at position flying in random directions.
+
+        Each velocity component is drawn from [-speed, speed], then drift is
+        added to every particle's velocity; spread scatters the start points over a cube of that half
+        size. lifetime is a (shortest, longest) pair of seconds and color an
+        RGB triple in 0..1. Returns how many particles were released.
+        """
+        start = self.count
+        released = max(0, min(count, self.capacity - start))
+        self.dropped += count - released
+        if released == 0:
+            return 0
+        count = released
+        end = start + count
+        vectors = self.position[start:end]
+        if spread:
+            self._rng.random(dtype=np.float32, out=vectors)
+            vectors -= 0.5
+            vectors *= 2.0 * spread
+            vectors += position
+        else:
+            vectors[:] = position
+
+        velocity = self.velocity[start:end]
+        self._rng.random(dtype=np.float32, out=velocity)
+        velocity -= 0.5
+        velocity *= 2.0 * speed
+        velocity += drift
+
+        life = self.life[start:end]
+        shortest, longest = lifetime
+        self._rng.random(dtype=np.float32, out=life)
+        life *= longest - shortest
+        life += shortest
+        np.reciprocal(life, out=self.inverse_lifetime[start:end])
+
+        self.color[start:end, 0] = color[0] * 255
+        self.color[start:end, 1] = color[1] * 255
+        self.color[start:end, 2] = color[2] * 255
+        self.color[start:end, 3] = 255
+        self.count = end
+        return count
+
+    def update(self, delta_time):
+        """Advance every live particle by delta_time and retire the expired ones."""
+        n = self.count
+        if n == 0:
+            return
+        velocity = self.velocity[:n]
+        position = self.position[:n]
+        if self.drag:
+            velocity *= max(0.0, 1.0 - self.drag * delta_time)
+        if self.gravity:
+            velocity[:, 2] -= self.gravity * delta_time
+        step = self._vectors[:n]
+        np.multiply(velocity, delta_time, out=step)
+        position += step
+        np.maximum(position[:, 2], 0.0, out=position[:, 2])
+
+        life = self.life[:n]
+        life -= delta_time
+        fade = self._scalars[:n]
+        np.multiply(life, self.inverse_lifetime[:n], out=fade)
+        np.clip(fade, 0.0, 1.0, out=fade)
+        fade *= 255.0
+        self.color[:n, 3] = fade
+
+        alive = self._alive[:n]
+        np.greater(life, 0.0, out=alive)
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            self._compact(alive, kept)
+
+    def _compact(self, alive, kept):
+        n = self.count
+        for array, scratch in ((self.position, self._vectors), (self.velocity, self._vectors),
+                               (self.color, self._colors), (self.life, self._scalars),
+                               (self.inverse_lifetime, self._scalars)):
+            np.compress(alive, array[:n], axis=0, out=scratch[:kept])
+            array[:kept] = scratch[:kept]
+        self.count = kept
+
+    def seed(self, seed):
+        """Reseed the generator used for spawn positions, velocities and lifetimes."""
+        self._rng = np.random.default_rng(seed)
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
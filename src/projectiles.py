@@ -0,0 +1,111 @@
+"""
+Fixed-capacity projectile pools.
+
+Bullets live in preallocated NumPy arrays instead of per-shot dicts. Slots are
+handed out from a free list and returned to it on expiry, so firing and
+removing projectiles never allocates, and moving or expiring every bullet is
+one array operation. When the pool is full the oldest live projectile is
+recycled, ring-buffer style, rather than growing the arrays.
+"""
+import math
+
+import numpy as np
+
+
+class ProjectilePool:
+    """Parallel arrays for up to capacity live projectiles plus a free-slot stack."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 3))
+        self.prev_position = np.zeros((capacity, 3))   # Start of the current tick: render lerp and swept hits
+        self.velocity = np.zeros((capacity, 2))
+        self.direction = np.zeros(capacity)             # Heading in degrees, for drawing trails
+        self.lifetime = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.color = np.ones((capacity, 3))
+        self.spawn_order = np.full(capacity, np.iinfo(np.int64).max)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._spawned = 0
+        self._reset_free_list()
+
+    def _reset_free_list(self):
+        # Stack of free slots with the lowest index on top, so live projectiles
+        # stay packed below the high-water mark and per-tick work skips the rest
+        self._free = np.arange(self.capacity - 1, -1, -1)
+        self._free_count = self.capacity
+        self._high = 0
+
+    def spawn(self, position, direction, speed, lifetime, size, color=(1.0, 1.0, 1.0)):
+        """Launch a projectile from position heading direction degrees; returns its slot."""
+        if self._free_count:
+            self._free_count -= 1
+            slot = self._free[self._free_count]
+            self._high = max(self._high, slot + 1)
+        else:
+            # Pool exhausted - overwrite the oldest live projectile
+            slot = int(np.argmin(self.spawn_order))
+
+        angle_rad = math.radians(direction)
+        self.position[slot] = position
+        self.prev_position[slot] = position
+        self.velocity[slot, 0] = speed * math.cos(angle_rad)
+        self.velocity[slot, 1] = speed * math.sin(angle_rad)
+        self.direction[slot] = direction
+        self.lifetime[slot] = lifetime
+        self.size[slot] = size
+        self.color[slot] = color
+        self.spawn_order[slot] = self._spawned
+        self.active[slot] = True
+        self._spawned += 1
+        return slot
+
+    def integrate(self, delta_time, half_width, half_length):
+        """Move every live projectile, then retire those expired or outside the bounds."""
+        if self._free_count == self.capacity:
+            return
+        n = self._high
+        position = self.position[:n]
+        position[:, :2] += self.velocity[:n] * delta_time
+        lifetime = self.lifetime[:n]
+        lifetime -= delta_time
+
+        expired = self.active[:n] & ((lifetime <= 0)
+                                     | (np.abs(position[:, 0]) > half_width)
+                                     | (np.abs(position[:, 1]) > half_length))
+        if expired.any():
+            self.release(np.flatnonzero(expired))
+
+    def save_previous(self):
+        """Snapshot positions at the start of a tick for interpolation and swept tests."""
+        n = self._high
+        self.prev_position[:n] = self.position[:n]
+
+    def release(self, slots):
+        """Return slots (an index array, repeats allowed) to the free list."""
+        # A slot listed twice must only be freed once, or two spawns would share it
+        slots = np.unique(np.asarray(slots, dtype=np.intp))
+        slots = slots[self.active[slots]]
+        count = len(slots)
+        if count == 0:
+            return
+        self.active[slots] = False
+        self.velocity[slots] = 0.0
+        self.spawn_order[slots] = np.iinfo(np.int64).max
+        self._free[self._free_count:self._free_count + count] = slots
+        self._free_count += count
+
+    def clear(self):
+        """Retire every projectile."""
+        self.active[:] = False
+        self.velocity[:] = 0.0
+        self.spawn_order[:] = np.iinfo(np.int64).max
+        self._reset_free_list()
+
+    def live_slots(self):
+        """Indices of live projectiles in firing order."""
+        slots = np.flatnonzero(self.active[:self._high])
+        return slots[np.argsort(self.spawn_order[slots], kind='stable')]
+
+    def __len__(self):
+        return self.capacity - self._free_count
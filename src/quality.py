@@ -0,0 +1,96 @@
+"""
+Adaptive quality tiers for holding a target frame rate.
+
+The game runs on anything from desktop GPUs to thin clients rendering in
+software, so instead of hand-tuned constants the renderer reads its cost
+knobs from the current entry of QUALITY_TIERS, and a QualityGovernor moves
+between entries by watching recent frame times: one tier down when frames
+run over budget, one tier up when there has been headroom for a while.
+"""
+from collections import deque
+
+# Highest quality first. Knobs:
+#   forest_density         fraction of each forest chunk's plants drawn, nearest the field first
+#   lod_scale              multiplier on the forest LOD distances (coarse cones and impostors sooner)
+#   sphere_detail          multiplier on the slices/stacks of spheres drawn every frame
+#   fog_scale              multiplier on fog density; the culling cutoff shrinks with it
+#   hud_interval           minimum seconds between rebuilds of a changing HUD widget
+#   enemy_detail_distance  enemies farther than this from the camera use the low-detail model
+QUALITY_TIERS = (
+    {'name': 'high', 'forest_density': 1.0, 'lod_scale': 1.0, 'sphere_detail': 1.0,
+     'fog_scale': 1.0, 'hud_interval': 0.0, 'enemy_detail_distance': float('inf')},
+    {'name': 'medium', 'forest_density': 0.8, 'lod_scale': 0.7, 'sphere_detail': 0.75,
+     'fog_scale': 1.15, 'hud_interval': 1.0 / 20, 'enemy_detail_distance': 3000.0},
+    {'name': 'low', 'forest_density': 0.55, 'lod_scale': 0.45, 'sphere_detail': 0.5,
+     'fog_scale': 1.4, 'hud_interval': 1.0 / 10, 'enemy_detail_distance': 1500.0},
+    {'name': 'minimum', 'forest_density': 0.3, 'lod_scale': 0.25, 'sphere_detail': 0.4,
+     'fog_scale': 1.8, 'hud_interval': 1.0 / 5, 'enemy_detail_distance': 0.0},
+)
+
+
+class QualityGovernor:
+    """
+    Picks a quality tier from a rolling window of frame times.
+
+    record() takes the interval between frames, which is what the player
+    sees, and optionally the time spent rendering. Going down a tier is
+    decided on the interval; going up is decided on the render time when
+    given, since a vsync-locked interval never shows headroom. The window
+    restarts after every change so a tier is judged by frames drawn with it,
+    and each time a tier proves too slow, the headroom needed to return to
+    it must last one window longer.
+    """
+
+    def __init__(self, target_fps, tiers=QUALITY_TIERS, window=45, headroom=0.7, slack=1.1):
+        self.tiers = tiers
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.headroom = headroom      # Render time below budget * headroom counts as spare
+        self.slack = slack            # Intervals above budget * slack count as too slow
+        self.tier = 0
+        self.changes = 0
+        self._intervals = deque(maxlen=window)
+        self._render_times = deque(maxlen=window)
+        self._spare_frames = 0
+        self._failures = [0] * len(tiers)   # Times each tier had to be left for being too slow
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    @property
+    def name(self):
+        return self.tiers[self.tier]['name']
+
+    @property
+    def average_frame_time(self):
+        return sum(self._intervals) / len(self._intervals) if self._intervals else 0.0
+
+    def record(self, frame_time, render_time=None):
+        """Add one frame's timings in seconds; returns True when the tier changed."""
+        self._intervals.append(frame_time)
+        self._render_times.append(frame_time if render_time is None else render_time)
+        if len(self._intervals) < self.window:
+            return False
+
+        if self.average_frame_time > self.budget * self.slack:
+            if self.tier + 1 < len(self.tiers):
+                self._failures[self.tier] += 1
+                return self._switch(self.tier + 1)
+            return False
+
+        if self.tier > 0 and sum(self._render_times) / self.window < self.budget * self.headroom:
+            self._spare_frames += 1
+            if self._spare_frames >= self.window * (1 + self._failures[self.tier - 1]):
+                return self._switch(self.tier - 1)
+        else:
+            self._spare_frames = 0
+        return False
+
+    def _switch(self, tier):
+        self.tier = tier
+        self.changes += 1
+        self._intervals.clear()
+        self._render_times.clear()
+        self._spare_frames = 0
+        return True
@@ -1,10 +1,64 @@
-from OpenGL.GL import *
+import os
+
+import OpenGL
+# Collect GL errors once per frame (see finish_frame) instead of calling glGetError after
+# every GL call; run with PYOPENGL_ERROR_CHECKING=true to find the exact call while debugging.
+# This only takes effect if nothing has imported OpenGL's entry points yet
+if 'PYOPENGL_ERROR_CHECKING' not in os.environ:
+    OpenGL.ERROR_CHECKING = 'deferred'
+from OpenGL.GL import (GL_AMBIENT, GL_AMBIENT_AND_DIFFUSE, GL_BLEND, GL_CLAMP_TO_EDGE,
+                       GL_COLOR_ARRAY, GL_COLOR_BUFFER_BIT, GL_COLOR_MATERIAL, GL_COMPILE,
+                       GL_COORD_REPLACE, GL_DEPTH_BUFFER_BIT, GL_DEPTH_TEST, GL_DIFFUSE,
+                       GL_EXP2, GL_FLOAT, GL_FOG, GL_FOG_COLOR,
+                       GL_FOG_DENSITY, GL_FOG_HINT, GL_FOG_MODE, GL_FRONT_AND_BACK, GL_LEQUAL,
+                       GL_LIGHT0, GL_LIGHTING, GL_LIGHT_MODEL_AMBIENT, GL_LIGHT_MODEL_LOCAL_VIEWER,
+                       GL_LINEAR, GL_LINE_LOOP, GL_MODELVIEW, GL_MODELVIEW_MATRIX, GL_MODULATE,
+                       GL_NICEST, GL_NORMALIZE, GL_ONE, GL_ONE_MINUS_SRC_ALPHA, GL_POINTS,
+                       GL_POINT_BIT, GL_POINT_DISTANCE_ATTENUATION, GL_POINT_SPRITE,
+                       GL_POLYGON_OFFSET_FILL, GL_POSITION, GL_PROJECTION, GL_PROJECTION_MATRIX,
+                       GL_QUADS, GL_RGBA, GL_RGBA8, GL_SMOOTH, GL_SPECULAR, GL_SRC_ALPHA,
+                       GL_TEXTURE_2D, GL_TEXTURE_BIT, GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE,
+                       GL_TEXTURE_MAG_FILTER, GL_TEXTURE_MIN_FILTER, GL_TEXTURE_WRAP_S,
+                       GL_TEXTURE_WRAP_T, GL_TRIANGLES, GL_TRIANGLE_FAN, GL_TRIANGLE_STRIP, GL_TRUE,
+                       GL_UNSIGNED_BYTE, GL_VERTEX_ARRAY, glBindTexture, glClear,
+                       glClearColor, glColor3fv, glColorMaterial, glColorPointer, glDepthFunc,
+                       glDisableClientState, glDrawArrays,
+                       glEnableClientState, glFogf, glFogfv, glFogi, glGenLists, glGenTextures,
+                       glGetFloatv, glHint, glLightModelfv, glLightModeli, glLightfv, glLineWidth,
+                       glPointParameterfv, glPointSize, glPolygonOffset, glPopAttrib, glPushAttrib,
+                       glShadeModel, glTexEnvi, glTexImage2D, glTexParameteri, glVertexPointer)
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
+# The immediate-mode and matrix calls made for every model skip PyOpenGL's per-call checks
+from OpenGL.GL.fast import (glBegin, glColor3f, glColor4f, glEnd, glLoadIdentity, glMatrixMode,
+                            glPopMatrix, glPushMatrix, glRotatef, glScalef, glTranslatef,
+                            glVertex2f, glVertex3f)
+from OpenGL.error import DeferredGLError, checkpoint
+from OpenGL.arrays.vbo import StreamingVBO
 import math
 import random
 import sys
 import time
+from functools import partial
+
+import numpy as np
+
+import simulation as sim
+from enemies import ENEMY_COLORS, ENEMY_TYPE_NAMES
+from arraycache import cache_key, default_directory, load_arrays, save_arrays
+from forest import IMPOSTOR_VARIANTS, LOD_DISTANCES, MESH_DETAIL, ForestRenderer
+from glyphs import GlyphAtlas, TextBatch
+from glstate import GLStateCache
+from hud import RetainedHud
+from quality import QualityGovernor
+from resolution import DynamicResolution
+from shapes import GLUTShapes
+from capture import FrameRecorder, open_sink
+from scatter import disk_radius, poisson_disk
+from culling import frustum_planes, visible_boxes, fog_cutoff_distance
+from simulation import (PLAY_AREA_WIDTH, PLAY_AREA_LENGTH, FINISH_ZONE_LENGTH,
+                        ENEMY_WIDTH, ENEMY_HEIGHT, player_width, player_height,
+                        player_base_speed, player_max_stamina)
 
 # --- Configuration ---
 WINDOW_WIDTH = 1200
@@ -15,34 +69,16 @@ FAR_CLIP = 150000
 # Game settings
 GAME_VERSION = "4.0"
 GAME_TITLE = "Squid Game: Red Light Green Light"
-GAME_STATE = "start"  # Start with start screen
-STATE_TIMER = 0
-STATE_CHANGE_INTERVAL_MIN = 3.0  # Initial timing values, will be adjusted based on game progression
-STATE_CHANGE_INTERVAL_MAX = 7.0  # Initial timing values, will be adjusted based on game progression
-NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
-DOLL_ROTATION_SPEED = 180.0  # Degrees per second
-DOLL_TARGET_ROTATION = 0  # 0 = facing player (red light), 180 = facing away (green light)
-DOLL_CURRENT_ROTATION = 180  # Start facing away
-
-# Game phases for dynamic difficulty
-GAME_PHASE = 1
-GAME_START_TIME = 0
-CURRENT_GAME_TIME = 0
-PHASE_DURATION = 30.0  # Time in seconds before increasing difficulty
 
 # Performance settings
 ENABLE_VSYNC = True
-USE_FRAME_LIMITING = True
 TARGET_FPS = 60
-MAX_VISIBLE_TREES = 1500
-PLAYER_SMOOTHING = 12.0
-CAMERA_SMOOTHING = 15.0
-PERFORMANCE_MODE = False
-
-# --- Playable Area Definition ---
-PLAY_AREA_WIDTH = 4000
-PLAY_AREA_LENGTH = 15000
-FINISH_ZONE_LENGTH = 1000
+PERFORMANCE_MODE = True  # Step quality tiers up and down to hold TARGET_FPS
+DYNAMIC_RESOLUTION = True  # Render the 3D scene below window resolution when it runs over budget
+MIN_RENDER_SCALE = 0.5
+RECORD_FORMAT = 'png'  # C key recording: 'png' sequence, 'raw' RGB24 file or 'ffmpeg' video
+RECORD_DIRECTORY = 'captures'
+STRICT_GL_ERRORS = False  # Raise GL errors found at frame end instead of printing them (offscreen harness)
 
 # Forest Generation
 FOREST_BUFFER = 10000
@@ -50,129 +86,39 @@ TOTAL_AREA_WIDTH = PLAY_AREA_WIDTH + FOREST_BUFFER * 2
 TOTAL_AREA_LENGTH = PLAY_AREA_LENGTH + FINISH_ZONE_LENGTH + FOREST_BUFFER * 2
 FOREST_DENSITY = 6000
 MIN_TREE_DISTANCE = 55
+FOREST_SEED = 12345
+FOREST_CHUNK_SIZE = 2500.0  # Side of a square forest chunk culled as a unit
+ENVIRONMENT_CACHE = True  # Keep the generated forest in a memory-mapped file between launches
+ENVIRONMENT_CACHE_DIRECTORY = default_directory('red-light-green-light')
+ENVIRONMENT_VERSION = 1  # Bump when plant generation or forest baking changes
+
+# Field layout
+FIELD_CHECKER_COLS = 20   # Increase for more squares
+FIELD_CHECKER_ROWS = 60   # Increase for more squares
+FIELD_CHUNK_ROWS = 10     # Checker rows per field display list
 
 # Visual Settings
 sky_color_top = (0.65, 0.85, 1.0)
 sky_color_horizon = (0.95, 0.95, 1.0)
 FOG_COLOR = (0.90, 0.88, 0.82)
 FOG_DENSITY = 0.000065
+FOG_CUTOFF_DISTANCE = fog_cutoff_distance(FOG_DENSITY)  # Scenery past this is fully fogged
 
 fovY = 70
 
-# Player attributes
-player_start_pos = [0, -PLAY_AREA_LENGTH/2 + 50, 15]  # Start slightly inside arena
-player_position = list(player_start_pos)
-target_player_position = list(player_start_pos)
-player_velocity = [0.0, 0.0, 0.0]  # Added for friction movement
-player_friction = 0.92  # Reduced friction for snappier movement
-player_direction = 90.0
-target_player_direction = 90.0
-player_move_speed = 1800.0 # Faster for better gameplay
-player_base_speed = 1800.0  # Base speed for reference
-player_height = 30
-player_width = 15
-player_is_moving = False
-player_was_caught = False
-player_reached_finish = False
-player_speed_boost_active = False
-player_speed_boost_timer = 0.0
-player_speed_boost_duration = 5.0  # 5 seconds of speed boost
-
-# Stamina System
-player_stamina = 100.0
-player_max_stamina = 100.0
-player_stamina_regen = 30.0  # Per second (fast regen)
-player_stamina_drain = 15.0  # Per second (slow drain for longer sprints)
-player_is_sprinting = False
-sprint_key_held = False  # Track Shift key state
-sprint_multiplier = 2.2  # Good sprint boost
-
-# Sprint Exhaustion & Cooldown
-sprint_exhausted = False        # True when stamina fully drained
-sprint_cooldown_timer = 0.0     # Counts down during exhaustion
-SPRINT_COOLDOWN_DURATION = 4.0  # 4 seconds before sprint available again
-SPRINT_EXHAUSTED_SPEED_MULT = 0.55  # 55% of normal speed when exhausted (big penalty)
-
-# Jump System
-player_z_velocity = 0.0
-player_is_jumping = False
-player_on_ground = True
-JUMP_FORCE = 450.0
-GRAVITY = 900.0
-player_ground_z = 15.0  # Normal ground level
-
-# Shield System
-player_shield_active = False
-player_shield_timer = 0.0
-SHIELD_DURATION = 6.0  # 6 seconds of shield
-
-# Enemy Bullets
-enemy_bullets = []
-ENEMY_BULLET_SPEED = 350.0  # Slow bullets player must dodge
-ENEMY_BULLET_SIZE = 10.0
-ENEMY_SHOOT_INTERVAL_MIN = 3.0
-ENEMY_SHOOT_INTERVAL_MAX = 8.0
-
-# Level / Arena Scaling
-CURRENT_LEVEL = 1
-LEVEL_ARENA_WIDTH_MULT = 1.0   # Scales arena width per level
-LEVEL_ARENA_LENGTH_MULT = 1.0  # Scales arena length per level
-
-# High Score System
-high_scores = []  # List of (name, score) tuples
-player_name_input = ""  # For name entry
-name_entry_active = False  # True when entering name after win
-MAX_HIGH_SCORES = 10
-
-
-# Enemy attributes
-enemies = []
-NUM_RED_ENEMIES = 6  # Reduced from 8
-NUM_BLUE_ENEMIES = 4  # Reduced from 5
-NUM_BLACK_ENEMIES = 2  # Unchanged
-ENEMY_MOVE_SPEED_RED = 500.0       # Increased from 350.0
-ENEMY_MOVE_SPEED_BLUE = 350.0      # Increased from 250.0 
-ENEMY_MOVE_SPEED_BLACK = 200.0     # Increased from 150.0
-ENEMY_HEIGHT = 60                  # Increased from 45
-ENEMY_WIDTH = 40                   # Increased from 28
-ENEMY_DETECTION_RADIUS = 30.0  # For movement detection during red light
-
-# Weapon attributes
-BULLET_SPEED = 1200.0  # Reduced from 2500.0 for better collision detection
-bullets = []
-bullet_cooldown = 0
-BULLET_COOLDOWN_TIME = 0.4  # Slightly faster firing rate
-BULLET_SIZE = 8.0  # Added defined bullet size for clarity
-
-# Power-ups
-powerups = []
-NUM_POWERUPS = 5  # More powerups for variety
-POWERUP_SPAWN_INTERVAL = 15.0  # Faster spawning
-powerup_spawn_timer = 0.0
-POWERUP_TYPES = ['speed', 'shield']  # Available powerup types
-
-# --- Camera Attributes ---
-camera_height = 45
-camera_distance_min = 40.0
-camera_distance_max = 1200.0
-camera_distance = 250.0
-camera_pitch_min = -85.0
-camera_pitch_max = 70.0
-camera_pitch = -10.0
-target_camera_pitch = camera_pitch
-camera_yaw = 0.0
-target_camera_yaw = camera_yaw
-camera_rotation_speed = 120.0
-
-# Screen Shake
-camera_shake_x = 0.0
-camera_shake_y = 0.0
-shake_intensity = 0.0
-shake_timer = 0.0
-
-# Particle System - DISABLED FOR STABILITY
-particles = []  # Not used
-particle_system_enabled = False
+# Bitmap fonts rasterized into the HUD glyph atlas
+HUD_FONTS = (GLUT_BITMAP_HELVETICA_12, GLUT_BITMAP_HELVETICA_18, GLUT_BITMAP_TIMES_ROMAN_24, GLUT_BITMAP_9_BY_15)
+
+
+# Particles: point sprites sized in world units, sparks blended additively
+PARTICLE_STYLES = ((sim.sparks, 6.0, True), (sim.debris, 9.0, False))  # (emitter, diameter, additive)
+PARTICLE_SPRITE_SIZE = 32
+particle_sprite = None  # Radial falloff texture for the point sprites
+
+# Per-frame vertex data (particles, HUD text quads) is appended to a ring of buffer segments
+STREAM_SEGMENT_BYTES = (sim.SPARK_CAPACITY + sim.DEBRIS_CAPACITY) * 16 + 256 * 1024  # Full emitters plus HUD
+STREAM_SEGMENTS = 3
+vertex_stream = None
 
 
 
@@ -191,17 +137,31 @@ DOLL_POSITION = [0, PLAY_AREA_LENGTH / 2, 0]  # Base exactly at finish line star
 # Static environment elements
 fixed_plants = []
 plant_positions = set()
-environment_display_list = None
-
+plant_table = None         # Generated plant attributes, one array per column
+environment_cache = None   # Arrays mapped from the environment cache file when it matched
+environment_display_lists = []  # One display list per field chunk
+environment_chunk_min = None     # Bounding box corners of each field chunk
+environment_chunk_max = None
+forest_renderer = None
+model_display_lists = {}         # Compiled character models, keyed like CHARACTER_MODELS
+glyph_atlas = GlyphAtlas(HUD_FONTS)
+# What the renderer draws and presents with; init_game takes replacements for windowless use
+animation_clock = time             # Its time() drives pulsing and bobbing effects
+solid_shapes = GLUTShapes()        # Cubes and spheres the models are built from
+present_frame = glutSwapBuffers
+request_redisplay = glutPostRedisplay
+gl_state = GLStateCache()  # All enable/disable/blend calls go through this
+hud_text = TextBatch(glyph_atlas, gl_state)  # Screen text queued until the next flush
+quality_governor = QualityGovernor(TARGET_FPS)
+fog_cutoff = FOG_CUTOFF_DISTANCE  # Culling distance for the current quality tier's fog
+# The scene gets three quarters of the frame; the HUD and the buffer swap have the rest
+scene_resolution = DynamicResolution(gl_state, 0.75 / TARGET_FPS, MIN_RENDER_SCALE)
+
+# View volume from the last setup_camera(), used to cull scenery chunks
+view_frustum = None
+camera_eye = None
+camera_right = None  # Camera's right axis in world space, for turning forest impostors
 
-# Input state tracking
-keys_pressed = set()
-last_positions = {}  # To track movement for red light detection
-
-# Scoring
-player_score = 0
-time_survived = 0.0
-enemies_killed = 0
 
 # Korean dialogue for Squid Game authenticity (using English text with Korean terms)
 DIALOGUE_RED_LIGHT = "RED LIGHT! (Mugunghwa Kkochi Pieosseumnida!)"
@@ -209,277 +169,245 @@ DIALOGUE_GREEN_LIGHT = "GREEN LIGHT! (Chorok Bul-iya!)"
 DIALOGUE_YELLOW_WARNING = "WARNING! RED LIGHT COMING! (Juuiha-seyo!)"
 
 # Timing / Debug
-print_debug = False
+game_clock = sim.FixedTimestep(sim.SIMULATION_HZ)
+render_alpha = 1.0  # Fraction of a tick between the previous and current simulation state
 last_update_time = 0
 fps_last_time = 0
 frame_count = 0
 fps = 0
+last_frame_start = 0.0
+frame_recorder = None  # FrameRecorder while recording
 
 # --- Utility & Setup Functions ---
 def draw_text(x, y, text, font=GLUT_BITMAP_HELVETICA_18, color=(0.0, 0.0, 0.0)):
-    """Renders text on screen at specified position with improved visibility."""
-    glColor3fv(color)
-    glWindowPos2f(x, y)
-    for char in text:
-        glutBitmapCharacter(font, ord(char))
+    """Queues text at a window position; it appears at the next hud_text.flush()."""
+    hud_text.add(x, y, text, font, color)
 
 def draw_centered_text(text, y_pos, font=GLUT_BITMAP_TIMES_ROMAN_24, color=(0.0, 0.0, 0.0)):
-    """Renders text centered on screen at specified y position with improved visibility."""
-    text_width = 0
-    for char in text:
-        text_width += glutBitmapWidth(font, ord(char))
+    """Queues text centered on screen at specified y position."""
+    text_width = glyph_atlas.text_width(text, font)
     x_pos = (WINDOW_WIDTH - text_width) // 2
     draw_text(x_pos, y_pos, text, font, color)
 
 def setup_fixed_environment():
-    """Generate the forest and environmental objects."""
-    global fixed_plants, plant_positions
+    """Scatter the forest around the arena, or map the layout saved by an earlier launch."""
+    global fixed_plants, plant_positions, plant_table, environment_cache
     
-    random.seed(12345)  # Use fixed seed for consistent layout
     plant_positions.clear()
     fixed_plants.clear()
-    
-    print(f"Generating environment (Target Density: {FOREST_DENSITY})...")
-    attempts, plant_count = 0, 0
-    
-    half_play_w = PLAY_AREA_WIDTH / 2
-    play_area_start_y = -PLAY_AREA_LENGTH / 2
-    play_area_end_y = PLAY_AREA_LENGTH / 2
-    finish_zone_end_y = play_area_end_y + FINISH_ZONE_LENGTH
-    
-    half_total_w = TOTAL_AREA_WIDTH / 2
-    half_total_l = TOTAL_AREA_LENGTH / 2
-    
-    grid_size = MIN_TREE_DISTANCE * 2
-    grid = {}
-    max_attempts = FOREST_DENSITY * 5
-    
-    print(f"Arena Bounds: X[-{half_play_w}, {half_play_w}], Y[{play_area_start_y}, {play_area_end_y}]")
-    print(f"Finish Zone: Y[{play_area_end_y}, {finish_zone_end_y}]")
-    
-    while plant_count < FOREST_DENSITY and attempts < max_attempts:
-        attempts += 1
-        
-        # Generate random position
-        x = random.uniform(-half_total_w, half_total_w)
-        y = random.uniform(-half_total_l, half_total_l)
-        
-        # Check if inside playable area (we don't want plants there)
-        is_inside_x = -half_play_w < x < half_play_w
-        is_inside_y = play_area_start_y < y < finish_zone_end_y
-        if is_inside_x and is_inside_y:
-            continue
-        
-        # Check for minimum distance using grid system
-        grid_x, grid_y = int((x + half_total_w) / grid_size), int((y + half_total_l) / grid_size)
-        too_close = False
-        
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                cell_key = (grid_x + dx, grid_y + dy)
-                if cell_key in grid:
-                    for px, py in grid[cell_key]:
-                        if (x - px)**2 + (y - py)**2 < MIN_TREE_DISTANCE**2:
-                            too_close = True
-                            break
-                    if too_close:
-                        break
-            if too_close:
-                break
-                
-        if too_close:
-            continue
-            
-        # Add to grid and plant list
-        cell_key = (grid_x, grid_y)
-        if cell_key not in grid:
-            grid[cell_key] = []
-        grid[cell_key].append((x, y))
-        
-        plant_positions.add((x, y))
-        plant_count += 1
-        
-        plant_data = {'x': x, 'y': y}
-        is_tree = random.random() < 0.90
-        
-        if is_tree:
-            tree_type = random.choice([0, 1])
-            height = random.uniform(180, 700)
-            z_rot = random.uniform(0, 360)
-            g = random.uniform(0.3, 0.55)
-            r = random.uniform(0.0, 0.1 * g)
-            b = random.uniform(0.0, 0.15 * g)
-            
-            plant_data.update({
-                'plant': 'tree',
-                'type': tree_type,
-                'height': height,
-                'color': (r, g, b),
-                'z_rot': z_rot
-            })
-            
-            if tree_type == 1:
-                foliage_radius = height / 4.0
-                num_clumps = 4
-                clump_details = []
-                
-                for i in range(num_clumps):
-                    ox = random.uniform(-foliage_radius * 0.5, foliage_radius * 0.5) * (1.0 - i / num_clumps)
-                    oy = random.uniform(-foliage_radius * 0.5, foliage_radius * 0.5) * (1.0 - i / num_clumps)
-                    oz = random.uniform(foliage_radius * 0.1, foliage_radius * 0.6) + i * (foliage_radius * 0.1)
-                    csize = foliage_radius * random.uniform(0.5, 0.8) * (1.0 - i / (num_clumps * 1.5))
-                    clump_details.append({'ox': ox, 'oy': oy, 'oz': oz, 'size': csize})
-                
-                plant_data['clump_details'] = clump_details
+    environment_cache = load_arrays(environment_cache_path(), environment_cache_key()) if ENVIRONMENT_CACHE else None
+    if environment_cache is not None:
+        plant_table = {name[len('plants/'):]: array for name, array in environment_cache.items()
+                       if name.startswith('plants/')}
+        print(f"Loaded {len(plant_table['position'])} background plants from the environment cache.")
+    else:
+        plant_table = generate_plant_table()
+        print(f"Generated {len(plant_table['position'])} background plants (spacing {plant_table['spacing']:.0f}).")
+    
+    detail_keys = ('ox', 'oy', 'oz', 'size')
+    clump_rows = iter(plant_table['clumps'].tolist())
+    sphere_rows = iter(plant_table['spheres'].tolist())
+    columns = zip(*(plant_table[name].tolist() for name in
+                    ('position', 'is_tree', 'tree_type', 'height', 'z_rot', 'size', 'color')))
+    for (x, y), tree, kind, tree_height, angle, bush, color in columns:
+        if tree:
+            plant_data = {'x': x, 'y': y, 'plant': 'tree', 'type': kind, 'height': tree_height,
+                          'color': tuple(color), 'z_rot': angle}
+            if kind == 1:
+                plant_data['clump_details'] = [dict(zip(detail_keys, row)) for row in next(clump_rows)]
         else:
-            size = random.uniform(60, 120)
-            g = random.uniform(0.35, 0.65)
-            r = random.uniform(0.05, 0.15 * g)
-            b = random.uniform(0.1, 0.2 * g)
-            
-            plant_data.update({
-                'plant': 'bush',
-                'size': size,
-                'color': (r, g, b)
-            })
-            
-            num_spheres = 3
-            sphere_details = []
-            
-            for _ in range(num_spheres):
-                ox = random.uniform(-size * 0.3, size * 0.3)
-                oy = random.uniform(-size * 0.3, size * 0.3)
-                oz = random.uniform(-size * 0.1, size * 0.1)
-                ssize = size * random.uniform(0.45, 0.75)
-                sphere_details.append({'ox': ox, 'oy': oy, 'oz': oz, 'size': ssize})
-            
-            plant_data['sphere_details'] = sphere_details
-            
+            plant_data = {'x': x, 'y': y, 'plant': 'bush', 'size': bush, 'color': tuple(color),
+                          'sphere_details': [dict(zip(detail_keys, row)) for row in next(sphere_rows)]}
         fixed_plants.append(plant_data)
+        plant_positions.add((x, y))
+
+def generate_plant_table():
+    """
+    Place and shape every background plant; returns the attributes as a
+    dict of arrays, one entry per plant, plus the clumps of round-topped
+    trees and the spheres of bushes in plant order.
+    """
+    rng = np.random.default_rng(FOREST_SEED)  # Fixed seed for a consistent layout
     
-    print(f"Generated {plant_count} background plants.")
-    
+    half_total_w = TOTAL_AREA_WIDTH / 2
+    half_total_l = TOTAL_AREA_LENGTH / 2
+    bounds = (-half_total_w, -half_total_l, half_total_w, half_total_l)
+    # No plants on the field or in the finish zone
+    arena = (-PLAY_AREA_WIDTH / 2, -PLAY_AREA_LENGTH / 2,
+             PLAY_AREA_WIDTH / 2, PLAY_AREA_LENGTH / 2 + FINISH_ZONE_LENGTH)
+    forest_area = TOTAL_AREA_WIDTH * TOTAL_AREA_LENGTH - PLAY_AREA_WIDTH * (PLAY_AREA_LENGTH + FINISH_ZONE_LENGTH)
+    
+    # Space plants as widely as FOREST_DENSITY allows, then thin the set to exactly that many
+    spacing = max(MIN_TREE_DISTANCE, disk_radius(forest_area, FOREST_DENSITY))
+    positions = poisson_disk(bounds, spacing, rng, excluded=[arena])
+    if len(positions) > FOREST_DENSITY:
+        positions = positions[np.sort(rng.choice(len(positions), FOREST_DENSITY, replace=False))]
     # Sort by distance from center for rendering optimization
-    fixed_plants.sort(key=lambda p: p['x']**2 + p['y']**2)
-    
-    # Reset random seed
-    random.seed()
+    positions = positions[np.argsort(np.einsum('ij,ij->i', positions, positions), kind='stable')]
+    count = len(positions)
+    
+    def uniform(low, high, shape=(count,)):
+        return low + rng.random(shape) * (high - low)
+    
+    is_tree = rng.random(count) < 0.90
+    tree_type = rng.integers(0, 2, count)
+    height = uniform(180, 700)
+    z_rot = uniform(0, 360)
+    size = uniform(60, 120)
+    g = np.where(is_tree, uniform(0.3, 0.55), uniform(0.35, 0.65))
+    r = np.where(is_tree, uniform(0.0, 0.1 * g), uniform(0.05, 0.15 * g))
+    b = np.where(is_tree, uniform(0.0, 0.15 * g), uniform(0.1, 0.2 * g))
+    
+    # Four foliage clumps per round-topped tree, shrinking and rising toward the top
+    num_clumps = 4
+    step = np.arange(num_clumps)
+    foliage_radius = height[is_tree & (tree_type == 1)][:, None] / 4.0
+    shape = foliage_radius.shape[:1] + (num_clumps,)
+    clumps = np.stack((
+        uniform(-0.5, 0.5, shape) * foliage_radius * (1.0 - step / num_clumps),
+        uniform(-0.5, 0.5, shape) * foliage_radius * (1.0 - step / num_clumps),
+        uniform(0.1, 0.6, shape) * foliage_radius + step * foliage_radius * 0.1,
+        foliage_radius * uniform(0.5, 0.8, shape) * (1.0 - step / (num_clumps * 1.5)),
+    ), axis=-1)
+    
+    # Three spheres per bush
+    bush_size = size[~is_tree][:, None]
+    shape = bush_size.shape[:1] + (3,)
+    spheres = np.stack((
+        uniform(-0.3, 0.3, shape) * bush_size,
+        uniform(-0.3, 0.3, shape) * bush_size,
+        uniform(-0.1, 0.1, shape) * bush_size,
+        uniform(0.45, 0.75, shape) * bush_size,
+    ), axis=-1)
+    
+    return {'position': positions, 'is_tree': is_tree, 'tree_type': tree_type, 'height': height,
+            'z_rot': z_rot, 'size': size, 'color': np.stack((r, g, b), axis=1), 'clumps': clumps,
+            'spheres': spheres, 'spacing': np.float64(spacing)}
+
+def environment_cache_key():
+    """Everything the generated forest depends on."""
+    return cache_key(ENVIRONMENT_VERSION, FOREST_SEED, FOREST_DENSITY, MIN_TREE_DISTANCE, TOTAL_AREA_WIDTH,
+                     TOTAL_AREA_LENGTH, PLAY_AREA_WIDTH, PLAY_AREA_LENGTH, FINISH_ZONE_LENGTH,
+                     FOREST_CHUNK_SIZE, MESH_DETAIL, IMPOSTOR_VARIANTS)
+
+def environment_cache_path():
+    return os.path.join(ENVIRONMENT_CACHE_DIRECTORY, f"environment-{environment_cache_key()}.bin")
+
+def save_environment_cache():
+    """Write the plant table and the baked forest buffers for the next launch."""
+    arrays = {f"plants/{name}": array for name, array in plant_table.items()}
+    arrays.update((f"forest/{name}", array) for name, array in forest_renderer.to_arrays().items())
+    path = environment_cache_path()
+    try:
+        save_arrays(path, arrays, environment_cache_key())
+        # Only the current layout is worth keeping
+        for name in os.listdir(ENVIRONMENT_CACHE_DIRECTORY):
+            stale = os.path.join(ENVIRONMENT_CACHE_DIRECTORY, name)
+            if name.startswith("environment-") and name.endswith(".bin") and stale != path:
+                os.remove(stale)
+    except OSError as error:
+        print(f"Environment cache not saved: {error}")
 
 def create_environment_display_list():
-    """Compiles the static environment into a display list for performance."""
-    global environment_display_list
-    
-    print("Compiling environment display list...")
-    environment_display_list = glGenLists(1)
-    glNewList(environment_display_list, GL_COMPILE)
+    """Compiles the field into per-chunk display lists and uploads the forest vertex buffers."""
+    global environment_display_lists, environment_chunk_min, environment_chunk_max, forest_renderer
     
-    draw_field()
-    draw_fixed_plants()
-    
-    glEndList()
-    print("Environment display list compiled.")
-
-
-def setup_enemies():
-    """Create enemy characters at positions ahead of the player."""
-    global enemies
-    enemies.clear()
-    
-    half_play_w = PLAY_AREA_WIDTH / 2 - 50
-    
-    # Scale enemy count with level
-    num_red = NUM_RED_ENEMIES + (CURRENT_LEVEL - 1) * 2
-    num_blue = NUM_BLUE_ENEMIES + (CURRENT_LEVEL - 1)
-    num_black = NUM_BLACK_ENEMIES + max(0, (CURRENT_LEVEL - 2))
+    print("Compiling environment display lists...")
+    half_play_w = PLAY_AREA_WIDTH / 2
+    play_area_start_y = -PLAY_AREA_LENGTH / 2
+    tile_length = PLAY_AREA_LENGTH / FIELD_CHECKER_ROWS
+    
+    chunks = []
+    for first_row in range(0, FIELD_CHECKER_ROWS, FIELD_CHUNK_ROWS):
+        last_row = min(first_row + FIELD_CHUNK_ROWS, FIELD_CHECKER_ROWS)
+        box = ((-half_play_w, play_area_start_y + first_row * tile_length, 0.0),
+               (half_play_w, play_area_start_y + last_row * tile_length, 1.0))
+        chunks.append(((first_row, last_row, False), box))
+    
+    # Progress markers, finish zone and sign
+    markings_box = ((-half_play_w, play_area_start_y + PLAY_AREA_LENGTH * 0.2 - 10, 0.0),
+                    (half_play_w, PLAY_AREA_LENGTH / 2 + FINISH_ZONE_LENGTH + 100, 100.0))
+    chunks.append(((0, 0, True), markings_box))
+    
+    environment_display_lists = []
+    for (first_row, last_row, markings), _ in chunks:
+        display_list = glGenLists(1)
+        gl_state.new_list(display_list, GL_COMPILE)
+        draw_field(first_row, last_row, markings)
+        gl_state.end_list(display_list)
+        environment_display_lists.append(display_list)
+    environment_chunk_min = np.array([box[0] for _, box in chunks])
+    environment_chunk_max = np.array([box[1] for _, box in chunks])
+    print(f"Environment display lists compiled ({len(chunks)} field chunks).")
+    
+    if environment_cache is not None:
+        forest = {name[len('forest/'):]: array for name, array in environment_cache.items()
+                  if name.startswith('forest/')}
+        forest_renderer = ForestRenderer.from_arrays(forest, FOREST_CHUNK_SIZE)
+    else:
+        print("Building forest vertex buffers...")
+        # Every plant is uploaded; the quality tier's forest_density thins them at draw time
+        forest_renderer = ForestRenderer(fixed_plants, FOREST_CHUNK_SIZE)
+        if ENVIRONMENT_CACHE:
+            save_environment_cache()
+    forest_renderer.upload()
+    print(f"Forest uploaded: {forest_renderer.full_detail_triangles} full-detail triangles "
+          f"in {forest_renderer.chunk_count} chunks, impostors {'on' if forest_renderer.impostors_ready else 'off'}.")
+
+def create_model_display_lists():
+    """Compiles every character pose in CHARACTER_MODELS into its own display list."""
+    print("Compiling character models...")
+    for key, draw_model in CHARACTER_MODELS.items():
+        display_list = glGenLists(1)
+        gl_state.new_list(display_list, GL_COMPILE)
+        draw_model()
+        gl_state.end_list(display_list)
+        model_display_lists[key] = display_list
+    print(f"Character models compiled ({len(model_display_lists)} poses).")
+
+def draw_environment():
+    """Draw the field chunks and forest chunks that are inside the view."""
+    if environment_display_lists:
+        visible = visible_boxes(environment_chunk_min, environment_chunk_max,
+                                view_frustum, camera_eye, fog_cutoff)
+        for display_list, shown in zip(environment_display_lists, visible):
+            if shown:
+                gl_state.call_list(display_list)
+    else:
+        # Fallback if lists not created yet
+        draw_field()
     
-    # Red enemies - fastest, 1 hit
-    for _ in range(num_red):
-        x = random.uniform(-half_play_w, half_play_w)
-        y = random.uniform(0, PLAY_AREA_LENGTH / 2 - 500)
-        direction = random.uniform(0, 360)
-        
-        enemy = {
-            'position': [x, y, 0],
-            'direction': direction,
-            'speed': ENEMY_MOVE_SPEED_RED * random.uniform(0.9, 1.1) * (1.0 + CURRENT_LEVEL * 0.1),
-            'color': (0.95, 0.2, 0.2),
-            'type': 'red',
-            'health': 1,
-            'alive': True,
-            'last_position': [x, y, 0],
-            'shoot_timer': random.uniform(ENEMY_SHOOT_INTERVAL_MIN, ENEMY_SHOOT_INTERVAL_MAX),
-            'can_shoot': CURRENT_LEVEL >= 2  # Red enemies shoot from level 2
-        }
-        enemies.append(enemy)
-    
-    # Blue enemies - medium speed, 2 hits
-    for _ in range(num_blue):
-        x = random.uniform(-half_play_w, half_play_w)
-        y = random.uniform(0, PLAY_AREA_LENGTH / 2 - 500)
-        direction = random.uniform(0, 360)
-        
-        enemy = {
-            'position': [x, y, 0],
-            'direction': direction,
-            'speed': ENEMY_MOVE_SPEED_BLUE * random.uniform(0.9, 1.1) * (1.0 + CURRENT_LEVEL * 0.1),
-            'color': (0.2, 0.3, 0.9),
-            'type': 'blue',
-            'health': 2,
-            'alive': True,
-            'last_position': [x, y, 0],
-            'shoot_timer': random.uniform(ENEMY_SHOOT_INTERVAL_MIN, ENEMY_SHOOT_INTERVAL_MAX),
-            'can_shoot': True  # Blue enemies always shoot
-        }
-        enemies.append(enemy)
-    
-    # Black enemies - slow but tough, 5 hits
-    for _ in range(num_black):
-        x = random.uniform(-half_play_w, half_play_w)
-        y = random.uniform(0, PLAY_AREA_LENGTH / 2 - 500)
-        direction = random.uniform(0, 360)
-        
-        enemy = {
-            'position': [x, y, 0],
-            'direction': direction,
-            'speed': ENEMY_MOVE_SPEED_BLACK * random.uniform(0.9, 1.1) * (1.0 + CURRENT_LEVEL * 0.1),
-            'color': (0.1, 0.1, 0.1),
-            'type': 'black',
-            'health': 5 + CURRENT_LEVEL,
-            'scale': 2.0,
-            'alive': True,
-            'last_position': [x, y, 0],
-            'shoot_timer': random.uniform(ENEMY_SHOOT_INTERVAL_MIN / 2, ENEMY_SHOOT_INTERVAL_MAX / 2),
-            'can_shoot': True  # Black enemies always shoot
-        }
-        enemies.append(enemy)
-
-def setup_powerups():
-    """Initialize power-ups across the playing field."""
-    global powerups
-    powerups.clear()
-    
-    half_play_w = PLAY_AREA_WIDTH / 2 - 100
-    
-    for _ in range(NUM_POWERUPS):
-        x = random.uniform(-half_play_w, half_play_w)
-        # Place powerups ahead of player, toward the finish line
-        y = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
-        
-        powerup = {
-            'position': [x, y, 15],
-            'type': random.choice(POWERUP_TYPES),
-            'active': True,
-            'rotation': 0.0  # For spinning effect
-        }
-        powerups.append(powerup)
+    if forest_renderer:
+        forest_renderer.draw(view_frustum, camera_eye, fog_cutoff, camera_right)
+
+
+def apply_quality_tier():
+    """Push the governor's current tier into the forest, fog and HUD."""
+    global fog_cutoff
+    settings = quality_governor.settings
+    if forest_renderer:
+        forest_renderer.set_density(settings['forest_density'])
+        forest_renderer.lod_distances = np.asarray(LOD_DISTANCES) * settings['lod_scale']
+    fog_density = FOG_DENSITY * settings['fog_scale']
+    glFogf(GL_FOG_DENSITY, fog_density)
+    fog_cutoff = fog_cutoff_distance(fog_density)
+    # Only counters that tick every frame are throttled; light and phase changes show at once
+    hud_layer.set_refresh_interval(settings['hud_interval'],
+                                   (stats_widget, meters_widget, progress_widget,
+                                    speed_boost_widget, debug_info_widget))
+
+def solid_sphere(radius, slices, stacks):
+    """glutSolidSphere with its tessellation scaled for the current quality tier."""
+    detail = quality_governor.settings['sphere_detail']
+    solid_shapes.solid_sphere(radius, max(4, round(slices * detail)), max(3, round(stacks * detail)))
 
 # --- Drawing Functions ---
 def draw_sky():
     """Draw sky gradient."""
-    viewport = glGetIntegerv(GL_VIEWPORT)
+    viewport = gl_state.viewport()
     
-    glDisable(GL_LIGHTING)
-    glDisable(GL_FOG)
+    gl_state.disable(GL_LIGHTING)
+    gl_state.disable(GL_FOG)
     
     glMatrixMode(GL_PROJECTION)
     glPushMatrix()
@@ -490,8 +418,8 @@ def draw_sky():
     glPushMatrix()
     glLoadIdentity()
     
-    glDisable(GL_DEPTH_TEST)
-    glDepthMask(GL_FALSE)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.depth_mask(False)
     
     glBegin(GL_QUADS)
     glColor3fv(sky_color_top)
@@ -502,129 +430,44 @@ def draw_sky():
     glVertex2f(0, 0)
     glEnd()
     
-    glDepthMask(GL_TRUE)
-    glEnable(GL_DEPTH_TEST)
+    gl_state.depth_mask(True)
+    gl_state.enable(GL_DEPTH_TEST)
     glPopMatrix()
     
     glMatrixMode(GL_PROJECTION)
     glPopMatrix()
     
     glMatrixMode(GL_MODELVIEW)
-    glEnable(GL_LIGHTING)
+    gl_state.enable(GL_LIGHTING)
 
 def draw_fixed_sun():
     """Draw the sun in the sky."""
     glPushMatrix()
     glTranslatef(sun_position[0], sun_position[1], sun_position[2])
     
-    glDisable(GL_DEPTH_TEST)
-    glDepthMask(GL_FALSE)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.depth_mask(False)
+    gl_state.disable(GL_LIGHTING)
     
     glColor3fv(sun_color)
-    glutSolidSphere(sun_size, 20, 16)
+    solid_sphere(sun_size, 20, 16)
     
     # Glow effect
     glColor4f(sun_color[0], sun_color[1], sun_color[2], 0.15)
-    glutSolidSphere(sun_size * 1.4, 16, 12)
-    
-    glEnable(GL_LIGHTING)
-    glDepthMask(GL_TRUE)
-    glEnable(GL_DEPTH_TEST)
-    
-    glPopMatrix()
-
-def draw_fixed_tree(plant_data):
-    """Draw a tree at the specified position."""
-    x = plant_data['x']
-    y = plant_data['y']
-    type = plant_data['type']
-    height = plant_data['height']
-    color = plant_data['color']
-    z_rot = plant_data['z_rot']
-    
-    glPushMatrix()
-    glTranslatef(x, y, 0)
-    glRotatef(z_rot, 0, 0, 1)
-    
-    # Draw trunk
-    trunk_scale = 1.0
-    trunk_radius = max(2.5 * trunk_scale, height / 22.0)
-    trunk_height = height / 2.6
-    
-    glColor3f(0.40, 0.28, 0.18)
-    quadric = gluNewQuadric()
-    slices = 6
-    gluCylinder(quadric, trunk_radius, trunk_radius * 0.3, trunk_height, slices, 2)
-    gluDeleteQuadric(quadric)
-    
-    # Draw foliage
-    glTranslatef(0, 0, trunk_height * 0.7)
-    glColor3fv(color)
-    
-    if type == 0:
-        # Pine tree
-        glutSolidCone(height / 5.0, height * 0.85, 8, 4)
-    else:
-        # Deciduous tree
-        if 'clump_details' in plant_data:
-            clump_scale = 1.0
-            for clump in plant_data['clump_details']:
-                glPushMatrix()
-                glTranslatef(clump['ox'] * clump_scale, clump['oy'] * clump_scale, clump['oz'] * clump_scale)
-                slices, stacks = (6, 5)
-                glutSolidSphere(clump['size'] * clump_scale, slices, stacks)
-                glPopMatrix()
-        else:
-            glutSolidSphere(height / 4.0, 6, 5)
-    
-    glPopMatrix()
-
-def draw_fixed_bush(plant_data):
-    """Draw a bush at the specified position."""
-    x = plant_data['x']
-    y = plant_data['y']
-    size = plant_data['size']
-    color = plant_data['color']
+    solid_sphere(sun_size * 1.4, 16, 12)
     
-    glPushMatrix()
-    glTranslatef(x, y, size * 0.3)
-    glColor3fv(color)
-    
-    if 'sphere_details' in plant_data:
-        for sphere in plant_data['sphere_details']:
-            glPushMatrix()
-            glTranslatef(sphere['ox'], sphere['oy'], sphere['oz'])
-            glutSolidSphere(sphere['size'], 5, 4)
-            glPopMatrix()
-    else:
-        glutSolidSphere(size * 0.6, 5, 4)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.depth_mask(True)
+    gl_state.enable(GL_DEPTH_TEST)
     
     glPopMatrix()
 
-def draw_fixed_plants():
-    """Draw all plants in the environment."""
-    visible_count = 0
-    
-    for i, plant_data in enumerate(fixed_plants):
-        if i >= MAX_VISIBLE_TREES:
-            break
-            
-        visible_count += 1
-        
-        if plant_data['plant'] == 'tree':
-            draw_fixed_tree(plant_data)
-        elif plant_data['plant'] == 'bush':
-            draw_fixed_bush(plant_data)
-    
-    return visible_count
-
-def draw_field():
-    """Draw the checkered playing field."""
+def draw_field(first_row=0, last_row=FIELD_CHECKER_ROWS, markings=True):
+    """Draw checker rows [first_row, last_row) of the playing field, plus the markers and finish zone."""
     # --- Temporarily disable lighting for pure colors ---
-    lighting_enabled = glIsEnabled(GL_LIGHTING)
+    lighting_enabled = gl_state.is_enabled(GL_LIGHTING)
     if lighting_enabled:
-        glDisable(GL_LIGHTING)
+        gl_state.disable(GL_LIGHTING)
 
     # Draw checkerboard ground pattern
     checker_z = 0.0
@@ -633,18 +476,16 @@ def draw_field():
     play_area_end_y = PLAY_AREA_LENGTH / 2
     
     # Define grid parameters for checker pattern
-    CHECKER_COLS = 20   # Increase for more squares
-    CHECKER_ROWS = 60   # Increase for more squares
-    tile_width = PLAY_AREA_WIDTH / CHECKER_COLS
-    tile_length = PLAY_AREA_LENGTH / CHECKER_ROWS
+    tile_width = PLAY_AREA_WIDTH / FIELD_CHECKER_COLS
+    tile_length = PLAY_AREA_LENGTH / FIELD_CHECKER_ROWS
     
     # Colors changed to be less confusing with red enemies
     checker_color1 = (0.9, 0.9, 0.9)  # Light gray/white
     checker_color2 = (0.6, 0.8, 0.4)  # Light green instead of red/purple
     
     glBegin(GL_QUADS)
-    for r in range(CHECKER_ROWS):
-        for c in range(CHECKER_COLS):
+    for r in range(first_row, last_row):
+        for c in range(FIELD_CHECKER_COLS):
             x_start = -half_play_w + c * tile_width
             y_start = play_area_start_y + r * tile_length
             x_end = x_start + tile_width
@@ -660,6 +501,11 @@ def draw_field():
             glVertex3f(x_end, y_end, checker_z)
             glVertex3f(x_start, y_end, checker_z)
     glEnd()
+    
+    if not markings:
+        if lighting_enabled:
+            gl_state.enable(GL_LIGHTING)
+        return
 
     # Progress markers every 20% of the track
     marker_count = 5
@@ -695,11 +541,11 @@ def draw_field():
     finish_zone_end_x = half_play_w
     
     # Draw finish zone slightly above main ground with a flashing effect
-    glEnable(GL_POLYGON_OFFSET_FILL)
+    gl_state.enable(GL_POLYGON_OFFSET_FILL)
     glPolygonOffset(-1.0, -1.0)
     
     # Flashing effect based on time
-    flash_intensity = 0.7 + 0.3 * math.sin(time.time() * 5.0)  # Oscillate between 0.7 and 1.0
+    flash_intensity = 0.7 + 0.3 * math.sin(animation_clock.time() * 5.0)  # Oscillate between 0.7 and 1.0
     
     # Draw main white finish zone
     glBegin(GL_QUADS)
@@ -787,20 +633,31 @@ def draw_field():
     
     glEnd()
     
-    glDisable(GL_POLYGON_OFFSET_FILL)
+    gl_state.disable(GL_POLYGON_OFFSET_FILL)
 
     # Re-enable lighting if it was on before
     if lighting_enabled:
-        glEnable(GL_LIGHTING)
+        gl_state.enable(GL_LIGHTING)
 
 def draw_giant_doll():
     """Draw the giant doll character."""
-    global DOLL_CURRENT_ROTATION
-    
     glPushMatrix()
     glTranslatef(DOLL_POSITION[0], DOLL_POSITION[1], DOLL_POSITION[2])
-    glRotatef(DOLL_CURRENT_ROTATION, 0, 0, 1)  # Rotate based on game state
+    glRotatef(sim.DOLL_CURRENT_ROTATION, 0, 0, 1)  # Rotate based on game state
+    call_model('doll')
+    glPopMatrix()
     
+    # Draw light above doll based on game state
+    light_height = DOLL_BASE_HEIGHT + DOLL_BASE_HEIGHT * 0.25 * 2
+    light_state = sim.GAME_STATE if sim.GAME_STATE in ("red", "yellow") else "green"
+    
+    glPushMatrix()
+    glTranslatef(DOLL_POSITION[0], DOLL_POSITION[1], light_height)
+    call_model(('doll_light', light_state))
+    glPopMatrix()
+
+def draw_doll_model():
+    """Draw the doll's body around its base, facing its rest direction."""
     # Define doll proportions
     head_size = DOLL_BASE_HEIGHT * 0.25
     torso_h = DOLL_BASE_HEIGHT * 0.30
@@ -822,14 +679,14 @@ def draw_giant_doll():
     glPushMatrix()
     glTranslatef(-leg_offset_x, -DOLL_DEPTH * 0.1, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glColor3f(0.95, 0.95, 0.95)
     glPushMatrix()
     glTranslatef(leg_offset_x, -DOLL_DEPTH * 0.1, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     current_z += leg_h
@@ -841,7 +698,7 @@ def draw_giant_doll():
     glPushMatrix()
     glTranslatef(0, -DOLL_DEPTH * 0.1, frock_center_z)
     glScalef(frock_w, DOLL_DEPTH * 0.8, frock_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     current_z += frock_h
@@ -853,7 +710,7 @@ def draw_giant_doll():
     glPushMatrix()
     glTranslatef(0, -DOLL_DEPTH * 0.1, torso_center_z)
     glScalef(torso_w, DOLL_DEPTH * 0.8, torso_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw arms (skin-colored cubes)
@@ -866,7 +723,7 @@ def draw_giant_doll():
     glRotatef(20, 0, 0, 1)
     glRotatef(-15, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
@@ -874,7 +731,7 @@ def draw_giant_doll():
     glRotatef(-20, 0, 0, 1)
     glRotatef(-15, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     current_z += torso_h
@@ -886,7 +743,7 @@ def draw_giant_doll():
     glColor3f(0.95, 0.80, 0.72)
     glPushMatrix()
     glTranslatef(0, 0, head_center_z)
-    glutSolidSphere(head_size / 2, 16, 12)
+    solid_shapes.solid_sphere(head_size / 2, 16, 12)
     glPopMatrix()
     
     # Hair/cap - black like in Squid Game
@@ -894,65 +751,67 @@ def draw_giant_doll():
     glPushMatrix()
     glTranslatef(0, 0, head_center_z + head_size * 0.1)
     glScalef(1.0, 1.0, 0.8)
-    glutSolidSphere(head_size * 0.52, 12, 8)
-    glPopMatrix()
-    
+    solid_shapes.solid_sphere(head_size * 0.52, 12, 8)
     glPopMatrix()
-    
-    # Draw light above doll based on game state
+
+def draw_doll_light_model(state):
+    """Draw the signal light above the doll for a 'red', 'yellow' or 'green' state."""
     light_size = DOLL_BASE_HEIGHT * 0.1
-    light_height = DOLL_BASE_HEIGHT + head_size * 2
-    
-    glPushMatrix()
-    glTranslatef(DOLL_POSITION[0], DOLL_POSITION[1], light_height)
     
-    if GAME_STATE == "red":
+    if state == "red":
         glColor3f(1.0, 0.0, 0.0)  # Red light
-    elif GAME_STATE == "yellow":
+    elif state == "yellow":
         glColor3f(1.0, 0.8, 0.0)  # Yellow light
     else:
         glColor3f(0.0, 1.0, 0.0)  # Green light
         
-    glutSolidSphere(light_size, 16, 12)
+    solid_shapes.solid_sphere(light_size, 16, 12)
     
     # Light glow effect
-    glDisable(GL_LIGHTING)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
     
-    if GAME_STATE == "red":
+    if state == "red":
         glColor4f(1.0, 0.0, 0.0, 0.3)  # Red glow
-    elif GAME_STATE == "yellow":
+    elif state == "yellow":
         glColor4f(1.0, 0.8, 0.0, 0.3)  # Yellow glow
     else:
         glColor4f(0.0, 1.0, 0.0, 0.3)  # Green glow
         
-    glutSolidSphere(light_size * 1.5, 12, 8)
+    solid_shapes.solid_sphere(light_size * 1.5, 12, 8)
     
-    glDisable(GL_BLEND)
-    glEnable(GL_LIGHTING)
-    
-    glPopMatrix()
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
 
 def draw_player():
     """Draw the player character."""
     # Check if player was caught or reached finish
-    if player_was_caught:
+    if sim.player_was_caught:
         draw_player_caught()
         return
         
-    if player_reached_finish:
+    if sim.player_reached_finish:
         draw_player_victory()
         return
     
+    px, py, pz = lerp_position(sim.prev_player_position, sim.player_position, render_alpha)
+    direction = lerp_angle(sim.prev_player_direction, sim.player_direction, render_alpha)
+    
     glPushMatrix()
-    glTranslatef(player_position[0], player_position[1], player_position[2])
-    glRotatef(player_direction - 90, 0, 0, 1)
+    glTranslatef(px, py, pz)
+    glRotatef(direction - 90, 0, 0, 1)
     
     # Add particle effect when speed boost is active
-    if player_speed_boost_active:
+    if sim.player_speed_boost_active:
         draw_speed_effect()
     
+    call_model('player')
+    
+    glPopMatrix()
+
+def draw_player_model(arm_pitch=-10):
+    """Draw the standing player; arm_pitch tilts both arms forward (negative) or up."""
     # Player proportions
     body_w = player_width * 0.8
     body_h = player_height * 0.6
@@ -970,13 +829,13 @@ def draw_player():
     glPushMatrix()
     glTranslatef(-leg_offset_x, 0, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(leg_offset_x, 0, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw body
@@ -986,7 +845,7 @@ def draw_player():
     glPushMatrix()
     glTranslatef(0, 0, body_center_z)
     glScalef(body_w, body_d, body_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw head
@@ -996,7 +855,7 @@ def draw_player():
     glPushMatrix()
     glTranslatef(0, 0, head_center_z)
     glScalef(head_s, head_s, head_s)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw arms
@@ -1007,24 +866,22 @@ def draw_player():
     glPushMatrix()
     glTranslatef(-arm_offset_x, 0, arm_attach_z)
     glRotatef(15, 0, 0, 1)
-    glRotatef(-10, 1, 0, 0)
+    glRotatef(arm_pitch, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(arm_offset_x, 0, arm_attach_z)
     glRotatef(-15, 0, 0, 1)
-    glRotatef(-10, 1, 0, 0)
+    glRotatef(arm_pitch, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
 
 def draw_speed_effect():
     """Draw particle effect when speed boost is active."""
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_LIGHTING)
     
     # Draw trail particles
     glColor4f(0.0, 0.8, 1.0, 0.7)  # Cyan glow
@@ -1037,20 +894,25 @@ def draw_speed_effect():
         glPushMatrix()
         glTranslatef(0, offset, 10 + i * 2.0)
         glColor4f(0.0, 0.8, 1.0, alpha)
-        glutSolidSphere(3.0 - i * 0.2, 8, 8)
+        solid_sphere(3.0 - i * 0.2, 8, 8)
         glPopMatrix()
     
-    glEnable(GL_LIGHTING)
+    gl_state.enable(GL_LIGHTING)
 
 def draw_player_caught():
     """Draw player in caught/dead state."""
     glPushMatrix()
-    glTranslatef(player_position[0], player_position[1], player_position[2])
+    glTranslatef(sim.player_position[0], sim.player_position[1], sim.player_position[2])
     
     # Player lying on the ground
-    glRotatef(player_direction, 0, 0, 1)
+    glRotatef(sim.player_direction, 0, 0, 1)
     glRotatef(90, 1, 0, 0)  # Rotate to lie flat
+    call_model('player_caught')
     
+    glPopMatrix()
+
+def draw_player_caught_model():
+    """Draw the player lying in a pool of blood, in the lying-flat frame."""
     # Same dimensions as normal player but lying down
     body_w = player_width * 0.8
     body_h = player_height * 0.6
@@ -1065,7 +927,7 @@ def draw_player_caught():
     glPushMatrix()
     glTranslatef(0, 0, 0)
     glScalef(body_w, body_d, body_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Head
@@ -1073,7 +935,7 @@ def draw_player_caught():
     glPushMatrix()
     glTranslatef(0, 0, body_h)
     glScalef(head_s, head_s, head_s)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Arms (stretched out)
@@ -1081,24 +943,24 @@ def draw_player_caught():
     glPushMatrix()
     glTranslatef(-body_w, 0, 0)
     glScalef(arm_l, limb_w, limb_w)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(body_w, 0, 0)
     glScalef(arm_l, limb_w, limb_w)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Legs (stretched out)
     glPushMatrix()
     glTranslatef(0, 0, -body_h)
     glScalef(limb_w, limb_w, leg_h * 1.5)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw blood effect (use deterministic shape to avoid flickering)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_LIGHTING)
     glColor4f(0.9, 0.0, 0.0, 0.7)  # Red with alpha
     glBegin(GL_TRIANGLE_FAN)
     glVertex3f(0, 0, -2.0)  # Center slightly below player
@@ -1114,92 +976,23 @@ def draw_player_caught():
         glVertex3f(x, y, -2.0)
     
     glEnd()
-    glEnable(GL_LIGHTING)
-    
-    glPopMatrix()
+    gl_state.enable(GL_LIGHTING)
 
 def draw_player_victory():
     """Draw player in victory pose."""
     glPushMatrix()
-    glTranslatef(player_position[0], player_position[1], player_position[2])
-    glRotatef(player_direction - 90, 0, 0, 1)
-    
-    # Player proportions
-    body_w = player_width * 0.8
-    body_h = player_height * 0.6
-    body_d = body_w * 0.7
-    head_s = player_width * 0.7
-    limb_w = player_width * 0.15
-    leg_h = player_height * 0.4
-    arm_l = player_height * 0.35
-    
-    # Draw legs
-    leg_center_z = leg_h / 2
-    leg_offset_x = body_w * 0.3
-    
-    glColor3f(0.0, 0.35, 0.25)  # Dark green
-    glPushMatrix()
-    glTranslatef(-leg_offset_x, 0, leg_center_z)
-    glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
-    glPushMatrix()
-    glTranslatef(leg_offset_x, 0, leg_center_z)
-    glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
-    # Draw body
-    body_center_z = leg_h + body_h / 2
-    
-    glColor3f(0.0, 0.45, 0.3)  # Green
-    glPushMatrix()
-    glTranslatef(0, 0, body_center_z)
-    glScalef(body_w, body_d, body_h)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
-    # Draw head
-    head_center_z = leg_h + body_h + head_s / 2
-    
-    glColor3f(0.9, 0.7, 0.6)  # Skin tone
-    glPushMatrix()
-    glTranslatef(0, 0, head_center_z)
-    glScalef(head_s, head_s, head_s)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
-    # Draw arms - raised for victory
-    arm_attach_z = body_center_z + body_h * 0.3
-    arm_offset_x = body_w / 2 + limb_w / 2
-    
-    glColor3f(0.0, 0.35, 0.25)  # Dark green
-    
-    # Left arm raised
-    glPushMatrix()
-    glTranslatef(-arm_offset_x, 0, arm_attach_z)
-    glRotatef(15, 0, 0, 1)
-    glRotatef(-120, 1, 0, 0)  # Raised up
-    glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
-    glPopMatrix()
+    glTranslatef(sim.player_position[0], sim.player_position[1], sim.player_position[2])
+    glRotatef(sim.player_direction - 90, 0, 0, 1)
     
-    # Right arm raised
-    glPushMatrix()
-    glTranslatef(arm_offset_x, 0, arm_attach_z)
-    glRotatef(-15, 0, 0, 1)
-    glRotatef(-120, 1, 0, 0)  # Raised up
-    glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
-    glPopMatrix()
+    # Arms raised for victory
+    call_model('player_victory')
     
     # Draw victory particles
-    glDisable(GL_LIGHTING)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
     
-    current_time = time.time()
+    current_time = animation_clock.time()
     
     for i in range(20):
         angle = current_time * 2.0 + i * (math.pi / 10)
@@ -1221,28 +1014,88 @@ def draw_player_victory():
             
         glPushMatrix()
         glTranslatef(x, y, z)
-        glutSolidSphere(size, 8, 8)
+        solid_sphere(size, 8, 8)
         glPopMatrix()
     
-    glDisable(GL_BLEND)
-    glEnable(GL_LIGHTING)
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
     
     glPopMatrix()
 
-def draw_enemy(enemy):
-    """Draw an enemy character."""
-    if not enemy['alive']:
-        draw_enemy_dead(enemy)
+def draw_enemy(index):
+    """Draw the enemy in slot index of the simulation's enemy store."""
+    enemies = sim.enemies
+    if not enemies.alive[index]:
+        draw_enemy_dead(index)
         return
     
+    enemy_type = enemies.type_name(index)
+    ex, ey, ez = lerp_position(enemies.prev_position[index], enemies.position[index], render_alpha)
+    
     glPushMatrix()
-    glTranslatef(enemy['position'][0], enemy['position'][1], enemy['position'][2])
-    glRotatef(enemy['direction'] - 90, 0, 0, 1)
+    glTranslatef(ex, ey, ez)
+    glRotatef(enemies.direction[index] - 90, 0, 0, 1)
     
     # Apply scale factor for black enemies
-    scale = enemy.get('scale', 1.0)
+    scale = enemies.scale[index]
     glScalef(scale, scale, scale)
     
+    # Far enemies use the low-detail model at reduced quality tiers
+    dx, dy, dz = ex - camera_eye[0], ey - camera_eye[1], ez - camera_eye[2]
+    if dx * dx + dy * dy + dz * dz > quality_governor.settings['enemy_detail_distance'] ** 2:
+        call_model(('enemy_low', enemy_type))
+    else:
+        call_model(('enemy', enemy_type))
+    
+    # Draw health indicator above enemy based on health
+    if enemy_type != 'red':  # Only show for enemies with >1 health
+        head_s = ENEMY_WIDTH * 0.7
+        head_center_z = ENEMY_HEIGHT + head_s / 2
+        
+        glPushMatrix()
+        glTranslatef(0, 0, head_center_z + head_s + 15)  # Positioned higher
+        
+        gl_state.disable(GL_LIGHTING)
+        
+        # Draw health bar background
+        health_width = 30.0  # Wider
+        health_height = 5.0  # Taller
+        
+        glColor3f(0.3, 0.3, 0.3)  # Dark gray background
+        glBegin(GL_QUADS)
+        glVertex3f(-health_width/2, -health_height/2, 0)
+        glVertex3f(health_width/2, -health_height/2, 0)
+        glVertex3f(health_width/2, health_height/2, 0)
+        glVertex3f(-health_width/2, health_height/2, 0)
+        glEnd()
+        
+        # Draw current health
+        max_health = 5 if enemy_type == 'black' else 2
+        current_health = enemies.health[index]
+        health_percent = current_health / max_health
+        filled_width = health_width * health_percent
+        
+        # Health color from red to green
+        r = 1.0 - health_percent
+        g = health_percent
+        b = 0.0
+        
+        glColor3f(r, g, b)
+        glBegin(GL_QUADS)
+        glVertex3f(-health_width/2, -health_height/2, 0.1)
+        glVertex3f(-health_width/2 + filled_width, -health_height/2, 0.1)
+        glVertex3f(-health_width/2 + filled_width, health_height/2, 0.1)
+        glVertex3f(-health_width/2, health_height/2, 0.1)
+        glEnd()
+        
+        gl_state.enable(GL_LIGHTING)
+        
+        glPopMatrix()
+    
+    glPopMatrix()
+
+def draw_enemy_model(enemy_type):
+    """Draw a standing enemy of one type, with its ground marker, before per-type scaling."""
     # Enemy proportions
     body_w = ENEMY_WIDTH * 0.8
     body_h = ENEMY_HEIGHT * 0.6
@@ -1253,12 +1106,12 @@ def draw_enemy(enemy):
     arm_l = ENEMY_HEIGHT * 0.35
     
     # Draw a subtle colored marker on the ground under the enemy for visibility
-    glDisable(GL_LIGHTING)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    if enemy['type'] == 'red':
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    if enemy_type == 'red':
         glColor4f(1.0, 0.2, 0.2, 0.4)
-    elif enemy['type'] == 'blue':
+    elif enemy_type == 'blue':
         glColor4f(0.2, 0.2, 1.0, 0.4)
     else:  # black
         glColor4f(0.4, 0.4, 0.4, 0.4)
@@ -1271,17 +1124,17 @@ def draw_enemy(enemy):
         angle = i * (2.0 * math.pi / 16)
         glVertex3f(math.cos(angle) * marker_radius, math.sin(angle) * marker_radius, 0.5)
     glEnd()
-    glDisable(GL_BLEND)
-    glEnable(GL_LIGHTING)
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
     
     # Draw legs
     leg_center_z = leg_h / 2
     leg_offset_x = body_w * 0.3
     
     # Adjust leg color based on enemy type
-    if enemy['type'] == 'red':
+    if enemy_type == 'red':
         leg_color = (0.9, 0.1, 0.1)  # Brighter red
-    elif enemy['type'] == 'blue':
+    elif enemy_type == 'blue':
         leg_color = (0.1, 0.1, 0.9)  # Brighter blue
     else:  # black
         leg_color = (0.0, 0.0, 0.0)  # Pure black
@@ -1290,22 +1143,22 @@ def draw_enemy(enemy):
     glPushMatrix()
     glTranslatef(-leg_offset_x, 0, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(leg_offset_x, 0, leg_center_z)
     glScalef(limb_w, limb_w, leg_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw body
     body_center_z = leg_h + body_h / 2
     
     # Use brighter colors for better visibility
-    if enemy['type'] == 'red':
+    if enemy_type == 'red':
         body_color = (1.0, 0.2, 0.2)  # Brighter red
-    elif enemy['type'] == 'blue':
+    elif enemy_type == 'blue':
         body_color = (0.2, 0.2, 1.0)  # Brighter blue
     else:  # black
         body_color = (0.0, 0.0, 0.0)  # Pure black
@@ -1314,7 +1167,7 @@ def draw_enemy(enemy):
     glPushMatrix()
     glTranslatef(0, 0, body_center_z)
     glScalef(body_w, body_d, body_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw head
@@ -1324,7 +1177,7 @@ def draw_enemy(enemy):
     glPushMatrix()
     glTranslatef(0, 0, head_center_z)
     glScalef(head_s, head_s, head_s)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Draw arms
@@ -1337,7 +1190,7 @@ def draw_enemy(enemy):
     glRotatef(15, 0, 0, 1)
     glRotatef(-10, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
@@ -1345,66 +1198,76 @@ def draw_enemy(enemy):
     glRotatef(-15, 0, 0, 1)
     glRotatef(-10, 1, 0, 0)
     glScalef(limb_w, limb_w, arm_l)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
-    # Draw health indicator above enemy based on health
-    if enemy['type'] != 'red':  # Only show for enemies with >1 health
-        glPushMatrix()
-        glTranslatef(0, 0, head_center_z + head_s + 15)  # Positioned higher
-        
-        glDisable(GL_LIGHTING)
-        
-        # Draw health bar background
-        health_width = 30.0  # Wider
-        health_height = 5.0  # Taller
-        
-        glColor3f(0.3, 0.3, 0.3)  # Dark gray background
-        glBegin(GL_QUADS)
-        glVertex3f(-health_width/2, -health_height/2, 0)
-        glVertex3f(health_width/2, -health_height/2, 0)
-        glVertex3f(health_width/2, health_height/2, 0)
-        glVertex3f(-health_width/2, health_height/2, 0)
-        glEnd()
-        
-        # Draw current health
-        max_health = 5 if enemy['type'] == 'black' else 2
-        current_health = enemy['health']
-        health_percent = current_health / max_health
-        filled_width = health_width * health_percent
-        
-        # Health color from red to green
-        r = 1.0 - health_percent
-        g = health_percent
-        b = 0.0
-        
-        glColor3f(r, g, b)
-        glBegin(GL_QUADS)
-        glVertex3f(-health_width/2, -health_height/2, 0.1)
-        glVertex3f(-health_width/2 + filled_width, -health_height/2, 0.1)
-        glVertex3f(-health_width/2 + filled_width, health_height/2, 0.1)
-        glVertex3f(-health_width/2, health_height/2, 0.1)
-        glEnd()
-        
-        glEnable(GL_LIGHTING)
-        
-        glPopMatrix()
-    
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
 
-def draw_enemy_dead(enemy):
-    """Draw an enemy in dead/eliminated state."""
-    glPushMatrix()
-    glTranslatef(enemy['position'][0], enemy['position'][1], enemy['position'][2])
-    
-    # Enemy lying on the ground
-    glRotatef(enemy['direction'], 0, 0, 1)
+def draw_enemy_low_model(enemy_type):
+    """Reduced enemy for distant or low-quality drawing: one box for legs and body, one for the head."""
+    body_w = ENEMY_WIDTH * 0.8
+    body_h = ENEMY_HEIGHT * 0.6
+    body_d = body_w * 0.7
+    head_s = ENEMY_WIDTH * 0.7
+    leg_h = ENEMY_HEIGHT * 0.4
+    
+    # Coarser ground marker
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    if enemy_type == 'red':
+        glColor4f(1.0, 0.2, 0.2, 0.4)
+        body_color = (1.0, 0.2, 0.2)
+    elif enemy_type == 'blue':
+        glColor4f(0.2, 0.2, 1.0, 0.4)
+        body_color = (0.2, 0.2, 1.0)
+    else:  # black
+        glColor4f(0.4, 0.4, 0.4, 0.4)
+        body_color = (0.0, 0.0, 0.0)
+    marker_radius = body_w * 1.2
+    glBegin(GL_TRIANGLE_FAN)
+    glVertex3f(0, 0, 0.5)
+    for i in range(9):
+        angle = i * (2.0 * math.pi / 8)
+        glVertex3f(math.cos(angle) * marker_radius, math.sin(angle) * marker_radius, 0.5)
+    glEnd()
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
+    
+    glColor3fv(body_color)
+    glPushMatrix()
+    glTranslatef(0, 0, (leg_h + body_h) / 2)
+    glScalef(body_w, body_d, leg_h + body_h)
+    solid_shapes.solid_cube(1.0)
+    glPopMatrix()
+    
+    glColor3f(0.95, 0.85, 0.7)
+    glPushMatrix()
+    glTranslatef(0, 0, leg_h + body_h + head_s / 2)
+    glScalef(head_s, head_s, head_s)
+    solid_shapes.solid_cube(1.0)
+    glPopMatrix()
+
+def draw_enemy_dead(index):
+    """Draw an enemy in dead/eliminated state."""
+    enemies = sim.enemies
+    ex, ey, ez = enemies.position[index]
+    
+    glPushMatrix()
+    glTranslatef(ex, ey, ez)
+    
+    # Enemy lying on the ground
+    glRotatef(enemies.direction[index], 0, 0, 1)
     glRotatef(90, 1, 0, 0)  # Rotate to lie flat
     
     # Apply scale factor for black enemies
-    scale = enemy.get('scale', 1.0)
+    scale = enemies.scale[index]
     glScalef(scale, scale, scale)
     
+    call_model(('enemy_dead', enemies.type_name(index)))
+    
+    glPopMatrix()
+
+def draw_enemy_dead_model(enemy_type):
+    """Draw a dead enemy of one type in the lying-flat frame, before per-type scaling."""
     # Same dimensions as normal enemy but lying down
     body_w = ENEMY_WIDTH * 0.8
     body_h = ENEMY_HEIGHT * 0.6
@@ -1415,7 +1278,7 @@ def draw_enemy_dead(enemy):
     arm_l = ENEMY_HEIGHT * 0.35
     
     # Darken color for dead enemy
-    r, g, b = enemy['color']
+    r, g, b = ENEMY_COLORS[ENEMY_TYPE_NAMES.index(enemy_type)]
     dead_color = (r * 0.5, g * 0.5, b * 0.5)
     
     # Body
@@ -1423,7 +1286,7 @@ def draw_enemy_dead(enemy):
     glPushMatrix()
     glTranslatef(0, 0, 0)
     glScalef(body_w, body_d, body_h)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Head
@@ -1431,14 +1294,14 @@ def draw_enemy_dead(enemy):
     glPushMatrix()
     glTranslatef(0, 0, body_h)
     glScalef(head_s, head_s, head_s)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Arms (stretched out)
     # Adjust leg color based on enemy type
-    if enemy['type'] == 'red':
+    if enemy_type == 'red':
         limb_color = (0.35, 0.05, 0.05)  # Dark red
-    elif enemy['type'] == 'blue':
+    elif enemy_type == 'blue':
         limb_color = (0.05, 0.05, 0.35)  # Dark blue
     else:  # black
         limb_color = (0.02, 0.02, 0.02)  # Dark black
@@ -1447,37 +1310,62 @@ def draw_enemy_dead(enemy):
     glPushMatrix()
     glTranslatef(-body_w, 0, 0)
     glScalef(arm_l, limb_w, limb_w)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     glPushMatrix()
     glTranslatef(body_w, 0, 0)
     glScalef(arm_l, limb_w, limb_w)
-    glutSolidCube(1.0)
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
     
     # Legs (stretched out)
     glPushMatrix()
     glTranslatef(0, 0, -body_h)
     glScalef(limb_w, limb_w, leg_h * 1.5)
-    glutSolidCube(1.0)
-    glPopMatrix()
-    
+    solid_shapes.solid_cube(1.0)
     glPopMatrix()
 
-def draw_bullet(bullet):
-    """Draw a bullet/projectile."""
+# Character models compiled into display lists by create_model_display_lists();
+# each entry draws one pose in the character's local frame
+CHARACTER_MODELS = {
+    'doll': draw_doll_model,
+    'player': draw_player_model,
+    'player_victory': partial(draw_player_model, arm_pitch=-120),
+    'player_caught': draw_player_caught_model,
+}
+for _light_state in ('red', 'yellow', 'green'):
+    CHARACTER_MODELS[('doll_light', _light_state)] = partial(draw_doll_light_model, _light_state)
+for _enemy_type in ENEMY_TYPE_NAMES:
+    CHARACTER_MODELS[('enemy', _enemy_type)] = partial(draw_enemy_model, _enemy_type)
+    CHARACTER_MODELS[('enemy_low', _enemy_type)] = partial(draw_enemy_low_model, _enemy_type)
+    CHARACTER_MODELS[('enemy_dead', _enemy_type)] = partial(draw_enemy_dead_model, _enemy_type)
+
+def call_model(key):
+    """Draw a character model from its display list, or directly if lists are not compiled yet."""
+    display_list = model_display_lists.get(key)
+    if display_list is not None:
+        gl_state.call_list(display_list)
+    else:
+        CHARACTER_MODELS[key]()
+
+def draw_bullet(slot):
+    """Draw the player bullet in slot of the simulation's bullet pool."""
+    bullets = sim.bullets
+    bx, by, bz = lerp_position(bullets.prev_position[slot], bullets.position[slot], render_alpha)
+    size = bullets.size[slot]
+    
     glPushMatrix()
-    glTranslatef(bullet['position'][0], bullet['position'][1], bullet['position'][2])
+    glTranslatef(bx, by, bz)
     
     # Larger orange bullet for better visibility
     glColor3f(1.0, 0.5, 0.0)  # Orange
-    glutSolidSphere(bullet['size'], 10, 8)  # Use bullet's size property
+    solid_sphere(size, 10, 8)  # Use bullet's size property
     
     # Add trail effect
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_LIGHTING)
     
-    angle_rad = math.radians(bullet['direction'])
+    angle_rad = math.radians(bullets.direction[slot])
     dx = -math.cos(angle_rad)
     dy = -math.sin(angle_rad)
     
@@ -1492,9 +1380,9 @@ def draw_bullet(bullet):
     ny = dx * trail_width
     
     # Trail start point (back of bullet)
-    x1 = bullet['position'][0] + dx * bullet['size']
-    y1 = bullet['position'][1] + dy * bullet['size']
-    z1 = bullet['position'][2]
+    x1 = bx + dx * size
+    y1 = by + dy * size
+    z1 = bz
     
     # Trail end point
     x2 = x1 + dx * trail_length
@@ -1512,39 +1400,42 @@ def draw_bullet(bullet):
     glEnd()
     
     # Draw a small glowing effect for better visibility
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
     
     glColor4f(1.0, 0.7, 0.3, 0.5)  # Orange glow
-    glutSolidSphere(bullet['size'] * 1.5, 8, 8)
+    solid_sphere(size * 1.5, 8, 8)
     
-    glDisable(GL_BLEND)
-    glEnable(GL_LIGHTING)
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
     
     glPopMatrix()
 
-def draw_enemy_bullet(eb):
+def draw_enemy_bullet(slot):
     """Draw an enemy bullet - larger, slower, more visible for dodging."""
+    enemy_bullets = sim.enemy_bullets
+    size = enemy_bullets.size[slot]
+    
     glPushMatrix()
-    glTranslatef(eb['position'][0], eb['position'][1], eb['position'][2])
+    glTranslatef(*lerp_position(enemy_bullets.prev_position[slot], enemy_bullets.position[slot], render_alpha))
     
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_LIGHTING)
     
     # Pulsing red/orange enemy bullet
-    pulse = 0.7 + 0.3 * math.sin(time.time() * 8.0)
-    color = eb.get('color', (1.0, 0.2, 0.2))
+    pulse = 0.7 + 0.3 * math.sin(animation_clock.time() * 8.0)
+    color = enemy_bullets.color[slot]
     glColor3f(color[0] * pulse, color[1] * pulse + 0.1, color[2] * pulse)
-    glutSolidSphere(eb['size'], 12, 10)
+    solid_sphere(size, 12, 10)
     
     # Glowing halo for visibility
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
     glColor4f(1.0, 0.3, 0.1, 0.35 * pulse)
-    glutSolidSphere(eb['size'] * 2.0, 10, 8)
-    glDisable(GL_BLEND)
+    solid_sphere(size * 2.0, 10, 8)
+    gl_state.disable(GL_BLEND)
     
     # Trail
-    angle_rad = math.radians(eb['direction'])
+    angle_rad = math.radians(enemy_bullets.direction[slot])
     dx = -math.cos(angle_rad)
     dy = -math.sin(angle_rad)
     trail_len = 35.0
@@ -1552,8 +1443,8 @@ def draw_enemy_bullet(eb):
     nx = -dy * trail_w
     ny = dx * trail_w
     
-    x1 = eb['size'] * dx
-    y1 = eb['size'] * dy
+    x1 = size * dx
+    y1 = size * dy
     x2 = x1 + dx * trail_len
     y2 = y1 + dy * trail_len
     
@@ -1566,35 +1457,97 @@ def draw_enemy_bullet(eb):
     glVertex3f(x2 - nx, y2 - ny, 0)
     glEnd()
     
-    glEnable(GL_LIGHTING)
+    gl_state.enable(GL_LIGHTING)
     glPopMatrix()
 
+def create_particle_sprite():
+    """Upload the soft round texture every particle is drawn with."""
+    global particle_sprite
+    half = PARTICLE_SPRITE_SIZE / 2
+    offsets = (np.arange(PARTICLE_SPRITE_SIZE) + 0.5 - half) / half
+    radius_squared = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    texels = np.full((PARTICLE_SPRITE_SIZE, PARTICLE_SPRITE_SIZE, 4), 255, dtype=np.uint8)
+    texels[..., 3] = np.clip(1.0 - radius_squared, 0.0, 1.0) ** 2 * 255
+    particle_sprite = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, particle_sprite)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, PARTICLE_SPRITE_SIZE, PARTICLE_SPRITE_SIZE, 0,
+                 GL_RGBA, GL_UNSIGNED_BYTE, texels)
+    glBindTexture(GL_TEXTURE_2D, 0)
+
+def draw_particles():
+    """Draw each emitter's live particles as point sprites in a single call from the vertex stream."""
+    if not any(emitter.count for emitter, _, _ in PARTICLE_STYLES):
+        return
+    offsets = [(vertex_stream.append(emitter.position[:emitter.count]),
+                vertex_stream.append(emitter.color[:emitter.count]))
+               for emitter, _, _ in PARTICLE_STYLES]
+    # Point sizes are in pixels; with 1/distance attenuation, diameter * this keeps them world-sized
+    pixels_per_unit = gl_state.viewport()[3] / (2.0 * math.tan(math.radians(fovY) / 2))
+
+    # Point and texture-environment state is not cached, so save and restore it
+    glPushAttrib(GL_POINT_BIT | GL_TEXTURE_BIT)
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.depth_mask(False)  # Test against the scene but do not sort or occlude each other
+    gl_state.enable(GL_TEXTURE_2D)
+    glBindTexture(GL_TEXTURE_2D, particle_sprite)
+    glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+    gl_state.enable(GL_POINT_SPRITE)
+    glTexEnvi(GL_POINT_SPRITE, GL_COORD_REPLACE, GL_TRUE)
+    glPointParameterfv(GL_POINT_DISTANCE_ATTENUATION, (0.0, 0.0, 1.0))
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    vertex_stream.bind()
+    for (emitter, diameter, additive), (position, color) in zip(PARTICLE_STYLES, offsets):
+        if not emitter.count:
+            continue
+        gl_state.blend_func(GL_SRC_ALPHA, GL_ONE if additive else GL_ONE_MINUS_SRC_ALPHA)
+        glPointSize(diameter * pixels_per_unit)
+        glVertexPointer(3, GL_FLOAT, 0, position)
+        glColorPointer(4, GL_UNSIGNED_BYTE, 0, color)
+        glDrawArrays(GL_POINTS, 0, emitter.count)
+    vertex_stream.unbind()
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    gl_state.disable(GL_POINT_SPRITE)
+    gl_state.disable(GL_TEXTURE_2D)
+    gl_state.depth_mask(True)
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
+    glPopAttrib()
+
 def draw_shield_effect():
     """Draw shield bubble around the player."""
-    if not player_shield_active:
+    if not sim.player_shield_active:
         return
     
+    px, py, pz = lerp_position(sim.prev_player_position, sim.player_position, render_alpha)
+    
     glPushMatrix()
-    glTranslatef(player_position[0], player_position[1], player_position[2] + player_height * 0.5)
+    glTranslatef(px, py, pz + player_height * 0.5)
     
-    glDisable(GL_LIGHTING)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    gl_state.disable(GL_LIGHTING)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     
     # Pulsing shield bubble
-    pulse = 0.4 + 0.2 * math.sin(time.time() * 4.0)
+    pulse = 0.4 + 0.2 * math.sin(animation_clock.time() * 4.0)
     shield_radius = player_width * 2.5
     
     # Outer shell
     glColor4f(0.2, 0.6, 1.0, pulse * 0.4)
-    glutSolidSphere(shield_radius, 20, 16)
+    solid_sphere(shield_radius, 20, 16)
     
     # Inner bright ring
     glColor4f(0.4, 0.8, 1.0, pulse * 0.6)
-    glutWireSphere(shield_radius * 0.95, 12, 8)
+    solid_shapes.wire_sphere(shield_radius * 0.95, 12, 8)
     
-    glDisable(GL_BLEND)
-    glEnable(GL_LIGHTING)
+    gl_state.disable(GL_BLEND)
+    gl_state.enable(GL_LIGHTING)
     glPopMatrix()
 
 def draw_powerup(powerup):
@@ -1609,10 +1562,10 @@ def draw_powerup(powerup):
     glRotatef(powerup['rotation'], 0, 0, 1)
     
     # Hover/bob effect
-    bob = math.sin(time.time() * 3.0 + powerup['position'][0]) * 8.0
+    bob = math.sin(animation_clock.time() * 3.0 + powerup['position'][0]) * 8.0
     glTranslatef(0, 0, bob)
     
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_LIGHTING)
     
     scale_factor = 2.0
     
@@ -1636,11 +1589,11 @@ def draw_powerup(powerup):
         glEnd()
         
         # Yellow glow
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+        gl_state.enable(GL_BLEND)
+        gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
         glColor4f(1.0, 0.8, 0.0, 0.5)
-        glutSolidSphere(28, 16, 12)
-        glDisable(GL_BLEND)
+        solid_sphere(28, 16, 12)
+        gl_state.disable(GL_BLEND)
     
     elif powerup['type'] == 'shield':
         # Shield icon - blue diamond with sphere
@@ -1660,13 +1613,13 @@ def draw_powerup(powerup):
         glEnd()
         
         # Blue glow
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+        gl_state.enable(GL_BLEND)
+        gl_state.blend_func(GL_SRC_ALPHA, GL_ONE)
         glColor4f(0.2, 0.5, 1.0, 0.5)
-        glutSolidSphere(30, 16, 12)
-        glDisable(GL_BLEND)
+        solid_sphere(30, 16, 12)
+        gl_state.disable(GL_BLEND)
     
-    glEnable(GL_LIGHTING)
+    gl_state.enable(GL_LIGHTING)
     glPopMatrix()
 
 def draw_progress_bar():
@@ -1680,14 +1633,14 @@ def draw_progress_bar():
     glPushMatrix()
     glLoadIdentity()
     
-    glDisable(GL_DEPTH_TEST)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.disable(GL_LIGHTING)
     
     # Calculate progress
     start_y = -PLAY_AREA_LENGTH / 2
     end_y = PLAY_AREA_LENGTH / 2
     total_distance = end_y - start_y
-    current_distance = player_position[1] - start_y
+    current_distance = sim.player_position[1] - start_y
     progress = current_distance / total_distance
     
     # Draw progress bar background with semi-transparent dark rectangle
@@ -1697,8 +1650,8 @@ def draw_progress_bar():
     bar_y = WINDOW_HEIGHT - 50
     
     # Draw semi-transparent background
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     glColor4f(0.0, 0.0, 0.0, 0.7)
     glBegin(GL_QUADS)
     glVertex2f(bar_x - 10, bar_y - 5)
@@ -1706,7 +1659,7 @@ def draw_progress_bar():
     glVertex2f(bar_x + bar_width + 10, bar_y + bar_height + 5)
     glVertex2f(bar_x - 10, bar_y + bar_height + 5)
     glEnd()
-    glDisable(GL_BLEND)
+    gl_state.disable(GL_BLEND)
     
     # Draw progress bar frame
     glColor3f(0.5, 0.5, 0.5)
@@ -1749,9 +1702,10 @@ def draw_progress_bar():
     finish_label = "FINISH"
     glColor3f(1.0, 1.0, 1.0)
     draw_text(bar_x + bar_width - 60, bar_y + bar_height/2 - 5, finish_label, GLUT_BITMAP_HELVETICA_18)
+    hud_text.flush()
     
-    glEnable(GL_LIGHTING)
-    glEnable(GL_DEPTH_TEST)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.enable(GL_DEPTH_TEST)
     
     glPopMatrix()
     
@@ -1771,8 +1725,8 @@ def draw_score():
     glPushMatrix()
     glLoadIdentity()
     
-    glDisable(GL_DEPTH_TEST)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.disable(GL_LIGHTING)
     
     # Draw score background
     score_width = 220
@@ -1781,8 +1735,8 @@ def draw_score():
     score_y = WINDOW_HEIGHT - 70
     
     # Semi-transparent dark background
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     glColor4f(0.0, 0.0, 0.0, 0.7)
     glBegin(GL_QUADS)
     glVertex2f(score_x, score_y - score_height)
@@ -1790,17 +1744,18 @@ def draw_score():
     glVertex2f(score_x + score_width, score_y)
     glVertex2f(score_x, score_y)
     glEnd()
-    glDisable(GL_BLEND)
+    gl_state.disable(GL_BLEND)
     
     # Draw score text
     title_text = "SCORE"
     draw_text(score_x + 10, score_y - 20, title_text, GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 0.0))
-    draw_text(score_x + 10, score_y - 45, f"Score: {player_score}", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
-    draw_text(score_x + 10, score_y - 70, f"Time: {time_survived:.1f}s", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
-    draw_text(score_x + 10, score_y - 95, f"Kills: {enemies_killed}", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
+    draw_text(score_x + 10, score_y - 45, f"Score: {sim.player_score}", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
+    draw_text(score_x + 10, score_y - 70, f"Time: {sim.time_survived:.1f}s", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
+    draw_text(score_x + 10, score_y - 95, f"Kills: {sim.enemies_killed}", GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
+    hud_text.flush()
     
-    glEnable(GL_LIGHTING)
-    glEnable(GL_DEPTH_TEST)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.enable(GL_DEPTH_TEST)
     
     glPopMatrix()
     
@@ -1809,6 +1764,54 @@ def draw_score():
     
     glMatrixMode(GL_MODELVIEW)
 
+def build_start_screen():
+    """Static part of the start screen: backdrop, title and instructions."""
+    # Draw dark background with subtle gradient feel
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glColor4f(0.0, 0.0, 0.0, 0.85)
+    glBegin(GL_QUADS)
+    glVertex2f(0, 0)
+    glVertex2f(WINDOW_WIDTH, 0)
+    glVertex2f(WINDOW_WIDTH, WINDOW_HEIGHT)
+    glVertex2f(0, WINDOW_HEIGHT)
+    glEnd()
+    gl_state.disable(GL_BLEND)
+    
+    # Draw title with Squid Game red
+    title_color = (0.95, 0.1, 0.2)
+    draw_centered_text("SQUID GAME", WINDOW_HEIGHT - 180, GLUT_BITMAP_TIMES_ROMAN_24, title_color)
+    draw_centered_text("Red Light, Green Light", WINDOW_HEIGHT - 215, GLUT_BITMAP_HELVETICA_18, (0.8, 0.8, 0.8))
+    
+    # Version
+    draw_centered_text(f"v{GAME_VERSION}", WINDOW_HEIGHT - 240, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
+    
+    # Instructions in a clean column, below the start button
+    instructions = [
+        ("WASD", "Move"),
+        ("Arrows", "Camera"),
+        ("Z / X", "Zoom"),
+        ("Space", "Shoot"),
+        ("Shift", "Sprint"),
+        ("J", "Jump"),
+        ("R", "Restart"),
+        ("ESC", "Exit"),
+    ]
+    
+    y_pos = WINDOW_HEIGHT / 2 + 10 - 60
+    # Column header
+    draw_centered_text("--- Controls ---", y_pos, GLUT_BITMAP_HELVETICA_12, (0.6, 0.6, 0.6))
+    y_pos -= 22
+    
+    for key, action in instructions:
+        label = f"{key:>8}  -  {action}"
+        draw_centered_text(label, y_pos, GLUT_BITMAP_9_BY_15, (0.75, 0.75, 0.75))
+        y_pos -= 20
+    
+    # Game rules hint at bottom
+    draw_centered_text("Survive the Red Light. Reach the finish line.", 40, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
+    hud_text.flush()
+
 def draw_start_screen():
     """Draw game start screen with improved visuals."""
     glMatrixMode(GL_PROJECTION)
@@ -1820,22 +1823,16 @@ def draw_start_screen():
     glPushMatrix()
     glLoadIdentity()
     
-    glDisable(GL_DEPTH_TEST)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.disable(GL_LIGHTING)
     
-    # Draw dark background with subtle gradient feel
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    glColor4f(0.0, 0.0, 0.0, 0.85)
-    glBegin(GL_QUADS)
-    glVertex2f(0, 0)
-    glVertex2f(WINDOW_WIDTH, 0)
-    glVertex2f(WINDOW_WIDTH, WINDOW_HEIGHT)
-    glVertex2f(0, WINDOW_HEIGHT)
-    glEnd()
+    # Everything but the pulsing bars and button is cached
+    start_screen_widget.draw()
     
     # Decorative top/bottom bars 
-    pulse = 0.5 + 0.5 * math.sin(time.time() * 1.5)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    pulse = 0.5 + 0.5 * math.sin(animation_clock.time() * 1.5)
     glColor4f(0.9 * pulse, 0.1, 0.2 * pulse, 0.4)
     glBegin(GL_QUADS)
     glVertex2f(0, WINDOW_HEIGHT - 6)
@@ -1849,15 +1846,7 @@ def draw_start_screen():
     glVertex2f(WINDOW_WIDTH, 6)
     glVertex2f(0, 6)
     glEnd()
-    glDisable(GL_BLEND)
-    
-    # Draw title with Squid Game red
-    title_color = (0.95, 0.1, 0.2)
-    draw_centered_text("SQUID GAME", WINDOW_HEIGHT - 180, GLUT_BITMAP_TIMES_ROMAN_24, title_color)
-    draw_centered_text("Red Light, Green Light", WINDOW_HEIGHT - 215, GLUT_BITMAP_HELVETICA_18, (0.8, 0.8, 0.8))
-    
-    # Version
-    draw_centered_text(f"v{GAME_VERSION}", WINDOW_HEIGHT - 240, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
+    gl_state.disable(GL_BLEND)
     
     # Pulsing start button
     button_width = 280
@@ -1865,11 +1854,11 @@ def draw_start_screen():
     button_x = (WINDOW_WIDTH - button_width) / 2
     button_y = WINDOW_HEIGHT / 2 + 10
     
-    btn_pulse = 0.6 + 0.4 * math.sin(time.time() * 3.0)
+    btn_pulse = 0.6 + 0.4 * math.sin(animation_clock.time() * 3.0)
     
     # Button border glow
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     glColor4f(0.9, 0.15, 0.2, 0.3 * btn_pulse)
     glBegin(GL_QUADS)
     glVertex2f(button_x - 4, button_y - 4)
@@ -1896,39 +1885,15 @@ def draw_start_screen():
     glVertex2f(button_x + button_width, button_y + button_height)
     glVertex2f(button_x, button_y + button_height)
     glEnd()
-    glDisable(GL_BLEND)
+    gl_state.disable(GL_BLEND)
     
     # Button text
     glColor3f(1.0, 1.0, 1.0)
     draw_centered_text("PRESS ENTER TO START", button_y + 15, GLUT_BITMAP_HELVETICA_18)
+    hud_text.flush()
     
-    # Instructions in a clean column
-    instructions = [
-        ("WASD", "Move"),
-        ("Arrows", "Camera"),
-        ("Z / X", "Zoom"),
-        ("Space", "Shoot"),
-        ("Shift", "Sprint"),
-        ("J", "Jump"),
-        ("R", "Restart"),
-        ("ESC", "Exit"),
-    ]
-    
-    y_pos = button_y - 60
-    # Column header
-    draw_centered_text("--- Controls ---", y_pos, GLUT_BITMAP_HELVETICA_12, (0.6, 0.6, 0.6))
-    y_pos -= 22
-    
-    for key, action in instructions:
-        label = f"{key:>8}  -  {action}"
-        draw_centered_text(label, y_pos, GLUT_BITMAP_9_BY_15, (0.75, 0.75, 0.75))
-        y_pos -= 20
-    
-    # Game rules hint at bottom
-    draw_centered_text("Survive the Red Light. Reach the finish line.", 40, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
-    
-    glEnable(GL_LIGHTING)
-    glEnable(GL_DEPTH_TEST)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.enable(GL_DEPTH_TEST)
     
     glPopMatrix()
     
@@ -1937,953 +1902,424 @@ def draw_start_screen():
     
     glMatrixMode(GL_MODELVIEW)
 
-# --- Game Logic Functions ---
-def update_state():
-    """Update game state based on user input and timing."""
-    global player_position, player_direction, last_update_time, fps_last_time, frame_count, fps
-    global target_player_position, target_player_direction, camera_distance, camera_yaw, camera_pitch
-    global target_camera_yaw, target_camera_pitch, STATE_TIMER, GAME_STATE, NEXT_STATE_CHANGE
-    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION, bullet_cooldown, player_is_moving
-    global player_was_caught, player_reached_finish, last_positions, player_velocity
-    global GAME_PHASE, CURRENT_GAME_TIME, player_score, time_survived, powerup_spawn_timer
-    global player_speed_boost_active, player_speed_boost_timer, player_move_speed
-    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
-    global notification_text, notification_timer
-    global player_shield_active, player_shield_timer
-    
-    current_time = time.time()
-    delta_time = current_time - last_update_time
-    delta_time = min(delta_time, 0.1)  # Cap delta time to prevent large jumps
-    last_update_time = current_time
+# --- Retained HUD ---
+# Each HUD element below is built by a function of the values it shows and
+# wrapped in a RetainedWidget, which replays a display list until those values
+# change. Values are pre-rounded (formatted text, whole-pixel bar fills) so the
+# lists are only rebuilt when the drawn result would actually differ.
+STATS_PANEL_W = 160
+STATS_PANEL_H = 100
+METER_W = STATS_PANEL_W - 16
+PROGRESS_BAR_W = 500
+
+# Scale from the WINDOW_WIDTH x WINDOW_HEIGHT layout to the viewport, refreshed each frame
+hud_width_scale = 1.0
+hud_height_scale = 1.0
+hud_window_width = WINDOW_WIDTH
+hud_window_height = WINDOW_HEIGHT
+hud_layout = None  # Viewport and window size the widgets were built for
+
+def draw_scaled_text(x, y, text, font=GLUT_BITMAP_HELVETICA_18, color=(1.0, 1.0, 1.0)):
+    """Queues text at a layout position scaled to the current window size."""
+    hud_text.add(x * hud_width_scale, y * hud_height_scale, text, font, color)
+
+def draw_scaled_centered_text(text, y_pos, font=GLUT_BITMAP_TIMES_ROMAN_24, color=(1.0, 1.0, 1.0)):
+    """Queues text centered across the viewport at a scaled layout height."""
+    text_width = glyph_atlas.text_width(text, font)
+    x_pos = (hud_window_width - text_width) // 2
+    hud_text.add(x_pos, y_pos * hud_height_scale, text, font, color)
+
+def text_w(text, font=GLUT_BITMAP_HELVETICA_18):
+    """Width of text in pixels."""
+    return glyph_atlas.text_width(text, font)
+
+def draw_panel(x, y, w, h, alpha=0.75, border_color=None):
+    """Draw a rounded-look panel (dark bg with slight border)."""
+    sx = x * hud_width_scale
+    sy = y * hud_height_scale
+    sw = w * hud_width_scale
+    sh = h * hud_height_scale
+    
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    
+    # Dark fill
+    glColor4f(0.05, 0.05, 0.1, alpha)
+    glBegin(GL_QUADS)
+    glVertex2f(sx, sy)
+    glVertex2f(sx + sw, sy)
+    glVertex2f(sx + sw, sy + sh)
+    glVertex2f(sx, sy + sh)
+    glEnd()
     
-    # Update FPS counter
-    frame_count += 1
-    if current_time - fps_last_time >= 1.0:
-        fps = frame_count
-        frame_count = 0
-        fps_last_time = current_time
+    # Border
+    if border_color:
+        glColor4f(border_color[0], border_color[1], border_color[2], 0.6)
+    else:
+        glColor4f(0.3, 0.3, 0.4, 0.5)
+    glLineWidth(1.5)
+    glBegin(GL_LINE_LOOP)
+    glVertex2f(sx, sy)
+    glVertex2f(sx + sw, sy)
+    glVertex2f(sx + sw, sy + sh)
+    glVertex2f(sx, sy + sh)
+    glEnd()
     
-    # Frame limiting if enabled
-    if USE_FRAME_LIMITING:
-        target_frame_time = 1.0 / TARGET_FPS
-        sleep_time = target_frame_time - delta_time
-        
-        if sleep_time > 0.001:
-            time.sleep(sleep_time)
-            current_time = time.time()
-            delta_time = current_time - (last_update_time - delta_time + target_frame_time)
-            delta_time = min(delta_time, 0.1)
-            last_update_time = current_time
+    gl_state.disable(GL_BLEND)
+
+def draw_bar(x, y, w, h, fill_pct, fill_color, bg_color=(0.2, 0.2, 0.2), border=True):
+    """Draw a bar (progress/stamina/health style)."""
+    sx = x * hud_width_scale
+    sy = y * hud_height_scale
+    sw = w * hud_width_scale
+    sh = h * hud_height_scale
+    fill_pct = max(0.0, min(1.0, fill_pct))
     
-    # Update notification system
-    if notification_timer > 0:
-        notification_timer -= delta_time
+    # Background
+    glColor3f(*bg_color)
+    glBegin(GL_QUADS)
+    glVertex2f(sx, sy)
+    glVertex2f(sx + sw, sy)
+    glVertex2f(sx + sw, sy + sh)
+    glVertex2f(sx, sy + sh)
+    glEnd()
     
-    # Handle start screen
-    if GAME_STATE == "start":
-        # Press Enter to start the game (Space is reserved for shooting)
-        if b'\r' in keys_pressed or b'\n' in keys_pressed:
-            start_game()
-            keys_pressed.discard(b'\r')
-            keys_pressed.discard(b'\n')
-            
-        glutPostRedisplay()
-        return
+    # Fill
+    fw = sw * fill_pct
+    glColor3f(*fill_color)
+    glBegin(GL_QUADS)
+    glVertex2f(sx, sy)
+    glVertex2f(sx + fw, sy)
+    glVertex2f(sx + fw, sy + sh)
+    glVertex2f(sx, sy + sh)
+    glEnd()
     
-    # Skip updates if player was caught or won (freeze game state)
-    if player_was_caught or player_reached_finish:
-        glutPostRedisplay()
-        return
+    # Border
+    if border:
+        glColor3f(0.5, 0.5, 0.5)
+        glLineWidth(1.0)
+        glBegin(GL_LINE_LOOP)
+        glVertex2f(sx, sy)
+        glVertex2f(sx + sw, sy)
+        glVertex2f(sx + sw, sy + sh)
+        glVertex2f(sx, sy + sh)
+        glEnd()
+
+def snap_fill(fill_pct, w):
+    """Round a bar fill to whole pixels of a bar w layout units wide."""
+    pixels = max(1.0, w * hud_width_scale)
+    return round(max(0.0, min(1.0, fill_pct)) * pixels) / pixels
+
+def stats_panel_origin():
+    """Bottom-left corner of the top-right stats panel."""
+    return WINDOW_WIDTH - STATS_PANEL_W - 10, WINDOW_HEIGHT - STATS_PANEL_H - 10
+
+def build_score_panel(score, time_text, kills, phase, level):
+    panel_x = 10
+    panel_y = WINDOW_HEIGHT - 110
+    panel_w = 200
+    panel_h = 100
     
-    # Calculate survival time (only while alive)
-    time_survived = current_time - GAME_START_TIME
-    
-    # Update game difficulty based on phase
-    if time_survived > GAME_PHASE * PHASE_DURATION:
-        GAME_PHASE += 1
-        # Adjust difficulty parameters
-        STATE_CHANGE_INTERVAL_MIN = max(1.0, STATE_CHANGE_INTERVAL_MIN - 0.4)
-        STATE_CHANGE_INTERVAL_MAX = max(3.0, STATE_CHANGE_INTERVAL_MAX - 0.6)
-        show_notification(f"Phase {GAME_PHASE}! Difficulty increased!")
-        print(f"Increasing difficulty to phase {GAME_PHASE}!")
-        print(f"New timing: {STATE_CHANGE_INTERVAL_MIN:.1f}s - {STATE_CHANGE_INTERVAL_MAX:.1f}s")
-    
-    # Update game state timer
-    STATE_TIMER += delta_time
-    if STATE_TIMER >= NEXT_STATE_CHANGE:
-        if GAME_STATE == "yellow":
-            # Then change to red
-            GAME_STATE = "red"
-            DOLL_TARGET_ROTATION = 0  # Face player
-            NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
-            STATE_TIMER = 0
-            show_notification("RED LIGHT! Stop moving!")
-        elif GAME_STATE == "green":
-            # First change to yellow warning
-            GAME_STATE = "yellow"
-            NEXT_STATE_CHANGE = 5.0  # Fixed 5-second yellow warning
-            STATE_TIMER = 0
-            show_notification("WARNING! Yellow light!")
-        else:
-            # Change back to green
-            GAME_STATE = "green"
-            DOLL_TARGET_ROTATION = 180  # Face away
-            NEXT_STATE_CHANGE = random.uniform(
-                STATE_CHANGE_INTERVAL_MIN * (1.0 + 0.5 / GAME_PHASE),  # More green time early in game
-                STATE_CHANGE_INTERVAL_MAX * (1.0 + 0.5 / GAME_PHASE)
-            )
-            STATE_TIMER = 0
-            show_notification("GREEN LIGHT! Go!")
-    
-    # Smooth doll rotation
-    rotation_diff = DOLL_TARGET_ROTATION - DOLL_CURRENT_ROTATION
-    if abs(rotation_diff) > 0.5:
-        rotation_step = DOLL_ROTATION_SPEED * delta_time
-        if rotation_diff > 0:
-            DOLL_CURRENT_ROTATION += min(rotation_step, rotation_diff)
-        else:
-            DOLL_CURRENT_ROTATION -= min(rotation_step, -rotation_diff)
+    draw_panel(panel_x, panel_y, panel_w, panel_h, 0.8)
     
-    # Update camera based on input
-    cam_rot_step = camera_rotation_speed * delta_time
-    pitch_changed = False
-    yaw_changed = False
+    # Score (gold, prominent)
+    draw_scaled_text(panel_x + 10, panel_y + panel_h - 22, f"SCORE  {score}", GLUT_BITMAP_HELVETICA_18, (1.0, 0.85, 0.1))
+    # Time
+    draw_scaled_text(panel_x + 10, panel_y + panel_h - 42, f"TIME   {time_text}s", GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
+    # Kills
+    draw_scaled_text(panel_x + 10, panel_y + panel_h - 58, f"KILLS  {kills}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.45, 0.45))
+    # Phase & Level
+    draw_scaled_text(panel_x + 10, panel_y + panel_h - 74, f"PHASE  {phase}", GLUT_BITMAP_HELVETICA_12, (0.4, 0.9, 1.0))
+    draw_scaled_text(panel_x + 10, panel_y + panel_h - 90, f"LEVEL  {level}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.6, 1.0))
+    hud_text.flush()
+
+def build_stats_panel(fps_text, ammo, sprint_line, shield_text, airborne):
+    stats_x, stats_y = stats_panel_origin()
+    stats_h = STATS_PANEL_H
     
-    # Camera rotation - modified for head-tilting behavior
-    if GLUT_KEY_LEFT in keys_pressed:
-        target_camera_yaw += cam_rot_step
-        yaw_changed = True
-        
-    if GLUT_KEY_RIGHT in keys_pressed:
-        target_camera_yaw -= cam_rot_step
-        yaw_changed = True
-        
-    if GLUT_KEY_UP in keys_pressed:
-        target_camera_pitch += cam_rot_step
-        pitch_changed = True
-        
-    if GLUT_KEY_DOWN in keys_pressed:
-        target_camera_pitch -= cam_rot_step
-        pitch_changed = True
-    
-    # Clamp camera pitch to prevent flipping
-    target_camera_pitch = max(camera_pitch_min, min(camera_pitch_max, target_camera_pitch))
-    
-    # Calculate movement vectors based on camera orientation
-    cam_yaw_rad = math.radians(camera_yaw)
-    move_forward_x = math.cos(cam_yaw_rad)
-    move_forward_y = math.sin(cam_yaw_rad)
-    move_right_x = math.sin(cam_yaw_rad)
-    move_right_y = -math.cos(cam_yaw_rad)
-    
-    # Initialize acceleration for this frame
-    accel_x = 0.0
-    accel_y = 0.0
-    player_is_moving = False
-    
-    # Determine acceleration based on input
-    current_speed = player_move_speed
-    
-    global player_is_sprinting, player_stamina
-    
-    # Check movement keys FIRST to set player_is_moving
-    if b'w' in keys_pressed:
-        accel_x += move_forward_x
-        accel_y += move_forward_y
-        player_is_moving = True
-        
-    if b's' in keys_pressed:
-        accel_x -= move_forward_x
-        accel_y -= move_forward_y
-        player_is_moving = True
-        
-    if b'a' in keys_pressed:
-        accel_x -= move_right_x
-        accel_y -= move_right_y
-        player_is_moving = True
-        
-    if b'd' in keys_pressed:
-        accel_x += move_right_x
-        accel_y += move_right_y
-        player_is_moving = True
+    draw_panel(stats_x, stats_y, STATS_PANEL_W, stats_h, 0.8)
     
-    # Check for sprint (Shift key) - AFTER movement checks so player_is_moving is correct
-    global sprint_key_held
-    global sprint_exhausted, sprint_cooldown_timer
+    draw_scaled_text(stats_x + 8, stats_y + stats_h - 18, f"FPS {fps_text}", GLUT_BITMAP_HELVETICA_12, (0.5, 1.0, 0.5))
+    draw_scaled_text(stats_x + 80, stats_y + stats_h - 18, f"AMMO {ammo}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.8, 0.3))
     
-    if sprint_key_held:
-        player_is_sprinting = True
-    else:
-        player_is_sprinting = False
-    
-    # Sprint exhaustion cooldown
-    if sprint_exhausted:
-        sprint_cooldown_timer -= delta_time
-        if sprint_cooldown_timer <= 0:
-            sprint_exhausted = False
-            sprint_cooldown_timer = 0
-            show_notification("Sprint recovered!")
-        # Force no sprint during cooldown AND apply speed penalty
-        player_is_sprinting = False
-        current_speed *= SPRINT_EXHAUSTED_SPEED_MULT
-    
-    # Sprint logic
-    if player_is_sprinting and player_stamina > 0 and player_is_moving and not sprint_exhausted:
-        current_speed *= sprint_multiplier
-        player_stamina -= player_stamina_drain * delta_time
-        if player_stamina <= 0: 
-            player_stamina = 0
-            player_is_sprinting = False
-            sprint_exhausted = True
-            sprint_cooldown_timer = SPRINT_COOLDOWN_DURATION
-            show_notification("EXHAUSTED! Slowed for 4s!")
+    # Sprint / Exhaustion status
+    if sprint_line:
+        draw_scaled_text(stats_x + 8, stats_y + stats_h - 36, sprint_line[0], GLUT_BITMAP_HELVETICA_12, sprint_line[1])
+    
+    # Shield indicator
+    if shield_text:
+        draw_scaled_text(stats_x + 8, stats_y + stats_h - 52, shield_text, GLUT_BITMAP_HELVETICA_12, (0.3, 0.7, 1.0))
+    
+    # Jump hint
+    if airborne:
+        draw_scaled_text(stats_x + 8, stats_y + stats_h - 68, "AIRBORNE", GLUT_BITMAP_HELVETICA_12, (0.5, 1.0, 0.8))
+    hud_text.flush()
+
+def build_stats_meters(speed_fill, speed_label, spd_color, stamina_fill, stam_color):
+    stats_x, stats_y = stats_panel_origin()
+    
+    # --- Speed Meter ---
+    speed_bar_x = stats_x + 8
+    speed_bar_y = stats_y + 22
+    speed_bar_h = 8
+    draw_bar(speed_bar_x, speed_bar_y, METER_W, speed_bar_h, speed_fill, spd_color)
+    draw_scaled_text(speed_bar_x, speed_bar_y + speed_bar_h + 2, speed_label, GLUT_BITMAP_HELVETICA_12, spd_color)
+    
+    # --- Stamina Bar ---
+    draw_bar(stats_x + 8, stats_y + 6, METER_W, 8, stamina_fill, stam_color)
+    hud_text.flush()
+
+def build_light_state(state, timer_text):
+    if state == "red":
+        state_text = DIALOGUE_RED_LIGHT
+        state_color = (1.0, 0.15, 0.15)
+        border_c = (0.8, 0.1, 0.1)
+    elif state == "yellow":
+        state_text = DIALOGUE_YELLOW_WARNING
+        state_color = (1.0, 0.9, 0.1)
+        border_c = (0.8, 0.7, 0.0)
     else:
-        # Regenerate stamina (only if not exhausted)
-        if not sprint_exhausted and player_stamina < player_max_stamina:
-            player_stamina += player_stamina_regen * delta_time
-            if player_stamina > player_max_stamina:
-                player_stamina = player_max_stamina
-    
-    # Jump logic
-    global player_z_velocity, player_is_jumping, player_on_ground, player_ground_z
-    
-    if b'j' in keys_pressed and player_on_ground and not player_is_jumping:
-        player_z_velocity = JUMP_FORCE
-        player_is_jumping = True
-        player_on_ground = False
-        keys_pressed.discard(b'j')  # Single press jump
-    
-    # Apply gravity
-    if not player_on_ground:
-        player_z_velocity -= GRAVITY * delta_time
-        player_position[2] += player_z_velocity * delta_time
-        target_player_position[2] += player_z_velocity * delta_time
-        
-        # Check ground collision
-        if player_position[2] <= player_ground_z:
-            player_position[2] = player_ground_z
-            target_player_position[2] = player_ground_z
-            player_z_velocity = 0.0
-            player_on_ground = True
-            player_is_jumping = False
-
-    # Apply speed to acceleration direction
-    accel_x *= current_speed
-    accel_y *= current_speed
-    
-    # Apply friction to current velocity (Frame-rate independent)
-    # 0.88 is the base friction for 60 FPS (approx 16.6ms)
-    # Formula: new_vel = old_vel * (base_friction ^ (dt * 60))
-    friction_factor = pow(player_friction, delta_time * 60.0)
-    player_velocity[0] *= friction_factor
-    player_velocity[1] *= friction_factor
-    
-    # Apply acceleration to velocity
-    if player_is_moving:
-        player_velocity[0] += accel_x * delta_time
-        player_velocity[1] += accel_y * delta_time
-    
-    # Apply velocity to position
-    target_player_position[0] += player_velocity[0] * delta_time
-    target_player_position[1] += player_velocity[1] * delta_time
-    
-    # Check movement during red light
-    moving_during_red = (GAME_STATE == "red" and DOLL_CURRENT_ROTATION < 45 and 
-                       (abs(player_velocity[0]) > 1.0 or abs(player_velocity[1]) > 1.0))
-    
-    if moving_during_red:
-        player_was_caught = True
-        print("You moved during red light! Game over.")
-    
-    # Boundary constraints
-    half_play_w = PLAY_AREA_WIDTH / 2 - player_width / 2
-    half_play_l = PLAY_AREA_LENGTH / 2 - player_width / 2
-    
-    target_player_position[0] = max(-half_play_w, min(half_play_w, target_player_position[0]))
-    target_player_position[1] = max(-half_play_l, min(half_play_l, target_player_position[1]))
-    
-    # Update player direction if moving
-    velocity_magnitude_sq = player_velocity[0]**2 + player_velocity[1]**2
-    if velocity_magnitude_sq > 10.0:  # Only update direction if moving significantly
-        target_player_direction = math.degrees(math.atan2(player_velocity[1], player_velocity[0]))
-    
-    # Camera zoom control
-    zoom_changed = False
-    zoom_speed = 350.0 * delta_time
-    
-    if b'z' in keys_pressed:
-        camera_distance -= zoom_speed
-        zoom_changed = True
-        
-    if b'x' in keys_pressed:
-        camera_distance += zoom_speed
-        zoom_changed = True
-        
-    camera_distance = max(camera_distance_min, min(camera_distance_max, camera_distance))
+        state_text = DIALOGUE_GREEN_LIGHT
+        state_color = (0.15, 1.0, 0.15)
+        border_c = (0.1, 0.7, 0.1)
+    
+    tw = text_w(state_text, GLUT_BITMAP_TIMES_ROMAN_24)
+    state_panel_w = tw + 60
+    state_panel_x = (WINDOW_WIDTH - state_panel_w) // 2
+    state_panel_y = WINDOW_HEIGHT - 55
+    state_panel_h = 45
+    
+    draw_panel(state_panel_x, state_panel_y, state_panel_w, state_panel_h, 0.85, border_c)
+    draw_scaled_centered_text(state_text, WINDOW_HEIGHT - 40, GLUT_BITMAP_TIMES_ROMAN_24, state_color)
+    
+    # Timer below
+    ttw = text_w(timer_text, GLUT_BITMAP_HELVETICA_12)
+    timer_panel_w = ttw + 30
+    timer_panel_x = (WINDOW_WIDTH - timer_panel_w) // 2
+    timer_panel_y = WINDOW_HEIGHT - 78
+    
+    draw_panel(timer_panel_x, timer_panel_y, timer_panel_w, 20, 0.6)
+    draw_scaled_centered_text(timer_text, WINDOW_HEIGHT - 74, GLUT_BITMAP_HELVETICA_12, (0.85, 0.85, 0.85))
+    hud_text.flush()
+
+def build_notification(text, alpha):
+    nw = text_w(text) + 40
+    nx = (WINDOW_WIDTH - nw) // 2
+    ny = WINDOW_HEIGHT - 115
+    
+    draw_panel(nx, ny, nw, 28, 0.7 * alpha, (1.0, 0.9, 0.2))
+    draw_scaled_centered_text(text, ny + 8, GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 0.3))
+    hud_text.flush()
+
+def build_progress_panel(progress, percent):
+    prog_bar_h = 16
+    prog_bar_x = (WINDOW_WIDTH - PROGRESS_BAR_W) // 2
+    prog_bar_y = 35
     
-    # Debug output if enabled
-    if print_debug:
-        if pitch_changed:
-            print(f"ARROW Key: Target Pitch -> {target_camera_pitch:.1f} | Current Distance: {camera_distance:.1f}")
-            
-        if yaw_changed:
-            print(f"ARROW Key: Target Yaw -> {target_camera_yaw:.1f}")
-            
-        if zoom_changed:
-            print(f"Z/X Key: Distance -> {camera_distance:.1f} | Current Target Pitch: {target_camera_pitch:.1f}")
-    
-    # Apply smooth player movement
-    player_lerp = min(1.0, PLAYER_SMOOTHING * delta_time)
-    player_position[0] += (target_player_position[0] - player_position[0]) * player_lerp
-    player_position[1] += (target_player_position[1] - player_position[1]) * player_lerp
-    
-    # Apply smooth rotation
-    player_angle_diff = (target_player_direction - player_direction + 180) % 360 - 180
-    player_direction = (player_direction + player_angle_diff * player_lerp) % 360
-    
-    # Apply smooth camera movement
-    cam_lerp = min(1.0, CAMERA_SMOOTHING * delta_time)
-    
-    yaw_diff = (target_camera_yaw - camera_yaw + 180) % 360 - 180
-    if abs(yaw_diff) > 180:
-        yaw_diff = (target_camera_yaw - camera_yaw)
-    camera_yaw = (camera_yaw + yaw_diff * cam_lerp) % 360
-    
-    pitch_diff = target_camera_pitch - camera_pitch
-    camera_pitch += pitch_diff * cam_lerp
-    
-    # Update weapon cooldown
-    if bullet_cooldown > 0:
-        bullet_cooldown -= delta_time
-    
-    # Check for weapon firing
-    if b' ' in keys_pressed and bullet_cooldown <= 0:
-        fire_weapon()
-        bullet_cooldown = BULLET_COOLDOWN_TIME
-    
-    # Update power-up effects
-    if player_speed_boost_active:
-        player_speed_boost_timer -= delta_time
-        if player_speed_boost_timer <= 0:
-            player_speed_boost_active = False
-            player_move_speed = player_base_speed
-            print("Speed boost ended!")
-    
-    # Update powerup spawn timer
-    powerup_spawn_timer -= delta_time
-    if powerup_spawn_timer <= 0:
-        spawn_powerup()
-        powerup_spawn_timer = POWERUP_SPAWN_INTERVAL
-    
-    # Update bullets
-    update_bullets(delta_time)
-    
-    # Update enemies
-    update_enemies(delta_time)
-    
-    # Update enemy bullets
-    update_enemy_bullets(delta_time)
-    
-    # Update shield timer
-    global player_shield_active, player_shield_timer
-    if player_shield_active:
-        player_shield_timer -= delta_time
-        if player_shield_timer <= 0:
-            player_shield_active = False
-            show_notification("Shield expired!")
-    
-    # Update powerups
-    update_powerups(delta_time)
-    
-    # Update Screen Shake
-    global shake_timer, camera_shake_x, camera_shake_y, shake_intensity
-    if shake_timer > 0:
-        shake_timer -= delta_time
-        camera_shake_x = random.uniform(-shake_intensity, shake_intensity)
-        camera_shake_y = random.uniform(-shake_intensity, shake_intensity)
-        shake_intensity *= 0.9 # Decay
+    # Progress fill color: red -> yellow -> green
+    if progress < 0.5:
+        pr, pg, pb = 1.0, progress * 2.0, 0.0
     else:
-        camera_shake_x = 0
-        camera_shake_y = 0
-    
-    # Particle system disabled for stability
-    # update_particles(delta_time)
-
-
-
-    
-    # Check for collisions (includes win condition check)
-    check_collisions()
-    
-    # Store last positions for movement detection
-    last_positions['player'] = list(player_position)
-    
-    for enemy in enemies:
-        if 'position' in enemy:
-            enemy['last_position'] = list(enemy['position'])
-    
-    glutPostRedisplay()
-
-def start_game():
-    """Start the game from the starting screen."""
-    global GAME_STATE, player_position, target_player_position, GAME_START_TIME
-    global player_score, time_survived, enemies_killed, player_move_speed
-    global STATE_TIMER, NEXT_STATE_CHANGE, DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION
-    global player_was_caught, player_reached_finish, player_velocity, GAME_PHASE
-    global player_speed_boost_active, player_speed_boost_timer, player_stamina
-    global player_direction, target_player_direction, bullets, powerups, powerup_spawn_timer
-    global player_is_sprinting, sprint_key_held
-    global sprint_exhausted, sprint_cooldown_timer
-    global player_z_velocity, player_is_jumping, player_on_ground
-    global player_shield_active, player_shield_timer, enemy_bullets
-    global CURRENT_LEVEL, name_entry_active, player_name_input
-    
-    # Reset player
-    player_position = list(player_start_pos)
-    target_player_position = list(player_start_pos)
-    player_direction = 90.0
-    target_player_direction = 90.0
-    player_was_caught = False
-    player_reached_finish = False
-    player_velocity = [0.0, 0.0, 0.0]
-    player_stamina = player_max_stamina
-    player_is_sprinting = False
-    sprint_key_held = False
-    sprint_exhausted = False
-    sprint_cooldown_timer = 0.0
-    player_z_velocity = 0.0
-    player_is_jumping = False
-    player_on_ground = True
-    player_position[2] = player_ground_z
-    
-    # Reset shield
-    player_shield_active = False
-    player_shield_timer = 0.0
-    
-    # Reset name entry
-    name_entry_active = False
-    player_name_input = ""
-    
-    # Reset game state
-    GAME_STATE = "green"
-    STATE_TIMER = 0
-    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN * 1.5, STATE_CHANGE_INTERVAL_MAX * 1.5)
-    DOLL_CURRENT_ROTATION = 180
-    DOLL_TARGET_ROTATION = 180
-    GAME_START_TIME = time.time()
-    GAME_PHASE = 1
-    CURRENT_LEVEL = 1
-    
-    # Reset scoring
-    player_score = 0
-    time_survived = 0.0
-    enemies_killed = 0
-    
-    # Reset speed boost
-    player_speed_boost_active = False
-    player_speed_boost_timer = 0.0
-    player_move_speed = player_base_speed
-    
-    # Clear bullets
-    bullets = []
-    enemy_bullets = []
-    
-    # Initialize enemies
-    setup_enemies()
-    
-    # Initialize powerups
-    setup_powerups()
-    powerup_spawn_timer = POWERUP_SPAWN_INTERVAL
-    
-    print("Game started!")
-
-# Add notification system
-notification_text = ""
-notification_timer = 0
-NOTIFICATION_DURATION = 3.0  # How long notifications stay on screen
-
-def show_notification(text):
-    """Display a notification message on screen."""
-    global notification_text, notification_timer
-    notification_text = text
-    notification_timer = NOTIFICATION_DURATION
-
-def fire_weapon():
-    """Create a new bullet fired from the player."""
-    global bullets
-    global shake_timer, shake_intensity # Added for recoil
-    
-    # Calculate bullet direction based on player orientation
-    angle_rad = math.radians(player_direction)
-    
-    # Starting position (slightly in front of player)
-    offset = 30.0
-    start_x = player_position[0] + offset * math.cos(angle_rad)
-    start_y = player_position[1] + offset * math.sin(angle_rad)
-    start_z = player_position[2] + player_height * 0.5
-    
-    # Create bullet object
-    bullet = {
-        'position': [start_x, start_y, start_z],
-        'direction': player_direction,
-        'lifetime': 3.0,  # Bullet disappears after this many seconds
-        'size': BULLET_SIZE,  # Store bullet size with the bullet
-        'last_position': [start_x, start_y, start_z]  # Track previous position for line collision
-    }
-    
-    bullets.append(bullet)
-    show_notification("Bullet fired!")
-
-    # Add recoil/shake (reduced for stability)
-    shake_timer = 0.15
-    shake_intensity = 1.5
-
-
-def update_bullets(delta_time):
-    """Move bullets and handle their lifetime."""
-    global bullets
-    
-    # Process each bullet
-    for bullet in bullets[:]:
-        # Store last position before moving
-        bullet['last_position'] = list(bullet['position'])
-        
-        # Move bullet
-        angle_rad = math.radians(bullet['direction'])
-        bullet['position'][0] += BULLET_SPEED * math.cos(angle_rad) * delta_time
-        bullet['position'][1] += BULLET_SPEED * math.sin(angle_rad) * delta_time
-        
-        # Update lifetime
-        bullet['lifetime'] -= delta_time
-        
-        # Remove expired bullets
-        if bullet['lifetime'] <= 0:
-            bullets.remove(bullet)
-            continue
-        
-        # Check if out of bounds
-        half_play_w = PLAY_AREA_WIDTH / 2 + 100
-        half_play_l = PLAY_AREA_LENGTH / 2 + 100
-        
-        if (abs(bullet['position'][0]) > half_play_w or 
-            abs(bullet['position'][1]) > half_play_l):
-            bullets.remove(bullet)
-
-def update_enemies(delta_time):
-    """Update enemy positions and check for red light violations."""
-    global enemies, player_position, player_score, enemies_killed
+        pr, pg, pb = 1.0 - (progress - 0.5) * 2.0, 1.0, 0.0
     
-    for enemy in enemies:
-        if not enemy['alive']:
-            continue
-            
-        # Determine speed based on game state
-        enemy_speed = enemy['speed']
-        if GAME_STATE == "yellow":
-            # During yellow light, enemies move at just 15% speed (extremely slow)
-            enemy_speed *= 0.15
-            
-        # Only move during green or yellow light
-        if GAME_STATE == "green" or GAME_STATE == "yellow" or DOLL_CURRENT_ROTATION > 45:  # Grace period during rotation
-            # Calculate vector toward player
-            dx = player_position[0] - enemy['position'][0]
-            dy = player_position[1] - enemy['position'][1]
-            distance = math.sqrt(dx*dx + dy*dy)
-            
-            if distance > 0:
-                # Normalize and apply speed
-                dx /= distance
-                dy /= distance
-                
-                # Add random jitter to movement
-                jitter = 0.3
-                dx += random.uniform(-jitter, jitter)
-                dy += random.uniform(-jitter, jitter)
-                
-                # Normalize again after jitter
-                magnitude = math.sqrt(dx*dx + dy*dy)
-                if magnitude > 0:
-                    dx /= magnitude
-                    dy /= magnitude
-                
-                # Move toward player with enemy's speed (modified by yellow light if applicable)
-                enemy['position'][0] += dx * enemy_speed * delta_time
-                enemy['position'][1] += dy * enemy_speed * delta_time
-                
-                # Update direction to face movement
-                enemy['direction'] = math.degrees(math.atan2(dy, dx))
-        else:
-            # Check if enemy moved during red light
-            enemy_moved = False
-            last_pos = enemy.get('last_position', enemy['position'])
-            
-            dx = enemy['position'][0] - last_pos[0]
-            dy = enemy['position'][1] - last_pos[1]
-            move_distance = math.sqrt(dx*dx + dy*dy)
-            
-            # If enemy moved more than threshold during red light, it dies
-            # Higher chance for red enemies (they're less cautious)
-            chance_to_be_caught = 0.4  # Base chance
-            if enemy['type'] == 'red':
-                chance_to_be_caught = 0.6  # Higher for red enemies
-            elif enemy['type'] == 'black':
-                chance_to_be_caught = 0.2  # Lower for black enemies (more cautious)
-                
-            if move_distance > 1.0 and random.random() < chance_to_be_caught:
-                enemy['alive'] = False
-                print(f"A {enemy['type']} enemy was caught moving during red light!")
-                
-                # Add score for enemy elimination
-                if enemy['type'] == 'red':
-                    player_score += 100
-                elif enemy['type'] == 'blue':
-                    player_score += 200
-                else:  # black
-                    player_score += 500
-                
-                enemies_killed += 1
-        
-        # Enemy shooting logic
-        if enemy.get('can_shoot', False) and enemy['alive']:
-            enemy['shoot_timer'] -= delta_time
-            if enemy['shoot_timer'] <= 0:
-                # Shoot at player
-                dx = player_position[0] - enemy['position'][0]
-                dy = player_position[1] - enemy['position'][1]
-                dist = math.sqrt(dx*dx + dy*dy)
-                
-                if dist > 0 and dist < 5000:  # Only shoot if within range
-                    # Add slight inaccuracy so player can dodge
-                    aim_jitter = random.uniform(-15, 15)
-                    angle = math.degrees(math.atan2(dy, dx)) + aim_jitter
-                    
-                    eb = {
-                        'position': [enemy['position'][0], enemy['position'][1], ENEMY_HEIGHT * 0.5],
-                        'direction': angle,
-                        'lifetime': 6.0,
-                        'size': ENEMY_BULLET_SIZE,
-                        'color': enemy['color'],
-                    }
-                    enemy_bullets.append(eb)
-                
-                # Reset timer (faster at higher levels)
-                interval_mult = max(0.5, 1.0 - CURRENT_LEVEL * 0.1)
-                enemy['shoot_timer'] = random.uniform(
-                    ENEMY_SHOOT_INTERVAL_MIN * interval_mult,
-                    ENEMY_SHOOT_INTERVAL_MAX * interval_mult
-                )
-
-def update_enemy_bullets(delta_time):
-    """Move enemy bullets, check collisions with player."""
-    global enemy_bullets, player_was_caught, player_shield_active
-    
-    for eb in enemy_bullets[:]:
-        angle_rad = math.radians(eb['direction'])
-        eb['position'][0] += ENEMY_BULLET_SPEED * math.cos(angle_rad) * delta_time
-        eb['position'][1] += ENEMY_BULLET_SPEED * math.sin(angle_rad) * delta_time
-        
-        eb['lifetime'] -= delta_time
-        if eb['lifetime'] <= 0:
-            enemy_bullets.remove(eb)
-            continue
-        
-        # Out of bounds check
-        if (abs(eb['position'][0]) > PLAY_AREA_WIDTH / 2 + 200 or 
-            abs(eb['position'][1]) > PLAY_AREA_LENGTH / 2 + 200):
-            enemy_bullets.remove(eb)
-            continue
-        
-        # Check collision with player
-        dx = player_position[0] - eb['position'][0]
-        dy = player_position[1] - eb['position'][1]
-        dz = player_position[2] - eb['position'][2]
-        dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-        hit_radius = player_width + eb['size']
-        
-        # Player can jump over bullets - if Z difference is large, skip
-        if abs(dz) > ENEMY_HEIGHT * 0.8:
-            continue
-        
-        if dist < hit_radius:
-            if player_shield_active:
-                # Shield absorbs the hit
-                show_notification("Shield blocked enemy bullet!")
-                enemy_bullets.remove(eb)
-                continue
-            else:
-                # Player is hit
-                player_was_caught = True
-                print("Hit by enemy bullet! Game over.")
-                return
-    global powerups
-    
-    for powerup in powerups:
-        if not powerup['active']:
-            continue
-            
-        # Rotate powerup for visual effect
-        powerup['rotation'] += 90.0 * delta_time  # 90 degrees per second
-        
-        # Keep rotation between 0-360
-        if powerup['rotation'] >= 360.0:
-            powerup['rotation'] -= 360.0
-
-def update_powerups(delta_time):
-    """Update powerup animations (rotation and bobbing)."""
-    for powerup in powerups:
-        if powerup['active']:
-            powerup['rotation'] = (powerup.get('rotation', 0) + 90 * delta_time) % 360
-
-
-def spawn_powerup():
-    """Spawn a new powerup in the playing field."""
-    global powerups
+    # Panel behind progress
+    draw_panel(prog_bar_x - 8, prog_bar_y - 8, PROGRESS_BAR_W + 16, prog_bar_h + 34, 0.7)
+    draw_bar(prog_bar_x, prog_bar_y, PROGRESS_BAR_W, prog_bar_h, progress, (pr, pg, pb))
     
-    # Check if we already have max powerups
-    active_powerups = sum(1 for p in powerups if p['active'])
-    if active_powerups >= NUM_POWERUPS:
-        return
-        
-    # Find inactive powerup to reuse
-    for powerup in powerups:
-        if not powerup['active']:
-            half_play_w = PLAY_AREA_WIDTH / 2 - 100
-            powerup['position'][0] = random.uniform(-half_play_w, half_play_w)
-            powerup['position'][1] = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
-            powerup['type'] = random.choice(POWERUP_TYPES)
-            powerup['rotation'] = 0.0
-            powerup['active'] = True
-            return
+    # Progress label
+    draw_scaled_centered_text(f"PROGRESS: {percent}%", prog_bar_y + prog_bar_h + 5, GLUT_BITMAP_HELVETICA_12, (1.0, 1.0, 1.0))
+    hud_text.flush()
+
+def draw_screen_tint(r, g, b, a):
+    """Blend a flat color over the whole viewport."""
+    gl_state.enable(GL_BLEND)
+    gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glColor4f(r, g, b, a)
+    glBegin(GL_QUADS)
+    glVertex2f(0, 0)
+    glVertex2f(hud_window_width, 0)
+    glVertex2f(hud_window_width, hud_window_height)
+    glVertex2f(0, hud_window_height)
+    glEnd()
+    gl_state.disable(GL_BLEND)
+
+def build_caught_overlay(cause, score, kills, time_text, phase, percent):
+    # Dark overlay
+    draw_screen_tint(0.0, 0.0, 0.0, 0.5)
+    
+    # Big centered panel
+    ov_w = 420
+    ov_h = 200
+    ov_x = (WINDOW_WIDTH - ov_w) // 2
+    ov_y = (WINDOW_HEIGHT - ov_h) // 2
+    
+    draw_panel(ov_x, ov_y, ov_w, ov_h, 0.9, (0.8, 0.1, 0.1))
+    
+    # "ELIMINATED" title
+    draw_scaled_centered_text("ELIMINATED", ov_y + ov_h - 40, GLUT_BITMAP_TIMES_ROMAN_24, (1.0, 0.15, 0.15))
+    
+    # Cause
+    draw_scaled_centered_text(cause, ov_y + ov_h - 75, GLUT_BITMAP_HELVETICA_18, (1.0, 0.7, 0.7))
+    
+    # Stats
+    draw_scaled_centered_text(f"Score: {score}    Kills: {kills}    Time: {time_text}s", ov_y + ov_h - 110, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
+    draw_scaled_centered_text(f"Phase Reached: {phase}    Progress: {percent}%", ov_y + ov_h - 135, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
+    hud_text.flush()
+
+def build_victory_overlay(score, kills, time_text, phase, level, name_entry, name_text, high_scores):
+    # Gold overlay
+    draw_screen_tint(0.1, 0.08, 0.0, 0.4)
+    
+    # Big centered panel
+    ov_w = 450
+    ov_h = 320
+    ov_x = (WINDOW_WIDTH - ov_w) // 2
+    ov_y = (WINDOW_HEIGHT - ov_h) // 2
+    
+    draw_panel(ov_x, ov_y, ov_w, ov_h, 0.92, (0.2, 0.8, 0.2))
+    
+    # Subtitle
+    draw_scaled_centered_text("You reached the finish line!", ov_y + ov_h - 60, GLUT_BITMAP_HELVETICA_18, (0.8, 1.0, 0.8))
+    
+    # Stats
+    draw_scaled_centered_text(f"Final Score: {score}", ov_y + ov_h - 90, GLUT_BITMAP_HELVETICA_18, (1.0, 0.85, 0.1))
+    draw_scaled_centered_text(f"Kills: {kills}    Time: {time_text}s    Phase: {phase}    Level: {level}", ov_y + ov_h - 115, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
+    
+    # Name entry
+    if name_entry:
+        draw_scaled_centered_text("Enter your name for the leaderboard:", ov_y + ov_h - 145, GLUT_BITMAP_HELVETICA_12, (0.9, 0.9, 0.5))
+        # Name input box
+        input_w = 200
+        input_h = 24
+        input_x = (WINDOW_WIDTH - input_w) // 2
+        input_y = ov_y + ov_h - 175
+        draw_panel(input_x, input_y, input_w, input_h, 0.6, (0.8, 0.8, 0.2))
+        draw_scaled_centered_text(name_text, input_y + 6, GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
+        draw_scaled_centered_text("Press ENTER to submit", ov_y + ov_h - 195, GLUT_BITMAP_HELVETICA_12, (0.7, 0.7, 0.7))
+    else:
+        # Show high scores
+        if high_scores:
+            draw_scaled_centered_text("--- HIGH SCORES ---", ov_y + ov_h - 145, GLUT_BITMAP_HELVETICA_12, (1.0, 0.85, 0.1))
+            for i, (name, hs_score) in enumerate(high_scores):
+                rank_color = (1.0, 0.85, 0.1) if i == 0 else (0.8, 0.8, 0.8)
+                hs_text = f"{i+1}. {name} - {hs_score}"
+                draw_scaled_centered_text(hs_text, ov_y + ov_h - 162 - i * 16, GLUT_BITMAP_HELVETICA_12, rank_color)
+        
+        draw_scaled_centered_text("Press N for Next Level", ov_y + 38, GLUT_BITMAP_HELVETICA_18, (0.2, 1.0, 0.4))
+    hud_text.flush()
+
+def build_speed_boost(boost_text):
+    bw = text_w(boost_text, GLUT_BITMAP_HELVETICA_12)
+    bx = WINDOW_WIDTH - bw - 30
+    by = stats_panel_origin()[1] - 30
+    draw_panel(bx, by, bw + 20, 22, 0.8, (0.0, 0.6, 1.0))
+    draw_scaled_text(bx + 10, by + 5, boost_text, GLUT_BITMAP_HELVETICA_12, (0.0, 0.9, 1.0))
+    hud_text.flush()
+
+def build_debug_info(lines):
+    draw_panel(10, WINDOW_HEIGHT - 260, 380, 150, 0.7)
+    for i, line in enumerate(lines):
+        draw_scaled_text(18, WINDOW_HEIGHT - 120 - i * 18, line, GLUT_BITMAP_HELVETICA_12, (0.7, 1.0, 0.7))
+    hud_text.flush()
+
+def build_controls_hint():
+    ctrl_text = "WASD:Move  Arrows:Cam  Space:Shoot  Shift:Sprint  J:Jump  R:Restart"
+    draw_scaled_text(12, 8, ctrl_text, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
+    hud_text.flush()
+
+hud_layer = RetainedHud(gl_state)
+start_screen_widget = hud_layer.widget(build_start_screen)
+score_widget = hud_layer.widget(build_score_panel)
+stats_widget = hud_layer.widget(build_stats_panel)
+meters_widget = hud_layer.widget(build_stats_meters)
+light_state_widget = hud_layer.widget(build_light_state)
+notification_widget = hud_layer.widget(build_notification)
+progress_widget = hud_layer.widget(build_progress_panel)
+caught_overlay_widget = hud_layer.widget(build_caught_overlay)
+victory_overlay_widget = hud_layer.widget(build_victory_overlay)
+speed_boost_widget = hud_layer.widget(build_speed_boost)
+debug_info_widget = hud_layer.widget(build_debug_info)
+controls_hint_widget = hud_layer.widget(build_controls_hint)
+
+def update_hud_layout(window_width, window_height):
+    """Refresh the HUD scale from the viewport; a new layout rebuilds every widget."""
+    global hud_width_scale, hud_height_scale, hud_window_width, hud_window_height, hud_layout
+    hud_width_scale = window_width / WINDOW_WIDTH
+    hud_height_scale = window_height / WINDOW_HEIGHT
+    hud_window_width = window_width
+    hud_window_height = window_height
+    layout = (window_width, window_height, WINDOW_WIDTH, WINDOW_HEIGHT)
+    if layout != hud_layout:
+        hud_layer.invalidate()
+        hud_layout = layout
+
+def draw_caught_overlay(progress):
+    """Eliminated overlay: a cached panel plus the pulsing restart prompt."""
+    cause = "You moved during RED LIGHT!" if sim.GAME_STATE == "red" else "Caught by an enemy!"
+    caught_overlay_widget.draw(cause, sim.player_score, sim.enemies_killed, f"{sim.time_survived:.1f}",
+                               sim.GAME_PHASE, int(progress * 100))
+    
+    # Pulsing restart prompt
+    ov_y = (WINDOW_HEIGHT - 200) // 2
+    pulse = 0.6 + 0.4 * math.sin(animation_clock.time() * 3.0)
+    draw_scaled_centered_text("Press R to Restart", ov_y + 20, GLUT_BITMAP_HELVETICA_18, (pulse, pulse, pulse))
+    hud_text.flush()
+
+def draw_victory_overlay():
+    """Win overlay: a cached panel and leaderboard plus the pulsing title and prompt."""
+    cursor = "_" if int(animation_clock.time() * 2) % 2 == 0 else " "  # Blinking cursor
+    victory_overlay_widget.draw(sim.player_score, sim.enemies_killed, f"{sim.time_survived:.1f}",
+                                sim.GAME_PHASE, sim.CURRENT_LEVEL, sim.name_entry_active,
+                                sim.player_name_input + cursor, tuple(sim.high_scores[:5]))
+    
+    ov_h = 320
+    ov_y = (WINDOW_HEIGHT - ov_h) // 2
+    # "YOU WIN" title with pulsing gold
+    pulse = 0.7 + 0.3 * math.sin(animation_clock.time() * 2.5)
+    draw_scaled_centered_text("YOU WIN!", ov_y + ov_h - 35, GLUT_BITMAP_TIMES_ROMAN_24, (pulse, 0.9 * pulse, 0.1))
+    if not sim.name_entry_active:
+        # Restart
+        pulse2 = 0.6 + 0.4 * math.sin(animation_clock.time() * 3.0)
+        draw_scaled_centered_text("Press R to Restart (Lv.1)", ov_y + 16, GLUT_BITMAP_HELVETICA_12, (pulse2, pulse2, pulse2))
+    hud_text.flush()
+
+# --- Game Loop ---
+def update_state():
+    """Run the fixed-rate simulation ticks owed for the elapsed time (GLUT idle callback)."""
+    global last_update_time, fps_last_time, frame_count, fps
     
-    # If no inactive powerups, create a new one
-    if len(powerups) < NUM_POWERUPS * 2:
-        half_play_w = PLAY_AREA_WIDTH / 2 - 100
-        x = random.uniform(-half_play_w, half_play_w)
-        y = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
-        
-        new_powerup = {
-            'position': [x, y, 15],
-            'type': random.choice(POWERUP_TYPES),
-            'active': True,
-            'rotation': 0.0
-        }
-        powerups.append(new_powerup)
-
-def check_collisions():
-    """Check for collisions between game objects."""
-    global bullets, enemies, player_position, player_was_caught, powerups
-    global player_speed_boost_active, player_speed_boost_timer, player_move_speed
-    global player_score, enemies_killed, player_reached_finish
-    global shake_timer, shake_intensity
-    global name_entry_active, player_name_input
-    global player_shield_active, player_shield_timer
-    
-    # Check if player reached finish line - with a more lenient check
-    # If player is within 95% of the way to the finish line, count it as a win
-    start_y = -PLAY_AREA_LENGTH / 2
-    end_y = PLAY_AREA_LENGTH / 2
-    total_distance = end_y - start_y
-    current_distance = player_position[1] - start_y
-    progress = current_distance / total_distance
+    current_time = time.perf_counter()
+    frame_time = current_time - last_update_time
+    last_update_time = current_time
     
-    # Win condition - reach the finish line
-    if progress >= 0.95:
-        player_reached_finish = True
-        # Teleport player to exact finish so progress shows 100%
-        player_position[1] = PLAY_AREA_LENGTH / 2
-        target_player_position[1] = PLAY_AREA_LENGTH / 2
-        # Calculate final score
-        time_bonus = int(max(100, 1000 / max(0.1, time_survived / 60.0)))
-        phase_bonus = GAME_PHASE * 500
-        kill_bonus = enemies_killed * 150
-        level_bonus = CURRENT_LEVEL * 1000
-        player_score += 10000 + time_bonus + phase_bonus + kill_bonus + level_bonus
-        # Activate name entry for high score
-        name_entry_active = True
-        player_name_input = ""
-        print(f"YOU WIN! Final Score: {player_score} (Time: {time_bonus}, Phase: {phase_bonus}, Kills: {kill_bonus}, Level: {level_bonus})")
-        return  # Skip other collision checks if player won
-    
-    # Check bullet-enemy collisions
-    bullets_to_remove = []
-    hit_enemies = set()
-    
-    for bullet in bullets[:]:
-        hit_detected = False
-        
-        for enemy in enemies:
-            if not enemy['alive']:
-                continue
-            
-            # Get enemy size with scale factor
-            enemy_scale = enemy.get('scale', 1.0)
-            enemy_size = ENEMY_WIDTH * enemy_scale
-            hit_radius = enemy_size * 1.5 + bullet['size']  # Much larger hit radius for easier aiming
-            
-            # First check - simple distance check for optimization
-            dx = bullet['position'][0] - enemy['position'][0]
-            dy = bullet['position'][1] - enemy['position'][1]
-            dz = bullet['position'][2] - enemy['position'][2]
-            distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # If bullet is close to enemy, perform more detailed collision check
-            if distance < hit_radius:
-                # Actual collision detection - line segment against sphere
-                # Check if the bullet's path (from last_position to position) intersects enemy
-                
-                # Vector from last position to current position
-                move_x = bullet['position'][0] - bullet['last_position'][0]
-                move_y = bullet['position'][1] - bullet['last_position'][1]
-                move_z = bullet['position'][2] - bullet['last_position'][2]
-                
-                # Vector from bullet's last position to enemy center
-                to_enemy_x = enemy['position'][0] - bullet['last_position'][0]
-                to_enemy_y = enemy['position'][1] - bullet['last_position'][1]
-                to_enemy_z = enemy['position'][2] - bullet['last_position'][2]
-                
-                # Length of movement vector
-                move_length_sq = move_x*move_x + move_y*move_y + move_z*move_z
-                
-                if move_length_sq > 0.001:  # Avoid division by zero
-                    move_length = math.sqrt(move_length_sq)
-                    
-                    # Normalize movement vector
-                    move_x /= move_length
-                    move_y /= move_length
-                    move_z /= move_length
-                    
-                    # Project vector to enemy onto movement direction
-                    dot_product = to_enemy_x*move_x + to_enemy_y*move_y + to_enemy_z*move_z
-                    
-                    # Clamp projection to segment length
-                    dot_product = max(0, min(move_length, dot_product))
-                    
-                    # Find closest point on line segment to enemy center
-                    closest_x = bullet['last_position'][0] + dot_product * move_x
-                    closest_y = bullet['last_position'][1] + dot_product * move_y
-                    closest_z = bullet['last_position'][2] + dot_product * move_z
-                    
-                    # Distance from closest point to enemy center
-                    dx = closest_x - enemy['position'][0]
-                    dy = closest_y - enemy['position'][1]
-                    dz = closest_z - enemy['position'][2]
-                    closest_distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-                    
-                    if closest_distance < enemy_size:
-                        hit_detected = True
-                else:
-                    # If bullet hasn't moved much, just use the simple distance check
-                    hit_detected = distance < enemy_size
-                
-                # If hit detected, process it
-                if hit_detected:
-                    # Reduce enemy health
-                    enemy['health'] -= 1
-                    
-                    # Check if enemy is defeated
-                    if enemy['health'] <= 0:
-                        enemy['alive'] = False
-                        
-                        # Add score for enemy elimination
-                        if enemy['type'] == 'red':
-                            player_score += 100
-                        elif enemy['type'] == 'blue':
-                            player_score += 200
-                        else:  # black
-                            player_score += 500
-                        
-                        # Particle effects disabled for stability
-                        # spawn_particles(enemy['position'], enemy['color'], 12)
-                        
-                        # Big shake on enemy death
-                        global shake_timer, shake_intensity
-                        shake_timer = 0.2  # Reduced intensity
-                        shake_intensity = 3.0  # Reduced from 5.0
-                        
-                        enemies_killed += 1
-                        show_notification(f"Enemy eliminated! ({enemy['type']})")
-                        print(f"Enemy eliminated! ({enemy['type']})")
-                    else:
-                        if enemy['type'] == 'blue':
-                            show_notification(f"Blue enemy hit! {enemy['health']}/2 health")
-                        else:  # black
-                            show_notification(f"Black enemy hit! {enemy['health']}/5 health")
-                        print(f"Enemy hit! Health: {enemy['health']} remaining")
-                    
-                    # Mark bullet for removal
-                    bullets_to_remove.append(bullet)
-                    
-                    # Track hit for this enemy for this frame
-                    hit_enemies.add(id(enemy))
-                    break  # Bullet can only hit one enemy
-    
-    # Remove hit bullets
-    for bullet in bullets_to_remove:
-        if bullet in bullets:
-            bullets.remove(bullet)
-    
-    # Check player-enemy collisions
-    for enemy in enemies:
-        if not enemy['alive']:
-            continue
-            
-        # Calculate XY distance
-        dx = player_position[0] - enemy['position'][0]
-        dy = player_position[1] - enemy['position'][1]
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        # Adjust collision radius for black enemies
-        enemy_width = ENEMY_WIDTH * enemy.get('scale', 1.0)
-        enemy_top_z = enemy['position'][2] + ENEMY_HEIGHT * enemy.get('scale', 1.0)
-        
-        # Skip collision if player jumped above the enemy
-        if player_position[2] > enemy_top_z + 10:
-            continue
-        
-        # Check for collision
-        if distance < player_width + enemy_width:
-            if player_shield_active:
-                # Shield absorbs the hit - destroy enemy and keep going!
-                enemy['alive'] = False
-                enemies_killed += 1
-                player_score += 300
-                show_notification("SHIELD DESTROYED ENEMY!")
-                shake_timer = 0.3
-                shake_intensity = 4.0
-            else:
-                player_was_caught = True
-                print("An enemy caught you! Game over.")
-                break
+    # Update FPS counter
+    frame_count += 1
+    if current_time - fps_last_time >= 1.0:
+        fps = frame_count
+        frame_count = 0
+        fps_last_time = current_time
     
-    # Check player-powerup collisions
-    for powerup in powerups:
-        if not powerup['active']:
-            continue
-            
-        # Calculate distance
-        dx = player_position[0] - powerup['position'][0]
-        dy = player_position[1] - powerup['position'][1]
-        dz = player_position[2] - powerup['position'][2]
-        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-        # Check for collision with larger radius
-        if distance < player_width + 25:  # Increased from 15 to 25
-            # Apply powerup effect
-            if powerup['type'] == 'speed':
-                player_speed_boost_active = True
-                player_speed_boost_timer = player_speed_boost_duration
-                player_move_speed = player_base_speed * 1.7
-                show_notification("SPEED BOOST ACTIVATED! +70% speed!")
-                player_score += 50
-            elif powerup['type'] == 'shield':
-                player_shield_active = True
-                player_shield_timer = SHIELD_DURATION
-                show_notification("SHIELD ACTIVATED! Invincible for 6s!")
-                player_score += 75
-            
-            # Deactivate powerup
-            powerup['active'] = False
+    advance(frame_time)
+    request_redisplay()
+
+def advance(frame_time):
+    """Tick the simulation at a fixed rate for frame_time seconds; leftover time becomes the render blend factor."""
+    global render_alpha
+    for _ in range(game_clock.advance(frame_time)):
+        sim.step(game_clock.dt)
+    render_alpha = game_clock.alpha
+
+# --- Interpolation Helpers ---
+def lerp_position(previous, current, alpha):
+    """Blend two positions; alpha 0 gives the previous tick, 1 the current one."""
+    return (previous[0] + (current[0] - previous[0]) * alpha,
+            previous[1] + (current[1] - previous[1]) * alpha,
+            previous[2] + (current[2] - previous[2]) * alpha)
+
+def lerp_angle(previous, current, alpha):
+    """Blend two angles in degrees along the shortest arc."""
+    diff = (current - previous + 180) % 360 - 180
+    return previous + diff * alpha
 
 def setup_camera():
     """Configure the camera position and orientation."""
@@ -2896,22 +2332,28 @@ def setup_camera():
     glMatrixMode(GL_MODELVIEW)
     glLoadIdentity()
     
+    # Interpolate player and camera between the last two simulation ticks
+    player_x, player_y, player_z = lerp_position(sim.prev_player_position, sim.player_position, render_alpha)
+    cam_yaw = lerp_angle(sim.prev_camera_yaw, sim.camera_yaw, render_alpha)
+    cam_pitch = sim.prev_camera_pitch + (sim.camera_pitch - sim.prev_camera_pitch) * render_alpha
+    cam_distance = sim.prev_camera_distance + (sim.camera_distance - sim.prev_camera_distance) * render_alpha
+    
     # Calculate camera pivot point (slightly above player)
-    pivot_z = player_position[2] + player_height * 0.6
+    pivot_z = player_z + player_height * 0.6
     
     # Convert camera angles to radians
-    cam_yaw_rad = math.radians(camera_yaw)
-    cam_pitch_rad = math.radians(camera_pitch)
+    cam_yaw_rad = math.radians(cam_yaw)
+    cam_pitch_rad = math.radians(cam_pitch)
     
     # Calculate camera offset from pivot point
-    offset_x = -camera_distance * math.cos(cam_yaw_rad) * math.cos(cam_pitch_rad)
-    offset_y = -camera_distance * math.sin(cam_yaw_rad) * math.cos(cam_pitch_rad)
-    offset_z = -camera_distance * math.sin(cam_pitch_rad)
+    offset_x = -cam_distance * math.cos(cam_yaw_rad) * math.cos(cam_pitch_rad)
+    offset_y = -cam_distance * math.sin(cam_yaw_rad) * math.cos(cam_pitch_rad)
+    offset_z = -cam_distance * math.sin(cam_pitch_rad)
     
     # Calculate camera position
-    eye_x = player_position[0] + offset_x
-    eye_y = player_position[1] + offset_y
-    eye_z = pivot_z + camera_height + offset_z
+    eye_x = player_x + offset_x
+    eye_y = player_y + offset_y
+    eye_z = pivot_z + sim.camera_height + offset_z
     
     # Ensure camera doesn't go below ground
     min_cam_z = 5.0
@@ -2919,54 +2361,54 @@ def setup_camera():
         eye_z = min_cam_z
     
     # Calculate look-at point
-    center_x = player_position[0]
-    center_y = player_position[1]
+    center_x = player_x
+    center_y = player_y
     center_z = pivot_z
     
     # Set up camera
     gluLookAt(eye_x, eye_y, eye_z,
               center_x, center_y, center_z,
               0.0, 0.0, 1.0)  # Up vector (z-axis)
+    
+    # Keep the view volume for culling scenery chunks this frame
+    global view_frustum, camera_eye, camera_right
+    modelview = glGetFloatv(GL_MODELVIEW_MATRIX)
+    view_frustum = frustum_planes(glGetFloatv(GL_PROJECTION_MATRIX), modelview)
+    camera_eye = (eye_x, eye_y, eye_z)
+    # First row of the view rotation; glGetFloatv returns columns
+    camera_right = (modelview[0][0], modelview[1][0], modelview[2][0])
 
 # --- Event Handlers ---
 def key_pressed(key, x, y):
     """Handle keyboard key press events."""
-    global keys_pressed, print_debug, sprint_key_held
-    global name_entry_active, player_name_input, high_scores
-    
     # Handle name entry mode
-    if name_entry_active:
+    if sim.name_entry_active:
         if key == b'\r' or key == b'\n':
             # Submit name
-            if player_name_input.strip():
-                high_scores.append((player_name_input.strip(), player_score))
-                high_scores.sort(key=lambda x: x[1], reverse=True)
-                high_scores = high_scores[:MAX_HIGH_SCORES]
-                print(f"High score saved: {player_name_input.strip()} - {player_score}")
-            name_entry_active = False
+            sim.submit_high_score(sim.player_name_input)
             return
         elif key == b'\x08' or key == b'\x7f':  # Backspace/Delete
-            player_name_input = player_name_input[:-1]
+            sim.player_name_input = sim.player_name_input[:-1]
             return
         elif key == b'\x1b':  # ESC to cancel
-            name_entry_active = False
+            sim.name_entry_active = False
             return
         else:
             # Add character (limit to 15 chars, printable only)
             try:
                 ch = key.decode('utf-8')
-                if len(player_name_input) < 15 and ch.isprintable():
-                    player_name_input += ch
+                if len(sim.player_name_input) < 15 and ch.isprintable():
+                    sim.player_name_input += ch
             except:
                 pass
             return
     
-    keys_pressed.add(key.lower())
+    sim.keys_pressed.add(key.lower())
     
     # Detect Shift via glutGetModifiers (safe in key-down callbacks)
     try:
         mods = glutGetModifiers()
-        sprint_key_held = bool(mods & GLUT_ACTIVE_SHIFT)
+        sim.sprint_key_held = bool(mods & GLUT_ACTIVE_SHIFT)
     except:
         pass
     
@@ -2974,213 +2416,134 @@ def key_pressed(key, x, y):
     if key == b'\x1b':
         # Use os._exit to avoid macOS GLUT segfault on shutdown
         import os
+        stop_recording()
         print("\nGame exited. Thanks for playing!")
         os._exit(0)
         
     # P to toggle debug info
     if key == b'p':
-        print_debug = not print_debug
-        print(f"Debug Print: {print_debug}")
+        sim.print_debug = not sim.print_debug
+        print(f"Debug Print: {sim.print_debug}")
         
+    # C to start or stop recording frames
+    if key == b'c':
+        if frame_recorder:
+            stop_recording()
+        else:
+            start_recording()
+    
     # R to restart the game
     if key == b'r':
-        restart_game()
+        sim.restart_game()
     
     # N to advance to next level (only when won and name entry is done)
-    if key == b'n' and player_reached_finish and not name_entry_active:
-        next_level()
+    if key == b'n' and sim.player_reached_finish and not sim.name_entry_active:
+        sim.next_level()
 
 def key_released(key, x, y):
     """Handle keyboard key release events."""
-    global sprint_key_held
-    keys_pressed.discard(key.lower())
+    sim.keys_pressed.discard(key.lower())
     # Note: glutGetModifiers() crashes in up-callbacks on macOS
     # Shift release is detected via key_pressed modifier checks instead
     # If no movement keys are pressed, sprint doesn't matter
 
 def special_key_pressed(key, x, y):
     """Handle special key press events (arrow keys, Shift, etc.)."""
-    global sprint_key_held
-    keys_pressed.add(key)
+    sim.keys_pressed.add(key)
     # Detect Shift via glutGetModifiers (safe in key-down callbacks)
     try:
         mods = glutGetModifiers()
-        sprint_key_held = bool(mods & GLUT_ACTIVE_SHIFT)
+        sim.sprint_key_held = bool(mods & GLUT_ACTIVE_SHIFT)
     except:
         pass
 
 def special_key_released(key, x, y):
     """Handle special key release events."""
-    global sprint_key_held
-    keys_pressed.discard(key)
+    sim.keys_pressed.discard(key)
     # Note: glutGetModifiers() crashes in up-callbacks on macOS
     # We can't directly detect Shift release here
     # But key_pressed modifier checks handle it on next keypress
 
-def next_level():
-    """Advance to the next level, keeping score and high scores."""
-    global player_position, target_player_position, player_direction, target_player_direction
-    global player_was_caught, player_reached_finish, GAME_STATE, STATE_TIMER, NEXT_STATE_CHANGE
-    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION, bullets, enemies
-    global GAME_START_TIME, GAME_PHASE
-    global player_velocity, powerups, player_speed_boost_active, player_move_speed
-    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
-    global player_stamina, player_is_sprinting, sprint_key_held
-    global sprint_exhausted, sprint_cooldown_timer
-    global player_z_velocity, player_is_jumping, player_on_ground
-    global player_shield_active, player_shield_timer, enemy_bullets
-    global CURRENT_LEVEL, name_entry_active, player_name_input
-    
-    CURRENT_LEVEL += 1
-    
-    # Reset player position but keep score
-    player_position = list(player_start_pos)
-    target_player_position = list(player_start_pos)
-    player_direction = 90.0
-    target_player_direction = 90.0
-    player_was_caught = False
-    player_reached_finish = False
-    player_velocity = [0.0, 0.0, 0.0]
-    player_stamina = player_max_stamina
-    player_is_sprinting = False
-    sprint_key_held = False
-    sprint_exhausted = False
-    sprint_cooldown_timer = 0.0
-    player_z_velocity = 0.0
-    player_is_jumping = False
-    player_on_ground = True
-    player_position[2] = player_ground_z
-    
-    # Reset shield
-    player_shield_active = False
-    player_shield_timer = 0.0
-    
-    # Reset name entry
-    name_entry_active = False
-    player_name_input = ""
-    
-    # Reset speed boost
-    player_speed_boost_active = False
-    player_move_speed = player_base_speed
-    
-    # Reset game state - make state changes faster each level
-    GAME_STATE = "green"
-    STATE_TIMER = 0
-    STATE_CHANGE_INTERVAL_MIN = max(1.5, 3.0 - (CURRENT_LEVEL - 1) * 0.3)
-    STATE_CHANGE_INTERVAL_MAX = max(3.0, 7.0 - (CURRENT_LEVEL - 1) * 0.5)
-    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
-    DOLL_CURRENT_ROTATION = 180
-    DOLL_TARGET_ROTATION = 180
-    GAME_START_TIME = time.time()
-    GAME_PHASE = 1
-    
-    # Clear bullets
-    bullets.clear()
-    enemy_bullets.clear()
-    
-    # Regenerate enemies and powerups (scaled to new level)
-    setup_enemies()
-    setup_powerups()
-    
-    print(f"Advanced to Level {CURRENT_LEVEL}!")
-
-
-def restart_game():
-    """Reset the game to its initial state."""
-    global player_position, target_player_position, player_direction, target_player_direction
-    global player_was_caught, player_reached_finish, GAME_STATE, STATE_TIMER, NEXT_STATE_CHANGE
-    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION, bullets, enemies
-    global player_score, time_survived, enemies_killed, GAME_START_TIME, GAME_PHASE
-    global player_velocity, powerups, player_speed_boost_active, player_move_speed
-    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
-    global player_stamina, player_is_sprinting, sprint_key_held
-    global sprint_exhausted, sprint_cooldown_timer
-    global player_z_velocity, player_is_jumping, player_on_ground
-    global player_shield_active, player_shield_timer, enemy_bullets
-    global CURRENT_LEVEL, name_entry_active, player_name_input
-    
-    # Reset player
-    player_position = list(player_start_pos)
-    target_player_position = list(player_start_pos)
-    player_direction = 90.0
-    target_player_direction = 90.0
-    player_was_caught = False
-    player_reached_finish = False
-    player_velocity = [0.0, 0.0, 0.0]
-    player_stamina = player_max_stamina
-    player_is_sprinting = False
-    sprint_key_held = False
-    sprint_exhausted = False
-    sprint_cooldown_timer = 0.0
-    player_z_velocity = 0.0
-    player_is_jumping = False
-    player_on_ground = True
-    player_position[2] = player_ground_z
-    
-    # Reset shield
-    player_shield_active = False
-    player_shield_timer = 0.0
-    
-    # Reset name entry
-    name_entry_active = False
-    player_name_input = ""
-    
-    # Reset speed boost
-    player_speed_boost_active = False
-    player_move_speed = player_base_speed
-    
-    # Reset game state
-    GAME_STATE = "green"
-    STATE_TIMER = 0
-    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
-    DOLL_CURRENT_ROTATION = 180
-    DOLL_TARGET_ROTATION = 180
-    GAME_START_TIME = time.time()
-    GAME_PHASE = 1
-    CURRENT_LEVEL = 1
-    
-    # Reset difficulty parameters to initial values
-    STATE_CHANGE_INTERVAL_MIN = 3.0
-    STATE_CHANGE_INTERVAL_MAX = 7.0
-    
-    # Reset scoring
-    player_score = 0
-    time_survived = 0
-    enemies_killed = 0
-    
-    # Clear bullets
-    bullets.clear()
-    enemy_bullets.clear()
-    
-    # Reset enemies
-    setup_enemies()
-    
-    # Reset powerups
-    setup_powerups()
-    
-    print("Game restarted!")
+def report_gl_errors(region):
+    """Print the GL errors raised since the last check, or raise them with STRICT_GL_ERRORS."""
+    try:
+        checkpoint(region)
+    except DeferredGLError as error:
+        if STRICT_GL_ERRORS:
+            raise
+        descriptions = ', '.join(gluErrorString(code).decode() for code in error.errors)
+        print(f"GL error in {error.region}: {descriptions}")
+
+def finish_frame(frame_start):
+    """Present the frame and let the quality governor see how long it took."""
+    global last_frame_start
+    report_gl_errors('display')
+    vertex_stream.next_frame()
+    if frame_recorder:
+        _, _, width, height = gl_state.viewport()
+        if not frame_recorder.capture(width, height) and frame_recorder.skipped == 1:
+            print(f"Window resized to {width}x{height}: skipping frames until it is back to "
+                  f"{frame_recorder.width}x{frame_recorder.height} (press C twice to record the new size)")
+        report_gl_errors('frame capture')
+    render_time = time.perf_counter() - frame_start
+    present_frame()
+    gl_state.end_frame()
+    
+    if PERFORMANCE_MODE and last_frame_start:
+        if quality_governor.record(frame_start - last_frame_start, render_time):
+            apply_quality_tier()
+            print(f"Quality tier: {quality_governor.name} "
+                  f"(avg frame {quality_governor.average_frame_time * 1000:.1f} ms before the change)")
+    last_frame_start = frame_start
+
+def start_recording(kind=RECORD_FORMAT, path=None):
+    """Capture every frame from now on into a RECORD_DIRECTORY file (or the given path)."""
+    global frame_recorder
+    if frame_recorder:
+        return
+    if path is None:
+        extension = {'png': '', 'raw': '.rgb', 'ffmpeg': '.mp4'}.get(kind, '')
+        os.makedirs(RECORD_DIRECTORY, exist_ok=True)
+        path = os.path.join(RECORD_DIRECTORY, time.strftime('recording-%Y%m%d-%H%M%S') + extension)
+    _, _, width, height = gl_state.viewport()
+    frame_recorder = FrameRecorder(width, height, open_sink(kind, path, width, height, TARGET_FPS))
+    print(f"Recording {width}x{height} frames to {path}")
+
+def stop_recording():
+    """Finish writing the recording, if one is running."""
+    global frame_recorder
+    if not frame_recorder:
+        return
+    recorder, frame_recorder = frame_recorder, None
+    recorder.close()
+    print(f"Recording stopped: {recorder.written} frames written to {recorder.sink.path}"
+          f" ({recorder.stalls} waits for the writer, {recorder.skipped} resized frames skipped)")
 
 def display():
     """Main display function to render the game scene."""
+    frame_start = time.perf_counter()
+    
     # Clear the screen
     glClearColor(FOG_COLOR[0], FOG_COLOR[1], FOG_COLOR[2], 1.0)
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     
     # Get current window size (to handle full screen)
-    viewport = glGetIntegerv(GL_VIEWPORT)
+    viewport = gl_state.viewport()
     window_width = viewport[2]
     window_height = viewport[3]
     
-    # Calculate scaling factors for UI positioning
-    width_scale = window_width / WINDOW_WIDTH
-    height_scale = window_height / WINDOW_HEIGHT
+    # Scale the HUD layout to the viewport
+    update_hud_layout(window_width, window_height)
     
     # Handle start screen
-    if GAME_STATE == "start":
+    if sim.GAME_STATE == "start":
         draw_start_screen()
-        glutSwapBuffers()
+        finish_frame(frame_start)
         return
     
+    # The world may be drawn offscreen at a lower resolution; the HUD below is always native
+    scene_resolution.begin(window_width, window_height)
+    
     # Draw sky (no fog/lighting)
     draw_sky()
     
@@ -3188,51 +2551,48 @@ def display():
     setup_camera()
     
     # Apply Screen Shake
-    if shake_timer > 0:
+    if sim.shake_timer > 0:
         glMatrixMode(GL_MODELVIEW)
-        glTranslatef(camera_shake_x, camera_shake_y, 0)
+        glTranslatef(sim.camera_shake_x, sim.camera_shake_y, 0)
 
     
     # Draw sun
     draw_fixed_sun()
     
     # Enable fog for distant objects
-    glEnable(GL_FOG)
+    gl_state.enable(GL_FOG)
     
     # Draw environment elements
-    if environment_display_list:
-        glCallList(environment_display_list)
-    else:
-        # Fallback if list not created yet
-        draw_fixed_plants()
-        draw_field()
+    draw_environment()
     draw_giant_doll()
     
     # Draw game entities
-    for powerup in powerups:
+    for powerup in sim.powerups:
         if powerup['active']:
             draw_powerup(powerup)
     
-    # Particle rendering disabled for stability
-    # (Particles were causing GLUT callback crashes)
-
-    for enemy in enemies:
-        draw_enemy(enemy)
+    for i in range(len(sim.enemies)):
+        draw_enemy(i)
     
     draw_player()
     
     # Draw shield effect around player
     draw_shield_effect()
     
-    for bullet in bullets:
-        draw_bullet(bullet)
+    for slot in sim.bullets.live_slots():
+        draw_bullet(slot)
     
     # Draw enemy bullets
-    for eb in enemy_bullets:
-        draw_enemy_bullet(eb)
+    for slot in sim.enemy_bullets.live_slots():
+        draw_enemy_bullet(slot)
+    
+    # Translucent particles last, over the opaque scene
+    draw_particles()
+    
+    scene_resolution.end()
     
     # Disable fog for UI elements
-    glDisable(GL_FOG)
+    gl_state.disable(GL_FOG)
     
     # Draw UI overlay
     glMatrixMode(GL_PROJECTION)
@@ -3244,16 +2604,16 @@ def display():
     glPushMatrix()
     glLoadIdentity()
     
-    glDisable(GL_DEPTH_TEST)
-    glDisable(GL_LIGHTING)
+    gl_state.disable(GL_DEPTH_TEST)
+    gl_state.disable(GL_LIGHTING)
     
     # Red Light Tint/Vignette Effect - strong blinking red tint
-    if GAME_STATE == "red" and DOLL_CURRENT_ROTATION < 45:
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    if sim.GAME_STATE == "red" and sim.DOLL_CURRENT_ROTATION < 45:
+        gl_state.enable(GL_BLEND)
+        gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
         # Intense blinking red overlay
-        blink = 0.5 + 0.5 * math.sin(time.time() * 6.0)  # Fast blink
+        blink = 0.5 + 0.5 * math.sin(animation_clock.time() * 6.0)  # Fast blink
         pulse = 0.12 + 0.18 * blink
         glColor4f(1.0, 0.0, 0.0, pulse)
         
@@ -3296,15 +2656,15 @@ def display():
         glVertex2f(window_width - border, window_height)
         glEnd()
         
-        glDisable(GL_BLEND)
+        gl_state.disable(GL_BLEND)
     
     # Yellow Light Tint - warning blink
-    elif GAME_STATE == "yellow":
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    elif sim.GAME_STATE == "yellow":
+        gl_state.enable(GL_BLEND)
+        gl_state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
         # Blinking yellow/amber overlay
-        blink = 0.5 + 0.5 * math.sin(time.time() * 4.0)  # Medium blink
+        blink = 0.5 + 0.5 * math.sin(animation_clock.time() * 4.0)  # Medium blink
         pulse = 0.06 + 0.10 * blink
         glColor4f(1.0, 0.85, 0.0, pulse)
         
@@ -3347,53 +2707,7 @@ def display():
         glVertex2f(window_width - border, window_height)
         glEnd()
         
-        glDisable(GL_BLEND)
-
-    
-    # Create semi-transparent background for text to improve readability
-    def draw_text_background(x, y, width, height, alpha=0.6):
-        # Scale positions for current window size
-        x = x * width_scale
-        y = y * height_scale
-        width = width * width_scale
-        height = height * height_scale
-        
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.1, 0.1, 0.1, alpha)
-        glBegin(GL_QUADS)
-        glVertex2f(x, y)
-        glVertex2f(x + width, y)
-        glVertex2f(x + width, y + height)
-        glVertex2f(x, y + height)
-        glEnd()
-        glDisable(GL_BLEND)
-    
-    # Modified draw_text function to scale for window size
-    def draw_scaled_text(x, y, text, font=GLUT_BITMAP_HELVETICA_18, color=(1.0, 1.0, 1.0)):
-        # Scale positions for current window size
-        x = x * width_scale
-        y = y * height_scale
-        
-        glColor3fv(color)
-        glWindowPos2f(x, y)
-        for char in text:
-            glutBitmapCharacter(font, ord(char))
-    
-    # Modified centered text function to scale for window size
-    def draw_scaled_centered_text(text, y_pos, font=GLUT_BITMAP_TIMES_ROMAN_24, color=(1.0, 1.0, 1.0)):
-        text_width = 0
-        for char in text:
-            text_width += glutBitmapWidth(font, ord(char))
-        
-        # Scale for window size
-        x_pos = (window_width - text_width) // 2
-        y_pos = y_pos * height_scale
-        
-        glColor3fv(color)
-        glWindowPos2f(x_pos, y_pos)
-        for char in text:
-            glutBitmapCharacter(font, ord(char))
+        gl_state.disable(GL_BLEND)
     
     # --- CLEAN UI LAYOUT ---
     # Layout:
@@ -3405,152 +2719,39 @@ def display():
     #   Controls:     Minimal at very bottom-left
     #   Game Over/Win: Full-screen centered overlay
     
-    # Helper: measure text width  
-    def text_w(text, font=GLUT_BITMAP_HELVETICA_18):
-        w = 0
-        for c in text:
-            w += glutBitmapWidth(font, ord(c))
-        return w
-    
-    # Helper: draw a rounded-look panel (dark bg with slight border)
-    def draw_panel(x, y, w, h, alpha=0.75, border_color=None):
-        sx = x * width_scale
-        sy = y * height_scale
-        sw = w * width_scale
-        sh = h * height_scale
-        
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        # Dark fill
-        glColor4f(0.05, 0.05, 0.1, alpha)
-        glBegin(GL_QUADS)
-        glVertex2f(sx, sy)
-        glVertex2f(sx + sw, sy)
-        glVertex2f(sx + sw, sy + sh)
-        glVertex2f(sx, sy + sh)
-        glEnd()
-        
-        # Border
-        if border_color:
-            glColor4f(border_color[0], border_color[1], border_color[2], 0.6)
-        else:
-            glColor4f(0.3, 0.3, 0.4, 0.5)
-        glLineWidth(1.5)
-        glBegin(GL_LINE_LOOP)
-        glVertex2f(sx, sy)
-        glVertex2f(sx + sw, sy)
-        glVertex2f(sx + sw, sy + sh)
-        glVertex2f(sx, sy + sh)
-        glEnd()
-        
-        glDisable(GL_BLEND)
-    
-    # Helper: draw a bar (progress/stamina/health style)
-    def draw_bar(x, y, w, h, fill_pct, fill_color, bg_color=(0.2, 0.2, 0.2), border=True):
-        sx = x * width_scale
-        sy = y * height_scale
-        sw = w * width_scale
-        sh = h * height_scale
-        fill_pct = max(0.0, min(1.0, fill_pct))
-        
-        # Background
-        glColor3f(*bg_color)
-        glBegin(GL_QUADS)
-        glVertex2f(sx, sy)
-        glVertex2f(sx + sw, sy)
-        glVertex2f(sx + sw, sy + sh)
-        glVertex2f(sx, sy + sh)
-        glEnd()
-        
-        # Fill
-        fw = sw * fill_pct
-        glColor3f(*fill_color)
-        glBegin(GL_QUADS)
-        glVertex2f(sx, sy)
-        glVertex2f(sx + fw, sy)
-        glVertex2f(sx + fw, sy + sh)
-        glVertex2f(sx, sy + sh)
-        glEnd()
-        
-        # Border
-        if border:
-            glColor3f(0.5, 0.5, 0.5)
-            glLineWidth(1.0)
-            glBegin(GL_LINE_LOOP)
-            glVertex2f(sx, sy)
-            glVertex2f(sx + sw, sy)
-            glVertex2f(sx + sw, sy + sh)
-            glVertex2f(sx, sy + sh)
-            glEnd()
-    
     # Calculate common values
-    actual_speed = math.sqrt(player_velocity[0]**2 + player_velocity[1]**2)
-    is_sprint_active = player_is_sprinting and player_stamina > 0
-    stamina_pct = player_stamina / player_max_stamina
+    actual_speed = math.sqrt(sim.player_velocity[0]**2 + sim.player_velocity[1]**2)
+    is_sprint_active = sim.player_is_sprinting and sim.player_stamina > 0
+    stamina_pct = sim.player_stamina / player_max_stamina
     
     start_y_pos = -PLAY_AREA_LENGTH / 2
     end_y_pos = PLAY_AREA_LENGTH / 2
     total_distance = end_y_pos - start_y_pos
-    current_distance = player_position[1] - start_y_pos
+    current_distance = sim.player_position[1] - start_y_pos
     progress = max(0.0, min(1.0, current_distance / total_distance))
     # Force 100% on win
-    if player_reached_finish:
+    if sim.player_reached_finish:
         progress = 1.0
     
-    game_alive = not player_was_caught and not player_reached_finish
+    game_alive = not sim.player_was_caught and not sim.player_reached_finish
     
     # ===== 1. TOP LEFT: Score Panel =====
-    panel_x = 10
-    panel_y = WINDOW_HEIGHT - 110
-    panel_w = 200
-    panel_h = 100
-    
-    draw_panel(panel_x, panel_y, panel_w, panel_h, 0.8)
-    
-    # Score (gold, prominent)
-    draw_scaled_text(panel_x + 10, panel_y + panel_h - 22, f"SCORE  {player_score}", GLUT_BITMAP_HELVETICA_18, (1.0, 0.85, 0.1))
-    # Time
-    draw_scaled_text(panel_x + 10, panel_y + panel_h - 42, f"TIME   {time_survived:.1f}s", GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
-    # Kills
-    draw_scaled_text(panel_x + 10, panel_y + panel_h - 58, f"KILLS  {enemies_killed}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.45, 0.45))
-    # Phase & Level
-    draw_scaled_text(panel_x + 10, panel_y + panel_h - 74, f"PHASE  {GAME_PHASE}", GLUT_BITMAP_HELVETICA_12, (0.4, 0.9, 1.0))
-    draw_scaled_text(panel_x + 10, panel_y + panel_h - 90, f"LEVEL  {CURRENT_LEVEL}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.6, 1.0))
+    score_widget.draw(sim.player_score, f"{sim.time_survived:.1f}", sim.enemies_killed, sim.GAME_PHASE, sim.CURRENT_LEVEL)
     
     # ===== 2. TOP RIGHT: Quick Stats =====
-    stats_w = 160
-    stats_h = 100
-    stats_x = WINDOW_WIDTH - stats_w - 10
-    stats_y = WINDOW_HEIGHT - stats_h - 10
-    
-    draw_panel(stats_x, stats_y, stats_w, stats_h, 0.8)
-    
-    draw_scaled_text(stats_x + 8, stats_y + stats_h - 18, f"FPS {fps:.0f}", GLUT_BITMAP_HELVETICA_12, (0.5, 1.0, 0.5))
-    draw_scaled_text(stats_x + 80, stats_y + stats_h - 18, f"AMMO {len(bullets)}", GLUT_BITMAP_HELVETICA_12, (1.0, 0.8, 0.3))
-    
-    # Sprint / Exhaustion status
-    if sprint_exhausted:
-        cd_text = f"EXHAUSTED {sprint_cooldown_timer:.1f}s"
-        draw_scaled_text(stats_x + 8, stats_y + stats_h - 36, cd_text, GLUT_BITMAP_HELVETICA_12, (1.0, 0.2, 0.2))
+    if sim.sprint_exhausted:
+        sprint_line = (f"EXHAUSTED {sim.sprint_cooldown_timer:.1f}s", (1.0, 0.2, 0.2))
     elif is_sprint_active:
-        draw_scaled_text(stats_x + 8, stats_y + stats_h - 36, "SPRINTING", GLUT_BITMAP_HELVETICA_12, (1.0, 1.0, 0.0))
+        sprint_line = ("SPRINTING", (1.0, 1.0, 0.0))
+    else:
+        sprint_line = None
+    shield_text = f"SHIELD {sim.player_shield_timer:.1f}s" if sim.player_shield_active else None
     
-    # Shield indicator
-    if player_shield_active:
-        draw_scaled_text(stats_x + 8, stats_y + stats_h - 52, f"SHIELD {player_shield_timer:.1f}s", GLUT_BITMAP_HELVETICA_12, (0.3, 0.7, 1.0))
-    
-    # Jump hint
-    if not player_on_ground:
-        draw_scaled_text(stats_x + 8, stats_y + stats_h - 68, "AIRBORNE", GLUT_BITMAP_HELVETICA_12, (0.5, 1.0, 0.8))
+    stats_widget.draw(f"{fps:.0f}", len(sim.bullets), sprint_line, shield_text, not sim.player_on_ground)
     
     # --- Speed Meter ---
     max_display_speed = player_base_speed * 2.5  # Scale bar relative to max possible speed
     speed_pct = min(1.0, actual_speed / max_display_speed)
-    speed_bar_x = stats_x + 8
-    speed_bar_y = stats_y + 22
-    speed_bar_w = stats_w - 16
-    speed_bar_h = 8
     
     # Color shifts: white → green → yellow → red as speed increases
     if speed_pct < 0.4:
@@ -3562,215 +2763,66 @@ def display():
     else:
         spd_color = (1.0, 0.3, 0.1)   # Red (boosted)
     
-    draw_bar(speed_bar_x, speed_bar_y, speed_bar_w, speed_bar_h, speed_pct, spd_color)
-    speed_label = f"SPD {actual_speed:.0f}"
-    draw_scaled_text(speed_bar_x, speed_bar_y + speed_bar_h + 2, speed_label, GLUT_BITMAP_HELVETICA_12, spd_color)
-    
     # --- Stamina Bar ---
-    mini_stam_x = stats_x + 8
-    mini_stam_y = stats_y + 6
-    mini_stam_w = stats_w - 16
-    mini_stam_h = 8
-    
-    if sprint_exhausted:
+    if sim.sprint_exhausted:
         stam_color = (0.6, 0.1, 0.1)  # Dark red during cooldown
     elif is_sprint_active:
         stam_color = (1.0, 0.4, 0.1)
-    elif player_stamina < player_max_stamina:
+    elif sim.player_stamina < player_max_stamina:
         stam_color = (0.6, 1.0, 0.2)
     else:
         stam_color = (0.2, 0.8, 1.0)
     
-    draw_bar(mini_stam_x, mini_stam_y, mini_stam_w, mini_stam_h, stamina_pct, stam_color)
+    meters_widget.draw(snap_fill(speed_pct, METER_W), f"SPD {actual_speed:.0f}", spd_color,
+                       snap_fill(stamina_pct, METER_W), stam_color)
     
     # ===== 3. TOP CENTER: Light State + Timer =====
     if game_alive:
-        if GAME_STATE == "red":
-            state_text = DIALOGUE_RED_LIGHT
-            state_color = (1.0, 0.15, 0.15)
-            border_c = (0.8, 0.1, 0.1)
-        elif GAME_STATE == "yellow":
-            state_text = DIALOGUE_YELLOW_WARNING
-            state_color = (1.0, 0.9, 0.1)
-            border_c = (0.8, 0.7, 0.0)
-        else:
-            state_text = DIALOGUE_GREEN_LIGHT
-            state_color = (0.15, 1.0, 0.15)
-            border_c = (0.1, 0.7, 0.1)
-        
-        tw = text_w(state_text, GLUT_BITMAP_TIMES_ROMAN_24)
-        state_panel_w = tw + 60
-        state_panel_x = (WINDOW_WIDTH - state_panel_w) // 2
-        state_panel_y = WINDOW_HEIGHT - 55
-        state_panel_h = 45
-        
-        draw_panel(state_panel_x, state_panel_y, state_panel_w, state_panel_h, 0.85, border_c)
-        draw_scaled_centered_text(state_text, WINDOW_HEIGHT - 40, GLUT_BITMAP_TIMES_ROMAN_24, state_color)
-        
-        # Timer below
-        time_left = max(0.0, NEXT_STATE_CHANGE - STATE_TIMER)
-        timer_text = f"Next in {time_left:.1f}s"
-        ttw = text_w(timer_text, GLUT_BITMAP_HELVETICA_12)
-        timer_panel_w = ttw + 30
-        timer_panel_x = (WINDOW_WIDTH - timer_panel_w) // 2
-        timer_panel_y = WINDOW_HEIGHT - 78
-        
-        draw_panel(timer_panel_x, timer_panel_y, timer_panel_w, 20, 0.6)
-        draw_scaled_centered_text(timer_text, WINDOW_HEIGHT - 74, GLUT_BITMAP_HELVETICA_12, (0.85, 0.85, 0.85))
+        time_left = max(0.0, sim.NEXT_STATE_CHANGE - sim.STATE_TIMER)
+        light_state_widget.draw(sim.GAME_STATE, f"Next in {time_left:.1f}s")
     
     # ===== 4. NOTIFICATIONS (mid-center, below state) =====
-    if notification_timer > 0 and notification_text:
-        notif_alpha = min(1.0, notification_timer / 0.5)
-        nw = text_w(notification_text) + 40
-        nx = (WINDOW_WIDTH - nw) // 2
-        ny = WINDOW_HEIGHT - 115
-        
-        draw_panel(nx, ny, nw, 28, 0.7 * notif_alpha, (1.0, 0.9, 0.2))
-        draw_scaled_centered_text(notification_text, ny + 8, GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 0.3))
+    if sim.notification_timer > 0 and sim.notification_text:
+        # Fade in steps so the widget is not rebuilt on every frame of the fade
+        notif_alpha = round(min(1.0, sim.notification_timer / 0.5) * 32) / 32
+        notification_widget.draw(sim.notification_text, notif_alpha)
     
     # ===== 5. BOTTOM: Progress Bar =====
-    prog_bar_w = 500
-    prog_bar_h = 16
-    prog_bar_x = (WINDOW_WIDTH - prog_bar_w) // 2
-    prog_bar_y = 35
-    
-    # Progress fill color: red -> yellow -> green
-    if progress < 0.5:
-        pr, pg, pb = 1.0, progress * 2.0, 0.0
-    else:
-        pr, pg, pb = 1.0 - (progress - 0.5) * 2.0, 1.0, 0.0
-    
-    # Panel behind progress
-    draw_panel(prog_bar_x - 8, prog_bar_y - 8, prog_bar_w + 16, prog_bar_h + 34, 0.7)
-    draw_bar(prog_bar_x, prog_bar_y, prog_bar_w, prog_bar_h, progress, (pr, pg, pb))
-    
-    # Progress label
-    progress_text = f"PROGRESS: {int(progress * 100)}%"
-    draw_scaled_centered_text(progress_text, prog_bar_y + prog_bar_h + 5, GLUT_BITMAP_HELVETICA_12, (1.0, 1.0, 1.0))
+    progress_widget.draw(snap_fill(progress, PROGRESS_BAR_W), int(progress * 100))
     
     # ===== 6. GAME OVER / WIN OVERLAY =====
-    if player_was_caught:
-        # Dark overlay
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.0, 0.0, 0.0, 0.5)
-        glBegin(GL_QUADS)
-        glVertex2f(0, 0)
-        glVertex2f(window_width, 0)
-        glVertex2f(window_width, window_height)
-        glVertex2f(0, window_height)
-        glEnd()
-        glDisable(GL_BLEND)
-        
-        # Big centered panel
-        ov_w = 420
-        ov_h = 200
-        ov_x = (WINDOW_WIDTH - ov_w) // 2
-        ov_y = (WINDOW_HEIGHT - ov_h) // 2
-        
-        draw_panel(ov_x, ov_y, ov_w, ov_h, 0.9, (0.8, 0.1, 0.1))
-        
-        # "ELIMINATED" title
-        draw_scaled_centered_text("ELIMINATED", ov_y + ov_h - 40, GLUT_BITMAP_TIMES_ROMAN_24, (1.0, 0.15, 0.15))
-        
-        # Cause
-        if GAME_STATE == "red":
-            cause = "You moved during RED LIGHT!"
-        else:
-            cause = "Caught by an enemy!"
-        draw_scaled_centered_text(cause, ov_y + ov_h - 75, GLUT_BITMAP_HELVETICA_18, (1.0, 0.7, 0.7))
-        
-        # Stats
-        draw_scaled_centered_text(f"Score: {player_score}    Kills: {enemies_killed}    Time: {time_survived:.1f}s", ov_y + ov_h - 110, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
-        draw_scaled_centered_text(f"Phase Reached: {GAME_PHASE}    Progress: {int(progress * 100)}%", ov_y + ov_h - 135, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
-        
-        # Pulsing restart prompt
-        pulse = 0.6 + 0.4 * math.sin(time.time() * 3.0)
-        draw_scaled_centered_text("Press R to Restart", ov_y + 20, GLUT_BITMAP_HELVETICA_18, (pulse, pulse, pulse))
-        
-    elif player_reached_finish:
-        # Gold overlay
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.1, 0.08, 0.0, 0.4)
-        glBegin(GL_QUADS)
-        glVertex2f(0, 0)
-        glVertex2f(window_width, 0)
-        glVertex2f(window_width, window_height)
-        glVertex2f(0, window_height)
-        glEnd()
-        glDisable(GL_BLEND)
-        
-        # Big centered panel
-        ov_w = 450
-        ov_h = 320
-        ov_x = (WINDOW_WIDTH - ov_w) // 2
-        ov_y = (WINDOW_HEIGHT - ov_h) // 2
-        
-        draw_panel(ov_x, ov_y, ov_w, ov_h, 0.92, (0.2, 0.8, 0.2))
-        
-        # "YOU WIN" title with pulsing gold
-        pulse = 0.7 + 0.3 * math.sin(time.time() * 2.5)
-        draw_scaled_centered_text("YOU WIN!", ov_y + ov_h - 35, GLUT_BITMAP_TIMES_ROMAN_24, (pulse, 0.9 * pulse, 0.1))
-        
-        # Subtitle
-        draw_scaled_centered_text("You reached the finish line!", ov_y + ov_h - 60, GLUT_BITMAP_HELVETICA_18, (0.8, 1.0, 0.8))
-        
-        # Stats
-        draw_scaled_centered_text(f"Final Score: {player_score}", ov_y + ov_h - 90, GLUT_BITMAP_HELVETICA_18, (1.0, 0.85, 0.1))
-        draw_scaled_centered_text(f"Kills: {enemies_killed}    Time: {time_survived:.1f}s    Phase: {GAME_PHASE}    Level: {CURRENT_LEVEL}", ov_y + ov_h - 115, GLUT_BITMAP_HELVETICA_12, (0.8, 0.8, 0.8))
-        
-        # Name entry
-        if name_entry_active:
-            draw_scaled_centered_text("Enter your name for the leaderboard:", ov_y + ov_h - 145, GLUT_BITMAP_HELVETICA_12, (0.9, 0.9, 0.5))
-            # Name input box
-            input_w = 200
-            input_h = 24
-            input_x = (WINDOW_WIDTH - input_w) // 2
-            input_y = ov_y + ov_h - 175
-            draw_panel(input_x, input_y, input_w, input_h, 0.6, (0.8, 0.8, 0.2))
-            cursor = "_" if int(time.time() * 2) % 2 == 0 else " "  # Blinking cursor
-            draw_scaled_centered_text(player_name_input + cursor, input_y + 6, GLUT_BITMAP_HELVETICA_18, (1.0, 1.0, 1.0))
-            draw_scaled_centered_text("Press ENTER to submit", ov_y + ov_h - 195, GLUT_BITMAP_HELVETICA_12, (0.7, 0.7, 0.7))
-        else:
-            # Show high scores
-            if high_scores:
-                draw_scaled_centered_text("--- HIGH SCORES ---", ov_y + ov_h - 145, GLUT_BITMAP_HELVETICA_12, (1.0, 0.85, 0.1))
-                for i, (name, score) in enumerate(high_scores[:5]):
-                    rank_color = (1.0, 0.85, 0.1) if i == 0 else (0.8, 0.8, 0.8)
-                    hs_text = f"{i+1}. {name} - {score}"
-                    draw_scaled_centered_text(hs_text, ov_y + ov_h - 162 - i * 16, GLUT_BITMAP_HELVETICA_12, rank_color)
-            
-            # Next level / Restart
-            pulse2 = 0.6 + 0.4 * math.sin(time.time() * 3.0)
-            draw_scaled_centered_text("Press N for Next Level", ov_y + 38, GLUT_BITMAP_HELVETICA_18, (0.2, 1.0, 0.4))
-            draw_scaled_centered_text("Press R to Restart (Lv.1)", ov_y + 16, GLUT_BITMAP_HELVETICA_12, (pulse2, pulse2, pulse2))
+    if sim.player_was_caught:
+        draw_caught_overlay(progress)
+    elif sim.player_reached_finish:
+        draw_victory_overlay()
     
     # Speed boost indicator (top-right, below stats panel)  
-    if player_speed_boost_active:
-        boost_text = f"SPEED BOOST {player_speed_boost_timer:.1f}s"
-        bw = text_w(boost_text, GLUT_BITMAP_HELVETICA_12)
-        bx = WINDOW_WIDTH - bw - 30
-        by = stats_y - 30
-        draw_panel(bx, by, bw + 20, 22, 0.8, (0.0, 0.6, 1.0))
-        draw_scaled_text(bx + 10, by + 5, boost_text, GLUT_BITMAP_HELVETICA_12, (0.0, 0.9, 1.0))
+    if sim.player_speed_boost_active:
+        speed_boost_widget.draw(f"SPEED BOOST {sim.player_speed_boost_timer:.1f}s")
     
     # Debug info (only when P pressed)
-    if print_debug:
-        draw_panel(10, WINDOW_HEIGHT - 200, 380, 90, 0.7)
-        px, py = int(player_position[0]), int(player_position[1])
-        draw_scaled_text(18, WINDOW_HEIGHT - 120, f"Pos:({px},{py}) Dir:{player_direction:.0f}", GLUT_BITMAP_HELVETICA_12, (0.7, 1.0, 0.7))
-        draw_scaled_text(18, WINDOW_HEIGHT - 138, f"Cam Y:{camera_yaw:.0f} P:{camera_pitch:.0f} D:{camera_distance:.0f}", GLUT_BITMAP_HELVETICA_12, (0.7, 1.0, 0.7))
-        draw_scaled_text(18, WINDOW_HEIGHT - 156, f"State:{GAME_STATE} Timer:{STATE_TIMER:.1f}/{NEXT_STATE_CHANGE:.1f}", GLUT_BITMAP_HELVETICA_12, (0.7, 1.0, 0.7))
-        draw_scaled_text(18, WINDOW_HEIGHT - 174, f"Phase:{GAME_PHASE} Vel:{player_velocity[0]:.0f},{player_velocity[1]:.0f}", GLUT_BITMAP_HELVETICA_12, (0.7, 1.0, 0.7))
+    if sim.print_debug:
+        px, py = int(sim.player_position[0]), int(sim.player_position[1])
+        debug_info_widget.draw((
+            f"Pos:({px},{py}) Dir:{sim.player_direction:.0f}",
+            f"Cam Y:{sim.camera_yaw:.0f} P:{sim.camera_pitch:.0f} D:{sim.camera_distance:.0f}",
+            f"State:{sim.GAME_STATE} Timer:{sim.STATE_TIMER:.1f}/{sim.NEXT_STATE_CHANGE:.1f}",
+            f"Phase:{sim.GAME_PHASE} Vel:{sim.player_velocity[0]:.0f},{sim.player_velocity[1]:.0f}",
+            "GL state: {} set, {} redundant skipped, {} queries cached".format(*gl_state.last_frame),
+            f"Quality: {quality_governor.name} ({quality_governor.tier + 1}/{len(quality_governor.tiers)})"
+            f"  avg frame {quality_governor.average_frame_time * 1000:.1f} ms",
+            f"Render scale: {scene_resolution.scale:.0%} ({scene_resolution.scene_size[0]}x"
+            f"{scene_resolution.scene_size[1]})  scene {scene_resolution.scene_time * 1000:.1f} ms",
+            f"Particles: {sim.sparks.count} sparks, {sim.debris.count} debris"
+            f"  ({sim.sparks.dropped + sim.debris.dropped} dropped)",
+        ))
     
     # Minimal controls hint (very bottom-left, small)
-    ctrl_text = "WASD:Move  Arrows:Cam  Space:Shoot  Shift:Sprint  J:Jump  R:Restart"
-    draw_scaled_text(12, 8, ctrl_text, GLUT_BITMAP_HELVETICA_12, (0.5, 0.5, 0.5))
+    controls_hint_widget.draw()
     
     # Restore rendering state
-    glEnable(GL_LIGHTING)
-    glEnable(GL_DEPTH_TEST)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.enable(GL_DEPTH_TEST)
     glPopMatrix()
     
     glMatrixMode(GL_PROJECTION)
@@ -3779,14 +2831,14 @@ def display():
     glMatrixMode(GL_MODELVIEW)
     
     # Swap buffers to display the rendered scene
-    glutSwapBuffers()
+    finish_frame(frame_start)
 
 def reshape(width, height):
     global WINDOW_WIDTH, WINDOW_HEIGHT
     WINDOW_WIDTH = width
     WINDOW_HEIGHT = height
-    glViewport(0, 0, width, height)
-    glutPostRedisplay()
+    gl_state.set_viewport(0, 0, width, height)
+    request_redisplay()
 
 def print_controls():
     """Print game controls to the console."""
@@ -3799,6 +2851,7 @@ def print_controls():
     print(" Jump: J")
     print(" Restart Game: R")
     print(" Debug Info: P")
+    print(" Record Frames: C")
     print(" Exit: ESC")
     print("---------------------------------------")
     print(" Game Rules:")
@@ -3819,17 +2872,10 @@ def print_controls():
 
 def main():
     """Initialize OpenGL and set up the game."""
-    global last_update_time, fps_last_time, target_player_position, target_player_direction
-    global target_camera_yaw, target_camera_pitch
-    
-    # Initialize target positions and orientations
-    target_player_position = list(player_position)
-    target_player_direction = player_direction
-    target_camera_yaw = camera_yaw
-    target_camera_pitch = camera_pitch
+    global last_update_time, fps_last_time
     
     # Initialize timing variables
-    current_time = time.time()
+    current_time = time.perf_counter()
     last_update_time = current_time
     fps_last_time = current_time
     
@@ -3840,17 +2886,58 @@ def main():
     glutInitWindowPosition(50, 50)
     glutCreateWindow(bytes(f"{GAME_TITLE} v{GAME_VERSION}", 'utf-8'))
     
+    # Print controls to console
+    print_controls()
+    
+    init_game()
+    
+    # Register GLUT callbacks
+    glutDisplayFunc(display)
+    glutKeyboardFunc(key_pressed)
+    glutKeyboardUpFunc(key_released)
+    glutSpecialFunc(special_key_pressed)
+    glutSpecialUpFunc(special_key_released)
+    glutIdleFunc(update_state)
+    glutReshapeFunc(reshape)
+    
+    # Start the game loop
+    print("Starting game... Press Enter to start, ESC to exit")
+    glutMainLoop()
+
+def init_game(clock=None, shapes=None, bitmaps=None, swap_buffers=None, post_redisplay=None):
+    """
+    Set up GL state, build the world and its GPU resources, and place enemies; needs a current context.
+
+    The GLUT front-end passes nothing. Windowless callers pass what GLUT would
+    otherwise provide: a clock (anything with time()) for the animations,
+    shapes like shapes.ArrayShapes, glyph bitmaps like
+    glyphs.FontTableBitmaps, and the functions to call in place of
+    glutSwapBuffers and glutPostRedisplay.
+    """
+    global vertex_stream, animation_clock, solid_shapes, present_frame, request_redisplay
+    animation_clock = clock or time
+    solid_shapes = shapes or GLUTShapes()
+    present_frame = swap_buffers or glutSwapBuffers
+    request_redisplay = post_redisplay or glutPostRedisplay
+    if bitmaps is not None:
+        glyph_atlas.bitmaps = bitmaps
+    # Initialize target positions and orientations
+    sim.target_player_position = list(sim.player_position)
+    sim.target_player_direction = sim.player_direction
+    sim.target_camera_yaw = sim.camera_yaw
+    sim.target_camera_pitch = sim.camera_pitch
+    
     # Set up OpenGL state
-    glEnable(GL_DEPTH_TEST)
+    gl_state.enable(GL_DEPTH_TEST)
     glDepthFunc(GL_LEQUAL)
-    glEnable(GL_NORMALIZE)
+    gl_state.enable(GL_NORMALIZE)
     glShadeModel(GL_SMOOTH)
-    glEnable(GL_COLOR_MATERIAL)
+    gl_state.enable(GL_COLOR_MATERIAL)
     glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
     
     # Set up lighting
-    glEnable(GL_LIGHTING)
-    glEnable(GL_LIGHT0)
+    gl_state.enable(GL_LIGHTING)
+    gl_state.enable(GL_LIGHT0)
     
     # Set light properties
     light_pos = [sun_position[0], sun_position[1], sun_position[2], 0.0]  # Directional light
@@ -3873,71 +2960,25 @@ def main():
     glFogf(GL_FOG_DENSITY, FOG_DENSITY)
     glHint(GL_FOG_HINT, GL_NICEST)
     
-    # Adjust settings for performance mode
-    if PERFORMANCE_MODE:
-        pass  # Add performance adjustments if needed
-    
-    # Print controls to console
-    print_controls()
-    
     # Generate environment and enemies
     setup_fixed_environment()
     create_environment_display_list()
-    setup_enemies()
-    setup_powerups()
-    
-    # Register GLUT callbacks
-    glutDisplayFunc(display)
-    glutKeyboardFunc(key_pressed)
-    glutKeyboardUpFunc(key_released)
-    glutSpecialFunc(special_key_pressed)
-    glutSpecialUpFunc(special_key_released)
-    glutIdleFunc(update_state)
-    glutReshapeFunc(reshape)
+    create_model_display_lists()
     
-    # Start the game loop
-    print("Starting game... Press Enter to start, ESC to exit")
-    glutMainLoop()
+    # Adjust settings for performance mode
+    apply_quality_tier()
+    if PERFORMANCE_MODE:
+        print(f"Adaptive quality on: holding {TARGET_FPS} FPS across {len(quality_governor.tiers)} tiers.")
+    scene_resolution.enabled = DYNAMIC_RESOLUTION
+    create_particle_sprite()
+    vertex_stream = hud_text.stream = StreamingVBO(STREAM_SEGMENT_BYTES, STREAM_SEGMENTS)
+    if glyph_atlas.build():
+        print(f"HUD glyph atlas built ({glyph_atlas.width}x{glyph_atlas.height}).")
+    checkpoint('init_game')
+    sim.setup_enemies()
+    sim.setup_powerups()
 
 # --- Entry Point ---
 if __name__ == "__main__":
     main()
 
-# Particle System Functions
-def spawn_particles(position, color, count):
-    """Spawn particles at the given position."""
-    global particles
-    for _ in range(count):
-        vel_x = random.uniform(-200, 200)
-        vel_y = random.uniform(-200, 200)
-        vel_z = random.uniform(50, 300)
-        particle = {
-            'pos': list(position),
-            'vel': [vel_x, vel_y, vel_z],
-            'color': color,
-            'size': random.uniform(5, 15),
-            'life': random.uniform(0.5, 1.0)
-        }
-        particles.append(particle)
-
-def update_particles(delta_time):
-    """Update particle physics and remove dead particles."""
-    global particles
-    to_remove = []
-    for i, p in enumerate(particles):
-        # Update position
-        p['pos'][0] += p['vel'][0] * delta_time
-        p['pos'][1] += p['vel'][1] * delta_time
-        p['pos'][2] += p['vel'][2] * delta_time
-        
-        # Apply gravity
-        p['vel'][2] -= 500 * delta_time
-        
-        # Reduce life
-        p['life'] -= delta_time
-        if p['life'] <= 0:
-            to_remove.append(i)
-    
-    # Remove dead particles
-    for i in reversed(to_remove):
-        particles.pop(i)
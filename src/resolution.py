@@ -0,0 +1,156 @@
+"""
+Dynamic resolution for the 3D scene.
+
+On a fill-rate-limited renderer (a software rasterizer, or a large fullscreen
+window on a weak GPU) the cost of a frame follows the number of pixels
+shaded more than anything the game draws. DynamicResolution renders the
+world into an offscreen framebuffer at a fraction of the window size and
+stretches it over the window with a filtered blit; the HUD is then drawn on
+top at native resolution, so text stays sharp.
+
+The scale is steered from measured scene time. Every few frames the scene is
+timed through a glFinish, which covers the rasterizer's work as well as the
+Python side without needing timer queries, and the scale is moved toward
+the size that would fit the budget. At full scale the scene is drawn
+straight into the window and the offscreen buffers sit idle.
+"""
+import math
+import time
+from collections import deque
+
+from OpenGL.GL import (GL_COLOR_ATTACHMENT0, GL_COLOR_BUFFER_BIT, GL_DEPTH_ATTACHMENT,
+                       GL_DEPTH_BUFFER_BIT, GL_DEPTH_COMPONENT24, GL_DRAW_FRAMEBUFFER,
+                       GL_FRAMEBUFFER, GL_FRAMEBUFFER_COMPLETE, GL_LINEAR, GL_READ_FRAMEBUFFER,
+                       GL_RENDERBUFFER, GL_RGBA8, glBindFramebuffer, glBindRenderbuffer,
+                       glBlitFramebuffer, glCheckFramebufferStatus, glClear,
+                       glDeleteFramebuffers, glDeleteRenderbuffers, glFinish,
+                       glFramebufferRenderbuffer, glGenFramebuffers, glGenRenderbuffers,
+                       glRenderbufferStorage)
+
+SCALE_STEP = 1.0 / 16   # Scales are kept to multiples of this so the buffers are not resized for noise
+
+
+class DynamicResolution:
+    """
+    Offscreen target for the 3D scene whose size follows its render time.
+
+    budget is the time in seconds the scene may take; with headroom the
+    scale is left alone while scene time stays between budget * headroom
+    and budget. state is the game's GLStateCache, which keeps track of the
+    viewport.
+    """
+
+    def __init__(self, state, budget, min_scale=0.5, max_scale=1.0, sample_interval=10,
+                 samples=3, headroom=0.7):
+        self.state = state
+        self.budget = budget
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.sample_interval = sample_interval   # Frames between timed scenes
+        self.headroom = headroom
+        self.scale = max_scale
+        self.enabled = True
+        self.output_framebuffer = 0    # Where the scaled scene is blitted; 0 is the window
+        self.size = (0, 0)             # Size of the offscreen buffers
+        self.scene_size = (0, 0)       # Size the current frame's scene is drawn at
+        self.scene_time = 0.0          # Last timed scene, in seconds
+        self._framebuffer = None
+        self._renderbuffers = None
+        self._window_size = (0, 0)
+        self._scaled = False
+        self._frame = 0
+        self._started = 0.0
+        self._samples = deque(maxlen=samples)
+
+    @property
+    def active(self):
+        """True while the scene is drawn below window resolution."""
+        return self.enabled and self.scale < self.max_scale
+
+    def begin(self, width, height):
+        """
+        Start drawing the scene for a width x height window.
+
+        Binds the offscreen framebuffer, sets the viewport to its scaled size
+        and clears it when the scale is below full; otherwise drawing goes to
+        the window as usual.
+        """
+        self._window_size = (width, height)
+        self._frame += 1
+        if self._frame % self.sample_interval == 0:
+            glFinish()   # Start the timed scene with nothing of the previous frame still queued
+            self._started = time.perf_counter()
+        else:
+            self._started = 0.0
+
+        self._scaled = self.active and self._bind(max(1, round(width * self.scale)),
+                                                   max(1, round(height * self.scale)))
+        self.scene_size = self.size if self._scaled else (width, height)
+        if self._scaled:
+            self.state.set_viewport(0, 0, *self.size)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+    def end(self):
+        """Finish the scene: stretch it over the window and, on sample frames, time it."""
+        width, height = self._window_size
+        if self._scaled:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self._framebuffer)
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.output_framebuffer)
+            glBlitFramebuffer(0, 0, self.size[0], self.size[1], 0, 0, width, height,
+                              GL_COLOR_BUFFER_BIT, GL_LINEAR)
+            glBindFramebuffer(GL_FRAMEBUFFER, self.output_framebuffer)
+            self.state.set_viewport(0, 0, width, height)
+            self._scaled = False
+
+        if self._started:
+            glFinish()
+            self.scene_time = time.perf_counter() - self._started
+            self._samples.append(self.scene_time)
+            self._adjust(sorted(self._samples)[len(self._samples) // 2])
+
+    def _adjust(self, scene_time):
+        if not self.enabled or self.budget * self.headroom <= scene_time <= self.budget:
+            return
+        # Fill cost goes with the pixel count, the square of the scale; aim for the middle of the band
+        target = self.budget * (1.0 + self.headroom) / 2
+        wanted = self.scale * math.sqrt(target / max(scene_time, 1e-6))
+        scale = min(self.max_scale, max(self.min_scale, round(wanted / SCALE_STEP) * SCALE_STEP))
+        if scale != self.scale:
+            self.scale = scale
+            self._samples.clear()   # Judge the new scale on its own frames
+
+    def _bind(self, width, height):
+        if self._framebuffer is None:
+            if not (bool(glGenFramebuffers) and bool(glBlitFramebuffer)):
+                self.enabled = False
+                return False
+            self._framebuffer = glGenFramebuffers(1)
+            self._renderbuffers = glGenRenderbuffers(2)
+        glBindFramebuffer(GL_FRAMEBUFFER, self._framebuffer)
+        if (width, height) != self.size:
+            self._allocate(width, height)
+            if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                glBindFramebuffer(GL_FRAMEBUFFER, self.output_framebuffer)
+                self.delete()
+                self.enabled = False
+                return False
+        return True
+
+    def _allocate(self, width, height):
+        color, depth = (int(buffer) for buffer in self._renderbuffers)
+        glBindRenderbuffer(GL_RENDERBUFFER, color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color)
+        glBindRenderbuffer(GL_RENDERBUFFER, depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        self.size = (width, height)
+
+    def delete(self):
+        if self._framebuffer is not None:
+            glDeleteFramebuffers(1, [self._framebuffer])
+            glDeleteRenderbuffers(2, self._renderbuffers)
+        self._framebuffer = None
+        self._renderbuffers = None
+        self.size = (0, 0)
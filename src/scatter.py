@@ -0,0 +1,168 @@
+"""
+Poisson-disk scattering of scenery.
+
+Bridson's algorithm grows a blue-noise point set outward from a few seeds:
+each active point proposes candidates in the ring between one and two radii
+around it, a candidate is kept when no existing point lies within the radius,
+and a point whose candidates all fail is retired. The result fills the area
+evenly with no two points closer than the radius, unlike darts thrown at
+random, which clump in some places and leave gaps in others.
+
+Here the whole active front is expanded at once. Candidates for every
+active point are drawn in one NumPy call and tested against an occupancy
+grid held in arrays: with cells of radius / sqrt(2) each cell holds at
+most one point, so a 5x5 block of cells around a candidate, less the
+corners, covers every point that could be too close, and all candidates gather their blocks in a
+single fancy-indexing pass. Candidates that pass but crowd each other are
+settled by index, lower first, through a second grid of the same shape.
+"""
+import math
+
+import numpy as np
+
+# Tries around each active point per pass (Bridson's k). Bridson suggests 30 for one point at a
+# time; here a point with a candidate that fits is tried again next pass, so fewer do as well
+CANDIDATES = 8
+MAX_FRONT = 1024    # Active points expanded per pass, bounding the size of the candidate arrays
+SEEDS = 64          # Random starting points, so the fronts meet sooner
+FILL = 0.54         # Points per radius squared a finished set reliably reaches
+
+# The 5x5 block of cells around a cell, less its corners, which lie a full radius away
+_OFFSETS = np.array([(dy, dx) for dy in range(-2, 3) for dx in range(-2, 3) if abs(dx) + abs(dy) < 4])
+
+
+def disk_radius(area, count):
+    """Largest spacing at which a Poisson-disk set over area yields at least count points."""
+    return math.sqrt(FILL * area / count)
+
+
+def poisson_disk(bounds, radius, rng, excluded=(), candidates=CANDIDATES):
+    """
+    Points spread over bounds with no two closer than radius.
+
+    bounds and each rectangle in excluded are (x0, y0, x1, y1); points are
+    kept out of the excluded rectangles. rng is a NumPy Generator, so a
+    seeded one gives the same layout every time. Returns an (N, 2) float64
+    array in the order the points were placed.
+    """
+    grid = _OccupancyGrid(bounds, radius, excluded)
+    seeds = rng.uniform(bounds[:2], bounds[2:], size=(SEEDS, 2))
+    active = grid.insert(seeds[grid.admits(seeds)])
+
+    while active.size:
+        if active.size > MAX_FRONT:
+            chosen = rng.choice(active.size, MAX_FRONT, replace=False)
+        else:
+            chosen = np.arange(active.size)
+        parents = grid.points[active[chosen]]
+
+        # Uniform over the ring's area between radius and 2 * radius
+        angles = rng.uniform(0.0, 2.0 * math.pi, size=(len(parents), candidates))
+        distances = radius * np.sqrt(rng.uniform(1.0, 4.0, size=(len(parents), candidates)))
+        proposed = np.empty((len(parents), candidates, 2))
+        proposed[..., 0] = parents[:, None, 0] + distances * np.cos(angles)
+        proposed[..., 1] = parents[:, None, 1] + distances * np.sin(angles)
+        proposed = proposed.reshape(-1, 2)
+
+        # A parent stays active while any of its candidates fits among the placed points,
+        # even if that candidate loses to a neighbour from the same pass
+        fits = grid.admits(proposed)
+        fertile = fits.reshape(len(parents), candidates).any(axis=1)
+        added = grid.insert(proposed[fits])
+        keep = np.ones(active.size, dtype=bool)
+        keep[chosen[~fertile]] = False
+        active = np.concatenate((active[keep], added))
+
+    return grid.points
+
+
+class _OccupancyGrid:
+    """
+    Placed points, and the coordinates of the point in each cell, with
+    infinity in empty cells so they are never within the radius.
+    """
+
+    def __init__(self, bounds, radius, excluded):
+        self.origin = np.array(bounds[:2], dtype=np.float64)
+        self.limit = np.array(bounds[2:], dtype=np.float64)
+        self.radius_squared = radius * radius
+        self.cell = radius / math.sqrt(2.0)
+        columns = int(math.ceil((self.limit[0] - self.origin[0]) / self.cell))
+        rows = int(math.ceil((self.limit[1] - self.origin[1]) / self.cell))
+        # Two empty cells of padding on every side, so neighbourhoods never need clipping; the
+        # cells are stored flat, row after row, so a block around a cell is one take() at fixed offsets
+        self.columns = columns + 4
+        self.x = np.full((rows + 4) * self.columns, np.inf)
+        self.y = np.full_like(self.x, np.inf)
+        self._pending = np.full(self.x.shape, -1, dtype=np.int64)   # Batch index per cell while inserting
+        self._block = (_OFFSETS[:, 0] * self.columns + _OFFSETS[:, 1]).astype(np.int64)
+        self.excluded = [np.array(rectangle, dtype=np.float64) for rectangle in excluded]
+        self._points = np.empty((1024, 2))
+        self.count = 0
+
+    @property
+    def points(self):
+        return self._points[:self.count]
+
+    def _cell_of(self, positions):
+        cells = ((positions - self.origin) / self.cell).astype(np.int64) + 2
+        return cells[:, 1] * self.columns + cells[:, 0]
+
+    def admits(self, positions):
+        """Mask of positions inside the bounds, outside the excluded areas and clear of placed points."""
+        inside = ((positions >= self.origin) & (positions < self.limit)).all(axis=1)
+        for x0, y0, x1, y1 in self.excluded:
+            inside &= ~((positions[:, 0] > x0) & (positions[:, 0] < x1) &
+                        (positions[:, 1] > y0) & (positions[:, 1] < y1))
+        candidates = np.flatnonzero(inside)
+        cells = self._cell_of(positions[candidates])
+        # A taken cell is within the radius wherever in it the point sits, so most fail here
+        free = self.x[cells] == np.inf
+        inside[candidates[~free]] = False
+        candidates, cells = candidates[free], cells[free]
+
+        # One row per cell of the block, one column per candidate, so the reduction runs down columns
+        block = self._block[:, None] + cells
+        dx = self.x.take(block)
+        dx -= positions[candidates, 0]
+        dy = self.y.take(block)
+        dy -= positions[candidates, 1]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        inside[candidates] = dx.min(axis=0) >= self.radius_squared
+        return inside
+
+    def insert(self, positions):
+        """
+        Place the admitted positions that keep their distance from each
+        other, lower indices winning. Returns the indices of the points placed.
+        """
+        if not len(positions):
+            return np.empty(0, dtype=np.int64)
+        cells = self._cell_of(positions)
+        # At most one per cell, then drop any within the radius of a lower-indexed survivor
+        _, first = np.unique(cells, return_index=True)
+        first.sort()
+        positions, cells = positions[first], cells[first]
+        order = np.arange(len(positions))
+        self._pending[cells] = order
+        rivals = self._pending.take(cells[:, None] + self._block)
+        self._pending[cells] = -1
+        rows, slots = np.nonzero((rivals >= 0) & (rivals < order[:, None]))
+        offsets = positions[rivals[rows, slots]] - positions[rows]
+        close = np.einsum('nc,nc->n', offsets, offsets) < self.radius_squared
+        placed = np.ones(len(positions), dtype=bool)
+        placed[rows[close]] = False
+        positions, cells = positions[placed], cells[placed]
+
+        start, end = self.count, self.count + len(positions)
+        if end > len(self._points):
+            grown = np.empty((max(end, 2 * len(self._points)), 2))
+            grown[:start] = self._points[:start]
+            self._points = grown
+        self._points[start:end] = positions
+        self.x[cells] = positions[:, 0]
+        self.y[cells] = positions[:, 1]
+        self.count = end
+        return np.arange(start, end)
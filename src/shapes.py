@@ -0,0 +1,77 @@
+"""
+The solid shapes the game builds its models from.
+
+The renderer draws every cube and sphere through a shapes object handed to
+init_game. GLUTShapes, the default, calls glutSolidCube and friends, which
+freeglut only runs once glutInit has opened a window. ArrayShapes draws the
+same solids from vertex arrays and needs nothing but a current context,
+which is what windowless rendering uses.
+"""
+import numpy as np
+
+from OpenGL.GL import (GL_FILL, GL_FLOAT, GL_FRONT_AND_BACK, GL_LINE, GL_NORMAL_ARRAY, GL_QUADS,
+                       GL_TRIANGLES, GL_UNSIGNED_INT, GL_VERTEX_ARRAY, glDisableClientState,
+                       glDrawArrays, glDrawElements, glEnableClientState, glNormalPointer,
+                       glPolygonMode, glVertexPointer)
+from OpenGL.GLUT import glutSolidCube, glutSolidSphere, glutWireSphere
+
+from forest import sphere_mesh
+
+
+class GLUTShapes:
+    """The GLUT solids; GLUT must be initialized."""
+
+    def solid_cube(self, size):
+        glutSolidCube(size)
+
+    def solid_sphere(self, radius, slices, stacks):
+        glutSolidSphere(radius, slices, stacks)
+
+    def wire_sphere(self, radius, slices, stacks):
+        glutWireSphere(radius, slices, stacks)
+
+
+class ArrayShapes:
+    """Vertex-array equivalents of the GLUT solids, for contexts GLUT did not create."""
+
+    def __init__(self):
+        self._spheres = {}
+        normals = np.repeat(np.array([(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)],
+                                     dtype=np.float32), 4, axis=0)
+        # Each face's corners go counter-clockwise seen from outside: u and v span the face
+        corners = []
+        for normal in normals[::4]:
+            u = np.roll(normal, 1)
+            v = np.cross(normal, u)
+            corners += [normal - u - v, normal + u - v, normal + u + v, normal - u + v]
+        self._cube = (np.array(corners, dtype=np.float32) * 0.5, normals)
+
+    def _draw(self, positions, normals, mode, indices=None):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, positions)
+        glNormalPointer(GL_FLOAT, 0, normals)
+        if indices is None:
+            glDrawArrays(mode, 0, len(positions))
+        else:
+            glDrawElements(mode, len(indices), GL_UNSIGNED_INT, indices)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def solid_cube(self, size):
+        positions, normals = self._cube
+        self._draw(positions * np.float32(size), normals, GL_QUADS)
+
+    def solid_sphere(self, radius, slices, stacks):
+        sphere = self._spheres.get((slices, stacks))
+        if sphere is None:
+            positions, normals, indices = sphere_mesh(slices, stacks)
+            sphere = self._spheres[slices, stacks] = (positions.astype(np.float32), normals.astype(np.float32),
+                                                       indices.astype(np.uint32))
+        positions, normals, indices = sphere
+        self._draw(positions * np.float32(radius), normals, GL_TRIANGLES, indices)
+
+    def wire_sphere(self, radius, slices, stacks):
+        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
+        self.solid_sphere(radius, slices, stacks)
+        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
@@ -0,0 +1,1373 @@
+"""
+Headless simulation core for Red Light, Green Light.
+
+Holds all gameplay state and rules with no dependency on OpenGL or GLUT, so
+the world can be advanced by a fixed time step without a window. The GLUT
+front-end in red_light_green_light.py drives step() from its idle callback and
+only reads this module's state when drawing.
+"""
+import math
+import random
+import time
+
+import numpy as np
+
+from enemies import (EnemyStore, ENEMY_RED, ENEMY_BLUE, ENEMY_BLACK,
+                     ENEMY_COLORS, ENEMY_KILL_SCORES, ENEMY_CATCH_CHANCES)
+from particles import ParticleEmitter
+from projectiles import ProjectilePool
+from collision import SpatialHash, swept_sphere_toi
+
+# --- Simulation Settings ---
+SIMULATION_HZ = 120
+FIXED_DT = 1.0 / SIMULATION_HZ
+VERBOSE = True  # Print gameplay events to the console
+EFFECTS = True  # Spawn and move particles; nothing in the game reads them back
+
+# Key codes for camera control (same values as KEY_LEFT/UP/RIGHT/DOWN)
+KEY_LEFT = 100
+KEY_UP = 101
+KEY_RIGHT = 102
+KEY_DOWN = 103
+
+# Game settings
+GAME_STATE = "start"  # Start with start screen
+STATE_TIMER = 0
+STATE_CHANGE_INTERVAL_MIN = 3.0  # Initial timing values, will be adjusted based on game progression
+STATE_CHANGE_INTERVAL_MAX = 7.0  # Initial timing values, will be adjusted based on game progression
+NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
+DOLL_ROTATION_SPEED = 180.0  # Degrees per second
+DOLL_TARGET_ROTATION = 0  # 0 = facing player (red light), 180 = facing away (green light)
+DOLL_CURRENT_ROTATION = 180  # Start facing away
+
+# Game phases for dynamic difficulty
+GAME_PHASE = 1
+GAME_START_TIME = 0
+CURRENT_GAME_TIME = 0  # Simulation clock in seconds, advanced by step()
+PHASE_DURATION = 30.0  # Time in seconds before increasing difficulty
+
+PLAYER_SMOOTHING = 12.0
+CAMERA_SMOOTHING = 15.0
+
+# --- Playable Area Definition ---
+PLAY_AREA_WIDTH = 4000
+PLAY_AREA_LENGTH = 15000
+FINISH_ZONE_LENGTH = 1000
+
+# Player attributes
+player_start_pos = [0, -PLAY_AREA_LENGTH/2 + 50, 15]  # Start slightly inside arena
+player_position = list(player_start_pos)
+target_player_position = list(player_start_pos)
+player_velocity = [0.0, 0.0, 0.0]  # Added for friction movement
+player_friction = 0.92  # Reduced friction for snappier movement
+player_direction = 90.0
+target_player_direction = 90.0
+player_move_speed = 1800.0 # Faster for better gameplay
+player_base_speed = 1800.0  # Base speed for reference
+player_height = 30
+player_width = 15
+player_is_moving = False
+player_was_caught = False
+player_reached_finish = False
+player_speed_boost_active = False
+player_speed_boost_timer = 0.0
+player_speed_boost_duration = 5.0  # 5 seconds of speed boost
+
+# State from the previous tick, used by the renderer to interpolate between ticks
+prev_player_position = list(player_start_pos)
+prev_player_direction = player_direction
+
+# Stamina System
+player_stamina = 100.0
+player_max_stamina = 100.0
+player_stamina_regen = 30.0  # Per second (fast regen)
+player_stamina_drain = 15.0  # Per second (slow drain for longer sprints)
+player_is_sprinting = False
+sprint_key_held = False  # Track Shift key state
+sprint_multiplier = 2.2  # Good sprint boost
+
+# Sprint Exhaustion & Cooldown
+sprint_exhausted = False        # True when stamina fully drained
+sprint_cooldown_timer = 0.0     # Counts down during exhaustion
+SPRINT_COOLDOWN_DURATION = 4.0  # 4 seconds before sprint available again
+SPRINT_EXHAUSTED_SPEED_MULT = 0.55  # 55% of normal speed when exhausted (big penalty)
+
+# Jump System
+player_z_velocity = 0.0
+player_is_jumping = False
+player_on_ground = True
+JUMP_FORCE = 450.0
+GRAVITY = 900.0
+player_ground_z = 15.0  # Normal ground level
+
+# Shield System
+player_shield_active = False
+player_shield_timer = 0.0
+SHIELD_DURATION = 6.0  # 6 seconds of shield
+
+# Enemy Bullets
+ENEMY_BULLET_CAPACITY = 512  # Oldest enemy bullet is recycled beyond this
+enemy_bullets = ProjectilePool(ENEMY_BULLET_CAPACITY)
+ENEMY_BULLET_SPEED = 350.0  # Slow bullets player must dodge
+ENEMY_BULLET_SIZE = 10.0
+ENEMY_SHOOT_INTERVAL_MIN = 3.0
+ENEMY_SHOOT_INTERVAL_MAX = 8.0
+
+# Level / Arena Scaling
+CURRENT_LEVEL = 1
+LEVEL_ARENA_WIDTH_MULT = 1.0   # Scales arena width per level
+LEVEL_ARENA_LENGTH_MULT = 1.0  # Scales arena length per level
+
+# High Score System
+high_scores = []  # List of (name, score) tuples
+player_name_input = ""  # For name entry
+name_entry_active = False  # True when entering name after win
+MAX_HIGH_SCORES = 10
+
+
+# Enemy attributes
+enemies = EnemyStore()
+NUM_RED_ENEMIES = 6  # Reduced from 8
+NUM_BLUE_ENEMIES = 4  # Reduced from 5
+NUM_BLACK_ENEMIES = 2  # Unchanged
+ENEMY_MOVE_SPEED_RED = 500.0       # Increased from 350.0
+ENEMY_MOVE_SPEED_BLUE = 350.0      # Increased from 250.0 
+ENEMY_MOVE_SPEED_BLACK = 200.0     # Increased from 150.0
+ENEMY_HEIGHT = 60                  # Increased from 45
+ENEMY_WIDTH = 40                   # Increased from 28
+ENEMY_DETECTION_RADIUS = 30.0  # For movement detection during red light
+
+# Weapon attributes
+BULLET_SPEED = 2500.0  # Swept collision tests the whole path, so fast bullets can't tunnel
+BULLET_CAPACITY = 64  # Far more than the fire rate and lifetime allow at once
+bullets = ProjectilePool(BULLET_CAPACITY)
+bullet_cooldown = 0
+BULLET_COOLDOWN_TIME = 0.4  # Slightly faster firing rate
+BULLET_SIZE = 8.0  # Added defined bullet size for clarity
+
+# Particle effects; each emitter's arrays are allocated once at this size
+SPARK_CAPACITY = 16384   # Muzzle flashes and hit sparks
+DEBRIS_CAPACITY = 32768  # Elimination bursts
+sparks = ParticleEmitter(SPARK_CAPACITY, gravity=400.0, drag=4.0)
+debris = ParticleEmitter(DEBRIS_CAPACITY, gravity=900.0, drag=0.8)
+
+# Collision broadphase - uniform grids over the play area, rebuilt every tick
+COLLISION_CELL_SIZE = 256.0  # About twice the largest enemy hit radius
+enemy_grid = SpatialHash(COLLISION_CELL_SIZE)
+enemy_bullet_grid = SpatialHash(COLLISION_CELL_SIZE)
+powerup_grid = SpatialHash(COLLISION_CELL_SIZE)
+
+# Power-ups
+powerups = []
+NUM_POWERUPS = 5  # More powerups for variety
+POWERUP_SPAWN_INTERVAL = 15.0  # Faster spawning
+powerup_spawn_timer = 0.0
+POWERUP_TYPES = ['speed', 'shield']  # Available powerup types
+
+# --- Camera Attributes ---
+# The camera is part of the simulation because WASD movement is camera-relative
+camera_height = 45
+camera_distance_min = 40.0
+camera_distance_max = 1200.0
+camera_distance = 250.0
+camera_pitch_min = -85.0
+camera_pitch_max = 70.0
+camera_pitch = -10.0
+target_camera_pitch = camera_pitch
+camera_yaw = 0.0
+target_camera_yaw = camera_yaw
+camera_rotation_speed = 120.0
+prev_camera_yaw = camera_yaw
+prev_camera_pitch = camera_pitch
+prev_camera_distance = camera_distance
+
+# Screen Shake
+camera_shake_x = 0.0
+camera_shake_y = 0.0
+shake_intensity = 0.0
+shake_timer = 0.0
+
+# Input state tracking
+keys_pressed = set()
+last_positions = {}  # To track movement for red light detection
+
+# Scoring
+player_score = 0
+time_survived = 0.0
+enemies_killed = 0
+
+# Notification system
+notification_text = ""
+notification_timer = 0
+NOTIFICATION_DURATION = 3.0  # How long notifications stay on screen
+
+# Debug
+print_debug = False
+
+class FixedTimestep:
+    """
+    Game-loop scheduler that turns variable frame times into fixed ticks.
+    
+    Real elapsed time is added to an accumulator and consumed in whole
+    steps of dt; the remainder becomes alpha, the fraction of a tick the
+    renderer should interpolate past the previous state.
+    """
+    
+    def __init__(self, hz=SIMULATION_HZ, max_frame_time=0.1):
+        self.dt = 1.0 / hz
+        self.max_frame_time = max_frame_time  # Cap to avoid a spiral of death after stalls
+        self.accumulator = 0.0
+        self.alpha = 0.0
+    
+    def advance(self, frame_time):
+        """Add elapsed real time and return how many ticks should run now."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            steps += 1
+        self.alpha = self.accumulator / self.dt
+        return steps
+
+def log(message):
+    """Print a gameplay event unless the simulation is running quietly."""
+    if VERBOSE:
+        print(message)
+
+def setup_enemies():
+    """Create enemy characters at positions ahead of the player."""
+    half_play_w = PLAY_AREA_WIDTH / 2 - 50
+    x_range = (-half_play_w, half_play_w)
+    y_range = (0, PLAY_AREA_LENGTH / 2 - 500)
+    level_speed = 1.0 + CURRENT_LEVEL * 0.1
+    
+    # Scale enemy count with level
+    num_red = NUM_RED_ENEMIES + (CURRENT_LEVEL - 1) * 2
+    num_blue = NUM_BLUE_ENEMIES + (CURRENT_LEVEL - 1)
+    num_black = NUM_BLACK_ENEMIES + max(0, (CURRENT_LEVEL - 2))
+    
+    enemies.resize(num_red + num_blue + num_black)
+    rng = enemies.rng
+    
+    # Red enemies - fastest, 1 hit, shoot from level 2
+    red = enemies.spawn(0, num_red, ENEMY_RED, x_range, y_range)
+    enemies.speed[red] = ENEMY_MOVE_SPEED_RED * rng.uniform(0.9, 1.1, num_red) * level_speed
+    enemies.health[red] = 1
+    enemies.shoot_timer[red] = rng.uniform(ENEMY_SHOOT_INTERVAL_MIN, ENEMY_SHOOT_INTERVAL_MAX, num_red)
+    enemies.can_shoot[red] = CURRENT_LEVEL >= 2
+    
+    # Blue enemies - medium speed, 2 hits, always shoot
+    blue = enemies.spawn(num_red, num_blue, ENEMY_BLUE, x_range, y_range)
+    enemies.speed[blue] = ENEMY_MOVE_SPEED_BLUE * rng.uniform(0.9, 1.1, num_blue) * level_speed
+    enemies.health[blue] = 2
+    enemies.shoot_timer[blue] = rng.uniform(ENEMY_SHOOT_INTERVAL_MIN, ENEMY_SHOOT_INTERVAL_MAX, num_blue)
+    enemies.can_shoot[blue] = True
+    
+    # Black enemies - slow but tough, 5+ hits, shoot twice as often
+    black = enemies.spawn(num_red + num_blue, num_black, ENEMY_BLACK, x_range, y_range)
+    enemies.speed[black] = ENEMY_MOVE_SPEED_BLACK * rng.uniform(0.9, 1.1, num_black) * level_speed
+    enemies.health[black] = 5 + CURRENT_LEVEL
+    enemies.shoot_timer[black] = rng.uniform(ENEMY_SHOOT_INTERVAL_MIN / 2, ENEMY_SHOOT_INTERVAL_MAX / 2, num_black)
+    enemies.can_shoot[black] = True
+
+def setup_powerups():
+    """Initialize power-ups across the playing field."""
+    global powerups
+    powerups.clear()
+    
+    half_play_w = PLAY_AREA_WIDTH / 2 - 100
+    
+    for _ in range(NUM_POWERUPS):
+        x = random.uniform(-half_play_w, half_play_w)
+        # Place powerups ahead of player, toward the finish line
+        y = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
+        
+        powerup = {
+            'position': [x, y, 15],
+            'type': random.choice(POWERUP_TYPES),
+            'active': True,
+            'rotation': 0.0  # For spinning effect
+        }
+        powerups.append(powerup)
+
+def save_previous_state():
+    """Remember pre-tick positions so the renderer can interpolate between ticks."""
+    global prev_player_direction, prev_camera_yaw, prev_camera_pitch, prev_camera_distance
+    
+    prev_player_position[:] = player_position
+    prev_player_direction = player_direction
+    prev_camera_yaw = camera_yaw
+    prev_camera_pitch = camera_pitch
+    prev_camera_distance = camera_distance
+    
+    enemies.prev_position[:] = enemies.position
+    bullets.save_previous()
+    enemy_bullets.save_previous()
+
+def step(delta_time):
+    """Advance the world by delta_time seconds using the current input state."""
+    global player_position, player_direction
+    global target_player_position, target_player_direction, camera_distance, camera_yaw, camera_pitch
+    global target_camera_yaw, target_camera_pitch, STATE_TIMER, GAME_STATE, NEXT_STATE_CHANGE
+    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION, bullet_cooldown, player_is_moving
+    global player_was_caught, player_reached_finish, last_positions, player_velocity
+    global GAME_PHASE, CURRENT_GAME_TIME, player_score, time_survived, powerup_spawn_timer
+    global player_speed_boost_active, player_speed_boost_timer, player_move_speed
+    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
+    global notification_text, notification_timer
+    global player_shield_active, player_shield_timer
+    
+    CURRENT_GAME_TIME += delta_time
+    save_previous_state()
+    
+    # Update notification system
+    if notification_timer > 0:
+        notification_timer -= delta_time
+    
+    # Handle start screen
+    if GAME_STATE == "start":
+        # Press Enter to start the game (Space is reserved for shooting)
+        if b'\r' in keys_pressed or b'\n' in keys_pressed:
+            start_game()
+            keys_pressed.discard(b'\r')
+            keys_pressed.discard(b'\n')
+        return
+    
+    # Effects already in the air keep settling after the round ends
+    if EFFECTS:
+        sparks.update(delta_time)
+        debris.update(delta_time)
+    
+    # Skip updates if player was caught or won (freeze game state)
+    if player_was_caught or player_reached_finish:
+        return
+    
+    # Calculate survival time (only while alive)
+    time_survived = CURRENT_GAME_TIME - GAME_START_TIME
+    
+    # Update game difficulty based on phase
+    if time_survived > GAME_PHASE * PHASE_DURATION:
+        GAME_PHASE += 1
+        # Adjust difficulty parameters
+        STATE_CHANGE_INTERVAL_MIN = max(1.0, STATE_CHANGE_INTERVAL_MIN - 0.4)
+        STATE_CHANGE_INTERVAL_MAX = max(3.0, STATE_CHANGE_INTERVAL_MAX - 0.6)
+        show_notification(f"Phase {GAME_PHASE}! Difficulty increased!")
+        log(f"Increasing difficulty to phase {GAME_PHASE}!")
+        log(f"New timing: {STATE_CHANGE_INTERVAL_MIN:.1f}s - {STATE_CHANGE_INTERVAL_MAX:.1f}s")
+    
+    # Update game state timer
+    STATE_TIMER += delta_time
+    if STATE_TIMER >= NEXT_STATE_CHANGE:
+        if GAME_STATE == "yellow":
+            # Then change to red
+            GAME_STATE = "red"
+            DOLL_TARGET_ROTATION = 0  # Face player
+            NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
+            STATE_TIMER = 0
+            show_notification("RED LIGHT! Stop moving!")
+        elif GAME_STATE == "green":
+            # First change to yellow warning
+            GAME_STATE = "yellow"
+            NEXT_STATE_CHANGE = 5.0  # Fixed 5-second yellow warning
+            STATE_TIMER = 0
+            show_notification("WARNING! Yellow light!")
+        else:
+            # Change back to green
+            GAME_STATE = "green"
+            DOLL_TARGET_ROTATION = 180  # Face away
+            NEXT_STATE_CHANGE = random.uniform(
+                STATE_CHANGE_INTERVAL_MIN * (1.0 + 0.5 / GAME_PHASE),  # More green time early in game
+                STATE_CHANGE_INTERVAL_MAX * (1.0 + 0.5 / GAME_PHASE)
+            )
+            STATE_TIMER = 0
+            show_notification("GREEN LIGHT! Go!")
+    
+    # Smooth doll rotation
+    rotation_diff = DOLL_TARGET_ROTATION - DOLL_CURRENT_ROTATION
+    if abs(rotation_diff) > 0.5:
+        rotation_step = DOLL_ROTATION_SPEED * delta_time
+        if rotation_diff > 0:
+            DOLL_CURRENT_ROTATION += min(rotation_step, rotation_diff)
+        else:
+            DOLL_CURRENT_ROTATION -= min(rotation_step, -rotation_diff)
+    
+    # Update camera based on input
+    cam_rot_step = camera_rotation_speed * delta_time
+    pitch_changed = False
+    yaw_changed = False
+    
+    # Camera rotation - modified for head-tilting behavior
+    if KEY_LEFT in keys_pressed:
+        target_camera_yaw += cam_rot_step
+        yaw_changed = True
+        
+    if KEY_RIGHT in keys_pressed:
+        target_camera_yaw -= cam_rot_step
+        yaw_changed = True
+        
+    if KEY_UP in keys_pressed:
+        target_camera_pitch += cam_rot_step
+        pitch_changed = True
+        
+    if KEY_DOWN in keys_pressed:
+        target_camera_pitch -= cam_rot_step
+        pitch_changed = True
+    
+    # Clamp camera pitch to prevent flipping
+    target_camera_pitch = max(camera_pitch_min, min(camera_pitch_max, target_camera_pitch))
+    
+    # Calculate movement vectors based on camera orientation
+    cam_yaw_rad = math.radians(camera_yaw)
+    move_forward_x = math.cos(cam_yaw_rad)
+    move_forward_y = math.sin(cam_yaw_rad)
+    move_right_x = math.sin(cam_yaw_rad)
+    move_right_y = -math.cos(cam_yaw_rad)
+    
+    # Initialize acceleration for this frame
+    accel_x = 0.0
+    accel_y = 0.0
+    player_is_moving = False
+    
+    # Determine acceleration based on input
+    current_speed = player_move_speed
+    
+    global player_is_sprinting, player_stamina
+    
+    # Check movement keys FIRST to set player_is_moving
+    if b'w' in keys_pressed:
+        accel_x += move_forward_x
+        accel_y += move_forward_y
+        player_is_moving = True
+        
+    if b's' in keys_pressed:
+        accel_x -= move_forward_x
+        accel_y -= move_forward_y
+        player_is_moving = True
+        
+    if b'a' in keys_pressed:
+        accel_x -= move_right_x
+        accel_y -= move_right_y
+        player_is_moving = True
+        
+    if b'd' in keys_pressed:
+        accel_x += move_right_x
+        accel_y += move_right_y
+        player_is_moving = True
+    
+    # Check for sprint (Shift key) - AFTER movement checks so player_is_moving is correct
+    global sprint_key_held
+    global sprint_exhausted, sprint_cooldown_timer
+    
+    if sprint_key_held:
+        player_is_sprinting = True
+    else:
+        player_is_sprinting = False
+    
+    # Sprint exhaustion cooldown
+    if sprint_exhausted:
+        sprint_cooldown_timer -= delta_time
+        if sprint_cooldown_timer <= 0:
+            sprint_exhausted = False
+            sprint_cooldown_timer = 0
+            show_notification("Sprint recovered!")
+        # Force no sprint during cooldown AND apply speed penalty
+        player_is_sprinting = False
+        current_speed *= SPRINT_EXHAUSTED_SPEED_MULT
+    
+    # Sprint logic
+    if player_is_sprinting and player_stamina > 0 and player_is_moving and not sprint_exhausted:
+        current_speed *= sprint_multiplier
+        player_stamina -= player_stamina_drain * delta_time
+        if player_stamina <= 0: 
+            player_stamina = 0
+            player_is_sprinting = False
+            sprint_exhausted = True
+            sprint_cooldown_timer = SPRINT_COOLDOWN_DURATION
+            show_notification("EXHAUSTED! Slowed for 4s!")
+    else:
+        # Regenerate stamina (only if not exhausted)
+        if not sprint_exhausted and player_stamina < player_max_stamina:
+            player_stamina += player_stamina_regen * delta_time
+            if player_stamina > player_max_stamina:
+                player_stamina = player_max_stamina
+    
+    # Jump logic
+    global player_z_velocity, player_is_jumping, player_on_ground, player_ground_z
+    
+    if b'j' in keys_pressed and player_on_ground and not player_is_jumping:
+        player_z_velocity = JUMP_FORCE
+        player_is_jumping = True
+        player_on_ground = False
+        keys_pressed.discard(b'j')  # Single press jump
+    
+    # Apply gravity
+    if not player_on_ground:
+        player_z_velocity -= GRAVITY * delta_time
+        player_position[2] += player_z_velocity * delta_time
+        target_player_position[2] += player_z_velocity * delta_time
+        
+        # Check ground collision
+        if player_position[2] <= player_ground_z:
+            player_position[2] = player_ground_z
+            target_player_position[2] = player_ground_z
+            player_z_velocity = 0.0
+            player_on_ground = True
+            player_is_jumping = False
+
+    # Apply speed to acceleration direction
+    accel_x *= current_speed
+    accel_y *= current_speed
+    
+    # Apply friction to current velocity (Frame-rate independent)
+    # 0.88 is the base friction for 60 FPS (approx 16.6ms)
+    # Formula: new_vel = old_vel * (base_friction ^ (dt * 60))
+    friction_factor = pow(player_friction, delta_time * 60.0)
+    player_velocity[0] *= friction_factor
+    player_velocity[1] *= friction_factor
+    
+    # Apply acceleration to velocity
+    if player_is_moving:
+        player_velocity[0] += accel_x * delta_time
+        player_velocity[1] += accel_y * delta_time
+    
+    # Apply velocity to position
+    target_player_position[0] += player_velocity[0] * delta_time
+    target_player_position[1] += player_velocity[1] * delta_time
+    
+    # Check movement during red light
+    moving_during_red = (GAME_STATE == "red" and DOLL_CURRENT_ROTATION < 45 and 
+                       (abs(player_velocity[0]) > 1.0 or abs(player_velocity[1]) > 1.0))
+    
+    if moving_during_red:
+        player_was_caught = True
+        log("You moved during red light! Game over.")
+    
+    # Boundary constraints
+    half_play_w = PLAY_AREA_WIDTH / 2 - player_width / 2
+    half_play_l = PLAY_AREA_LENGTH / 2 - player_width / 2
+    
+    target_player_position[0] = max(-half_play_w, min(half_play_w, target_player_position[0]))
+    target_player_position[1] = max(-half_play_l, min(half_play_l, target_player_position[1]))
+    
+    # Update player direction if moving
+    velocity_magnitude_sq = player_velocity[0]**2 + player_velocity[1]**2
+    if velocity_magnitude_sq > 10.0:  # Only update direction if moving significantly
+        target_player_direction = math.degrees(math.atan2(player_velocity[1], player_velocity[0]))
+    
+    # Camera zoom control
+    zoom_changed = False
+    zoom_speed = 350.0 * delta_time
+    
+    if b'z' in keys_pressed:
+        camera_distance -= zoom_speed
+        zoom_changed = True
+        
+    if b'x' in keys_pressed:
+        camera_distance += zoom_speed
+        zoom_changed = True
+        
+    camera_distance = max(camera_distance_min, min(camera_distance_max, camera_distance))
+    
+    # Debug output if enabled
+    if print_debug:
+        if pitch_changed:
+            print(f"ARROW Key: Target Pitch -> {target_camera_pitch:.1f} | Current Distance: {camera_distance:.1f}")
+            
+        if yaw_changed:
+            print(f"ARROW Key: Target Yaw -> {target_camera_yaw:.1f}")
+            
+        if zoom_changed:
+            print(f"Z/X Key: Distance -> {camera_distance:.1f} | Current Target Pitch: {target_camera_pitch:.1f}")
+    
+    # Apply smooth player movement
+    player_lerp = min(1.0, PLAYER_SMOOTHING * delta_time)
+    player_position[0] += (target_player_position[0] - player_position[0]) * player_lerp
+    player_position[1] += (target_player_position[1] - player_position[1]) * player_lerp
+    
+    # Apply smooth rotation
+    player_angle_diff = (target_player_direction - player_direction + 180) % 360 - 180
+    player_direction = (player_direction + player_angle_diff * player_lerp) % 360
+    
+    # Apply smooth camera movement
+    cam_lerp = min(1.0, CAMERA_SMOOTHING * delta_time)
+    
+    yaw_diff = (target_camera_yaw - camera_yaw + 180) % 360 - 180
+    if abs(yaw_diff) > 180:
+        yaw_diff = (target_camera_yaw - camera_yaw)
+    camera_yaw = (camera_yaw + yaw_diff * cam_lerp) % 360
+    
+    pitch_diff = target_camera_pitch - camera_pitch
+    camera_pitch += pitch_diff * cam_lerp
+    
+    # Update weapon cooldown
+    if bullet_cooldown > 0:
+        bullet_cooldown -= delta_time
+    
+    # Check for weapon firing
+    if b' ' in keys_pressed and bullet_cooldown <= 0:
+        fire_weapon()
+        bullet_cooldown = BULLET_COOLDOWN_TIME
+    
+    # Update power-up effects
+    if player_speed_boost_active:
+        player_speed_boost_timer -= delta_time
+        if player_speed_boost_timer <= 0:
+            player_speed_boost_active = False
+            player_move_speed = player_base_speed
+            log("Speed boost ended!")
+    
+    # Update powerup spawn timer
+    powerup_spawn_timer -= delta_time
+    if powerup_spawn_timer <= 0:
+        spawn_powerup()
+        powerup_spawn_timer = POWERUP_SPAWN_INTERVAL
+    
+    # Update bullets
+    update_bullets(delta_time)
+    
+    # Update enemies
+    update_enemies(delta_time)
+    
+    # Update enemy bullets
+    update_enemy_bullets(delta_time)
+    
+    # Update shield timer
+    global player_shield_active, player_shield_timer
+    if player_shield_active:
+        player_shield_timer -= delta_time
+        if player_shield_timer <= 0:
+            player_shield_active = False
+            show_notification("Shield expired!")
+    
+    # Update powerups
+    update_powerups(delta_time)
+    
+    # Update Screen Shake
+    global shake_timer, camera_shake_x, camera_shake_y, shake_intensity
+    if shake_timer > 0:
+        shake_timer -= delta_time
+        camera_shake_x = random.uniform(-shake_intensity, shake_intensity)
+        camera_shake_y = random.uniform(-shake_intensity, shake_intensity)
+        shake_intensity *= 0.9 # Decay
+    else:
+        camera_shake_x = 0
+        camera_shake_y = 0
+    
+    # Check for collisions (includes win condition check)
+    check_collisions()
+    
+    # Store last positions for movement detection
+    last_positions['player'] = list(player_position)
+    
+    enemies.last_position[:] = enemies.position
+
+def start_game():
+    """Start the game from the starting screen."""
+    global GAME_STATE, player_position, target_player_position, GAME_START_TIME
+    global player_score, time_survived, enemies_killed, player_move_speed
+    global STATE_TIMER, NEXT_STATE_CHANGE, DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION
+    global player_was_caught, player_reached_finish, player_velocity, GAME_PHASE
+    global player_speed_boost_active, player_speed_boost_timer, player_stamina
+    global player_direction, target_player_direction, powerups, powerup_spawn_timer
+    global player_is_sprinting, sprint_key_held
+    global sprint_exhausted, sprint_cooldown_timer
+    global player_z_velocity, player_is_jumping, player_on_ground
+    global player_shield_active, player_shield_timer
+    global CURRENT_LEVEL, name_entry_active, player_name_input
+    
+    # Reset player
+    player_position = list(player_start_pos)
+    target_player_position = list(player_start_pos)
+    player_direction = 90.0
+    target_player_direction = 90.0
+    player_was_caught = False
+    player_reached_finish = False
+    player_velocity = [0.0, 0.0, 0.0]
+    player_stamina = player_max_stamina
+    player_is_sprinting = False
+    sprint_key_held = False
+    sprint_exhausted = False
+    sprint_cooldown_timer = 0.0
+    player_z_velocity = 0.0
+    player_is_jumping = False
+    player_on_ground = True
+    player_position[2] = player_ground_z
+    
+    # Reset shield
+    player_shield_active = False
+    player_shield_timer = 0.0
+    
+    # Reset name entry
+    name_entry_active = False
+    player_name_input = ""
+    
+    # Reset game state
+    GAME_STATE = "green"
+    STATE_TIMER = 0
+    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN * 1.5, STATE_CHANGE_INTERVAL_MAX * 1.5)
+    DOLL_CURRENT_ROTATION = 180
+    DOLL_TARGET_ROTATION = 180
+    GAME_START_TIME = CURRENT_GAME_TIME
+    GAME_PHASE = 1
+    CURRENT_LEVEL = 1
+    
+    # Reset scoring
+    player_score = 0
+    time_survived = 0.0
+    enemies_killed = 0
+    
+    # Reset speed boost
+    player_speed_boost_active = False
+    player_speed_boost_timer = 0.0
+    player_move_speed = player_base_speed
+    
+    # Clear bullets and effects
+    bullets.clear()
+    enemy_bullets.clear()
+    sparks.clear()
+    debris.clear()
+    
+    # Initialize enemies
+    setup_enemies()
+    
+    # Initialize powerups
+    setup_powerups()
+    powerup_spawn_timer = POWERUP_SPAWN_INTERVAL
+    
+    save_previous_state()
+    
+    log("Game started!")
+
+def show_notification(text):
+    """Display a notification message on screen."""
+    global notification_text, notification_timer
+    notification_text = text
+    notification_timer = NOTIFICATION_DURATION
+
+def fire_weapon():
+    """Launch a new bullet from the player."""
+    global shake_timer, shake_intensity # Added for recoil
+    
+    # Calculate bullet direction based on player orientation
+    angle_rad = math.radians(player_direction)
+    
+    # Starting position (slightly in front of player)
+    offset = 30.0
+    start_x = player_position[0] + offset * math.cos(angle_rad)
+    start_y = player_position[1] + offset * math.sin(angle_rad)
+    start_z = player_position[2] + player_height * 0.5
+    
+    # Bullet disappears after 3 seconds
+    bullets.spawn((start_x, start_y, start_z), player_direction, BULLET_SPEED, 3.0, BULLET_SIZE)
+    show_notification("Bullet fired!")
+    
+    # Muzzle flash, thrown forward along the shot
+    if EFFECTS:
+        sparks.emit((start_x, start_y, start_z), 40, 150.0, (0.05, 0.15), (1.0, 0.8, 0.3),
+                    drift=(600.0 * math.cos(angle_rad), 600.0 * math.sin(angle_rad), 0.0))
+
+    # Add recoil/shake (reduced for stability)
+    shake_timer = 0.15
+    shake_intensity = 1.5
+
+
+def emit_elimination(index):
+    """Debris in the enemy's color and a flash of sparks where an enemy went down."""
+    if not EFFECTS:
+        return
+    scale = float(enemies.scale[index])
+    x, y, z = enemies.position[index]
+    center = (x, y, z + ENEMY_HEIGHT * scale * 0.5)
+    debris.emit(center, 1500, 250.0, (0.6, 1.4), enemies.color(index),
+                drift=(0.0, 0.0, 300.0), spread=ENEMY_WIDTH * 0.5 * scale)
+    sparks.emit(center, 300, 450.0, (0.1, 0.3), (1.0, 1.0, 0.9))
+
+
+def update_bullets(delta_time):
+    """Move bullets and retire those past their lifetime or out of bounds."""
+    bullets.integrate(delta_time, PLAY_AREA_WIDTH / 2 + 100, PLAY_AREA_LENGTH / 2 + 100)
+
+def update_enemies(delta_time):
+    """Update enemy positions and check for red light violations."""
+    global player_score, enemies_killed
+    
+    alive = enemies.alive
+    if not alive.any():
+        return
+    rng = enemies.rng
+    
+    # Only move during green or yellow light
+    if GAME_STATE == "green" or GAME_STATE == "yellow" or DOLL_CURRENT_ROTATION > 45:  # Grace period during rotation
+        enemy_speed = enemies.speed
+        if GAME_STATE == "yellow":
+            # During yellow light, enemies move at just 15% speed (extremely slow)
+            enemy_speed = enemy_speed * 0.15
+        
+        # Calculate vectors toward player
+        dx = player_position[0] - enemies.position[:, 0]
+        dy = player_position[1] - enemies.position[:, 1]
+        distance = np.hypot(dx, dy)
+        moving = alive & (distance > 0)
+        
+        # Normalize, add random jitter to movement, then normalize again
+        jitter = 0.3
+        safe_distance = np.where(moving, distance, 1.0)
+        dx = dx / safe_distance + rng.uniform(-jitter, jitter, len(enemies))
+        dy = dy / safe_distance + rng.uniform(-jitter, jitter, len(enemies))
+        magnitude = np.hypot(dx, dy)
+        magnitude[magnitude == 0] = 1.0
+        dx /= magnitude
+        dy /= magnitude
+        
+        # Move toward player with enemy's speed (modified by yellow light if applicable)
+        step = np.where(moving, enemy_speed * delta_time, 0.0)
+        enemies.position[:, 0] += dx * step
+        enemies.position[:, 1] += dy * step
+        
+        # Update direction to face movement
+        enemies.direction[moving] = np.degrees(np.arctan2(dy[moving], dx[moving]))
+    else:
+        # Check if enemies moved during red light
+        moved = enemies.position[:, :2] - enemies.last_position[:, :2]
+        move_distance = np.hypot(moved[:, 0], moved[:, 1])
+        
+        # Enemies that moved more than the threshold may die; red enemies are
+        # less cautious and black ones more so
+        chance_to_be_caught = ENEMY_CATCH_CHANCES[enemies.type]
+        caught = alive & (move_distance > 1.0) & (rng.random(len(enemies)) < chance_to_be_caught)
+        
+        for i in np.flatnonzero(caught):
+            log(f"A {enemies.type_name(i)} enemy was caught moving during red light!")
+            emit_elimination(i)
+        
+        if caught.any():
+            enemies.kill(caught)
+            # Add score for enemy elimination
+            player_score += int(ENEMY_KILL_SCORES[enemies.type[caught]].sum())
+            enemies_killed += int(caught.sum())
+    
+    # Enemy shooting logic
+    shooters = enemies.can_shoot & enemies.alive
+    enemies.shoot_timer[shooters] -= delta_time
+    firing = np.flatnonzero(shooters & (enemies.shoot_timer <= 0))
+    if len(firing) == 0:
+        return
+    
+    # Reset timers (faster at higher levels)
+    interval_mult = max(0.5, 1.0 - CURRENT_LEVEL * 0.1)
+    enemies.shoot_timer[firing] = rng.uniform(
+        ENEMY_SHOOT_INTERVAL_MIN * interval_mult,
+        ENEMY_SHOOT_INTERVAL_MAX * interval_mult,
+        len(firing)
+    )
+    
+    for i in firing:
+        # Shoot at player
+        ex, ey = float(enemies.position[i, 0]), float(enemies.position[i, 1])
+        dx = player_position[0] - ex
+        dy = player_position[1] - ey
+        dist = math.sqrt(dx*dx + dy*dy)
+        
+        if dist > 0 and dist < 5000:  # Only shoot if within range
+            # Add slight inaccuracy so player can dodge
+            aim_jitter = random.uniform(-15, 15)
+            angle = math.degrees(math.atan2(dy, dx)) + aim_jitter
+            
+            enemy_bullets.spawn((ex, ey, ENEMY_HEIGHT * 0.5), angle, ENEMY_BULLET_SPEED,
+                                6.0, ENEMY_BULLET_SIZE, ENEMY_COLORS[enemies.type[i]])
+
+def update_enemy_bullets(delta_time):
+    """Move enemy bullets and retire those past their lifetime or out of bounds."""
+    enemy_bullets.integrate(delta_time, PLAY_AREA_WIDTH / 2 + 200, PLAY_AREA_LENGTH / 2 + 200)
+
+def update_powerups(delta_time):
+    """Update powerup animations (rotation and bobbing)."""
+    for powerup in powerups:
+        if powerup['active']:
+            powerup['rotation'] = (powerup.get('rotation', 0) + 90 * delta_time) % 360
+
+
+def spawn_powerup():
+    """Spawn a new powerup in the playing field."""
+    global powerups
+    
+    # Check if we already have max powerups
+    active_powerups = sum(1 for p in powerups if p['active'])
+    if active_powerups >= NUM_POWERUPS:
+        return
+        
+    # Find inactive powerup to reuse
+    for powerup in powerups:
+        if not powerup['active']:
+            half_play_w = PLAY_AREA_WIDTH / 2 - 100
+            powerup['position'][0] = random.uniform(-half_play_w, half_play_w)
+            powerup['position'][1] = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
+            powerup['type'] = random.choice(POWERUP_TYPES)
+            powerup['rotation'] = 0.0
+            powerup['active'] = True
+            return
+    
+    # If no inactive powerups, create a new one
+    if len(powerups) < NUM_POWERUPS * 2:
+        half_play_w = PLAY_AREA_WIDTH / 2 - 100
+        x = random.uniform(-half_play_w, half_play_w)
+        y = random.uniform(-PLAY_AREA_LENGTH / 4, PLAY_AREA_LENGTH / 2 - 500)
+        
+        new_powerup = {
+            'position': [x, y, 15],
+            'type': random.choice(POWERUP_TYPES),
+            'active': True,
+            'rotation': 0.0
+        }
+        powerups.append(new_powerup)
+
+def check_collisions():
+    """Check for collisions between game objects."""
+    global player_position, player_was_caught, powerups
+    global player_speed_boost_active, player_speed_boost_timer, player_move_speed
+    global player_score, enemies_killed, player_reached_finish
+    global shake_timer, shake_intensity
+    global name_entry_active, player_name_input
+    global player_shield_active, player_shield_timer
+    
+    # Check if player reached finish line - with a more lenient check
+    # If player is within 95% of the way to the finish line, count it as a win
+    start_y = -PLAY_AREA_LENGTH / 2
+    end_y = PLAY_AREA_LENGTH / 2
+    total_distance = end_y - start_y
+    current_distance = player_position[1] - start_y
+    progress = current_distance / total_distance
+    
+    # Win condition - reach the finish line
+    if progress >= 0.95:
+        player_reached_finish = True
+        # Teleport player to exact finish so progress shows 100%
+        player_position[1] = PLAY_AREA_LENGTH / 2
+        target_player_position[1] = PLAY_AREA_LENGTH / 2
+        # Calculate final score
+        time_bonus = int(max(100, 1000 / max(0.1, time_survived / 60.0)))
+        phase_bonus = GAME_PHASE * 500
+        kill_bonus = enemies_killed * 150
+        level_bonus = CURRENT_LEVEL * 1000
+        player_score += 10000 + time_bonus + phase_bonus + kill_bonus + level_bonus
+        # Activate name entry for high score
+        name_entry_active = True
+        player_name_input = ""
+        log(f"YOU WIN! Final Score: {player_score} (Time: {time_bonus}, Phase: {phase_bonus}, Kills: {kill_bonus}, Level: {level_bonus})")
+        return  # Skip other collision checks if player won
+    
+    # Bucket everything that can collide into the broadphase grids
+    rebuild_collision_grids()
+    
+    # Check enemy bullet-player collisions
+    if len(enemy_bullets):
+        slots = enemy_bullet_grid.query_point(player_position[0], player_position[1],
+                                              player_width + ENEMY_BULLET_SIZE)
+        offsets = np.asarray(player_position, dtype=float) - enemy_bullets.position[slots]
+        dist = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        hit_radius = player_width + enemy_bullets.size[slots]
+        
+        # Player can jump over bullets - if Z difference is large, skip
+        hits = (np.abs(offsets[:, 2]) <= ENEMY_HEIGHT * 0.8) & (dist < hit_radius)
+        if hits.any():
+            if player_shield_active:
+                # Shield absorbs the hits
+                show_notification("Shield blocked enemy bullet!")
+                enemy_bullets.release(slots[hits])
+            else:
+                # Player is hit
+                player_was_caught = True
+                log("Hit by enemy bullet! Game over.")
+    
+    # Check bullet-enemy collisions
+    bullets_to_remove = []
+    enemy_positions = enemies.position
+    enemy_sizes = ENEMY_WIDTH * enemies.scale  # Enemy size with scale factor
+    
+    # Broadphase - grid candidates around the whole path each bullet covered
+    # this tick (last_position to position), not just where it ended up
+    bullet_slots = bullets.live_slots()
+    starts = bullets.prev_position[bullet_slots]
+    ends = bullets.position[bullet_slots]
+    travel = ends - starts
+    reach = 0.5 * float(np.sqrt(np.einsum('ij,ij->i', travel, travel)).max(initial=0.0))
+    pair_bullet, pair_enemy = enemy_grid.query(0.5 * (starts + ends),
+                                               reach + float(enemy_sizes.max(initial=0.0)) + BULLET_SIZE)
+    
+    # Narrowphase - every candidate bullet path against its enemy's sphere in
+    # one batch, keeping only pairs that touch during the tick
+    toi = swept_sphere_toi(starts[pair_bullet], ends[pair_bullet], enemy_positions[pair_enemy],
+                           enemy_sizes[pair_enemy] + bullets.size[bullet_slots[pair_bullet]])
+    hit = np.isfinite(toi)
+    pair_bullet, pair_enemy, toi = pair_bullet[hit], pair_enemy[hit], toi[hit]
+    
+    # Resolve bullets in firing order, each against its earliest impact that
+    # is still alive (an earlier bullet this tick may have finished it off)
+    order = np.lexsort((toi, pair_bullet))
+    pair_bullet, pair_enemy = pair_bullet[order], pair_enemy[order]
+    boundaries = np.flatnonzero(np.diff(pair_bullet)) + 1
+    groups = zip(np.split(pair_bullet, boundaries), np.split(pair_enemy, boundaries)) if len(pair_bullet) else ()
+    
+    for group, hits in groups:
+        hits = hits[enemies.alive[hits]]
+        if len(hits) == 0:
+            continue
+        b = group[0]
+        
+        # Bullet can only hit one enemy
+        i = hits[0]
+        enemy_type = enemies.type_name(i)
+        
+        # Reduce enemy health
+        enemies.health[i] -= 1
+        health = int(enemies.health[i])
+        
+        # Check if enemy is defeated
+        if health <= 0:
+            enemies.kill(i)
+            
+            # Add score for enemy elimination
+            player_score += int(ENEMY_KILL_SCORES[enemies.type[i]])
+            
+            emit_elimination(i)
+            
+            # Big shake on enemy death
+            shake_timer = 0.2  # Reduced intensity
+            shake_intensity = 3.0  # Reduced from 5.0
+            
+            enemies_killed += 1
+            show_notification(f"Enemy eliminated! ({enemy_type})")
+            log(f"Enemy eliminated! ({enemy_type})")
+        else:
+            if enemy_type == 'blue':
+                show_notification(f"Blue enemy hit! {health}/2 health")
+            else:  # black
+                show_notification(f"Black enemy hit! {health}/5 health")
+            log(f"Enemy hit! Health: {health} remaining")
+            if EFFECTS:
+                sparks.emit(bullets.position[bullet_slots[b]], 120, 250.0, (0.15, 0.4), enemies.color(i),
+                            drift=(0.0, 0.0, 120.0))
+        
+        # Mark bullet for removal
+        bullets_to_remove.append(bullet_slots[b])
+    
+    # Remove hit bullets
+    bullets.release(bullets_to_remove)
+    
+    # Check player-enemy collisions
+    nearby = enemy_grid.query_point(player_position[0], player_position[1],
+                                    player_width + float(enemy_sizes.max(initial=0.0)))
+    dx = player_position[0] - enemy_positions[nearby, 0]
+    dy = player_position[1] - enemy_positions[nearby, 1]
+    distance = np.hypot(dx, dy)
+    
+    # Collision radius and height scale with the enemy (black enemies are bigger)
+    enemy_top_z = enemy_positions[nearby, 2] + ENEMY_HEIGHT * enemies.scale[nearby]
+    
+    # Skip collision if player jumped above the enemy
+    touching = (enemies.alive[nearby]
+                & (player_position[2] <= enemy_top_z + 10)
+                & (distance < player_width + enemy_sizes[nearby]))
+    
+    for i in nearby[touching]:
+        if player_shield_active:
+            # Shield absorbs the hit - destroy enemy and keep going!
+            enemies.kill(i)
+            emit_elimination(i)
+            enemies_killed += 1
+            player_score += 300
+            show_notification("SHIELD DESTROYED ENEMY!")
+            shake_timer = 0.3
+            shake_intensity = 4.0
+        else:
+            player_was_caught = True
+            log("An enemy caught you! Game over.")
+            break
+    
+    # Check player-powerup collisions
+    for index in powerup_grid.query_point(player_position[0], player_position[1], player_width + 25):
+        powerup = powerups[index]
+        if not powerup['active']:
+            continue
+            
+        # Calculate distance
+        dx = player_position[0] - powerup['position'][0]
+        dy = player_position[1] - powerup['position'][1]
+        dz = player_position[2] - powerup['position'][2]
+        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+        
+        # Check for collision with larger radius
+        if distance < player_width + 25:  # Increased from 15 to 25
+            # Apply powerup effect
+            if powerup['type'] == 'speed':
+                player_speed_boost_active = True
+                player_speed_boost_timer = player_speed_boost_duration
+                player_move_speed = player_base_speed * 1.7
+                show_notification("SPEED BOOST ACTIVATED! +70% speed!")
+                player_score += 50
+            elif powerup['type'] == 'shield':
+                player_shield_active = True
+                player_shield_timer = SHIELD_DURATION
+                show_notification("SHIELD ACTIVATED! Invincible for 6s!")
+                player_score += 75
+            
+            # Deactivate powerup
+            powerup['active'] = False
+
+def rebuild_collision_grids():
+    """Re-bucket live enemies, enemy bullets and powerups for this tick's collision checks."""
+    # Once the dead outnumber the living, drop their slots so the per-tick
+    # array work follows the survivors rather than the round's starting count
+    if 2 * np.count_nonzero(enemies.alive) < len(enemies):
+        enemies.compact()
+    enemy_grid.rebuild(enemies.position, enemies.alive)
+    enemy_bullet_grid.rebuild(enemy_bullets.position, enemy_bullets.active)
+    
+    if powerups:
+        powerup_positions = np.array([powerup['position'] for powerup in powerups], dtype=float)
+        powerup_active = np.array([powerup['active'] for powerup in powerups])
+        powerup_grid.rebuild(powerup_positions, powerup_active)
+    else:
+        powerup_grid.rebuild(np.zeros((0, 3)))
+
+def next_level():
+    """Advance to the next level, keeping score and high scores."""
+    global player_position, target_player_position, player_direction, target_player_direction
+    global player_was_caught, player_reached_finish, GAME_STATE, STATE_TIMER, NEXT_STATE_CHANGE
+    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION
+    global GAME_START_TIME, GAME_PHASE
+    global player_velocity, powerups, player_speed_boost_active, player_move_speed
+    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
+    global player_stamina, player_is_sprinting, sprint_key_held
+    global sprint_exhausted, sprint_cooldown_timer
+    global player_z_velocity, player_is_jumping, player_on_ground
+    global player_shield_active, player_shield_timer
+    global CURRENT_LEVEL, name_entry_active, player_name_input
+    
+    CURRENT_LEVEL += 1
+    
+    # Reset player position but keep score
+    player_position = list(player_start_pos)
+    target_player_position = list(player_start_pos)
+    player_direction = 90.0
+    target_player_direction = 90.0
+    player_was_caught = False
+    player_reached_finish = False
+    player_velocity = [0.0, 0.0, 0.0]
+    player_stamina = player_max_stamina
+    player_is_sprinting = False
+    sprint_key_held = False
+    sprint_exhausted = False
+    sprint_cooldown_timer = 0.0
+    player_z_velocity = 0.0
+    player_is_jumping = False
+    player_on_ground = True
+    player_position[2] = player_ground_z
+    
+    # Reset shield
+    player_shield_active = False
+    player_shield_timer = 0.0
+    
+    # Reset name entry
+    name_entry_active = False
+    player_name_input = ""
+    
+    # Reset speed boost
+    player_speed_boost_active = False
+    player_move_speed = player_base_speed
+    
+    # Reset game state - make state changes faster each level
+    GAME_STATE = "green"
+    STATE_TIMER = 0
+    STATE_CHANGE_INTERVAL_MIN = max(1.5, 3.0 - (CURRENT_LEVEL - 1) * 0.3)
+    STATE_CHANGE_INTERVAL_MAX = max(3.0, 7.0 - (CURRENT_LEVEL - 1) * 0.5)
+    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
+    DOLL_CURRENT_ROTATION = 180
+    DOLL_TARGET_ROTATION = 180
+    GAME_START_TIME = CURRENT_GAME_TIME
+    GAME_PHASE = 1
+    
+    # Clear bullets and effects
+    bullets.clear()
+    enemy_bullets.clear()
+    sparks.clear()
+    debris.clear()
+    
+    # Regenerate enemies and powerups (scaled to new level)
+    setup_enemies()
+    setup_powerups()
+    
+    save_previous_state()
+    
+    log(f"Advanced to Level {CURRENT_LEVEL}!")
+
+
+def restart_game():
+    """Reset the game to its initial state."""
+    global player_position, target_player_position, player_direction, target_player_direction
+    global player_was_caught, player_reached_finish, GAME_STATE, STATE_TIMER, NEXT_STATE_CHANGE
+    global DOLL_CURRENT_ROTATION, DOLL_TARGET_ROTATION
+    global player_score, time_survived, enemies_killed, GAME_START_TIME, GAME_PHASE
+    global player_velocity, powerups, player_speed_boost_active, player_move_speed
+    global STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX
+    global player_stamina, player_is_sprinting, sprint_key_held
+    global sprint_exhausted, sprint_cooldown_timer
+    global player_z_velocity, player_is_jumping, player_on_ground
+    global player_shield_active, player_shield_timer
+    global CURRENT_LEVEL, name_entry_active, player_name_input
+    
+    # Reset player
+    player_position = list(player_start_pos)
+    target_player_position = list(player_start_pos)
+    player_direction = 90.0
+    target_player_direction = 90.0
+    player_was_caught = False
+    player_reached_finish = False
+    player_velocity = [0.0, 0.0, 0.0]
+    player_stamina = player_max_stamina
+    player_is_sprinting = False
+    sprint_key_held = False
+    sprint_exhausted = False
+    sprint_cooldown_timer = 0.0
+    player_z_velocity = 0.0
+    player_is_jumping = False
+    player_on_ground = True
+    player_position[2] = player_ground_z
+    
+    # Reset shield
+    player_shield_active = False
+    player_shield_timer = 0.0
+    
+    # Reset name entry
+    name_entry_active = False
+    player_name_input = ""
+    
+    # Reset speed boost
+    player_speed_boost_active = False
+    player_move_speed = player_base_speed
+    
+    # Reset game state
+    GAME_STATE = "green"
+    STATE_TIMER = 0
+    NEXT_STATE_CHANGE = random.uniform(STATE_CHANGE_INTERVAL_MIN, STATE_CHANGE_INTERVAL_MAX)
+    DOLL_CURRENT_ROTATION = 180
+    DOLL_TARGET_ROTATION = 180
+    GAME_START_TIME = CURRENT_GAME_TIME
+    GAME_PHASE = 1
+    CURRENT_LEVEL = 1
+    
+    # Reset difficulty parameters to initial values
+    STATE_CHANGE_INTERVAL_MIN = 3.0
+    STATE_CHANGE_INTERVAL_MAX = 7.0
+    
+    # Reset scoring
+    player_score = 0
+    time_survived = 0
+    enemies_killed = 0
+    
+    # Clear bullets and effects
+    bullets.clear()
+    enemy_bullets.clear()
+    sparks.clear()
+    debris.clear()
+    
+    # Reset enemies
+    setup_enemies()
+    
+    # Reset powerups
+    setup_powerups()
+    
+    save_previous_state()
+    
+    log("Game restarted!")
+
+
+def submit_high_score(name):
+    """Record the entered name and current score in the leaderboard."""
+    global high_scores, name_entry_active
+    
+    if name.strip():
+        high_scores.append((name.strip(), player_score))
+        high_scores.sort(key=lambda x: x[1], reverse=True)
+        high_scores = high_scores[:MAX_HIGH_SCORES]
+        log(f"High score saved: {name.strip()} - {player_score}")
+    name_entry_active = False
+
+# --- Headless Runner ---
+def autopilot():
+    """Simple input policy for headless runs: run on green, stand still otherwise."""
+    global target_camera_yaw
+    
+    target_camera_yaw = 90.0  # Look down the track toward the finish line
+    keys_pressed.add(b' ')
+    if GAME_STATE == "green":
+        keys_pressed.add(b'w')
+    else:
+        keys_pressed.discard(b'w')
+
+def run_headless(rounds=100, dt=FIXED_DT, max_round_time=300.0, controller=autopilot, seed=None):
+    """
+    Play full rounds without a window and return aggregate results.
+    
+    Each round starts a fresh level 1 game and is stepped with a fixed dt
+    until the player is caught, reaches the finish, or max_round_time passes.
+    Particle effects are switched off for the run; they never affect play.
+    """
+    global VERBOSE, EFFECTS
+    
+    if seed is not None:
+        random.seed(seed)
+        enemies.seed(seed)
+        sparks.seed(seed)
+        debris.seed(seed)
+    
+    was_verbose, had_effects = VERBOSE, EFFECTS
+    VERBOSE = EFFECTS = False
+    
+    results = {'rounds': rounds, 'wins': 0, 'losses': 0, 'timeouts': 0, 'steps': 0}
+    max_steps = int(max_round_time / dt)
+    start_time = time.perf_counter()
+    
+    try:
+        for _ in range(rounds):
+            keys_pressed.clear()
+            start_game()
+            
+            for _ in range(max_steps):
+                controller()
+                step(dt)
+                results['steps'] += 1
+                if player_was_caught or player_reached_finish:
+                    break
+            
+            if player_reached_finish:
+                results['wins'] += 1
+            elif player_was_caught:
+                results['losses'] += 1
+            else:
+                results['timeouts'] += 1
+    finally:
+        VERBOSE, EFFECTS = was_verbose, had_effects
+        keys_pressed.clear()
+    
+    elapsed = time.perf_counter() - start_time
+    results['elapsed'] = elapsed
+    results['rounds_per_second'] = rounds / elapsed if elapsed > 0 else 0.0
+    results['steps_per_second'] = results['steps'] / elapsed if elapsed > 0 else 0.0
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run Red Light, Green Light rounds without a window.")
+    parser.add_argument("--rounds", type=int, default=100, help="number of rounds to simulate")
+    parser.add_argument("--hz", type=float, default=SIMULATION_HZ, help="simulation tick rate")
+    parser.add_argument("--max-time", type=float, default=300.0, help="simulated seconds before a round times out")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args()
+    
+    summary = run_headless(args.rounds, 1.0 / args.hz, args.max_time, seed=args.seed)
+    print(f"Rounds: {summary['rounds']}  Wins: {summary['wins']}  "
+          f"Losses: {summary['losses']}  Timeouts: {summary['timeouts']}")
+    print(f"Steps: {summary['steps']}  Elapsed: {summary['elapsed']:.2f}s  "
+          f"({summary['rounds_per_second']:.1f} rounds/s, {summary['steps_per_second']:.0f} steps/s)")
@@ -0,0 +1,29 @@
+"""
+Shared test setup: the repository root (for the vendored OpenGL package) and
+src/ go on sys.path, and GL tests get an offscreen context from offscreen.py.
+
+PyOpenGL picks its platform on first import, so it is chosen here, before any
+test module imports OpenGL.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'src')]
+
+import pytest
+
+import offscreen
+
+BACKEND = offscreen.select_platform()
+
+
+@pytest.fixture(scope='session')
+def gl_context():
+    """A current 64x64 offscreen context, or a skip where none can be made."""
+    try:
+        context = offscreen.CONTEXTS[BACKEND](64, 64)
+    except Exception as exc:
+        pytest.skip(f"No {BACKEND} context: {exc}")
+    yield context
+    context.destroy()
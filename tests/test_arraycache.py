@@ -0,0 +1,73 @@
+"""save_arrays/load_arrays round-trip aligned, read-only views and reject anything that does not match."""
+import os
+
+import numpy as np
+import pytest
+
+from arraycache import ALIGNMENT, MAGIC, cache_key, load_arrays, save_arrays
+
+ARRAYS = {
+    'positions': np.arange(300, dtype=np.float32).reshape(100, 3),
+    'flags': np.array([True, False, True]),
+    'bytes': np.arange(7, dtype=np.uint8),
+    'counts': np.array(42, dtype=np.int64),
+    'big_endian': np.arange(5, dtype='>i4'),
+    'records': np.array([(1, 2.5), (3, 4.5)], dtype=[('id', '<u2'), ('weight', '<f8')]),
+    'empty': np.zeros((0, 4), dtype=np.float64),
+    'fortran': np.asfortranarray(np.arange(12, dtype=np.int16).reshape(3, 4)),
+}
+
+
+@pytest.fixture
+def saved(tmp_path):
+    path = str(tmp_path / 'cache' / 'arrays.bin')
+    save_arrays(path, ARRAYS, 'key-1')
+    return path
+
+
+def test_round_trip_keeps_dtype_shape_and_values(saved):
+    loaded = load_arrays(saved, 'key-1')
+    assert set(loaded) == set(ARRAYS)
+    for name, array in ARRAYS.items():
+        assert loaded[name].dtype == array.dtype, name
+        assert loaded[name].shape == array.shape, name
+        np.testing.assert_array_equal(loaded[name], array)
+    assert os.listdir(os.path.dirname(saved)) == ['arrays.bin']
+
+
+def test_arrays_are_aligned_read_only_views(saved):
+    for name, array in load_arrays(saved, 'key-1').items():
+        if array.size:
+            assert array.ctypes.data % ALIGNMENT == 0, name
+        assert array.flags.c_contiguous and not array.flags.writeable, name
+
+
+def test_other_keys_and_missing_files_load_nothing(saved, tmp_path):
+    assert load_arrays(saved, 'key-2') is None
+    assert load_arrays(str(tmp_path / 'missing.bin'), 'key-1') is None
+    assert cache_key(1, 'a') == cache_key(1, 'a') != cache_key(1, 'b')
+
+
+def test_saving_again_replaces_the_file(saved):
+    save_arrays(saved, {'only': np.ones(3)}, 'key-2')
+    assert load_arrays(saved, 'key-1') is None
+    assert list(load_arrays(saved, 'key-2')) == ['only']
+
+
+@pytest.mark.parametrize('damage', ['truncated data', 'truncated header', 'magic', 'header size', 'header'])
+def test_damaged_files_load_nothing(saved, damage):
+    with open(saved, 'rb') as handle:
+        content = bytearray(handle.read())
+    if damage == 'truncated data':
+        content = content[:-ALIGNMENT]
+    elif damage == 'truncated header':
+        content = content[:len(MAGIC) + 12]
+    elif damage == 'magic':
+        content[0] ^= 0xFF
+    elif damage == 'header size':
+        content[len(MAGIC):len(MAGIC) + 8] = (1 << 40).to_bytes(8, 'little')
+    else:
+        content[len(MAGIC) + 8] = ord('#')
+    with open(saved, 'wb') as handle:
+        handle.write(content)
+    assert load_arrays(saved, 'key-1') is None
@@ -0,0 +1,54 @@
+"""ArrayDatatype's direct path for numpy arrays agrees with the handler it skips."""
+import numpy as np
+import pytest
+
+from OpenGL.arrays import arraydatatype
+from OpenGL.arrays.arraydatatype import ArrayDatatype, GLfloatArray
+from OpenGL.arrays.numpymodule import NumpyHandler
+
+if not hasattr(arraydatatype, '_direct'):
+    pytest.skip("OpenGL_accelerate provides ArrayDatatype", allow_module_level=True)
+
+handler = NumpyHandler()
+
+
+def test_matching_contiguous_arrays_pass_straight_through():
+    value = np.arange(12, dtype=np.float32).reshape(4, 3)
+    assert arraydatatype._direct(GLfloatArray, value)
+    assert GLfloatArray.asArray(value) is value
+    assert GLfloatArray.dataPointer(value) == value.ctypes.data == handler.dataPointer(value)
+    assert GLfloatArray.from_param(value).value == value.ctypes.data
+    assert GLfloatArray.arraySize(value) == handler.arraySize(value) == 12
+    assert GLfloatArray.arrayByteCount(value) == handler.arrayByteCount(value) == 48
+
+
+def test_read_only_arrays_use_the_array_interface():
+    value = np.arange(4, dtype=np.float32)
+    value.setflags(write=False)
+    assert GLfloatArray.dataPointer(value) == value.ctypes.data
+
+
+def test_untyped_arrays_take_any_dtype():
+    value = np.zeros(5, dtype=np.uint8)
+    assert arraydatatype._direct(ArrayDatatype, value)
+    assert ArrayDatatype.arrayByteCount(value) == 5
+
+
+def test_other_arrays_still_go_through_the_handler():
+    doubles = np.arange(6, dtype=np.float64)
+    assert not arraydatatype._direct(GLfloatArray, doubles)
+    converted = GLfloatArray.asArray(doubles)
+    assert converted.dtype == np.float32
+    np.testing.assert_array_equal(converted, doubles)
+
+    strided = np.arange(8, dtype=np.float32)[::2]
+    assert not arraydatatype._direct(GLfloatArray, strided)
+    np.testing.assert_array_equal(GLfloatArray.asArray(strided), strided)
+
+
+def test_registering_a_handler_forgets_the_decisions():
+    value = np.zeros(3, dtype=np.float32)
+    arraydatatype._direct(GLfloatArray, value)
+    assert arraydatatype._DIRECT_DISPATCH
+    arraydatatype.GLOBAL_REGISTRY.register(handler, (np.ndarray,))
+    assert not arraydatatype._DIRECT_DISPATCH
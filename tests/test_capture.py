@@ -0,0 +1,64 @@
+"""FrameRecorder hands every frame of its size to the sink, top-down, and skips frames of any other size."""
+import numpy as np
+
+from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_SCISSOR_TEST, glClear, glClearColor, glDisable, glEnable, glScissor
+
+from capture import FrameRecorder
+
+SIZE = 64
+
+
+class ListSink:
+    path = 'memory'
+
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def write(self, index, frame):
+        self.frames.append((index, frame.copy()))
+
+    def close(self):
+        self.closed = True
+
+
+def draw(shade):
+    """Clear to a grey level with a red band over the top quarter."""
+    glClearColor(shade / 255.0, shade / 255.0, shade / 255.0, 1.0)
+    glClear(GL_COLOR_BUFFER_BIT)
+    glEnable(GL_SCISSOR_TEST)
+    glScissor(0, SIZE * 3 // 4, SIZE, SIZE // 4)
+    glClearColor(1.0, 0.0, 0.0, 1.0)
+    glClear(GL_COLOR_BUFFER_BIT)
+    glDisable(GL_SCISSOR_TEST)
+
+
+def test_frames_reach_the_sink_in_order_and_top_down(gl_context):
+    sink = ListSink()
+    recorder = FrameRecorder(SIZE, SIZE, sink, buffers=2, frames=2)
+    for shade in (10, 20, 30, 40, 50):
+        draw(shade)
+        assert recorder.capture(SIZE, SIZE)
+    recorder.close()
+    assert sink.closed and recorder.written == 5 and recorder.skipped == 0
+    assert [index for index, _ in sink.frames] == list(range(5))
+    for (_, frame), shade in zip(sink.frames, (10, 20, 30, 40, 50)):
+        assert frame.shape == (SIZE, SIZE, 3)
+        assert (frame[:SIZE // 4] == (255, 0, 0)).all()
+        assert (frame[SIZE // 4:] == shade).all()
+
+
+def test_frames_of_another_size_are_skipped(gl_context):
+    sink = ListSink()
+    recorder = FrameRecorder(SIZE, SIZE, sink)
+    draw(10)
+    assert recorder.capture(SIZE, SIZE)
+    # The window shrank, then grew past the recording's size, then came back
+    assert not recorder.capture(SIZE // 2, SIZE)
+    assert not recorder.capture(SIZE * 2, SIZE * 2)
+    draw(20)
+    assert recorder.capture(SIZE, SIZE)
+    recorder.close()
+    assert recorder.skipped == 2 and recorder.captured == 2
+    assert [index for index, _ in sink.frames] == [0, 1]
+    assert np.unique(sink.frames[1][1][SIZE // 4:]).tolist() == [20]
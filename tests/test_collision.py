@@ -0,0 +1,80 @@
+"""SpatialHash candidates cover every true neighbour; swept_sphere_toi finds first contact."""
+import numpy as np
+import pytest
+
+from collision import SpatialHash, swept_sphere_toi
+
+
+def brute_force_pairs(points, positions, radius):
+    distance = np.linalg.norm(points[:, None, :2] - positions[None, :, :2], axis=2)
+    return {(int(q), int(i)) for q, i in zip(*np.nonzero(distance <= radius))}
+
+
+@pytest.mark.parametrize('min_items', [1, 1000], ids=['bucketed', 'all-pairs'])
+def test_query_finds_every_item_within_radius(min_items):
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-500.0, 500.0, size=(300, 3))
+    points = rng.uniform(-600.0, 600.0, size=(50, 3))
+    grid = SpatialHash(40.0, min_items=min_items)
+    grid.rebuild(positions)
+    for radius in (10.0, 40.0, 95.0):
+        query_index, item_index = grid.query(points, radius)
+        candidates = set(zip(query_index.tolist(), item_index.tolist()))
+        assert brute_force_pairs(points, positions, radius) <= candidates
+        assert len(candidates) == len(query_index)
+
+
+def test_query_point_matches_query():
+    rng = np.random.default_rng(4)
+    positions = rng.uniform(-300.0, 300.0, size=(200, 2))
+    grid = SpatialHash(25.0, min_items=1)
+    grid.rebuild(positions)
+    for x, y in rng.uniform(-300.0, 300.0, size=(20, 2)):
+        _, items = grid.query([(x, y)], 30.0)
+        np.testing.assert_array_equal(grid.query_point(x, y, 30.0), np.sort(items))
+
+
+def test_mask_and_negative_cells():
+    positions = np.array([(-0.5, -0.5), (5.5, 5.5), (-100.0, 100.0), (-0.4, -0.6)])
+    grid = SpatialHash(1.0, min_items=1)
+    grid.rebuild(positions, mask=np.array([True, True, True, False]))
+    assert len(grid) == 3
+    assert set(grid.query_point(-0.5, -0.5, 0.1).tolist()) == {0}
+    assert set(grid.query_point(-100.0, 100.0, 0.1).tolist()) == {2}
+
+
+def test_empty_grid():
+    grid = SpatialHash(10.0)
+    grid.rebuild(np.zeros((0, 2)))
+    query_index, item_index = grid.query([(0.0, 0.0)], 5.0)
+    assert len(query_index) == len(item_index) == 0
+
+
+def test_swept_sphere_toi_cases():
+    starts = [(0, 0, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0)]
+    ends = [(10, 0, 0), (10, 0, 0), (10, 0, 0), (-10, 0, 0), (2, 0, 0), (0, 0, 0)]
+    centers = [(6, 0, 0), (5, 3, 0), (0.5, 0, 0), (6, 0, 0), (6, 0, 0), (6, 0, 0)]
+    radii = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    toi = swept_sphere_toi(starts, ends, centers, radii)
+    # Head-on, passing wide, starting inside, moving away, stopping short, standing still
+    np.testing.assert_allclose(toi, [0.5, np.inf, 0.0, np.inf, np.inf, np.inf])
+
+
+def test_swept_sphere_toi_matches_sampling():
+    rng = np.random.default_rng(6)
+    count = 200
+    # Segments aimed roughly through their spheres, so that most of them hit
+    centers = rng.uniform(-5.0, 5.0, size=(count, 3))
+    starts = centers + rng.uniform(-10.0, 10.0, size=(count, 3))
+    ends = 2 * centers - starts + rng.normal(0.0, 3.0, size=(count, 3))
+    radii = rng.uniform(1.0, 4.0, size=count)
+    toi = swept_sphere_toi(starts, ends, centers, radii)
+
+    steps = np.linspace(0.0, 1.0, 20001)
+    path = starts[:, None, :] + steps[None, :, None] * (ends - starts)[:, None, :]
+    touching = np.linalg.norm(path - centers[:, None, :], axis=2) <= radii[:, None]
+    hit = touching.any(axis=1)
+    first = np.where(hit, steps[np.argmax(touching, axis=1)], np.inf)
+    np.testing.assert_array_equal(np.isfinite(toi), hit)
+    assert hit.sum() > count // 2
+    np.testing.assert_allclose(toi[hit], first[hit], atol=1e-4)
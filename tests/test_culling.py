@@ -0,0 +1,84 @@
+"""visible_boxes rejects boxes outside the frustum or beyond the fog, and keeps the rest."""
+import math
+
+import numpy as np
+import pytest
+
+from culling import box_distances, fog_cutoff_distance, frustum_planes, visible_boxes
+
+
+def perspective(fovy, aspect, near, far):
+    """gluPerspective's matrix, column-major as glGetFloatv returns it."""
+    f = 1.0 / math.tan(math.radians(fovy) / 2)
+    matrix = np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0],
+    ])
+    return matrix.T.ravel()
+
+
+def translation(x, y, z):
+    matrix = np.eye(4)
+    matrix[:3, 3] = (x, y, z)
+    return matrix.T.ravel()
+
+
+# A 90 degree square frustum looking down -z from the origin, 1 to 100 units deep
+PLANES = frustum_planes(perspective(90, 1.0, 1.0, 100.0), np.eye(4).ravel())
+
+
+def boxes(*centers, half=0.5):
+    centers = np.asarray(centers, dtype=float)
+    return centers - half, centers + half
+
+
+def test_planes_are_normalized_and_face_inwards():
+    np.testing.assert_allclose(np.linalg.norm(PLANES[:, :3], axis=1), 1.0)
+    inside = np.array([0.0, 0.0, -50.0, 1.0])
+    assert (PLANES @ inside > 0).all()
+    np.testing.assert_allclose(PLANES[4] @ [0, 0, -1, 1], 0.0, atol=1e-9)
+    np.testing.assert_allclose(PLANES[5] @ [0, 0, -100, 1], 0.0, atol=1e-9)
+
+
+@pytest.mark.parametrize('center, expected', [
+    ((0, 0, -10), True),        # Straight ahead
+    ((0, 0, 10), False),        # Behind the camera
+    ((0, 0, -150), False),      # Past the far plane
+    ((-30, 0, -10), False),     # Off to the left
+    ((0, 30, -10), False),      # Above
+    ((10.4, 0, -10), True),     # Centre just outside the right plane, corner still inside
+    ((0, 0, -100.4), True),     # Straddling the far plane
+])
+def test_boxes_against_the_frustum(center, expected):
+    assert visible_boxes(*boxes(center), PLANES).tolist() == [expected]
+
+
+def test_the_modelview_moves_the_frustum():
+    # Moving the camera 200 units along +x shifts the world the other way
+    planes = frustum_planes(perspective(90, 1.0, 1.0, 100.0), translation(-200, 0, 0))
+    assert visible_boxes(*boxes((0, 0, -10), (200, 0, -10)), planes).tolist() == [False, True]
+
+
+def test_fog_cutoff_rejects_boxes_by_their_nearest_point():
+    box_min, box_max = boxes((0, 0, -10), (0, 0, -60), (0, 0, -90), half=5.0)
+    np.testing.assert_allclose(box_distances(box_min, box_max, (0, 0, 0)), [5, 55, 85])
+    assert box_distances(box_min, box_max, (0, 0, -10))[0] == 0
+    mask = visible_boxes(box_min, box_max, PLANES, eye=(0, 0, 0), max_distance=55.0)
+    assert mask.tolist() == [True, True, False]
+    # Either half of the distance test alone culls nothing
+    assert visible_boxes(box_min, box_max, PLANES, eye=(0, 0, 0)).all()
+    assert visible_boxes(box_min, box_max, max_distance=1.0).all()
+
+
+def test_fog_cutoff_distance_is_where_the_fog_passes_the_threshold():
+    density = 0.002
+    cutoff = fog_cutoff_distance(density)
+    np.testing.assert_allclose(math.exp(-(density * cutoff) ** 2), 1.0 / 255.0)
+    assert fog_cutoff_distance(2 * density) == pytest.approx(cutoff / 2)
+
+
+def test_no_boxes_and_no_tests():
+    assert visible_boxes(np.zeros((0, 3)), np.zeros((0, 3)), PLANES).shape == (0,)
+    assert visible_boxes(*boxes((0, 0, 10), (0, 0, -1e6))).all()
@@ -0,0 +1,77 @@
+"""EnemyStore spawns into slot ranges, kills by slot and compacts the survivors to the front."""
+import numpy as np
+
+import simulation as sim
+from enemies import ENEMY_BLACK, ENEMY_BLUE, ENEMY_RED, ENEMY_SCALES, FIELDS, EnemyStore
+
+
+def make_store():
+    store = EnemyStore(10, rng=np.random.default_rng(1))
+    store.spawn(0, 4, ENEMY_RED, (-100, 100), (0, 50))
+    store.spawn(4, 4, ENEMY_BLUE, (-100, 100), (0, 50))
+    store.spawn(8, 2, ENEMY_BLACK, (-100, 100), (0, 50))
+    return store
+
+
+def test_resize_starts_every_slot_dead():
+    store = EnemyStore(5)
+    assert len(store) == 5 and not store.alive.any()
+    for name in FIELDS:
+        assert len(getattr(store, name)) == 5, name
+
+
+def test_spawn_fills_its_slots_and_leaves_the_rest():
+    store = EnemyStore(6, rng=np.random.default_rng(2))
+    assert store.spawn(1, 3, ENEMY_BLACK, (10, 20), (-5, 5)) == slice(1, 4)
+    np.testing.assert_array_equal(store.alive, [False, True, True, True, False, False])
+    spawned = store.position[1:4]
+    assert ((spawned[:, 0] >= 10) & (spawned[:, 0] <= 20)).all()
+    assert ((spawned[:, 1] >= -5) & (spawned[:, 1] <= 5)).all()
+    assert (spawned[:, 2] == 0).all()
+    np.testing.assert_array_equal(store.prev_position[1:4], spawned)
+    np.testing.assert_array_equal(store.last_position[1:4], spawned)
+    assert (store.type[1:4] == ENEMY_BLACK).all()
+    assert (store.scale[1:4] == ENEMY_SCALES[ENEMY_BLACK]).all()
+    assert store.type_name(2) == 'black'
+    assert not store.position[[0, 4, 5]].any()
+
+
+def test_kill_takes_an_index_an_index_array_or_a_mask():
+    store = make_store()
+    store.kill(0)
+    store.kill(np.array([3, 9]))
+    store.kill(store.type == ENEMY_BLUE)
+    np.testing.assert_array_equal(np.flatnonzero(store.alive), [1, 2, 8])
+    # The slots stay put until the store is compacted
+    assert len(store) == 10
+
+
+def test_compact_keeps_the_survivors_in_slot_order():
+    store = make_store()
+    store.speed[:] = np.arange(10)
+    position = store.position.copy()
+    store.kill([0, 2, 5, 6, 9])
+    assert store.compact() == 5
+    np.testing.assert_array_equal(store.speed, [1, 3, 4, 7, 8])
+    np.testing.assert_array_equal(store.position, position[[1, 3, 4, 7, 8]])
+    np.testing.assert_array_equal(store.type, [ENEMY_RED, ENEMY_RED, ENEMY_BLUE, ENEMY_BLUE, ENEMY_BLACK])
+    assert store.alive.all()
+    for name in FIELDS:
+        assert len(getattr(store, name)) == 5, name
+    # Nothing dead, nothing to move
+    speed = store.speed
+    assert store.compact() == 5 and store.speed is speed
+
+
+def test_collision_checks_compact_once_most_enemies_are_dead():
+    sim.VERBOSE = False
+    sim.keys_pressed.clear()
+    sim.start_game()
+    count = len(sim.enemies)
+    sim.enemies.kill(slice(0, count // 2))
+    sim.rebuild_collision_grids()
+    assert len(sim.enemies) == count
+    sim.enemies.kill(count // 2)
+    sim.rebuild_collision_grids()
+    assert len(sim.enemies) == count - count // 2 - 1
+    assert sim.enemies.alive.all()
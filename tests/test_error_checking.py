@@ -0,0 +1,55 @@
+"""Deferred GL error checking: errors stay in the GL until OpenGL.error.checkpoint."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from OpenGL import GL, error
+from OpenGL.GL import fast
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BAD_CAPABILITY = 0xFFFF
+
+
+def test_checkpoint_reports_unchecked_errors(gl_context):
+    error.checkpoint()
+    fast.glEnable(BAD_CAPABILITY)
+    fast.glEnable(BAD_CAPABILITY)
+    with pytest.raises(error.DeferredGLError) as raised:
+        error.checkpoint('setup')
+    assert raised.value.region == 'setup'
+    assert raised.value.errors == [GL.GL_INVALID_ENUM]
+    assert raised.value.err == GL.GL_INVALID_ENUM
+    error.checkpoint()
+
+
+def test_per_call_checking_still_raises(gl_context):
+    with pytest.raises(error.GLError):
+        GL.glEnable(BAD_CAPABILITY)
+    error.checkpoint()
+
+
+def test_deferred_mode_leaves_errors_for_the_checkpoint(gl_context):
+    script = (
+        "import sys\n"
+        "import offscreen\n"
+        "backend = offscreen.select_platform()\n"
+        "import OpenGL\n"
+        "assert OpenGL.ERROR_CHECKING == 'deferred', OpenGL.ERROR_CHECKING\n"
+        "context = offscreen.CONTEXTS[backend](16, 16)\n"
+        "from OpenGL.GL import GL_INVALID_ENUM, glEnable\n"
+        "from OpenGL.error import DeferredGLError, checkpoint\n"
+        f"glEnable({BAD_CAPABILITY})\n"
+        "try:\n"
+        "    checkpoint('frame')\n"
+        "except DeferredGLError as err:\n"
+        "    assert err.region == 'frame' and err.errors == [GL_INVALID_ENUM], err\n"
+        "else:\n"
+        "    sys.exit('no error at the checkpoint')\n"
+        "checkpoint('clean')\n"
+        "context.destroy()\n"
+    )
+    environment = dict(os.environ, PYOPENGL_ERROR_CHECKING='deferred',
+                       PYTHONPATH=os.pathsep.join((ROOT, os.path.join(ROOT, 'src'))))
+    subprocess.run([sys.executable, '-c', script], check=True, env=environment, cwd=ROOT)
@@ -0,0 +1,75 @@
+"""The lazily loaded OpenGL.GL namespace matches the eager star-imports it replaced."""
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+from OpenGL import GL
+from OpenGL.GL import _names, _namespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_index_is_up_to_date():
+    assert _namespace.build_index() == _names.INDEX
+
+
+def test_names_resolve_to_their_owners():
+    for module_name, names in _names.INDEX.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            assert getattr(GL, name) is getattr(module, name), name
+
+
+def test_star_import_binds_all_names_and_submodules():
+    namespace = {}
+    exec('from OpenGL.GL import *', namespace)
+    names = set(namespace) - {'__builtins__'}
+    assert names == set(GL.__all__)
+    for name in ('glClear', 'GL_FLOAT', 'GLError', 'GLerror', 'glRotate', 'VERSION', 'ARB', 'KHR'):
+        assert name in names, name
+
+
+def test_aliases_and_missing_names():
+    assert GL.glRotate is GL.glRotated
+    assert GL.glGetInteger is GL.glGetIntegerv
+    with pytest.raises(AttributeError):
+        GL.glNoSuchFunction
+
+
+def test_first_use_loads_only_the_owning_module():
+    script = (
+        "import sys\n"
+        "from OpenGL.GL import glClear, GL_FLOAT\n"
+        "loaded = [name for name in sys.modules if name.startswith('OpenGL.GL.VERSION.GL_4')]\n"
+        "assert not loaded, loaded\n"
+        "from OpenGL.GL import glBufferStorage\n"
+        "assert 'OpenGL.GL.VERSION.GL_4_4' in sys.modules\n"
+    )
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, '-c', script], check=True, env=environment, cwd=ROOT)
+
+
+def test_bare_import_runs_the_registrations():
+    script = (
+        "import OpenGL.GL, OpenGL.images\n"
+        "from OpenGL.arrays import vbo\n"
+        "from OpenGL.GL import GL_RGBA, GL_UNSIGNED_BYTE\n"
+        "assert OpenGL.images.COMPONENT_COUNTS[GL_RGBA] == 4\n"
+        "assert GL_UNSIGNED_BYTE in OpenGL.images.TYPE_TO_ARRAYTYPE\n"
+        "assert OpenGL.images.TIGHT_PACK_FORMATS and OpenGL.images.RANK_PACKINGS\n"
+        "assert len(vbo.Implementation.IMPLEMENTATION_CLASSES) == 2\n"
+    )
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, '-c', script], check=True, env=environment, cwd=ROOT)
+
+
+def test_vbo_finds_its_implementation_without_opengl_gl():
+    script = (
+        "from OpenGL.arrays import vbo\n"
+        "assert vbo.get_implementation() is not None\n"
+    )
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, '-c', script], check=True, env=environment, cwd=ROOT)
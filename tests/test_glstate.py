@@ -0,0 +1,89 @@
+"""GLStateCache drops redundant state calls, counts them per frame, and forgets on invalidate."""
+import pytest
+
+from OpenGL.GL import (GL_BLEND, GL_COMPILE, GL_COMPILE_AND_EXECUTE, GL_DEPTH_TEST, GL_DEPTH_WRITEMASK,
+                       GL_LIGHTING, GL_ONE, GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, glDeleteLists, glDisable,
+                       glGenLists, glGetBooleanv, glIsEnabled)
+
+from glstate import GLStateCache
+
+
+@pytest.fixture
+def cache(gl_context):
+    for cap in (GL_BLEND, GL_DEPTH_TEST, GL_LIGHTING):
+        glDisable(cap)
+    return GLStateCache()
+
+
+def test_repeated_changes_reach_gl_once(cache):
+    for _ in range(3):
+        cache.enable(GL_BLEND)
+        cache.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        cache.depth_mask(False)
+    assert glIsEnabled(GL_BLEND) and not glGetBooleanv(GL_DEPTH_WRITEMASK)
+    assert (cache.issued, cache.skipped) == (3, 6)
+    # A different value always goes through
+    cache.blend_func(GL_SRC_ALPHA, GL_ONE)
+    cache.disable(GL_BLEND)
+    cache.depth_mask(True)
+    assert not glIsEnabled(GL_BLEND) and glGetBooleanv(GL_DEPTH_WRITEMASK)
+    assert (cache.issued, cache.skipped) == (6, 6)
+
+
+def test_queries_are_answered_from_the_cache(cache):
+    assert cache.is_enabled(GL_DEPTH_TEST) is False
+    assert cache.answered == 0
+    cache.enable(GL_DEPTH_TEST)
+    assert cache.is_enabled(GL_DEPTH_TEST) is True
+    cache.set_viewport(0, 0, 32, 16)
+    assert cache.viewport() == (0, 0, 32, 16)
+    assert cache.answered == 2
+
+
+def test_end_frame_keeps_the_counts_and_resets_them(cache):
+    cache.enable(GL_LIGHTING)
+    cache.enable(GL_LIGHTING)
+    cache.is_enabled(GL_LIGHTING)
+    assert cache.end_frame() == (1, 1, 1)
+    assert cache.last_frame == (1, 1, 1)
+    assert (cache.issued, cache.skipped, cache.answered) == (0, 0, 0)
+    cache.enable(GL_LIGHTING)
+    assert cache.end_frame() == (0, 1, 0)
+
+
+def test_invalidate_resyncs_after_changes_behind_its_back(cache):
+    cache.enable(GL_BLEND)
+    cache.viewport()
+    glDisable(GL_BLEND)
+    # The stale cache believes blending is still on and drops the call
+    cache.enable(GL_BLEND)
+    assert not glIsEnabled(GL_BLEND)
+    cache.invalidate()
+    cache.enable(GL_BLEND)
+    assert glIsEnabled(GL_BLEND)
+    assert (cache.issued, cache.skipped) == (2, 1)
+    cache.viewport()
+    assert cache.answered == 0
+
+
+@pytest.mark.parametrize('mode', [GL_COMPILE, GL_COMPILE_AND_EXECUTE], ids=['compile', 'compile_and_execute'])
+def test_display_lists_record_every_change_and_apply_it_when_called(cache, mode):
+    cache.enable(GL_BLEND)
+    display_list = glGenLists(1)
+    try:
+        cache.new_list(display_list, mode)
+        # Recorded in full even though the cache already has blending on
+        cache.enable(GL_BLEND)
+        cache.enable(GL_LIGHTING)
+        cache.end_list(display_list)
+        assert cache.skipped == 0
+        assert cache.is_enabled(GL_LIGHTING) is (mode == GL_COMPILE_AND_EXECUTE)
+        cache.disable(GL_LIGHTING)
+
+        cache.call_list(display_list)
+        assert glIsEnabled(GL_LIGHTING)
+        issued = cache.issued
+        cache.enable(GL_LIGHTING)
+        assert cache.issued == issued
+    finally:
+        glDeleteLists(display_list, 1)
@@ -0,0 +1,49 @@
+"""The game renders windowless frames, HUD lettering included, through offscreen.py."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import json
+import numpy as np
+import offscreen
+
+try:
+    game = offscreen.OffscreenGame(320, 240)
+except Exception as error:
+    print(json.dumps({'skip': str(error)}))
+    raise SystemExit
+with game:
+    start = game.render()
+    game.sim.VERBOSE = False
+    game.sim.start_game()
+    play = game.frame(controller=game.sim.autopilot)
+    print(json.dumps({
+        'shape': play.shape,
+        'colors': [len(np.unique(image.reshape(-1, 3), axis=0)) for image in (start, play)],
+        'atlas': game.game.glyph_atlas.texture is not None,
+        'clock': game.game.animation_clock is game.clock,
+        'glutless': game.game.glyph_atlas.bitmaps.width(game.game.GLUT_BITMAP_HELVETICA_18, ord('A')),
+    }))
+"""
+
+
+def test_one_frame_renders_with_text(tmp_path):
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'src')]),
+                       XDG_CACHE_HOME=str(tmp_path))
+    output = subprocess.run([sys.executable, '-c', SCRIPT], check=True, env=environment, cwd=tmp_path,
+                            capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    if 'skip' in result:
+        pytest.skip(f"No offscreen context: {result['skip']}")
+    assert result['shape'] == [240, 320, 3]
+    # The start screen is flat panels and lettering; play adds the lit, fogged scene
+    start_colors, play_colors = result['colors']
+    assert start_colors > 4 and play_colors > 100
+    assert result['atlas'] and result['clock']
+    assert result['glutless'] == 12
@@ -0,0 +1,67 @@
+"""ParticleEmitter spawns into its free tail, keeps the live particles packed, and retires them on time."""
+import numpy as np
+
+from particles import ParticleEmitter
+
+
+def test_emit_fills_the_tail_and_drops_the_overflow():
+    emitter = ParticleEmitter(100, seed=1)
+    assert emitter.emit((10.0, 20.0, 30.0), 60, 5.0, (1.0, 2.0), (1.0, 0.5, 0.0), drift=(0.0, 0.0, 100.0)) == 60
+    assert emitter.emit((0.0, 0.0, 0.0), 60, 5.0, (1.0, 2.0), (0.0, 0.0, 1.0)) == 40
+    assert len(emitter) == 100 and emitter.dropped == 20
+    assert emitter.emit((0.0, 0.0, 0.0), 5, 5.0, (1.0, 2.0), (0.0, 0.0, 1.0)) == 0
+    assert emitter.dropped == 25
+
+    first = slice(0, 60)
+    np.testing.assert_array_equal(emitter.position[first], np.tile([10.0, 20.0, 30.0], (60, 1)))
+    assert (np.abs(emitter.velocity[first, :2]) <= 5.0).all()
+    assert (np.abs(emitter.velocity[first, 2] - 100.0) <= 5.0).all()
+    assert ((emitter.life[:100] >= 1.0) & (emitter.life[:100] <= 2.0)).all()
+    np.testing.assert_allclose(emitter.inverse_lifetime[:100], 1.0 / emitter.life[:100])
+    np.testing.assert_array_equal(emitter.color[0], [255, 127, 0, 255])
+    np.testing.assert_array_equal(emitter.color[99], [0, 0, 255, 255])
+
+
+def test_spread_scatters_start_points_over_a_cube():
+    emitter = ParticleEmitter(500, seed=2)
+    emitter.emit((100.0, 0.0, 50.0), 500, 0.0, (1.0, 1.0), (1.0, 1.0, 1.0), spread=10.0)
+    offsets = emitter.position - (100.0, 0.0, 50.0)
+    assert (np.abs(offsets) <= 10.0).all()
+    assert np.abs(offsets).max() > 9.0
+
+
+def test_compact_keeps_the_survivors_in_order():
+    emitter = ParticleEmitter(8, seed=3)
+    emitter.emit((0.0, 0.0, 0.0), 8, 1.0, (1.0, 1.0), (1.0, 1.0, 1.0))
+    emitter.position[:8, 0] = np.arange(8)
+    emitter.life[:8] = np.arange(8) + 1.0
+    alive = np.array([True, False, True, True, False, False, True, False])
+    emitter._compact(alive, int(alive.sum()))
+    assert len(emitter) == 4
+    np.testing.assert_array_equal(emitter.position[:4, 0], [0, 2, 3, 6])
+    np.testing.assert_array_equal(emitter.life[:4], [1, 3, 4, 7])
+
+
+def test_particles_expire_after_their_lifetime_and_fade_on_the_way():
+    emitter = ParticleEmitter(64, seed=4)
+    emitter.emit((0.0, 0.0, 0.0), 32, 1.0, (0.5, 0.5), (1.0, 1.0, 1.0))
+    emitter.emit((0.0, 0.0, 0.0), 32, 1.0, (1.5, 1.5), (1.0, 1.0, 1.0))
+    emitter.update(0.25)
+    assert len(emitter) == 64
+    np.testing.assert_allclose(emitter.color[:32, 3], 127, atol=1)
+    emitter.update(0.5)
+    assert len(emitter) == 32
+    np.testing.assert_allclose(emitter.life[:32], 0.75, atol=1e-6)
+    emitter.update(1.0)
+    assert len(emitter) == 0
+    # The freed slots are reused from the front
+    assert emitter.emit((0.0, 0.0, 0.0), 64, 1.0, (1.0, 1.0), (1.0, 1.0, 1.0)) == 64
+
+
+def test_update_applies_drag_and_gravity_and_stops_at_the_ground():
+    emitter = ParticleEmitter(4, gravity=10.0, drag=0.5, seed=5)
+    emitter.emit((0.0, 0.0, 1.0), 4, 0.0, (5.0, 5.0), (1.0, 1.0, 1.0), drift=(2.0, 0.0, 0.0))
+    emitter.update(1.0)
+    np.testing.assert_allclose(emitter.velocity[:4], np.tile([1.0, 0.0, -10.0], (4, 1)))
+    np.testing.assert_allclose(emitter.position[:4, 0], 1.0)
+    np.testing.assert_array_equal(emitter.position[:4, 2], 0.0)
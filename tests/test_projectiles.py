@@ -0,0 +1,53 @@
+"""ProjectilePool: slot reuse, release and recycling of the oldest projectile."""
+import numpy as np
+
+from projectiles import ProjectilePool
+
+
+def spawn(pool, x=0.0):
+    return pool.spawn((x, 0.0, 0.0), 0.0, 10.0, 1.0, 1.0)
+
+
+def test_release_frees_slots_for_reuse():
+    pool = ProjectilePool(4)
+    slots = [spawn(pool) for _ in range(3)]
+    assert slots == [0, 1, 2] and len(pool) == 3
+    pool.release([1])
+    assert len(pool) == 2 and not pool.active[1]
+    assert spawn(pool) == 1
+
+
+def test_release_with_repeated_slots_frees_each_once():
+    pool = ProjectilePool(4)
+    for _ in range(3):
+        spawn(pool)
+    pool.release(np.array([2, 0, 2, 0]))
+    assert len(pool) == 1
+    assert sorted(spawn(pool) for _ in range(3)) == [0, 2, 3]
+    assert len(pool) == 4 and pool.active.all()
+
+
+def test_release_ignores_inactive_slots():
+    pool = ProjectilePool(2)
+    spawn(pool)
+    pool.release([0])
+    pool.release([0, 1])
+    assert len(pool) == 0 and pool._free_count == 2
+
+
+def test_full_pool_recycles_the_oldest():
+    pool = ProjectilePool(2)
+    spawn(pool, 1.0)
+    spawn(pool, 2.0)
+    assert spawn(pool, 3.0) == 0
+    assert list(pool.live_slots()) == [1, 0]
+    assert pool.position[0, 0] == 3.0
+
+
+def test_integrate_moves_and_expires():
+    pool = ProjectilePool(4)
+    slot = spawn(pool)
+    pool.integrate(0.5, 100.0, 100.0)
+    assert pool.position[slot, 0] == 5.0 and pool.active[slot]
+    pool.integrate(0.6, 100.0, 100.0)
+    assert not pool.active[slot] and len(pool) == 0
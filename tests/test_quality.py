@@ -0,0 +1,77 @@
+"""QualityGovernor steps tiers on synthetic frame times, and every tier knob is read by the renderer."""
+import os
+import re
+
+from quality import QUALITY_TIERS, QualityGovernor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = 1.0 / 60
+
+
+def feed(governor, frames, frame_time, render_time=None):
+    """Record frames identical frames; returns the 1-based frame numbers on which the tier changed."""
+    return [number for number in range(1, frames + 1) if governor.record(frame_time, render_time)]
+
+
+def test_slow_frames_step_down_one_window_at_a_time():
+    governor = QualityGovernor(60, window=10)
+    assert feed(governor, 9, 2 * BUDGET) == []
+    assert feed(governor, 1, 2 * BUDGET) == [1]
+    assert governor.name == 'medium'
+    # The window restarts, so the next step needs a full window of the new tier's frames
+    assert feed(governor, 30, 2 * BUDGET) == [10, 20]
+    assert governor.tier == len(QUALITY_TIERS) - 1
+    assert feed(governor, 30, 2 * BUDGET) == []
+    assert governor.changes == 3
+
+
+def test_frames_within_slack_hold_the_tier():
+    governor = QualityGovernor(60, window=10, slack=1.1)
+    assert feed(governor, 50, 1.05 * BUDGET) == []
+    # One long frame in the window is averaged out
+    governor.record(1.5 * BUDGET)
+    assert feed(governor, 5, BUDGET) == []
+    assert governor.tier == 0
+
+
+def test_headroom_in_render_time_steps_up_after_a_window():
+    governor = QualityGovernor(60, window=10, headroom=0.7)
+    governor._switch(2)
+    # Vsync holds the interval at the budget; only the render time shows the spare capacity
+    assert feed(governor, 30, BUDGET, 0.5 * BUDGET) == [19]
+    assert governor.name == 'medium'
+    # Without a render time the interval is all there is, and it shows no headroom
+    assert feed(governor, 60, BUDGET) == []
+
+
+def test_headroom_has_to_be_unbroken():
+    governor = QualityGovernor(60, window=10)
+    governor._switch(1)
+    assert feed(governor, 12, BUDGET, 0.5 * BUDGET) == []
+    # A window averaging no headroom resets the count of spare frames...
+    assert feed(governor, 10, BUDGET, BUDGET) == []
+    # ...so it starts again once the average recovers, seven frames in
+    assert feed(governor, 15, BUDGET, 0.5 * BUDGET) == []
+    assert feed(governor, 1, BUDGET, 0.5 * BUDGET) == [1]
+    assert governor.tier == 0
+
+
+def test_a_tier_that_failed_needs_longer_headroom_to_return():
+    governor = QualityGovernor(60, window=10)
+    assert feed(governor, 10, 2 * BUDGET) == [10]
+    # high failed once, so returning to it takes two windows of spare frames after the first fills
+    assert feed(governor, 29, BUDGET, 0.5 * BUDGET) == [29]
+    assert feed(governor, 10, 2 * BUDGET) == [10]
+    assert feed(governor, 50, BUDGET, 0.5 * BUDGET) == [39]
+    assert governor.tier == 0
+
+
+def test_tiers_share_their_knobs_and_the_renderer_reads_each_one():
+    knobs = set(QUALITY_TIERS[0]) - {'name'}
+    assert knobs == {'forest_density', 'lod_scale', 'fog_scale', 'hud_interval', 'sphere_detail',
+                     'enemy_detail_distance'}
+    for tier in QUALITY_TIERS:
+        assert set(tier) - {'name'} == knobs, tier['name']
+    with open(os.path.join(ROOT, 'src', 'red_light_green_light.py')) as handle:
+        read = set(re.findall(r"settings\['(\w+)'\]", handle.read()))
+    assert read == knobs
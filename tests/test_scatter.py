@@ -0,0 +1,45 @@
+"""poisson_disk keeps its spacing, bounds and exclusions, and fills the area."""
+import numpy as np
+
+from scatter import disk_radius, poisson_disk
+
+BOUNDS = (0.0, 0.0, 200.0, 150.0)
+AREA = 200.0 * 150.0
+
+
+def nearest_distances(points):
+    gaps = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+    np.fill_diagonal(gaps, np.inf)
+    return gaps.min(axis=1)
+
+
+def test_points_keep_their_spacing_and_bounds():
+    radius = 5.0
+    points = poisson_disk(BOUNDS, radius, np.random.default_rng(1))
+    assert points.shape[1] == 2
+    assert nearest_distances(points).min() >= radius
+    assert (points >= BOUNDS[:2]).all() and (points <= BOUNDS[2:]).all()
+    # No gaps: anywhere in the bounds is within two radii of a point
+    probes = np.random.default_rng(99).uniform(BOUNDS[:2], BOUNDS[2:], size=(2000, 2))
+    assert np.linalg.norm(probes[:, None, :] - points[None, :, :], axis=2).min(axis=1).max() < 2 * radius
+
+
+def test_disk_radius_gives_at_least_the_count():
+    for count in (200, 800):
+        points = poisson_disk(BOUNDS, disk_radius(AREA, count), np.random.default_rng(count))
+        assert len(points) >= count
+
+
+def test_excluded_rectangles_stay_empty():
+    hole = (50.0, 40.0, 120.0, 90.0)
+    points = poisson_disk(BOUNDS, 4.0, np.random.default_rng(2), excluded=[hole])
+    inside = ((points[:, 0] >= hole[0]) & (points[:, 0] <= hole[2])
+              & (points[:, 1] >= hole[1]) & (points[:, 1] <= hole[3]))
+    assert not inside.any()
+    assert len(points) > 0
+
+
+def test_same_seed_same_layout():
+    first = poisson_disk(BOUNDS, 6.0, np.random.default_rng(9))
+    np.testing.assert_array_equal(first, poisson_disk(BOUNDS, 6.0, np.random.default_rng(9)))
+    assert not np.array_equal(first, poisson_disk(BOUNDS, 6.0, np.random.default_rng(10))[:len(first)])
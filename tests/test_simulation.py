@@ -0,0 +1,65 @@
+"""The headless simulation core runs, and repeats itself, without OpenGL."""
+import os
+import subprocess
+import sys
+
+import simulation as sim
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script):
+    environment = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    return subprocess.run([sys.executable, '-c', script], check=True, env=environment, cwd=ROOT,
+                          capture_output=True, text=True).stdout
+
+
+def test_simulation_imports_no_opengl():
+    run("import sys\n"
+        "import simulation\n"
+        "loaded = [name for name in sys.modules if name.split('.')[0] == 'OpenGL']\n"
+        "assert not loaded, loaded\n")
+
+
+def test_headless_rounds_finish_and_repeat_with_a_seed():
+    # A fresh process per run: state such as the camera carries over between rounds
+    script = ("import simulation as sim\n"
+              "results = sim.run_headless(rounds=2, max_round_time=20.0, seed=7)\n"
+              "print(results['wins'], results['losses'], results['timeouts'], results['steps'],\n"
+              "      sim.player_position, sim.time_survived)\n")
+    first = run(script)
+    wins, losses, timeouts, steps = (int(value) for value in first.split()[:4])
+    assert wins + losses + timeouts == 2 and steps > 0
+    assert run(script) == first
+
+
+def test_step_advances_the_round():
+    sim.VERBOSE = False
+    sim.keys_pressed.clear()
+    sim.start_game()
+    before = sim.time_survived
+    for _ in range(10):
+        sim.step(sim.FIXED_DT)
+    assert sim.time_survived > before
+
+
+def test_fixed_timestep_consumes_whole_ticks():
+    # Binary fractions of a second, so the accumulator is exact
+    clock = sim.FixedTimestep(hz=64)
+    assert clock.advance(2.5 / 64) == 2
+    assert clock.alpha == 0.5
+    assert clock.advance(0.5 / 64) == 1
+    assert clock.alpha == 0.0
+    assert clock.advance(0.25 / 64) == 0
+    assert clock.alpha == 0.25
+
+
+def test_fixed_timestep_caps_long_frames():
+    clock = sim.FixedTimestep(hz=64, max_frame_time=4 / 64)
+    assert clock.advance(2.0) == 4
+    assert clock.alpha == 0.0
+
+
+def test_headless_runs_skip_particle_effects():
+    sim.run_headless(rounds=1, max_round_time=5.0, seed=3)
+    assert sim.EFFECTS and len(sim.sparks) == len(sim.debris) == 0
@@ -0,0 +1,90 @@
+"""StreamingVBO: appended data reads back from the buffer on both upload paths."""
+import numpy as np
+import pytest
+
+from OpenGL.arrays import vbo
+
+
+def read_back(stream, offset, count):
+    from OpenGL.GL import GL_ARRAY_BUFFER, glGetBufferSubData
+    return np.frombuffer(glGetBufferSubData(GL_ARRAY_BUFFER, offset.offset, count * 4), np.float32)
+
+
+@pytest.fixture(params=[True, False], ids=['persistent', 'orphaning'])
+def persistent(request, gl_context):
+    return request.param
+
+
+def test_appends_read_back_across_frames(persistent):
+    stream = vbo.StreamingVBO(256, segments=3, persistent=persistent)
+    try:
+        for frame in range(8):
+            arrays = [np.arange(frame, frame + 5 + index, dtype=np.float32) for index in range(3)]
+            offsets = [stream.append(array) for array in arrays]
+            assert all(offset.offset % stream.alignment == 0 for offset in offsets)
+            with stream:
+                for array, offset in zip(arrays, offsets):
+                    np.testing.assert_array_equal(read_back(stream, offset, len(array)), array)
+            stream.next_frame()
+            assert stream.cursor % stream.segment_size == 0
+    finally:
+        stream.delete()
+
+
+def test_wrap_between_appends_keeps_the_earlier_ones(persistent):
+    # The second append wraps the ring before the first has been bound
+    stream = vbo.StreamingVBO(64, segments=2, persistent=persistent)
+    try:
+        stream.append(np.zeros(16, np.float32))
+        with stream:
+            pass
+        first_array = np.arange(8, dtype=np.float32)
+        second_array = np.arange(100, 116, dtype=np.float32)
+        first = stream.append(first_array)
+        second = stream.append(second_array)
+        assert second.offset == 0 and first.offset >= second_array.nbytes
+        with stream:
+            np.testing.assert_array_equal(read_back(stream, first, 8), first_array)
+            np.testing.assert_array_equal(read_back(stream, second, 16), second_array)
+    finally:
+        stream.delete()
+
+
+def test_appends_between_binds_must_fit(persistent):
+    stream = vbo.StreamingVBO(64, segments=2, persistent=persistent)
+    try:
+        stream.append(np.zeros(16, np.float32))
+        stream.append(np.zeros(8, np.float32))
+        with pytest.raises(ValueError):
+            stream.append(np.zeros(24, np.float32))
+        with pytest.raises(ValueError):
+            stream.append(np.zeros(40, np.float32))
+    finally:
+        stream.delete()
+
+
+def test_coalesce_merges_overlapping_and_nearby_ranges():
+    assert vbo._coalesce([(40, 50), (0, 10), (10, 20), (5, 8), (24, 30)]) == [(0, 20), (24, 30), (40, 50)]
+    assert vbo._coalesce([(0, 10), (14, 20)], gap=4) == [(0, 20)]
+
+
+@pytest.mark.parametrize('layout', ['contiguous', 'strided'])
+def test_overlapping_and_adjacent_writes_read_back(gl_context, layout):
+    from OpenGL.GL import GL_ARRAY_BUFFER, glGetBufferSubData
+    source = np.arange(64, dtype=np.float32)
+    data = source[:32] if layout == 'contiguous' else source[::2]
+    buffer = vbo.VBO(data)
+    try:
+        with buffer:
+            pass
+        buffer[2:10] = np.full(8, -1.0, np.float32)
+        buffer[6:14] = np.full(8, -2.0, np.float32)   # Overlaps the first write
+        buffer[14:16] = np.full(2, -3.0, np.float32)  # Adjacent to the second
+        buffer[24:26] = np.full(2, -4.0, np.float32)  # Apart from the rest
+        with buffer:
+            uploaded = np.frombuffer(glGetBufferSubData(GL_ARRAY_BUFFER, 0, 32 * 4), np.float32)
+        expected = np.ascontiguousarray(data)
+        assert (expected[2:6] == -1.0).all() and (expected[6:14] == -2.0).all()
+        np.testing.assert_array_equal(uploaded, expected)
+    finally:
+        buffer.delete()